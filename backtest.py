@@ -1,9 +1,26 @@
+import os
+import time
 import requests
 import pandas as pd
 import matplotlib.pyplot as plt
+from src.modules.datafeed.ohlcv_store import OHLCVStore
 
 # Dexscreener API endpoint for historical data
-API_URL = "https://api.dexscreener.com/latest/dex/tokens/0x86b7cbA8d4bD93D20191614544ad26D011C9DE2b"
+TOKEN_ADDRESS = "0x86b7cbA8d4bD93D20191614544ad26D011C9DE2b"
+API_URL = f"https://api.dexscreener.com/latest/dex/tokens/{TOKEN_ADDRESS}"
+
+# Local price history cache; DexScreener is only hit when the last fetch doesn't reach the sell date
+CACHE_DIR = "data/ohlcv"
+FETCHED_AT_PATH = os.path.join(CACHE_DIR, "dexscreener", "fetched_at")
+HISTORY_REFRESH_SECONDS = 3600  # how stale the history may get while the sell date is still ahead
+_store = None
+
+def get_store():
+    """Returns the price history cache, created on first use rather than at import."""
+    global _store
+    if _store is None:
+        _store = OHLCVStore(CACHE_DIR)
+    return _store
 
 def fetch_historical_data():
     """Fetches historical price data from DexScreener API."""
@@ -15,9 +32,37 @@ def fetch_historical_data():
         print("Error fetching data")
         return []
 
+def last_fetch_ms():
+    """Returns when the price history was last fetched (epoch ms), or 0 if it never was."""
+    try:
+        with open(FETCHED_AT_PATH) as file:
+            return float(file.read())
+    except (OSError, ValueError):
+        return 0.0
+
+def load_price_history(until):
+    """
+    Returns cached price history, refreshing it from DexScreener unless the last fetch already covers `until`.
+
+    History can't extend past the moment it was fetched, so a token whose history stops early (inactive, or
+    `until` still in the future) is refetched at most every HISTORY_REFRESH_SECONDS, not on every call.
+    """
+    store = get_store()
+    until_ms = pd.Timestamp(until).timestamp() * 1000
+    if last_fetch_ms() < min(until_ms, time.time() * 1000 - HISTORY_REFRESH_SECONDS * 1000):
+        fetched_at = time.time() * 1000
+        history = fetch_historical_data()
+        if history:
+            rows = [[int(point['timestamp']) * 1000] + [float(point['priceUsd'])] * 4 + [0.0] for point in history]
+            store.write("dexscreener", TOKEN_ADDRESS, "history", rows)
+            with open(FETCHED_AT_PATH, "w") as file:
+                file.write(str(fetched_at))
+    cached = store.load("dexscreener", TOKEN_ADDRESS, "history")
+    return [{'timestamp': int(row[0]) // 1000, 'priceUsd': row[4]} for row in cached]
+
 def backtest_trade(buy_date, sell_date, investment=100):
     """Simulates a trade based on historical price data."""
-    data = fetch_historical_data()
+    data = load_price_history(sell_date)
     if not data:
         print("No price data available.")
         return
@@ -63,4 +108,5 @@ def backtest_trade(buy_date, sell_date, investment=100):
     plt.show()
 
 # Example usage (Jan 1, 2025 to Jan 7, 2025)
-backtest_trade("2025-01-01", "2025-01-07")
\ No newline at end of file
+if __name__ == "__main__":
+    backtest_trade("2025-01-01", "2025-01-07")
\ No newline at end of file
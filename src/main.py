@@ -79,12 +79,10 @@ def stream_websocket_data(data_feed, user_id):
         return {"error": "API keys not found"}
 
     try:
-        data_feed.start_websocket(exchange_name="binance", symbol="BTCUSDT",
-                                  api_key=api_keys["api_key"], secret=api_keys["secret_key"])
-        data_feed.start_websocket(exchange_name="coinbase", symbol="BTC-USD",
-                                  api_key=api_keys["api_key"], secret=api_keys["secret_key"])
-        data_feed.start_websocket(exchange_name="kraken", symbol="BTC/USD",
-                                  api_key=api_keys["api_key"], secret=api_keys["secret_key"])
+        data_feed.add_stream(exchange_name="binance", symbols=["BTCUSDT"])
+        data_feed.add_stream(exchange_name="coinbase", symbols=["BTC-USD"])
+        data_feed.add_stream(exchange_name="kraken", symbols=["BTC/USD"])
+        data_feed.run_streams()
     except Exception as e:
         logger.error(f"Error streaming WebSocket data: {str(e)}")
 
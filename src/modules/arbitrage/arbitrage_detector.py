@@ -1,23 +1,35 @@
 # src/modules/arbitrage/arbitrage_detector.py
 
-import ccxt
 import yaml
 import time
-from src.utils.logger import get_logger
+from src.modules.utils.logger import get_logger
 from src.modules.order_management.order_manager import OrderManager
+from src.modules.exchange_connector.exchange_registry import get_exchange_registry
+from src.modules.datafeed.price_cache import get_price_cache
 
 class ArbitrageDetector:
-    def __init__(self, config_path="src/config/arbitrage_config.yaml", secrets_path="src/config/secrets.yaml"):
+    def __init__(self, config_path="src/config/arbitrage_config.yaml", secrets_path="src/config/secrets.yaml",
+                 order_books=None, order_manager=None, registry=None, router=None):
         """
         Initializes the Arbitrage Detector.
         :param config_path: Path to the arbitrage configuration file.
         :param secrets_path: Path to the API credentials file.
+        :param order_books: Optional OrderBookManager; live books are used instead of REST tickers.
+        :param order_manager: Shared OrderManager; a new one is created if omitted.
+        :param registry: ExchangeRegistry providing shared clients; defaults to the process-wide one.
+        :param router: Optional VenueRouter; among venues quoting within 'routing_tolerance_percent' of
+                       the best price, each leg goes to the one with the lowest recent order latency.
         """
         self.logger = get_logger("ArbitrageDetector")
         self.config = self._load_yaml(config_path)
         self.secrets = self._load_yaml(secrets_path)
+        self.registry = registry or get_exchange_registry()
         self.exchanges = self._initialize_exchanges()
-        self.order_manager = OrderManager()
+        self._owns_order_manager = order_manager is None
+        self.order_manager = order_manager or OrderManager(registry=self.registry)
+        self.order_books = order_books
+        self.price_cache = get_price_cache()
+        self.router = router
 
     def _load_yaml(self, path):
         """Load YAML configuration file."""
@@ -29,19 +41,8 @@ class ArbitrageDetector:
             return {}
 
     def _initialize_exchanges(self):
-        """Initialize exchange connections with API keys."""
-        exchanges = {}
-        for exchange_name, credentials in self.secrets.get("exchanges", {}).items():
-            try:
-                exchange_class = getattr(ccxt, exchange_name)
-                exchanges[exchange_name] = exchange_class({
-                    "apiKey": credentials["api_key"],
-                    "secret": credentials["api_secret"],
-                })
-                self.logger.info(f"Connected to {exchange_name}")
-            except Exception as e:
-                self.logger.error(f"Failed to connect to {exchange_name}: {e}")
-        return exchanges
+        """Get the shared exchange clients for the configured API keys."""
+        return self.registry.clients_for(self.secrets)
 
     def get_price_data(self, exchange_name, symbol):
         """
@@ -50,13 +51,19 @@ class ArbitrageDetector:
         :param symbol: Trading pair (e.g., BTC/USDT).
         :return: Market price or None if failed.
         """
+        if self.order_books is not None:
+            book = self.order_books.get(exchange_name, symbol)
+            if book is not None and book.mid_price() is not None:
+                return book.mid_price()
+
         exchange = self.exchanges.get(exchange_name)
         if not exchange:
             self.logger.error(f"Exchange {exchange_name} not initialized.")
             return None
 
         try:
-            ticker = exchange.fetch_ticker(symbol)
+            ticker = self.price_cache.get_or_fetch(exchange_name, symbol,
+                                                 self.registry.throttled(exchange_name, exchange, "fetch_ticker"))
             return ticker["last"]  # Latest trade price
         except Exception as e:
             self.logger.error(f"Failed to fetch market data from {exchange_name}: {e}")
@@ -84,6 +91,9 @@ class ArbitrageDetector:
         # Find highest and lowest price differences
         highest_exchange, highest_price = max(price_data.items(), key=lambda x: x[1])
         lowest_exchange, lowest_price = min(price_data.items(), key=lambda x: x[1])
+        if self.router is not None:
+            highest_exchange, lowest_exchange = self._route_legs(price_data, highest_price, lowest_price)
+            highest_price, lowest_price = price_data[highest_exchange], price_data[lowest_exchange]
 
         price_difference = highest_price - lowest_price
         profit_percent = (price_difference / lowest_price) * 100
@@ -116,6 +126,19 @@ class ArbitrageDetector:
         self.logger.info("No profitable arbitrage opportunity detected.")
         return None
 
+    def _route_legs(self, price_data, highest_price, lowest_price):
+        """
+        Pick the fastest sell and buy venues among those quoting close to the best prices.
+
+        :return: (sell_exchange, buy_exchange).
+        """
+        tolerance = self.config["arbitrage"].get("routing_tolerance_percent", 0) / 100
+        sellers = [name for name, price in price_data.items() if price >= highest_price * (1 - tolerance)]
+        buyers = [name for name, price in price_data.items() if price <= lowest_price * (1 + tolerance)]
+        sell_exchange = self.router.choose(sellers)
+        buy_exchange = self.router.choose([name for name in buyers if name != sell_exchange] or buyers)
+        return sell_exchange, buy_exchange
+
     def execute_arbitrage_trade(self, opportunity, trade_size):
         """
         Executes arbitrage trade.
@@ -147,4 +170,9 @@ class ArbitrageDetector:
         if not sell_order:
             self.logger.error("Failed to place sell order. Consider manually selling.")
 
-        self.logger.info("Arbitrage trade executed successfully.")
\ No newline at end of file
+        self.logger.info("Arbitrage trade executed successfully.")
+
+    def close(self):
+        """Close the order manager if this instance created it (a shared one is left to its owner)."""
+        if self._owns_order_manager:
+            self.order_manager.close()
@@ -1,21 +1,24 @@
 # src/modules/arbitrage/arbitrage_execution.py
 
 import time
+import yaml
 from tenacity import retry, stop_after_attempt, wait_fixed
-from src.utils.logger import get_logger
+from src.modules.utils.logger import get_logger
 from src.modules.order_management.order_manager import OrderManager
-from src.modules.risk_management.risk_manager import RiskManager
 
 class ArbitrageExecution:
-    def __init__(self, config_path="src/config/arbitrage_config.yaml"):
+    def __init__(self, config_path="src/config/arbitrage_config.yaml", order_manager=None, risk_manager=None):
         """
         Initialize the Arbitrage Execution module.
         :param config_path: Path to the arbitrage configuration file.
+        :param order_manager: Shared OrderManager; a new one is created if omitted.
+        :param risk_manager: Shared RiskManager; defaults to the order manager's.
         """
         self.logger = get_logger("ArbitrageExecution")
         self.config = self._load_yaml(config_path)
-        self.order_manager = OrderManager()
-        self.risk_manager = RiskManager()
+        self._owns_order_manager = order_manager is None
+        self.order_manager = order_manager or OrderManager(risk_manager=risk_manager)
+        self.risk_manager = risk_manager or self.order_manager.risk_manager
 
     def _load_yaml(self, path):
         """Load YAML configuration file."""
@@ -41,8 +44,10 @@ class ArbitrageExecution:
         self.logger.info(f"Executing arbitrage: Buy {trade_size} {symbol} on {buy_exchange} at {buy_price}, "
                          f"Sell on {sell_exchange} at {sell_price}")
 
-        # Check risk constraints before placing orders
-        if not self.risk_manager.assess_order_risk(trade_size, portfolio_value=100):  # Example portfolio value
+        # Check both legs against the pre-trade limits before placing either
+        gate = self.order_manager.pretrade_gate
+        if gate.check(buy_exchange, symbol, "buy", trade_size, buy_price, record=False) or \
+                gate.check(sell_exchange, symbol, "sell", trade_size, sell_price, record=False):
             self.logger.warning("Arbitrage trade rejected due to risk constraints.")
             return
 
@@ -106,4 +111,9 @@ class ArbitrageExecution:
         if abs(expected_price - actual_price) / expected_price > slippage_tolerance:
             self.logger.warning(f"Slippage too high! Expected: {expected_price}, Actual: {actual_price}")
             return False
-        return True
\ No newline at end of file
+        return True
+
+    def close(self):
+        """Close the order manager if this instance created it (a shared one is left to its owner)."""
+        if self._owns_order_manager:
+            self.order_manager.close()
@@ -0,0 +1,161 @@
+# src/modules/datafeed/backfill.py
+
+import asyncio
+import time
+from src.modules.utils.logger import get_logger
+from src.modules.utils.metrics import get_counters
+from src.modules.datafeed.ohlcv_store import timeframe_to_ms
+from src.modules.exchange_connector.rate_limiter import RateLimiter, BACKFILL, DEFAULT_RATE_LIMIT
+
+class HistoricalBackfill:
+    """
+    Fills the OHLCV store for many (exchange, symbol, timeframe) series at once.
+
+    Each requested range is reduced to the ranges the store is missing, split into pages of
+    at most 'page_limit' candles, and the pages are fetched concurrently: different venues run
+    in parallel, while calls to the same venue are paced to its configured rate_limit.
+
+    With shared venue rate limiters, pages are requested in the BACKFILL lane, so live cancels,
+    orders and market-data requests on the same venue always go first.
+    """
+
+    def __init__(self, exchanges: dict, store, rate_limits: dict = None, page_limit: int = 1000,
+                 max_concurrency: int = 4, max_attempts: int = 3, rate_limiters: dict = None):
+        """
+        :param exchanges: Mapping of exchange name -> ccxt client.
+        :param store: OHLCVStore that receives the candles.
+        :param rate_limits: Mapping of exchange name -> requests per minute (from exchanges.yaml).
+        :param page_limit: Maximum candles requested per fetch_ohlcv call.
+        :param max_concurrency: Maximum in-flight requests per venue.
+        :param max_attempts: Attempts per page before it is reported as failed.
+        :param rate_limiters: Mapping of exchange name -> shared RateLimiter; venues without one get a
+                              private limiter spacing requests evenly at their rate_limits entry.
+        """
+        self.logger = get_logger("HistoricalBackfill")
+        self.counters = get_counters("datafeed")
+        self.exchanges = exchanges
+        self.store = store
+        self.rate_limits = rate_limits or {}
+        self.rate_limiters = rate_limiters or {}
+        self.page_limit = page_limit
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+
+    def plan(self, exchange_name: str, symbol: str, timeframe: str, since: int, until: int):
+        """
+        Split the uncached part of a range into pages.
+
+        :return: List of (page_start_ms, page_end_ms) inclusive ranges.
+        """
+        step = timeframe_to_ms(timeframe)
+        pages = []
+        for start, end in self.store.missing_ranges(exchange_name, symbol, timeframe, since, until):
+            while start <= end:
+                page_end = min(end, start + (self.page_limit - 1) * step)
+                pages.append((start, page_end))
+                start = page_end + step
+        return pages
+
+    def _limiter(self, exchange_name):
+        limiter = self.rate_limiters.get(exchange_name)
+        if limiter is None:
+            limiter = RateLimiter(self.rate_limits.get(exchange_name, DEFAULT_RATE_LIMIT), burst=1, reserve=0,
+                                  weights={"fetch_ohlcv": 1}, name=exchange_name)
+        return limiter
+
+    async def _fetch_page(self, exchange_name, symbol, timeframe, start, end, limiter, semaphore):
+        """
+        Fetch one page. Venues that cap a response below 'page_limit' (Coinbase returns at most
+        300 candles) answer with a short page; the rest of the page is requested from the last
+        returned candle on, until the page is complete or the venue has nothing more.
+        """
+        exchange = self.exchanges[exchange_name]
+        step = timeframe_to_ms(timeframe)
+        rows = []
+        async with semaphore:
+            while start <= end:
+                page = await self._fetch_rows(exchange, exchange_name, symbol, timeframe, start, end, limiter)
+                if page is None:
+                    self.counters.increment(f"{exchange_name}.backfill_failed_pages")
+                    return None
+                page = [row for row in page if start <= row[0] <= end]
+                if not page:
+                    break
+                rows.extend(page)
+                start = max(row[0] for row in page) + step
+        return rows
+
+    async def _fetch_rows(self, exchange, exchange_name, symbol, timeframe, start, end, limiter):
+        """One fetch_ohlcv call from 'start', retried up to 'max_attempts' times; None if all fail."""
+        limit = (end - start) // timeframe_to_ms(timeframe) + 1
+        for attempt in range(1, self.max_attempts + 1):
+            await limiter.acquire_for_async("fetch_ohlcv", BACKFILL)
+            try:
+                return await asyncio.to_thread(exchange.fetch_ohlcv, symbol, timeframe, since=start, limit=limit)
+            except Exception as e:
+                self.logger.warning(f"Backfill page {start}-{end} for {symbol} on {exchange_name} failed "
+                                    f"(attempt {attempt}/{self.max_attempts}): {e}")
+        return None
+
+    async def backfill(self, jobs):
+        """
+        Fetch and store every missing candle for a list of jobs.
+
+        :param jobs: Iterable of (exchange_name, symbol, timeframe, since_ms, until_ms).
+        :return: Report dict with candles, pages, failed_pages, elapsed seconds and candles_per_second.
+        """
+        started = time.monotonic()
+        limiters, semaphores, tasks, pages = {}, {}, [], []
+        for exchange_name, symbol, timeframe, since, until in jobs:
+            if exchange_name not in self.exchanges:
+                self.logger.error(f"Exchange {exchange_name} is not initialized.")
+                continue
+            if exchange_name not in limiters:
+                limiters[exchange_name] = self._limiter(exchange_name)
+                semaphores[exchange_name] = asyncio.Semaphore(self.max_concurrency)
+            for start, end in self.plan(exchange_name, symbol, timeframe, since, until):
+                pages.append((start, end))
+                tasks.append(((exchange_name, symbol, timeframe), asyncio.ensure_future(self._fetch_page(
+                    exchange_name, symbol, timeframe, start, end, limiters[exchange_name], semaphores[exchange_name]))))
+
+        await asyncio.gather(*(task for _, task in tasks))
+
+        # Merge all pages of a series in one write; the store deduplicates by timestamp
+        now = int(time.time() * 1000)
+        series, fetched, failed = {}, {}, 0
+        for (key, task), (start, end) in zip(tasks, pages):
+            rows = task.result()
+            if rows is None:
+                failed += 1
+                continue
+            series.setdefault(key, []).extend(rows)
+            # Record fetched pages, even empty ones, so periods without candles are not requested again
+            step = timeframe_to_ms(key[2])
+            covered_end = min(end, now - now % step - step)
+            if start <= covered_end:
+                fetched.setdefault(key, []).append((start, covered_end))
+
+        candles = 0
+        for (exchange_name, symbol, timeframe), rows in series.items():
+            step = timeframe_to_ms(timeframe)
+            complete = [row for row in rows if row[0] + step <= now]
+            self.store.write(exchange_name, symbol, timeframe, complete)
+            candles += len(complete)
+        for (exchange_name, symbol, timeframe), ranges in fetched.items():
+            self.store.mark_covered(exchange_name, symbol, timeframe, ranges)
+
+        elapsed = time.monotonic() - started
+        report = {
+            "candles": candles,
+            "pages": len(tasks),
+            "failed_pages": failed,
+            "elapsed": elapsed,
+            "candles_per_second": candles / elapsed if elapsed > 0 else 0.0
+        }
+        self.logger.info(f"Backfilled {candles} candles in {len(tasks)} pages ({failed} failed) in {elapsed:.2f}s "
+                         f"({report['candles_per_second']:.0f} candles/s)")
+        return report
+
+    def run(self, jobs):
+        """Run backfill() to completion in a new event loop (blocks)."""
+        return asyncio.run(self.backfill(jobs))
@@ -1,28 +1,51 @@
 # src/modules/datafeed/data_feed.py
 
-import ccxt
 import yaml
-import asyncio
 from tenacity import retry, stop_after_attempt, wait_fixed
-from src.modules.utils.logger import get_logger
-from src.modules.datafeed.websocket_client import WebSocketClient
+from src.modules.utils.logger import get_logger, RateLimitedLogger
+from src.modules.utils.metrics import get_counters
+from src.modules.datafeed.stream_manager import StreamManager
+from src.modules.datafeed.order_book import OrderBookManager
+from src.modules.datafeed.market_data import Ticker, Trade
+from src.modules.datafeed.tick_store import TickStore
+from src.modules.datafeed.ohlcv_store import OHLCVStore, timeframe_to_ms
+from src.modules.datafeed.backfill import HistoricalBackfill
+from src.modules.datafeed.recorder import FrameRecorder
+from src.modules.datafeed.event_bus import EventBus
+from src.modules.datafeed.price_cache import get_price_cache
+from src.modules.exchange_connector.exchange_registry import get_exchange_registry
 
 
 class DataFeed:
     """Handles fetching market data via REST APIs and real-time WebSocket connections."""
 
-    def __init__(self, config_path: str, secrets_path: str):
+    def __init__(self, config_path: str, secrets_path: str, registry=None):
         """
         Initialize the DataFeed module with exchange APIs and WebSocket support.
 
         :param config_path: Path to the config.yaml file.
         :param secrets_path: Path to the secrets.yaml file.
+        :param registry: ExchangeRegistry providing shared clients; defaults to the process-wide one.
         """
         self.logger = get_logger("DataFeed")
+        self.sampled_logger = RateLimitedLogger(self.logger)
         self.config = self._load_yaml(config_path)
         self.secrets = self._load_yaml(secrets_path)
+        self.registry = registry or get_exchange_registry()
         self.exchanges = self._initialize_exchanges()
-        self.websocket_client = None  # WebSocket client instance
+        record_path = self.config.get("record_path")
+        self.recorder = FrameRecorder(record_path) if record_path else None
+        self.stream_manager = StreamManager(ws_urls=self.config.get("ws_urls"), on_message=self._on_stream_message,
+                                            recorder=self.recorder)
+        self.event_bus = EventBus()
+        self.price_cache = get_price_cache()
+        self.price_ttl = self.config.get("price_cache_ttl")
+        self.tick_store = TickStore(capacity=self.config.get("tick_buffer_size", 4096))
+        self.order_books = OrderBookManager(snapshot_fetcher=self.fetch_order_book,
+                                            resubscriber=self.stream_manager.resubscribe,
+                                            snapshot_listener=self.recorder.record_snapshot if self.recorder else None)
+        cache_dir = self.config.get("ohlcv_cache_dir")
+        self.ohlcv_store = OHLCVStore(cache_dir) if cache_dir else None
 
     def _load_yaml(self, path: str):
         """Load a YAML file and handle errors."""
@@ -34,19 +57,8 @@ class DataFeed:
             return {}
 
     def _initialize_exchanges(self):
-        """Initialize exchange clients using CCXT with API credentials."""
-        exchanges = {}
-        for exchange_name, credentials in self.secrets.get("exchanges", {}).items():
-            try:
-                exchange_class = getattr(ccxt, exchange_name)
-                exchanges[exchange_name] = exchange_class({
-                    "apiKey": credentials["api_key"],
-                    "secret": credentials["api_secret"]
-                })
-                self.logger.info(f"Initialized exchange: {exchange_name}")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize {exchange_name}: {e}")
-        return exchanges
+        """Get the shared CCXT exchange clients for the configured API credentials."""
+        return self.registry.clients_for(self.secrets)
 
     def _get_exchange(self, exchange_name: str):
         """Retrieve the exchange client by name."""
@@ -60,16 +72,22 @@ class DataFeed:
         """
         Fetch market ticker data for a specific symbol from an exchange, with retry logic.
 
+        A fresh ticker from the streaming price cache is returned without a REST call.
+
         :param exchange_name: Name of the exchange (e.g., 'binance').
         :param symbol: Trading pair symbol (e.g., 'BTC/USDT').
         :return: Ticker data or None if an error occurs.
         """
+        cached = self.price_cache.get(exchange_name, symbol, self.price_ttl)
+        if cached is not None:
+            return cached
+
         exchange = self._get_exchange(exchange_name)
         if not exchange:
             return None
 
         try:
-            ticker = exchange.fetch_ticker(symbol)
+            ticker = self.registry.throttled(exchange_name, exchange, "fetch_ticker")(symbol)
             self.logger.info(f"Fetched market data for {symbol} on {exchange_name}")
             return ticker
         except Exception as e:
@@ -77,56 +95,198 @@ class DataFeed:
             raise
 
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
-    def fetch_historical_data(self, exchange_name: str, symbol: str, timeframe: str = "1h", limit: int = 100):
+    def fetch_historical_data(self, exchange_name: str, symbol: str, timeframe: str = "1h", limit: int = 100,
+                              since: int = None):
         """
         Fetch historical OHLCV data for a specific symbol from an exchange.
 
+        When 'ohlcv_cache_dir' is configured, candles are served from the on-disk OHLCVStore and
+        only the ranges missing from the cache are downloaded.
+
         :param exchange_name: Name of the exchange (e.g., 'binance').
         :param symbol: Trading pair symbol (e.g., 'BTC/USDT').
         :param timeframe: Timeframe for candlesticks (e.g., '1m', '1h', '1d').
         :param limit: Number of candlesticks to fetch.
-        :return: List of OHLCV data or None if an error occurs.
+        :param since: Open time of the first candle in milliseconds; defaults to the last 'limit' candles.
+        :return: OHLCV rows (a NumPy array when served from the cache) or None if an error occurs.
         """
         exchange = self._get_exchange(exchange_name)
         if not exchange:
             return None
 
         try:
-            ohlcv = exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            if self.ohlcv_store is not None:
+                return self._fetch_cached_ohlcv(exchange, exchange_name, symbol, timeframe, limit, since)
+            fetch_ohlcv = self.registry.throttled(exchange_name, exchange, "fetch_ohlcv")
+            ohlcv = fetch_ohlcv(symbol, timeframe, since=since, limit=limit) if since is not None \
+                else fetch_ohlcv(symbol, timeframe, limit=limit)
             self.logger.info(f"Fetched historical data for {symbol} on {exchange_name}")
             return ohlcv
         except Exception as e:
             self.logger.warning(f"Retrying fetch_historical_data for {symbol} on {exchange_name} due to error: {e}")
             raise
 
-    def start_websocket(self, exchange_name: str, symbol: str):
+    def _fetch_cached_ohlcv(self, exchange, exchange_name, symbol, timeframe, limit, since):
+        """Serve candles from the OHLCV cache, paging in only the missing ranges."""
+        step = timeframe_to_ms(timeframe)
+        page_limit = self.config.get("ohlcv_page_limit", 1000)
+        if since is None:
+            now = exchange.milliseconds()
+            since = now - now % step - (limit - 1) * step
+        until = since + (limit - 1) * step
+
+        fetch_ohlcv = self.registry.throttled(exchange_name, exchange, "fetch_ohlcv")
+
+        def fetch_range(start, end):
+            rows = []
+            while start <= end:
+                page = fetch_ohlcv(symbol, timeframe, since=start, limit=min(page_limit, (end - start) // step + 1))
+                if not page:
+                    break
+                rows.extend(row for row in page if row[0] <= end)
+                start = page[-1][0] + step
+            return rows
+
+        ohlcv = self.ohlcv_store.get(exchange_name, symbol, timeframe, since, until, fetcher=fetch_range)
+        self.logger.info(f"Served {len(ohlcv)} {timeframe} candles for {symbol} on {exchange_name} from cache")
+        return ohlcv
+
+    def backfill_historical_data(self, jobs):
+        """
+        Backfill the OHLCV cache for many series concurrently, paced to each venue's rate_limit.
+
+        :param jobs: Iterable of (exchange_name, symbol, timeframe, since_ms, until_ms).
+        :return: Backfill report (candles, pages, failed_pages, elapsed, candles_per_second) or None.
+        """
+        if self.ohlcv_store is None:
+            self.logger.error("Backfill requires 'ohlcv_cache_dir' to be configured.")
+            return None
+
+        venues = {job[0] for job in jobs if job[0] in self.exchanges}
+        for exchange_name in venues:
+            self.registry.ensure_markets(self.exchanges[exchange_name])
+        rate_limiters = {name: self.registry.rate_limiter(name) for name in venues}
+        backfill = HistoricalBackfill(self.exchanges, self.ohlcv_store, rate_limiters=rate_limiters,
+                                      page_limit=self.config.get("ohlcv_page_limit", 1000))
+        return backfill.run(jobs)
+
+    def fetch_order_book(self, exchange_name: str, symbol: str, limit: int = 1000):
+        """
+        Fetch an L2 order book snapshot for a symbol.
+
+        :param exchange_name: Name of the exchange (e.g., 'binance').
+        :param symbol: Trading pair symbol (e.g., 'BTC/USDT').
+        :param limit: Number of levels per side.
+        :return: ccxt order book dict or None if an error occurs.
         """
-        Initialize and start the WebSocket client for real-time data streaming.
+        exchange = self._get_exchange(exchange_name)
+        if not exchange:
+            return None
+
+        try:
+            order_book = self.registry.throttled(exchange_name, exchange, "fetch_order_book")(symbol, limit=limit)
+            self.logger.info(f"Fetched order book snapshot for {symbol} on {exchange_name}")
+            return order_book
+        except Exception as e:
+            self.logger.error(f"Failed to fetch order book for {symbol} on {exchange_name}: {e}")
+            return None
+
+    def add_order_book(self, exchange_name: str, stream_symbol: str, symbol: str = None):
+        """
+        Maintain a local L2 order book from the exchange's depth stream.
 
         :param exchange_name: Name of the exchange (e.g., 'binance', 'coinbase', 'kraken').
-        :param symbol: Trading pair symbol (e.g., 'BTCUSDT', 'BTC-USD').
+        :param stream_symbol: Symbol in WebSocket format (e.g., 'BTCUSDT', 'BTC-USD', 'XBT/USD').
+        :param symbol: Unified symbol for REST snapshots and lookups (e.g., 'BTC/USDT'); derived
+                       from the stream symbol if omitted.
+        :return: The OrderBook that will be kept up to date, or None if unsupported.
         """
-        # Define WebSocket URLs for supported exchanges
-        ws_urls = {
-            "binance": "wss://stream.binance.com:9443/ws",
-            "coinbase": "wss://ws-feed.pro.coinbase.com",
-            "kraken": "wss://ws.kraken.com"
-        }
+        if not self.add_stream(exchange_name, stream_symbol, channels=("depth",)):
+            return None
+        return self.order_books.track(exchange_name, stream_symbol, symbol)
 
-        if exchange_name not in ws_urls:
-            self.logger.error(f"WebSocket is not supported for {exchange_name}")
+    def _on_stream_message(self, exchange_name, payload):
+        """
+        Dispatch a decoded WebSocket payload to local market-data state and publish it on the
+        event bus as (exchange, symbol, 'ticker' | 'trade' | 'book').
+        """
+        if isinstance(payload, Ticker):
+            self.sampled_logger.debug(f"{exchange_name}.ticker", "Ticker update: %s", payload)
+            self.price_cache.update(payload)
+            self.event_bus.publish(exchange_name, payload.symbol, "ticker", payload)
+            return
+        if isinstance(payload, list) and payload and isinstance(payload[0], Trade):
+            for trade in payload:
+                self.tick_store.on_trade(trade)
+            self.event_bus.publish(exchange_name, payload[0].symbol, "trade", payload)
             return
+        book = self.order_books.on_message(exchange_name, payload)
+        if book is not None and book.synced:
+            self.event_bus.publish(exchange_name, book.symbol, "book", book)
 
-        ws_url = ws_urls[exchange_name]
-        self.websocket_client = WebSocketClient(
-            exchange_name=exchange_name,
-            ws_url=ws_url,
-            symbol=symbol
-        )
-        self.logger.info(f"Starting WebSocket for {symbol} on {exchange_name}")
+    def add_stream(self, exchange_name: str, symbols, channels=("ticker",)):
+        """
+        Register symbols for real-time streaming without starting the event loop.
 
-        # Run WebSocket in an event loop
+        :param exchange_name: Name of the exchange (e.g., 'binance', 'coinbase', 'kraken').
+        :param symbols: A symbol or list of symbols in exchange format (e.g., 'BTCUSDT', 'BTC-USD').
+        :param channels: Channels to subscribe to for each symbol.
+        :return: True if the stream was registered.
+        """
+        registered = self.stream_manager.add_stream(exchange_name, symbols, channels)
+        if registered:
+            self.logger.info(f"Registered WebSocket stream for {symbols} on {exchange_name}")
+        return registered
+
+    def run_streams(self):
+        """Run every registered stream concurrently in a single event loop (blocks)."""
         try:
-            asyncio.run(self.websocket_client.run())
+            self.stream_manager.run_forever()
         except Exception as e:
-            self.logger.error(f"WebSocket client error: {e}")
\ No newline at end of file
+            self.logger.error(f"WebSocket client error: {e}")
+        finally:
+            if self.recorder is not None:
+                self.recorder.close()
+
+    def replay_recording(self, path: str, speed: float = None):
+        """
+        Feed a recorded capture through the same pipeline as live streams (tick store, order books, ...).
+
+        Order books are rebuilt from the REST snapshots recorded with the frames; nothing is
+        fetched or resubscribed while replaying.
+
+        :param path: Capture file written while 'record_path' was configured.
+        :param speed: 1.0 for real time, N for N times faster, None for as fast as possible.
+        :return: Number of frames replayed, or None if the capture could not be read.
+        """
+        books = self.order_books
+        live = books.snapshot_fetcher, books.resubscriber, books.snapshot_listener
+        books.snapshot_fetcher = books.resubscriber = books.snapshot_listener = None
+        try:
+            return self.stream_manager.replay(path, speed, on_snapshot=books.load_snapshot)
+        except Exception as e:
+            self.logger.error(f"Failed to replay {path}: {e}")
+            return None
+        finally:
+            books.snapshot_fetcher, books.resubscriber, books.snapshot_listener = live
+
+    def get_stream_stats(self):
+        """
+        Return streaming health counters (messages, reconnects, sequence gaps, resyncs, ...).
+
+        :return: Dictionary of '<exchange>.<event>' -> count.
+        """
+        return get_counters("datafeed").snapshot()
+
+    def start_websocket(self, exchange_name: str, symbol: str):
+        """
+        Register a symbol and start streaming all registered symbols in one event loop.
+
+        :param exchange_name: Name of the exchange (e.g., 'binance', 'coinbase', 'kraken').
+        :param symbol: Trading pair symbol (e.g., 'BTCUSDT', 'BTC-USD').
+        """
+        if not self.add_stream(exchange_name, symbol):
+            return
+
+        self.logger.info(f"Starting WebSocket for {symbol} on {exchange_name}")
+        self.run_streams()
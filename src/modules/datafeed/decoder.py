@@ -0,0 +1,157 @@
+# src/modules/datafeed/decoder.py
+
+import json
+import time
+from datetime import datetime
+from src.modules.datafeed.market_data import Ticker, Trade, symbol_map
+
+try:
+    import orjson
+except ImportError:  # optional fast backend
+    orjson = None
+
+if orjson is not None:
+    json_loads = orjson.loads
+    JSON_BACKEND = "orjson"
+else:
+    json_loads = json.loads
+    JSON_BACKEND = "json"
+
+
+# Substrings identifying frames nobody consumes (acks, heartbeats, status); these are
+# dropped before any JSON parsing happens.
+SKIP_MARKERS = {
+    "binance": ('"result":null',),
+    "coinbase": ('"type":"heartbeat"', '"type":"subscriptions"'),
+    "kraken": ('"event":"heartbeat"', '"event":"systemStatus"', '"event":"subscriptionStatus"'),
+}
+
+# Substrings identifying each channel's frames on the wire
+CHANNEL_MARKERS = {
+    "binance": {"ticker": '"e":"24hrTicker"', "depth": '"e":"depthUpdate"', "trade": '"e":"trade"'},
+    "coinbase": {"ticker": '"type":"ticker"', "depth": ('"type":"l2update"', '"type":"snapshot"'),
+                 "trade": ('"type":"match"', '"type":"last_match"')},
+    "kraken": {"ticker": '"ticker"', "depth": '"book-', "trade": '"trade"'},
+}
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+def _iso_to_ms(timestamp):
+    return int(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp() * 1000)
+
+
+class MessageDecoder:
+    """
+    Turns raw WebSocket frames from one exchange into typed records.
+
+    Frames are classified by cheap substring checks first, so acks, heartbeats and channels
+    that nobody subscribed to are discarded without being parsed. Ticker and trade frames are
+    parsed once and reduced to normalized Ticker/Trade records with unified symbols; depth
+    frames are returned as parsed messages for the order book engine.
+    """
+
+    def __init__(self, exchange_name: str, channels=("ticker", "depth", "trade")):
+        """
+        :param exchange_name: Name of the exchange (e.g., 'binance').
+        :param channels: Logical channels to decode; frames for other channels are skipped.
+        """
+        self.exchange_name = exchange_name.lower()
+        self.skip_markers = SKIP_MARKERS.get(self.exchange_name, ())
+        markers = CHANNEL_MARKERS.get(self.exchange_name, {})
+        self.channel_markers = []
+        for channel in channels:
+            marker = markers.get(channel)
+            if marker is None:
+                continue
+            for substring in marker if isinstance(marker, tuple) else (marker,):
+                self.channel_markers.append((substring, channel))
+        self._extract_ticker = getattr(self, f"_{self.exchange_name}_ticker", None)
+        self._extract_trades = getattr(self, f"_{self.exchange_name}_trades", None)
+
+    def classify(self, raw):
+        """
+        Return the logical channel of a raw frame, or None if it should be skipped.
+
+        :param raw: Raw frame as received (str).
+        """
+        for marker in self.skip_markers:
+            if marker in raw:
+                return None
+        for marker, channel in self.channel_markers:
+            if marker in raw:
+                return channel
+        return None
+
+    def decode(self, raw):
+        """
+        Decode a raw frame.
+
+        :param raw: Raw frame as received (str or bytes).
+        :return: Tuple (channel, payload) where payload is a Ticker for 'ticker' frames, a list of
+                 Trade records for 'trade' frames and the parsed message for 'depth' frames, or
+                 None if the frame is skipped.
+        """
+        if isinstance(raw, bytes):
+            raw = raw.decode()
+        channel = self.classify(raw)
+        if channel is None:
+            return None
+
+        data = json_loads(raw)
+        if channel == "ticker":
+            if self._extract_ticker is None:
+                return None
+            ticker = self._extract_ticker(data)
+            return None if ticker is None else (channel, ticker)
+        if channel == "trade":
+            if self._extract_trades is None:
+                return None
+            trades = self._extract_trades(data)
+            return (channel, trades) if trades else None
+        return channel, data
+
+    def _binance_ticker(self, data):
+        if "stream" in data:
+            data = data["data"]
+        return Ticker(self.exchange_name, symbol_map.to_unified(self.exchange_name, data["s"]),
+                      float(data["b"]), float(data["a"]), float(data["c"]), float(data["v"]), data["E"])
+
+    def _binance_trades(self, data):
+        if "stream" in data:
+            data = data["data"]
+        # 'm' is true when the buyer is the maker, i.e. the taker sold
+        return [Trade(self.exchange_name, symbol_map.to_unified(self.exchange_name, data["s"]),
+                      float(data["p"]), float(data["q"]), "sell" if data["m"] else "buy", data["T"], data["t"])]
+
+    def _coinbase_ticker(self, data):
+        timestamp = data.get("time")
+        return Ticker(self.exchange_name, symbol_map.to_unified(self.exchange_name, data["product_id"]),
+                      float(data["best_bid"]), float(data["best_ask"]), float(data["price"]),
+                      float(data.get("volume_24h", 0)), _iso_to_ms(timestamp) if timestamp else _now_ms())
+
+    def _coinbase_trades(self, data):
+        # 'side' on a match is the maker's side; the taker traded the other way
+        return [Trade(self.exchange_name, symbol_map.to_unified(self.exchange_name, data["product_id"]),
+                      float(data["price"]), float(data["size"]), "sell" if data["side"] == "buy" else "buy",
+                      _iso_to_ms(data["time"]), data.get("trade_id"))]
+
+    def _kraken_ticker(self, data):
+        # [channelID, {"a": [price, ...], "b": [...], "c": [price, volume], "v": [today, 24h]}, "ticker", pair]
+        if not isinstance(data, list) or len(data) < 4 or data[-2] != "ticker":
+            return None
+        fields = data[1]
+        return Ticker(self.exchange_name, symbol_map.to_unified(self.exchange_name, data[-1]),
+                      float(fields["b"][0]), float(fields["a"][0]), float(fields["c"][0]),
+                      float(fields["v"][1]), _now_ms())
+
+    def _kraken_trades(self, data):
+        # [channelID, [[price, volume, time, side, orderType, misc], ...], "trade", pair]
+        if not isinstance(data, list) or len(data) < 4 or data[-2] != "trade":
+            return None
+        symbol = symbol_map.to_unified(self.exchange_name, data[-1])
+        return [Trade(self.exchange_name, symbol, float(price), float(volume), "buy" if side == "b" else "sell",
+                      int(float(timestamp) * 1000))
+                for price, volume, timestamp, side, *_ in data[1]]
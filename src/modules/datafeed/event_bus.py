@@ -0,0 +1,169 @@
+# src/modules/datafeed/event_bus.py
+
+import asyncio
+from collections import OrderedDict, deque
+from src.modules.utils.logger import get_logger
+
+WILDCARD = "*"
+
+# Queue policies for slow subscribers
+DROP_OLDEST = "drop_oldest"  # keep the newest 'maxsize' events, discarding the oldest
+CONFLATE = "conflate"        # keep only the latest event per topic
+
+
+class Subscription:
+    """
+    One consumer's view of the bus: a bounded queue of (topic, event) pairs.
+
+    Publishing never waits on a subscription. When the queue is full the subscription's
+    policy decides what is lost, so a slow consumer only ever loses its own events.
+    """
+
+    def __init__(self, bus, pattern, maxsize: int, policy: str, name: str = None):
+        self.bus = bus
+        self.pattern = pattern
+        self.maxsize = maxsize
+        self.policy = policy
+        self.name = name or f"{policy}:{'/'.join(pattern)}"
+        self._events = OrderedDict() if policy == CONFLATE else deque()
+        self._ready = asyncio.Event()
+        self.delivered = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.closed = False
+
+    def __len__(self):
+        return len(self._events)
+
+    def matches(self, topic):
+        """Return True if a concrete (exchange, symbol, channel) topic matches this subscription."""
+        return all(wanted == WILDCARD or wanted == value for wanted, value in zip(self.pattern, topic))
+
+    def _put(self, topic, event):
+        events = self._events
+        if self.policy == CONFLATE:
+            if topic in events:
+                events[topic] = event
+                self.conflated += 1
+            else:
+                if len(events) >= self.maxsize:
+                    events.popitem(last=False)
+                    self.dropped += 1
+                events[topic] = event
+        else:
+            if len(events) >= self.maxsize:
+                events.popleft()
+                self.dropped += 1
+            events.append((topic, event))
+        self.delivered += 1
+        self._ready.set()
+
+    def get_nowait(self):
+        """
+        Pop the next event without waiting.
+
+        :return: (topic, event) or None if the queue is empty.
+        """
+        if not self._events:
+            return None
+        item = self._events.popitem(last=False) if self.policy == CONFLATE else self._events.popleft()
+        if not self._events:
+            self._ready.clear()
+        return item
+
+    async def get(self):
+        """
+        Wait for the next event.
+
+        :return: (topic, event), or None once the subscription is closed and drained.
+        """
+        while not self._events:
+            if self.closed:
+                return None
+            await self._ready.wait()
+        return self.get_nowait()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        item = await self.get()
+        if item is None:
+            raise StopAsyncIteration
+        return item
+
+    def close(self):
+        """Stop receiving events; pending events can still be drained."""
+        self.closed = True
+        self.bus.unsubscribe(self)
+        self._ready.set()
+
+    def stats(self):
+        """Return queue statistics for this subscription."""
+        return {"queued": len(self._events), "delivered": self.delivered, "dropped": self.dropped,
+                "conflated": self.conflated}
+
+
+class EventBus:
+    """
+    In-process publish/subscribe for normalized market data.
+
+    Topics are (exchange, symbol, channel) tuples; subscribers may use '*' for any part.
+    publish() is synchronous and O(matching subscribers): matches are resolved once per
+    concrete topic and cached until the subscription set changes. It must be called from
+    the event loop thread that the subscribers consume on.
+    """
+
+    def __init__(self):
+        self.logger = get_logger("EventBus")
+        self.subscriptions = []
+        self._routes = {}  # concrete topic -> list of matching subscriptions
+
+    def subscribe(self, exchange: str = WILDCARD, symbol: str = WILDCARD, channel: str = WILDCARD,
+                  maxsize: int = 1000, policy: str = DROP_OLDEST, name: str = None):
+        """
+        Register a consumer.
+
+        :param exchange: Exchange name or '*'.
+        :param symbol: Unified symbol (e.g., 'BTC/USDT') or '*'.
+        :param channel: 'ticker', 'trade', 'book' or '*'.
+        :param maxsize: Queue bound (events for DROP_OLDEST, distinct topics for CONFLATE).
+        :param policy: DROP_OLDEST or CONFLATE.
+        :param name: Label used in stats.
+        :return: Subscription to read events from.
+        """
+        if policy not in (DROP_OLDEST, CONFLATE):
+            raise ValueError(f"Unknown subscription policy: {policy}")
+        subscription = Subscription(self, (exchange, symbol, channel), maxsize, policy, name)
+        self.subscriptions.append(subscription)
+        self._routes.clear()
+        self.logger.info(f"Subscribed {subscription.name}")
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a consumer."""
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+            self._routes.clear()
+
+    def publish(self, exchange: str, symbol: str, channel: str, event):
+        """
+        Deliver an event to every matching subscription without waiting.
+
+        :param exchange: Exchange name.
+        :param symbol: Unified symbol.
+        :param channel: Channel name.
+        :param event: Payload (Ticker, list of Trade, OrderBook, ...).
+        :return: Number of subscriptions the event was delivered to.
+        """
+        topic = (exchange, symbol, channel)
+        routes = self._routes.get(topic)
+        if routes is None:
+            routes = self._routes[topic] = [sub for sub in self.subscriptions if sub.matches(topic)]
+        for subscription in routes:
+            subscription._put(topic, event)
+        return len(routes)
+
+    def stats(self):
+        """Return per-subscription queue statistics keyed by subscription name."""
+        return {subscription.name: subscription.stats() for subscription in self.subscriptions}
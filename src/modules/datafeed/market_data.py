@@ -0,0 +1,198 @@
+# src/modules/datafeed/market_data.py
+
+from typing import NamedTuple
+
+# Quote currencies recognised when splitting concatenated symbols such as 'BTCUSDT',
+# longest first so 'USDT' wins over 'USD'.
+KNOWN_QUOTES = ("FDUSD", "USDT", "USDC", "BUSD", "TUSD", "USD", "EUR", "GBP", "BTC", "ETH", "BNB")
+
+# Exchange-specific asset codes -> common codes
+ASSET_ALIASES = {"XBT": "BTC", "XDG": "DOGE"}
+EXCHANGE_ASSET_CODES = {"kraken": {"BTC": "XBT", "DOGE": "XDG"}}
+
+# ccxt ticker keys that differ from Ticker attribute names
+CCXT_TICKER_FIELDS = {"baseVolume": "volume"}
+
+# Pairs pre-registered on every venue so the hot path never has to parse them
+DEFAULT_PAIRS = ("BTC/USDT", "ETH/USDT", "BNB/USDT", "BTC/USD", "ETH/USD", "ETH/BTC")
+
+
+class BookLevel(NamedTuple):
+    """One price level of an order book."""
+    price: float
+    amount: float
+
+
+class Ticker:
+    """Best bid/ask and last trade for one symbol, identical across venues."""
+
+    __slots__ = ("exchange", "symbol", "bid", "ask", "last", "volume", "timestamp")
+
+    def __init__(self, exchange, symbol, bid, ask, last, volume, timestamp):
+        """
+        :param exchange: Exchange name (e.g., 'binance').
+        :param symbol: Unified symbol (e.g., 'BTC/USDT').
+        :param bid: Best bid price.
+        :param ask: Best ask price.
+        :param last: Last trade price.
+        :param volume: Rolling 24h base volume.
+        :param timestamp: Exchange event time in milliseconds.
+        """
+        self.exchange = exchange
+        self.symbol = symbol
+        self.bid = bid
+        self.ask = ask
+        self.last = last
+        self.volume = volume
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_ccxt(cls, exchange, ticker):
+        """
+        Build a Ticker from a ccxt fetch_ticker() result.
+
+        :param exchange: Exchange name.
+        :param ticker: ccxt unified ticker dict.
+        """
+        return cls(exchange, ticker.get("symbol"), ticker.get("bid"), ticker.get("ask"), ticker.get("last"),
+                   ticker.get("baseVolume"), ticker.get("timestamp"))
+
+    def __getitem__(self, key):
+        """Read fields with ccxt ticker keys (ticker['last'], ticker['baseVolume'], ...)."""
+        try:
+            return getattr(self, CCXT_TICKER_FIELDS.get(key, key))
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __repr__(self):
+        return (f"Ticker({self.exchange} {self.symbol} bid={self.bid} ask={self.ask} "
+                f"last={self.last} ts={self.timestamp})")
+
+
+class Trade:
+    """A single public trade, identical across venues."""
+
+    __slots__ = ("exchange", "symbol", "price", "amount", "side", "timestamp", "trade_id")
+
+    def __init__(self, exchange, symbol, price, amount, side, timestamp, trade_id=None):
+        """
+        :param exchange: Exchange name (e.g., 'binance').
+        :param symbol: Unified symbol (e.g., 'BTC/USDT').
+        :param price: Trade price.
+        :param amount: Trade size in base currency.
+        :param side: Taker side ('buy' or 'sell').
+        :param timestamp: Trade time in milliseconds.
+        :param trade_id: Exchange trade id, if provided.
+        """
+        self.exchange = exchange
+        self.symbol = symbol
+        self.price = price
+        self.amount = amount
+        self.side = side
+        self.timestamp = timestamp
+        self.trade_id = trade_id
+
+    def __repr__(self):
+        return f"Trade({self.exchange} {self.symbol} {self.side} {self.amount}@{self.price} ts={self.timestamp})"
+
+
+class SymbolMap:
+    """
+    Precomputed mapping between exchange wire symbols ('BTCUSDT', 'BTC-USD', 'XBT/USD') and
+    unified symbols ('BTC/USDT', 'BTC/USD'). Lookups are a single dict access; unseen symbols
+    are parsed once and cached.
+    """
+
+    def __init__(self, pairs=DEFAULT_PAIRS, exchanges=("binance", "coinbase", "kraken")):
+        """
+        :param pairs: Unified pairs to precompute for every exchange.
+        :param exchanges: Exchanges to precompute.
+        """
+        self._to_unified = {}
+        self._to_exchange = {}
+        for exchange in exchanges:
+            for pair in pairs:
+                self.register(exchange, pair)
+
+    @staticmethod
+    def wire_symbol(exchange: str, unified: str):
+        """Format a unified symbol the way an exchange's WebSocket API expects it."""
+        base, quote = unified.split("/")
+        codes = EXCHANGE_ASSET_CODES.get(exchange, {})
+        base, quote = codes.get(base, base), codes.get(quote, quote)
+        if exchange == "binance":
+            return f"{base}{quote}"
+        if exchange == "coinbase":
+            return f"{base}-{quote}"
+        return f"{base}/{quote}"
+
+    def register(self, exchange: str, unified: str, wire: str = None):
+        """
+        Add a symbol pair to the map.
+
+        :param exchange: Exchange name.
+        :param unified: Unified symbol (e.g., 'BTC/USDT').
+        :param wire: Exchange symbol; derived from the exchange's convention if omitted.
+        """
+        wire = wire or self.wire_symbol(exchange, unified)
+        self._to_unified[(exchange, wire.upper())] = unified
+        self._to_exchange[(exchange, unified)] = wire
+
+    def to_unified(self, exchange: str, symbol: str):
+        """
+        Return the unified symbol for an exchange symbol.
+
+        :param exchange: Exchange name.
+        :param symbol: Symbol as sent by the exchange.
+        """
+        unified = self._to_unified.get((exchange, symbol))
+        if unified is None:
+            unified = self._to_unified.get((exchange, symbol.upper()))
+            if unified is None:
+                unified = self._parse(symbol)
+                self._to_unified[(exchange, symbol.upper())] = unified
+            self._to_unified[(exchange, symbol)] = unified
+        return unified
+
+    def to_exchange(self, exchange: str, unified: str):
+        """
+        Return the exchange wire symbol for a unified symbol.
+
+        :param exchange: Exchange name.
+        :param unified: Unified symbol (e.g., 'BTC/USDT').
+        """
+        wire = self._to_exchange.get((exchange, unified))
+        if wire is None:
+            self.register(exchange, unified)
+            wire = self._to_exchange[(exchange, unified)]
+        return wire
+
+    @staticmethod
+    def _parse(symbol: str):
+        symbol = symbol.upper()
+        for separator in ("/", "-", "_"):
+            if separator in symbol:
+                base, quote = symbol.split(separator, 1)
+                break
+        else:
+            for quote in KNOWN_QUOTES:
+                if symbol.endswith(quote) and len(symbol) > len(quote):
+                    base = symbol[:-len(quote)]
+                    break
+            else:
+                return symbol
+        return f"{ASSET_ALIASES.get(base, base)}/{ASSET_ALIASES.get(quote, quote)}"
+
+
+# Process-wide symbol map used by the decoders
+symbol_map = SymbolMap()
+
+
+def normalize_symbol(exchange: str, symbol: str):
+    """
+    Convert an exchange symbol to the unified format (e.g., 'BTCUSDT' -> 'BTC/USDT').
+
+    :param exchange: Exchange name.
+    :param symbol: Symbol as sent by the exchange.
+    """
+    return symbol_map.to_unified(exchange, symbol)
@@ -0,0 +1,198 @@
+# src/modules/datafeed/ohlcv_store.py
+
+import os
+import re
+import time
+import numpy as np
+from src.modules.utils.logger import get_logger
+
+TIMEFRAME_UNITS_MS = {"s": 1000, "m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+# Candle columns: timestamp (ms), open, high, low, close, volume
+OHLCV_COLUMNS = 6
+
+
+def timeframe_to_ms(timeframe: str):
+    """
+    Convert a ccxt timeframe string to milliseconds.
+
+    :param timeframe: Timeframe such as '1m', '15m', '1h', '1d'.
+    """
+    match = re.fullmatch(r"(\d+)([smhdw])", timeframe)
+    if not match:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return int(match.group(1)) * TIMEFRAME_UNITS_MS[match.group(2)]
+
+
+class OHLCVStore:
+    """
+    Local candle cache keyed by exchange/symbol/timeframe.
+
+    Each series is one .npy file holding an (n, 6) float64 array in column-major order, so
+    every column (timestamps, closes, ...) is contiguous on disk and reads are memory-mapped.
+    get() works out which candles in the requested range are missing and downloads only
+    those ranges (head, tail and interior gaps) through the caller's fetcher. Ranges already
+    fetched are remembered in a small sidecar file, so periods the venue has no candles for
+    (before listing, trading halts) are not requested again.
+    """
+
+    def __init__(self, root_dir: str):
+        """
+        :param root_dir: Directory holding the cache files.
+        """
+        self.logger = get_logger("OHLCVStore")
+        self.root_dir = root_dir
+
+    def _path(self, exchange_name, symbol, timeframe):
+        safe_symbol = symbol.replace("/", "-").replace(":", "_")
+        return os.path.join(self.root_dir, exchange_name, safe_symbol, f"{timeframe}.npy")
+
+    def _covered_path(self, exchange_name, symbol, timeframe):
+        return self._path(exchange_name, symbol, timeframe)[:-len(".npy")] + ".covered.npy"
+
+    def _save(self, path, array):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            np.save(file, array)
+        os.replace(tmp_path, path)
+
+    def covered(self, exchange_name: str, symbol: str, timeframe: str):
+        """
+        Ranges already fetched for a series, whether or not the venue returned candles for them.
+
+        :return: (k, 2) int64 array of sorted, disjoint inclusive (start_ms, end_ms) ranges.
+        """
+        path = self._covered_path(exchange_name, symbol, timeframe)
+        if not os.path.exists(path):
+            return np.empty((0, 2), dtype=np.int64)
+        return np.load(path)
+
+    def mark_covered(self, exchange_name: str, symbol: str, timeframe: str, ranges):
+        """
+        Record ranges as fetched, merging them with the ranges already recorded.
+
+        :param ranges: Iterable of inclusive (start_ms, end_ms) ranges of complete candles.
+        """
+        step = timeframe_to_ms(timeframe)
+        merged = []
+        for start, end in sorted([*map(tuple, self.covered(exchange_name, symbol, timeframe).tolist()), *ranges]):
+            if merged and start <= merged[-1][1] + step:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self._save(self._covered_path(exchange_name, symbol, timeframe), np.asarray(merged, dtype=np.int64))
+
+    def load(self, exchange_name: str, symbol: str, timeframe: str):
+        """
+        Memory-map the cached candles for a series.
+
+        :return: Read-only (n, 6) array sorted by timestamp (empty if nothing is cached).
+        """
+        path = self._path(exchange_name, symbol, timeframe)
+        if not os.path.exists(path):
+            return np.empty((0, OHLCV_COLUMNS), dtype=np.float64)
+        return np.load(path, mmap_mode="r")
+
+    def write(self, exchange_name: str, symbol: str, timeframe: str, rows):
+        """
+        Merge candles into the cache, replacing existing candles with the same timestamp.
+
+        :param rows: Iterable of [timestamp, open, high, low, close, volume].
+        :return: Number of candles stored after the merge.
+        """
+        new_rows = np.asarray(rows, dtype=np.float64).reshape(-1, OHLCV_COLUMNS)
+        if not len(new_rows):
+            return len(self.load(exchange_name, symbol, timeframe))
+
+        merged = np.concatenate([new_rows, np.asarray(self.load(exchange_name, symbol, timeframe))])
+        # np.unique keeps the first occurrence, so freshly fetched rows win over cached ones
+        _, first_index = np.unique(merged[:, 0], return_index=True)
+        merged = np.asfortranarray(merged[first_index])
+        self._save(self._path(exchange_name, symbol, timeframe), merged)
+        return len(merged)
+
+    def missing_ranges(self, exchange_name: str, symbol: str, timeframe: str, since: int, until: int):
+        """
+        Find the candle ranges in [since, until] that are neither cached nor already fetched.
+
+        :param since: First candle open time wanted (ms).
+        :param until: Last candle open time wanted (ms).
+        :return: List of (start_ms, end_ms) inclusive ranges to download.
+        """
+        step = timeframe_to_ms(timeframe)
+        since = since - since % step
+        until = until - until % step
+        if since > until:
+            return []
+        cached = self.load(exchange_name, symbol, timeframe)
+        timestamps = cached[:, 0]
+        start = np.searchsorted(timestamps, since, side="left")
+        end = np.searchsorted(timestamps, until, side="right")
+        window = timestamps[start:end]
+        if not len(window):
+            ranges = [(since, until)]
+        else:
+            ranges = []
+            if window[0] > since:
+                ranges.append((since, int(window[0]) - step))
+            gaps = np.nonzero(np.diff(window) > step)[0]
+            for index in gaps:
+                ranges.append((int(window[index]) + step, int(window[index + 1]) - step))
+            if window[-1] < until:
+                ranges.append((int(window[-1]) + step, until))
+
+        for covered_start, covered_end in self.covered(exchange_name, symbol, timeframe).tolist():
+            remaining = []
+            for range_start, range_end in ranges:
+                if covered_end < range_start or covered_start > range_end:
+                    remaining.append((range_start, range_end))
+                    continue
+                if range_start < covered_start:
+                    remaining.append((range_start, covered_start - step))
+                if range_end > covered_end:
+                    remaining.append((covered_end + step, range_end))
+            ranges = remaining
+        return ranges
+
+    def get(self, exchange_name: str, symbol: str, timeframe: str, since: int, until: int = None, fetcher=None):
+        """
+        Return candles in [since, until], downloading only the ranges not yet cached.
+
+        Candles that are still open (their period has not ended) are returned but never
+        persisted, so the next call refreshes them.
+
+        :param since: First candle open time wanted (ms).
+        :param until: Last candle open time wanted (ms); defaults to the current candle.
+        :param fetcher: Callable (since_ms, until_ms) returning a list of OHLCV rows for that range.
+        :return: (n, 6) array; a memory-mapped view when no open candle is appended.
+        """
+        step = timeframe_to_ms(timeframe)
+        now = int(time.time() * 1000)
+        until = now - now % step if until is None else until
+
+        open_rows, complete, fetched = [], [], []
+        if fetcher is not None:
+            last_complete = now - now % step - step
+            for range_start, range_end in self.missing_ranges(exchange_name, symbol, timeframe, since, until):
+                rows = fetcher(range_start, range_end) or []
+                filled = [row for row in rows if row[0] + step <= now]
+                complete.extend(filled)
+                open_rows.extend(row for row in rows if row[0] + step > now and since <= row[0] <= until)
+                if range_start <= last_complete:
+                    fetched.append((range_start, min(range_end, last_complete)))
+                self.logger.info(f"Filled {len(filled)} {timeframe} candles for {symbol} on {exchange_name} "
+                                 f"in range {range_start}-{range_end}")
+            # One rewrite of the series per call, however many ranges were fetched
+            if complete:
+                self.write(exchange_name, symbol, timeframe, complete)
+            if fetched:
+                self.mark_covered(exchange_name, symbol, timeframe, fetched)
+
+        cached = self.load(exchange_name, symbol, timeframe)
+        start = np.searchsorted(cached[:, 0], since, side="left")
+        end = np.searchsorted(cached[:, 0], until, side="right")
+        window = cached[start:end]
+        if open_rows:
+            window = np.concatenate([window, np.asarray(open_rows, dtype=np.float64)])
+        return window
@@ -0,0 +1,492 @@
+# src/modules/datafeed/order_book.py
+
+import asyncio
+import zlib
+from array import array
+from bisect import bisect_left
+from src.modules.utils.logger import get_logger
+from src.modules.utils.metrics import get_counters
+from src.modules.datafeed.market_data import BookLevel, symbol_map
+
+
+class BookSide:
+    """
+    One side of an L2 order book stored as two parallel sorted float arrays.
+
+    Prices are kept as sort keys (price for bids, -price for asks) in ascending order so the
+    best level is always the last element: best bid/ask is O(1), top-N is O(N), and most
+    updates (which land near the top of the book) shift only a handful of elements.
+    """
+
+    __slots__ = ("is_bid", "_keys", "_sizes")
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self._keys = array("d")
+        self._sizes = array("d")
+
+    def __len__(self):
+        return len(self._keys)
+
+    def clear(self):
+        """Remove every level."""
+        del self._keys[:]
+        del self._sizes[:]
+
+    def update(self, price: float, size: float):
+        """
+        Set the resting size at a price level; a size of zero removes the level.
+
+        :param price: Level price.
+        :param size: New total size at that price.
+        """
+        key = price if self.is_bid else -price
+        keys = self._keys
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            if size:
+                self._sizes[index] = size
+            else:
+                del keys[index]
+                del self._sizes[index]
+        elif size:
+            keys.insert(index, key)
+            self._sizes.insert(index, size)
+
+    def truncate(self, max_levels: int):
+        """Drop the worst levels so at most max_levels remain."""
+        excess = len(self._keys) - max_levels
+        if excess > 0:
+            del self._keys[:excess]
+            del self._sizes[:excess]
+
+    def best(self):
+        """Return the best BookLevel or None if the side is empty."""
+        if not self._keys:
+            return None
+        key = self._keys[-1]
+        return BookLevel(key if self.is_bid else -key, self._sizes[-1])
+
+    def top(self, n: int):
+        """Return up to n levels as a list of BookLevel, best first."""
+        keys, sizes = self._keys, self._sizes
+        count = min(n, len(keys))
+        sign = 1.0 if self.is_bid else -1.0
+        return [BookLevel(sign * keys[-i], sizes[-i]) for i in range(1, count + 1)]
+
+    def depth_notional(self, levels: int = None, limit_price: float = None):
+        """
+        Sum price * size from the best level outwards.
+
+        :param levels: Only include this many levels from the top.
+        :param limit_price: Stop at levels worse than this price.
+        :return: Quote-currency notional resting on this side.
+        """
+        keys, sizes = self._keys, self._sizes
+        count = len(keys) if levels is None else min(levels, len(keys))
+        limit_key = None if limit_price is None else (limit_price if self.is_bid else -limit_price)
+        total = 0.0
+        for i in range(1, count + 1):
+            key = keys[-i]
+            if limit_key is not None and key < limit_key:
+                break
+            total += abs(key) * sizes[-i]
+        return total
+
+
+class OrderBook:
+    """In-memory L2 order book for a single (exchange, symbol)."""
+
+    __slots__ = ("exchange_name", "symbol", "max_depth", "bids", "asks", "last_update_id", "timestamp", "synced")
+
+    def __init__(self, exchange_name: str, symbol: str, max_depth: int = None):
+        """
+        :param exchange_name: Name of the exchange (e.g., 'binance').
+        :param symbol: Unified trading pair (e.g., 'BTC/USDT').
+        :param max_depth: Optional number of levels to keep per side.
+        """
+        self.exchange_name = exchange_name
+        self.symbol = symbol
+        self.max_depth = max_depth
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self.last_update_id = None
+        self.timestamp = None
+        self.synced = False
+
+    def apply_snapshot(self, bids, asks, update_id=None, timestamp=None):
+        """
+        Replace the book contents with a full snapshot.
+
+        :param bids: Iterable of [price, size] bid levels.
+        :param asks: Iterable of [price, size] ask levels.
+        :param update_id: Exchange update id / sequence the snapshot corresponds to.
+        :param timestamp: Snapshot timestamp in milliseconds.
+        """
+        self.bids.clear()
+        self.asks.clear()
+        self.apply_diff(bids, asks, update_id, timestamp)
+        self.synced = True
+
+    def apply_diff(self, bids, asks, update_id=None, timestamp=None):
+        """
+        Apply an incremental depth update; each level carries the new absolute size.
+
+        :param bids: Iterable of [price, size] bid changes.
+        :param asks: Iterable of [price, size] ask changes.
+        :param update_id: Exchange update id of the last change in this diff.
+        :param timestamp: Event timestamp in milliseconds.
+        """
+        update_bid = self.bids.update
+        for level in bids:
+            update_bid(float(level[0]), float(level[1]))
+        update_ask = self.asks.update
+        for level in asks:
+            update_ask(float(level[0]), float(level[1]))
+
+        if self.max_depth:
+            self.bids.truncate(self.max_depth)
+            self.asks.truncate(self.max_depth)
+        if update_id is not None:
+            self.last_update_id = update_id
+        if timestamp is not None:
+            self.timestamp = timestamp
+
+    def best_bid(self):
+        """Return the best bid BookLevel or None."""
+        return self.bids.best()
+
+    def best_ask(self):
+        """Return the best ask BookLevel or None."""
+        return self.asks.best()
+
+    def mid_price(self):
+        """Return the mid price or None if either side is empty."""
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread(self):
+        """Return best ask minus best bid, or None if either side is empty."""
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def top(self, n: int = 10):
+        """Return the top n levels of both sides, best first."""
+        return {"bids": self.bids.top(n), "asks": self.asks.top(n)}
+
+    def depth_notional(self, within_percent: float = None, levels: int = None):
+        """
+        Quote-currency liquidity resting on both sides of the book.
+
+        :param within_percent: Only count levels within this % of the mid price.
+        :param levels: Only count this many levels per side.
+        :return: Combined bid and ask notional.
+        """
+        bid_limit = ask_limit = None
+        if within_percent is not None:
+            mid = self.mid_price()
+            if mid is None:
+                return 0.0
+            bid_limit = mid * (1 - within_percent / 100)
+            ask_limit = mid * (1 + within_percent / 100)
+        return self.bids.depth_notional(levels, bid_limit) + self.asks.depth_notional(levels, ask_limit)
+
+
+class OrderBookManager:
+    """
+    Maintains local order books per (exchange, symbol) from REST snapshots and depth streams.
+
+    Every book is checked for gaps as updates arrive (Binance update ids, Kraken CRC32
+    checksums, and a crossed-book sanity check on all venues). On a gap the book is marked
+    unsynced and rebuilt: Binance re-fetches the REST snapshot, Coinbase and Kraken are
+    resubscribed so the exchange replays its WebSocket snapshot. Each event is counted in the
+    'datafeed' counters as '<exchange>.sequence_gaps', '<exchange>.resyncs', etc.
+    """
+
+    def __init__(self, snapshot_fetcher=None, snapshot_depth: int = 1000, max_depth: int = None,
+                 resubscriber=None, snapshot_listener=None):
+        """
+        :param snapshot_fetcher: Callable (exchange_name, symbol, limit) returning a ccxt-style
+                                 order book dict with 'bids', 'asks' and 'nonce'.
+        :param snapshot_depth: Number of levels requested in REST snapshots.
+        :param max_depth: Optional number of levels kept per side.
+        :param resubscriber: Callable (exchange_name, stream_symbol) that resubscribes a symbol so
+                             the exchange sends a fresh WebSocket snapshot. Returning False, or a
+                             future resolving to False, means nothing was sent.
+        :param snapshot_listener: Callable (exchange_name, symbol, snapshot) invoked with every REST
+                                  snapshot applied, e.g. FrameRecorder.record_snapshot.
+        """
+        self.logger = get_logger("OrderBookManager")
+        self.counters = get_counters("datafeed")
+        self.snapshot_fetcher = snapshot_fetcher
+        self.snapshot_depth = snapshot_depth
+        self.max_depth = max_depth
+        self.resubscriber = resubscriber
+        self.snapshot_listener = snapshot_listener
+        self.books = {}            # (exchange_name, symbol) -> OrderBook
+        self.stream_symbols = {}   # (exchange_name, stream symbol) -> unified symbol
+        self.book_streams = {}     # (exchange_name, symbol) -> stream symbol
+        self._pending = {}         # (exchange_name, symbol) -> diffs buffered while a snapshot is in flight
+        self._in_flight = set()    # books with a snapshot request outstanding
+        self._resubscribing = set()  # books waiting for a WebSocket snapshot after a resubscribe
+        self._kraken_decimals = {}  # (exchange_name, symbol) -> (price decimals, volume decimals)
+
+    def track(self, exchange_name: str, stream_symbol: str, symbol: str = None):
+        """
+        Start maintaining a book.
+
+        :param exchange_name: Name of the exchange.
+        :param stream_symbol: Symbol as it appears on the WebSocket (e.g., 'BTCUSDT', 'XBT/USD').
+        :param symbol: Unified symbol used for REST snapshots and lookups (e.g., 'BTC/USDT');
+                       derived from the stream symbol if omitted.
+        :return: The OrderBook instance.
+        """
+        exchange_name = exchange_name.lower()
+        symbol = symbol or symbol_map.to_unified(exchange_name, stream_symbol)
+        self.stream_symbols[(exchange_name, stream_symbol.upper())] = symbol
+        key = (exchange_name, symbol)
+        self.book_streams[key] = stream_symbol
+        if key not in self.books:
+            # Kraken checksums cover the subscribed depth, so the local book must be trimmed to it
+            max_depth = self.max_depth or (100 if exchange_name == "kraken" else None)
+            self.books[key] = OrderBook(exchange_name, symbol, max_depth)
+        return self.books[key]
+
+    def get(self, exchange_name: str, symbol: str):
+        """Return the synced OrderBook for a unified symbol, or None."""
+        book = self.books.get((exchange_name, symbol))
+        return book if book is not None and book.synced else None
+
+    def _book_for(self, exchange_name, stream_symbol):
+        symbol = self.stream_symbols.get((exchange_name, stream_symbol.upper()))
+        if symbol is None:
+            return None
+        return self.books.get((exchange_name, symbol))
+
+    def on_message(self, exchange_name: str, data):
+        """
+        Route a decoded WebSocket message to the matching book.
+
+        :param exchange_name: Name of the exchange the message came from.
+        :param data: Decoded JSON message.
+        :return: The OrderBook the message applied to, or None if it matched no tracked book.
+        """
+        if exchange_name == "binance":
+            book = self._on_binance(data)
+        elif exchange_name == "coinbase":
+            book = self._on_coinbase(data)
+        elif exchange_name == "kraken":
+            book = self._on_kraken(data)
+        else:
+            return None
+
+        if book is not None and book.synced and self._is_crossed(book):
+            self.counters.increment(f"{exchange_name}.crossed_books")
+            self.resync(book, reason="crossed book")
+        return book
+
+    @staticmethod
+    def _is_crossed(book):
+        bid, ask = book.bids.best(), book.asks.best()
+        return bid is not None and ask is not None and bid[0] >= ask[0]
+
+    def _on_binance(self, data):
+        if isinstance(data, dict) and "stream" in data:
+            data = data["data"]
+        if not isinstance(data, dict) or data.get("e") != "depthUpdate":
+            return None
+        book = self._book_for("binance", data["s"])
+        if book is None:
+            return None
+
+        # Binance diffs must be layered on top of a REST snapshot
+        if not book.synced:
+            self._pending.setdefault((book.exchange_name, book.symbol), []).append(data)
+            self.request_snapshot(book)
+            return book
+        if data["u"] <= book.last_update_id:
+            self.counters.increment("binance.stale_updates")
+            return book
+        if data["U"] > book.last_update_id + 1:
+            self.counters.increment("binance.sequence_gaps")
+            self._pending.setdefault((book.exchange_name, book.symbol), []).append(data)
+            self.resync(book, reason=f"update id gap {book.last_update_id} -> {data['U']}")
+            return book
+        book.apply_diff(data["b"], data["a"], data["u"], data.get("E"))
+        return book
+
+    def _on_coinbase(self, data):
+        if not isinstance(data, dict):
+            return None
+        message_type = data.get("type")
+        if message_type not in ("snapshot", "l2update"):
+            return None
+        book = self._book_for("coinbase", data["product_id"])
+        if book is None:
+            return None
+
+        if message_type == "snapshot":
+            book.apply_snapshot(data["bids"], data["asks"])
+            self._resubscribing.discard(("coinbase", book.symbol))
+            return book
+        if not book.synced:
+            return book
+        bids = [(price, size) for side, price, size in data["changes"] if side == "buy"]
+        asks = [(price, size) for side, price, size in data["changes"] if side == "sell"]
+        book.apply_diff(bids, asks)
+        return book
+
+    def _on_kraken(self, data):
+        # Book messages are [channelID, {...}, ({...},) "book-N", pair]
+        if not isinstance(data, list) or len(data) < 4 or not str(data[-2]).startswith("book"):
+            return None
+        book = self._book_for("kraken", data[-1])
+        if book is None:
+            return None
+
+        checksum = None
+        for payload in data[1:-2]:
+            if "as" in payload or "bs" in payload:
+                self._remember_kraken_decimals(book, payload.get("as", []) + payload.get("bs", []))
+                book.apply_snapshot(
+                    [level[:2] for level in payload.get("bs", [])],
+                    [level[:2] for level in payload.get("as", [])]
+                )
+                self._resubscribing.discard(("kraken", book.symbol))
+            elif book.synced:
+                book.apply_diff(
+                    [level[:2] for level in payload.get("b", [])],
+                    [level[:2] for level in payload.get("a", [])]
+                )
+                checksum = payload.get("c", checksum)
+
+        if checksum is not None and book.synced and int(checksum) != self._kraken_checksum(book):
+            self.counters.increment("kraken.checksum_mismatches")
+            self.counters.increment("kraken.sequence_gaps")
+            self.resync(book, reason="checksum mismatch")
+        return book
+
+    def _remember_kraken_decimals(self, book, levels):
+        if not levels:
+            return
+        price, volume = levels[0][0], levels[0][1]
+        self._kraken_decimals[(book.exchange_name, book.symbol)] = (
+            len(price.split(".")[1]) if "." in price else 0,
+            len(volume.split(".")[1]) if "." in volume else 0
+        )
+
+    def _kraken_checksum(self, book):
+        """CRC32 over the top 10 asks then bids, as defined by Kraken's book checksum."""
+        price_decimals, volume_decimals = self._kraken_decimals.get((book.exchange_name, book.symbol), (1, 8))
+        parts = []
+        for levels in (book.asks.top(10), book.bids.top(10)):
+            for price, volume in levels:
+                parts.append(f"{price:.{price_decimals}f}".replace(".", "").lstrip("0"))
+                parts.append(f"{volume:.{volume_decimals}f}".replace(".", "").lstrip("0"))
+        return zlib.crc32("".join(parts).encode())
+
+    def resync(self, book: OrderBook, reason: str = "gap"):
+        """
+        Mark a book as unsynced and rebuild it from a fresh snapshot.
+
+        :param book: The OrderBook to rebuild.
+        :param reason: Human-readable cause, used for logging.
+        """
+        key = (book.exchange_name, book.symbol)
+        book.synced = False
+        if key in self._in_flight or key in self._resubscribing:
+            return
+        self.counters.increment(f"{book.exchange_name}.resyncs")
+        self.logger.warning(f"Resyncing {book.symbol} order book on {book.exchange_name}: {reason}")
+
+        if book.exchange_name == "binance":
+            self.request_snapshot(book)
+        elif self.resubscriber is not None:
+            self._resubscribing.add(key)
+            sent = False
+            try:
+                sent = self.resubscriber(book.exchange_name, self.book_streams[key])
+            finally:
+                # A resubscribe that was never sent brings no snapshot; let the next gap try again
+                if isinstance(sent, asyncio.Future):
+                    sent.add_done_callback(lambda done: self._resubscribe_done(key, done))
+                elif sent is False:
+                    self._resubscribing.discard(key)
+
+    def _resubscribe_done(self, key, done):
+        if done.cancelled() or done.exception() is not None or done.result() is False:
+            self._resubscribing.discard(key)
+
+    def request_snapshot(self, book: OrderBook):
+        """
+        Fetch a REST snapshot for a book, off the event loop when one is running.
+
+        :param book: The OrderBook to (re)initialise.
+        """
+        key = (book.exchange_name, book.symbol)
+        if self.snapshot_fetcher is None or key in self._in_flight:
+            return
+        self._in_flight.add(key)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None:
+            self._complete_snapshot(book, self._fetch_snapshot(book))
+            return
+        future = loop.run_in_executor(None, self._fetch_snapshot, book)
+        future.add_done_callback(lambda done: self._complete_snapshot(book, done.result()))
+
+    def _fetch_snapshot(self, book):
+        try:
+            return self.snapshot_fetcher(book.exchange_name, book.symbol, self.snapshot_depth)
+        except Exception as e:
+            self.logger.error(f"Failed to fetch order book snapshot for {book.symbol} on {book.exchange_name}: {e}")
+            return None
+
+    def load_snapshot(self, exchange_name: str, symbol: str, snapshot: dict):
+        """
+        Apply a snapshot obtained elsewhere (e.g. a recorded one during replay) as if it had
+        just been fetched, layering any buffered diffs on top.
+
+        :return: The OrderBook, or None if the symbol is not tracked.
+        """
+        book = self.books.get((exchange_name, symbol))
+        if book is not None:
+            self._complete_snapshot(book, snapshot)
+        return book
+
+    def _complete_snapshot(self, book, snapshot):
+        key = (book.exchange_name, book.symbol)
+        self._in_flight.discard(key)
+        if not snapshot:
+            self._pending.pop(key, None)
+            return
+
+        book.apply_snapshot(snapshot["bids"], snapshot["asks"], snapshot.get("nonce"), snapshot.get("timestamp"))
+        self.counters.increment(f"{book.exchange_name}.snapshots")
+        if self.snapshot_listener is not None:
+            self.snapshot_listener(book.exchange_name, book.symbol, snapshot)
+        buffered = self._pending.pop(key, [])
+        for index, diff in enumerate(buffered):
+            if book.last_update_id is None:
+                book.apply_diff(diff["b"], diff["a"], diff["u"], diff.get("E"))
+                continue
+            if diff["u"] <= book.last_update_id:
+                continue
+            if diff["U"] > book.last_update_id + 1:
+                # The snapshot is older than the buffered stream; keep buffering and let the
+                # next diff request a newer one
+                self.counters.increment(f"{book.exchange_name}.sequence_gaps")
+                book.synced = False
+                self._pending[key] = buffered[index:]
+                return
+            book.apply_diff(diff["b"], diff["a"], diff["u"], diff.get("E"))
+        self.logger.info(f"Order book synced for {book.symbol} on {book.exchange_name} "
+                         f"({len(book.bids)} bids, {len(book.asks)} asks)")
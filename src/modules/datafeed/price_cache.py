@@ -0,0 +1,93 @@
+# src/modules/datafeed/price_cache.py
+
+import threading
+import time
+from src.modules.utils.metrics import get_counters
+
+DEFAULT_PRICE_TTL = 5.0  # seconds a streamed ticker is considered fresh
+
+
+class PriceCache:
+    """
+    Latest Ticker per (exchange, symbol), written by the streaming layer and read by anything
+    that needs a current price. Each entry carries its local receive time; reads older than
+    the TTL count as misses so callers fall back to REST instead of trading on stale data.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_PRICE_TTL):
+        """
+        :param ttl: Default maximum age in seconds for a cached ticker to be served.
+        """
+        self.ttl = ttl
+        self.counters = get_counters("price_cache")
+        self._entries = {}  # (exchange, symbol) -> (Ticker, monotonic receive time)
+
+    def update(self, ticker):
+        """
+        Store a streamed ticker.
+
+        :param ticker: market_data.Ticker with a unified symbol.
+        """
+        self._entries[(ticker.exchange, ticker.symbol)] = (ticker, time.monotonic())
+
+    def get(self, exchange_name: str, symbol: str, max_age: float = None):
+        """
+        Return the cached ticker if it is fresh enough.
+
+        :param exchange_name: Exchange name (e.g., 'binance').
+        :param symbol: Unified symbol (e.g., 'BTC/USDT').
+        :param max_age: Maximum age in seconds; defaults to the cache TTL.
+        :return: Ticker or None on a miss.
+        """
+        entry = self._entries.get((exchange_name, symbol))
+        if entry is None:
+            return None
+        ticker, received = entry
+        if time.monotonic() - received > (self.ttl if max_age is None else max_age):
+            return None
+        return ticker
+
+    def age(self, exchange_name: str, symbol: str):
+        """Return the age in seconds of the cached ticker, or None if there is none."""
+        entry = self._entries.get((exchange_name, symbol))
+        return None if entry is None else time.monotonic() - entry[1]
+
+    def get_or_fetch(self, exchange_name: str, symbol: str, fetch_ticker, max_age: float = None):
+        """
+        Return the cached ticker, or call the REST fallback on a miss.
+
+        REST results are returned but not cached; only the streams write to the cache.
+
+        :param exchange_name: Exchange name (e.g., 'binance').
+        :param symbol: Unified symbol (e.g., 'BTC/USDT').
+        :param fetch_ticker: Callable symbol -> ccxt ticker dict (e.g., exchange.fetch_ticker).
+        :param max_age: Maximum age in seconds; defaults to the cache TTL.
+        :return: Ticker (cache hit) or ccxt ticker dict (REST); both support ticker['last'].
+        """
+        ticker = self.get(exchange_name, symbol, max_age)
+        if ticker is not None:
+            self.counters.increment(f"{exchange_name}.hits")
+            return ticker
+        self.counters.increment(f"{exchange_name}.misses")
+        return fetch_ticker(symbol)
+
+    def clear(self):
+        """Drop every cached ticker."""
+        self._entries.clear()
+
+
+_price_cache = None
+_price_cache_lock = threading.Lock()
+
+
+def get_price_cache():
+    """
+    Return the process-wide PriceCache shared by the data feed and its consumers.
+
+    :return: Shared PriceCache instance.
+    """
+    global _price_cache
+    with _price_cache_lock:
+        if _price_cache is None:
+            _price_cache = PriceCache()
+        return _price_cache
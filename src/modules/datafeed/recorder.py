@@ -0,0 +1,210 @@
+# src/modules/datafeed/recorder.py
+
+import asyncio
+import gzip
+import json
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.modules.utils.logger import get_logger
+
+# Record header: receive time (ns since epoch), exchange name length, payload length
+RECORD_HEADER = struct.Struct("<qBI")
+
+# Appended to the exchange name of records holding a REST order book snapshot instead of a frame
+SNAPSHOT_SUFFIX = "#snapshot"
+
+
+class FrameRecorder:
+    """
+    Append-only, gzip-compressed capture of raw WebSocket frames.
+
+    Each record is a fixed header followed by the exchange name and the frame exactly as it
+    came off the socket. Records are buffered in memory and compressed in batches on a
+    background thread, so a full buffer never stalls the event loop that records frames. REST
+    order book snapshots the books were built from are captured too (record_snapshot()), so a
+    replay needs no network access. Each session appends a new gzip member, so one file can be
+    extended across runs.
+    """
+
+    def __init__(self, path: str, flush_bytes: int = 1 << 20, compresslevel: int = 6):
+        """
+        :param path: Capture file (e.g., 'data/recordings/2024-01-01.frames.gz').
+        :param flush_bytes: Buffered bytes that trigger a compressed write.
+        :param compresslevel: gzip compression level (1 fastest, 9 smallest).
+        """
+        self.logger = get_logger("FrameRecorder")
+        self.path = path
+        self.flush_bytes = flush_bytes
+        self.compresslevel = compresslevel
+        self._file = None
+        self._buffer = bytearray()
+        self._names = {}
+        self._writer = None  # single thread, so batches are written in order
+        self._last_write = None
+        self.frames = 0
+
+    def record(self, exchange_name: str, raw, timestamp_ns: int = None):
+        """
+        Capture one raw frame.
+
+        :param exchange_name: Exchange the frame was received from.
+        :param raw: Frame as received (str or bytes).
+        :param timestamp_ns: Receive time; defaults to now.
+        """
+        name = self._names.get(exchange_name)
+        if name is None:
+            name = self._names[exchange_name] = exchange_name.encode()
+        payload = raw.encode() if isinstance(raw, str) else raw
+        if timestamp_ns is None:
+            timestamp_ns = time.time_ns()
+        buffer = self._buffer
+        buffer += RECORD_HEADER.pack(timestamp_ns, len(name), len(payload))
+        buffer += name
+        buffer += payload
+        self.frames += 1
+        if len(buffer) >= self.flush_bytes:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-recorder")
+            data = bytes(buffer)
+            buffer.clear()
+            self._last_write = self._writer.submit(self._write, data)
+
+    def record_snapshot(self, exchange_name: str, symbol: str, snapshot: dict, timestamp_ns: int = None):
+        """
+        Capture the REST order book snapshot a book was (re)built from, for replay.
+
+        :param exchange_name: Exchange the snapshot was fetched from.
+        :param symbol: Unified symbol of the book.
+        :param snapshot: ccxt order book dict ('bids', 'asks', 'nonce', 'timestamp').
+        :param timestamp_ns: Receive time; defaults to now.
+        """
+        self.record(exchange_name + SNAPSHOT_SUFFIX, json.dumps({
+            "symbol": symbol, "bids": snapshot["bids"], "asks": snapshot["asks"],
+            "nonce": snapshot.get("nonce"), "timestamp": snapshot.get("timestamp"),
+        }), timestamp_ns)
+
+    def _write(self, data):
+        try:
+            if self._file is None:
+                self._file = gzip.open(self.path, "ab", compresslevel=self.compresslevel)
+            self._file.write(data)
+            self._file.flush()
+        except Exception as e:
+            self.logger.error(f"Failed to write {len(data)} recorded bytes to {self.path}: {e}")
+
+    def flush(self):
+        """Compress and write buffered frames, waiting for batches still being written."""
+        if self._last_write is not None:
+            self._last_write.result()
+            self._last_write = None
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        self._write(data)
+
+    def close(self):
+        """Flush remaining frames and close the file; recording again reopens it in append mode."""
+        self.flush()
+        if self._writer is not None:
+            self._writer.shutdown()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self.logger.info(f"Recorded {self.frames} frames to {self.path}")
+
+
+class FrameReplayer:
+    """
+    Reads a FrameRecorder capture back and replays it at 1x, Nx or maximum speed.
+
+    Snapshot records reach the handler with the exchange name still carrying SNAPSHOT_SUFFIX.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Capture file written by FrameRecorder.
+        """
+        self.logger = get_logger("FrameReplayer")
+        self.path = path
+
+    def frames(self):
+        """
+        Iterate over the recorded frames in order. A capture cut short by a crash is read up to
+        its last complete record.
+
+        :return: Generator of (timestamp_ns, exchange_name, raw_bytes).
+        """
+        names = {}
+        header_size = RECORD_HEADER.size
+        with gzip.open(self.path, "rb") as file:
+            while True:
+                try:
+                    header = file.read(header_size)
+                    if len(header) < header_size:
+                        return
+                    timestamp_ns, name_length, payload_length = RECORD_HEADER.unpack(header)
+                    name = file.read(name_length)
+                    raw = file.read(payload_length)
+                except EOFError:
+                    self.logger.warning(f"{self.path} ends with an incomplete gzip member; stopping there")
+                    return
+                if len(raw) < payload_length:
+                    return
+                exchange_name = names.get(name)
+                if exchange_name is None:
+                    exchange_name = names[name] = name.decode()
+                yield timestamp_ns, exchange_name, raw
+
+    def _schedule(self, speed):
+        """Yield (delay_seconds, frame) pairs that reproduce the recorded timing at the given speed."""
+        start_wall = time.monotonic()
+        first_ns = None
+        for frame in self.frames():
+            delay = 0.0
+            if speed:
+                if first_ns is None:
+                    first_ns = frame[0]
+                delay = (frame[0] - first_ns) / 1e9 / speed - (time.monotonic() - start_wall)
+            yield delay, frame
+
+    def replay(self, handler, speed: float = None):
+        """
+        Feed every frame to a handler, blocking between frames to honour the recorded timing.
+
+        :param handler: Callable handler(exchange_name, raw_bytes, timestamp_ns).
+        :param speed: 1.0 for real time, N for N times faster, None or 0 for as fast as possible.
+        :return: Number of frames replayed.
+        """
+        count = 0
+        started = time.monotonic()
+        for delay, (timestamp_ns, exchange_name, raw) in self._schedule(speed):
+            if delay > 0:
+                time.sleep(delay)
+            handler(exchange_name, raw, timestamp_ns)
+            count += 1
+        self._log_rate(count, started)
+        return count
+
+    async def replay_async(self, handler, speed: float = None):
+        """
+        Like replay(), but waits with asyncio.sleep so other tasks keep running.
+
+        :param handler: Callable handler(exchange_name, raw_bytes, timestamp_ns).
+        :param speed: 1.0 for real time, N for N times faster, None or 0 for as fast as possible.
+        :return: Number of frames replayed.
+        """
+        count = 0
+        started = time.monotonic()
+        for delay, (timestamp_ns, exchange_name, raw) in self._schedule(speed):
+            if delay > 0:
+                await asyncio.sleep(delay)
+            handler(exchange_name, raw, timestamp_ns)
+            count += 1
+        self._log_rate(count, started)
+        return count
+
+    def _log_rate(self, count, started):
+        elapsed = time.monotonic() - started
+        rate = count / elapsed if elapsed > 0 else 0.0
+        self.logger.info(f"Replayed {count} frames from {self.path} in {elapsed:.2f}s ({rate:.0f} frames/s)")
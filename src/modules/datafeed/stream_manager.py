@@ -0,0 +1,168 @@
+# src/modules/datafeed/stream_manager.py
+
+import asyncio
+import json
+from src.modules.utils.logger import get_logger
+from src.modules.datafeed.websocket_client import WebSocketClient
+from src.modules.datafeed.decoder import MessageDecoder
+from src.modules.datafeed.recorder import FrameReplayer, SNAPSHOT_SUFFIX
+
+# Public WebSocket endpoints for supported exchanges
+DEFAULT_WS_URLS = {
+    "binance": "wss://stream.binance.com:9443/ws",
+    "coinbase": "wss://ws-feed.pro.coinbase.com",
+    "kraken": "wss://ws.kraken.com"
+}
+
+# Maximum number of symbol/channel streams to carry on a single connection
+DEFAULT_MAX_STREAMS_PER_CONNECTION = {
+    "binance": 200,
+    "coinbase": 100,
+    "kraken": 100
+}
+
+
+class StreamManager:
+    """Runs many WebSocketClient connections concurrently inside one asyncio event loop."""
+
+    def __init__(self, ws_urls=None, max_streams_per_connection=None, on_message=None, recorder=None):
+        """
+        Initialize the StreamManager.
+
+        :param ws_urls: Optional mapping of exchange name to WebSocket URL, overriding the defaults.
+        :param max_streams_per_connection: Optional mapping of exchange name to the number of
+                                           symbol/channel streams multiplexed on one connection.
+        :param on_message: Callback invoked as on_message(exchange_name, data) for every message.
+        :param recorder: Optional FrameRecorder shared by every connection to capture raw frames.
+        """
+        self.logger = get_logger("StreamManager")
+        self.ws_urls = {**DEFAULT_WS_URLS, **(ws_urls or {})}
+        self.max_streams = {**DEFAULT_MAX_STREAMS_PER_CONNECTION, **(max_streams_per_connection or {})}
+        self.on_message = on_message
+        self.recorder = recorder
+        self.subscriptions = {}  # (exchange_name, channels) -> ordered list of symbols
+        self.clients = []
+        self._tasks = []
+
+    def add_stream(self, exchange_name: str, symbols, channels=("ticker",)):
+        """
+        Register symbols to stream from an exchange. Symbols sharing an exchange and channel set
+        are combined onto as few connections as the exchange allows.
+
+        :param exchange_name: Name of the exchange (e.g., 'binance', 'coinbase', 'kraken').
+        :param symbols: A symbol or list of symbols in exchange format (e.g., 'BTCUSDT', 'BTC-USD').
+        :param channels: Channels to subscribe to for each symbol.
+        :return: True if the stream was registered, False if the exchange is unsupported.
+        """
+        exchange_name = exchange_name.lower()
+        if exchange_name not in self.ws_urls:
+            self.logger.error(f"WebSocket is not supported for {exchange_name}")
+            return False
+
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        registered = self.subscriptions.setdefault((exchange_name, tuple(channels)), [])
+        for symbol in symbols:
+            if symbol not in registered:
+                registered.append(symbol)
+        return True
+
+    def build_clients(self):
+        """Create one WebSocketClient per connection-sized batch of registered symbols."""
+        clients = []
+        for (exchange_name, channels), symbols in self.subscriptions.items():
+            batch_size = max(1, self.max_streams.get(exchange_name, 100) // len(channels))
+            for start in range(0, len(symbols), batch_size):
+                clients.append(WebSocketClient(
+                    exchange_name=exchange_name,
+                    ws_url=self.ws_urls[exchange_name],
+                    symbols=symbols[start:start + batch_size],
+                    channels=channels,
+                    on_message=self.on_message,
+                    recorder=self.recorder
+                ))
+        return clients
+
+    async def run(self):
+        """Connect every registered stream and run them side by side until all have stopped."""
+        self.clients = self.build_clients()
+        if not self.clients:
+            self.logger.warning("No streams registered; nothing to run.")
+            return
+
+        self.logger.info(f"Starting {len(self.clients)} WebSocket connection(s) in one event loop")
+        self._tasks = [asyncio.ensure_future(self._run_client(client)) for client in self.clients]
+        try:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        finally:
+            if self.recorder is not None:
+                self.recorder.flush()
+
+    async def _run_client(self, client):
+        """Run a single client, isolating its failure from the other connections."""
+        try:
+            await client.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Stream for {client.exchange_name} {client.symbols} stopped: {e}")
+        finally:
+            await client.close()
+
+    def resubscribe(self, exchange_name: str, symbol: str, channel: str = "depth"):
+        """
+        Schedule a resubscribe for one symbol on the connection that carries it.
+
+        :param exchange_name: Name of the exchange.
+        :param symbol: Symbol in exchange format.
+        :param channel: Logical channel whose connection should resubscribe.
+        :return: Task resolving to True once the resubscribe is sent, or False if no stream carries the symbol.
+        """
+        for client in self.clients:
+            if client.exchange_name == exchange_name and channel in client.channels and symbol in client.symbols:
+                return asyncio.ensure_future(client.resubscribe([symbol]))
+        self.logger.warning(f"No running stream carries {symbol} on {exchange_name}")
+        return False
+
+    async def stop(self):
+        """Stop reconnecting and cancel all running connections."""
+        for client in self.clients:
+            client.stop()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def replay(self, path: str, speed: float = None, on_snapshot=None):
+        """
+        Replay a FrameRecorder capture through the same decode and dispatch path as live streams.
+
+        :param path: Capture file written by FrameRecorder.
+        :param speed: 1.0 for real time, N for N times faster, None or 0 for as fast as possible.
+        :param on_snapshot: Callback on_snapshot(exchange_name, symbol, snapshot) for recorded REST
+                            order book snapshots; they are skipped if omitted.
+        :return: Number of frames replayed.
+        """
+        decoders = {}
+
+        def handle(exchange_name, raw, _timestamp_ns):
+            if exchange_name.endswith(SNAPSHOT_SUFFIX):
+                if on_snapshot is not None:
+                    snapshot = json.loads(raw)
+                    on_snapshot(exchange_name[:-len(SNAPSHOT_SUFFIX)], snapshot["symbol"], snapshot)
+                return
+            decoder = decoders.get(exchange_name)
+            if decoder is None:
+                decoder = decoders[exchange_name] = MessageDecoder(exchange_name)
+            decoded = decoder.decode(raw)
+            if decoded is not None and self.on_message:
+                self.on_message(exchange_name, decoded[1])
+
+        return FrameReplayer(path).replay(handle, speed)
+
+    def run_forever(self):
+        """Blocking entry point that runs all registered streams in a fresh event loop."""
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            self.logger.info("Stream manager interrupted; shutting down.")
@@ -0,0 +1,193 @@
+# src/modules/datafeed/tick_store.py
+
+import math
+import numpy as np
+
+
+class TickRingBuffer:
+    """
+    Fixed-capacity ring buffer of recent ticks (price, size, timestamp) for one symbol.
+
+    Rolling statistics over the buffered window are maintained incrementally on every append
+    (O(1)): EWMA volatility of log returns, realized variance, VWAP and trade rate. Readers
+    get plain floats or NumPy views of the underlying storage, never copies of the window.
+    """
+
+    def __init__(self, capacity: int = 4096, ewma_lambda: float = 0.94):
+        """
+        :param capacity: Number of ticks retained.
+        :param ewma_lambda: Decay factor for the EWMA variance (RiskMetrics-style, 0 < lambda < 1).
+        """
+        self.capacity = capacity
+        self.ewma_lambda = ewma_lambda
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.sizes = np.zeros(capacity, dtype=np.float64)
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.returns = np.zeros(capacity, dtype=np.float64)  # log return of each tick vs. the previous one
+        self._head = 0    # index the next tick is written to
+        self._count = 0
+        self._appends_since_recompute = 0
+        self._sum_pv = 0.0
+        self._sum_v = 0.0
+        self._sum_r2 = 0.0
+        self._ewma_var = 0.0
+        self.last_price = None
+
+    def __len__(self):
+        return self._count
+
+    def append(self, price: float, size: float, timestamp: int):
+        """
+        Add a tick, evicting the oldest one when full.
+
+        :param price: Trade price.
+        :param size: Trade size (0 for quote-only updates; excluded from VWAP).
+        :param timestamp: Tick time in milliseconds.
+        """
+        head = self._head
+        if self._count == self.capacity:
+            old_price = float(self.prices[head])
+            old_size = float(self.sizes[head])
+            old_return = float(self.returns[head])
+            self._sum_pv -= old_price * old_size
+            self._sum_v -= old_size
+            self._sum_r2 -= old_return * old_return
+        else:
+            self._count += 1
+
+        last_price = self.last_price
+        log_return = math.log(price / last_price) if last_price else 0.0
+        self.prices[head] = price
+        self.sizes[head] = size
+        self.timestamps[head] = timestamp
+        self.returns[head] = log_return
+
+        self._sum_pv += price * size
+        self._sum_v += size
+        self._sum_r2 += log_return * log_return
+        self._ewma_var = self.ewma_lambda * self._ewma_var + (1 - self.ewma_lambda) * log_return * log_return
+        self.last_price = price
+        self._head = head + 1 if head + 1 < self.capacity else 0
+
+        # Running sums accumulate float error; rebuild them from storage once per lap
+        self._appends_since_recompute += 1
+        if self._appends_since_recompute >= self.capacity:
+            self._recompute()
+
+    def _recompute(self):
+        prices, sizes, returns = self.prices[:self._count], self.sizes[:self._count], self.returns[:self._count]
+        self._sum_pv = float(np.dot(prices, sizes))
+        self._sum_v = float(sizes.sum())
+        self._sum_r2 = float(np.dot(returns, returns))
+        self._appends_since_recompute = 0
+
+    @property
+    def oldest_index(self):
+        """Storage index of the oldest buffered tick."""
+        return self._head if self._count == self.capacity else 0
+
+    @property
+    def last_timestamp(self):
+        """Timestamp of the newest tick, or None if empty."""
+        return int(self.timestamps[self._head - 1]) if self._count else None
+
+    @property
+    def ewma_volatility(self):
+        """Per-tick EWMA volatility of log returns (fraction)."""
+        return math.sqrt(self._ewma_var)
+
+    @property
+    def ewma_volatility_percent(self):
+        """Per-tick EWMA volatility of log returns in percent."""
+        return math.sqrt(self._ewma_var) * 100
+
+    def volatility_percent(self, horizon_seconds: float):
+        """
+        EWMA volatility scaled from one tick to a time horizon, in percent.
+
+        Returns are assumed independent, so variance grows with the number of ticks expected in
+        the horizon at the current trade rate: sigma_tick * sqrt(trade_rate * horizon_seconds).
+
+        :param horizon_seconds: Horizon the volatility refers to (e.g. 86400 for daily).
+        :return: Volatility in percent, or None until the trade rate is known.
+        """
+        rate = self.trade_rate
+        if rate <= 0:
+            return None
+        return math.sqrt(self._ewma_var * rate * horizon_seconds) * 100
+
+    @property
+    def realized_variance(self):
+        """Sum of squared log returns over the buffered window."""
+        return max(self._sum_r2, 0.0)
+
+    @property
+    def vwap(self):
+        """Volume-weighted average price over the buffered window, or None with no volume."""
+        return self._sum_pv / self._sum_v if self._sum_v > 0 else None
+
+    @property
+    def trade_rate(self):
+        """Ticks per second over the buffered window."""
+        if self._count < 2:
+            return 0.0
+        elapsed_ms = self.timestamps[self._head - 1] - self.timestamps[self.oldest_index]
+        return (self._count - 1) * 1000.0 / elapsed_ms if elapsed_ms > 0 else 0.0
+
+    def segments(self):
+        """
+        Return the buffered window in chronological order as one or two (prices, sizes, timestamps)
+        tuples of NumPy views; two segments are returned once the buffer has wrapped.
+        """
+        if self._count < self.capacity or self._head == 0:
+            end = self._count
+            return [(self.prices[:end], self.sizes[:end], self.timestamps[:end])]
+        head = self._head
+        return [
+            (self.prices[head:], self.sizes[head:], self.timestamps[head:]),
+            (self.prices[:head], self.sizes[:head], self.timestamps[:head])
+        ]
+
+    def stats(self):
+        """Return the rolling statistics as a dictionary."""
+        return {
+            "last_price": self.last_price,
+            "ewma_volatility_percent": self.ewma_volatility_percent,
+            "realized_variance": self.realized_variance,
+            "vwap": self.vwap,
+            "trade_rate": self.trade_rate,
+            "count": self._count
+        }
+
+
+class TickStore:
+    """Holds one TickRingBuffer per (exchange, symbol)."""
+
+    def __init__(self, capacity: int = 4096, ewma_lambda: float = 0.94):
+        """
+        :param capacity: Ticks retained per symbol.
+        :param ewma_lambda: EWMA decay factor shared by every buffer.
+        """
+        self.capacity = capacity
+        self.ewma_lambda = ewma_lambda
+        self.buffers = {}
+
+    def buffer(self, exchange_name: str, symbol: str):
+        """Return the buffer for a symbol, creating it on first use."""
+        key = (exchange_name, symbol)
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = TickRingBuffer(self.capacity, self.ewma_lambda)
+        return buffer
+
+    def get(self, exchange_name: str, symbol: str):
+        """Return the buffer for a symbol, or None if no ticks have been seen."""
+        return self.buffers.get((exchange_name, symbol))
+
+    def on_trade(self, trade):
+        """
+        Append a normalized Trade record.
+
+        :param trade: market_data.Trade instance.
+        """
+        self.buffer(trade.exchange, trade.symbol).append(trade.price, trade.amount, trade.timestamp)
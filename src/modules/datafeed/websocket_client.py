@@ -1,76 +1,211 @@
 # src/modules/datafeed/websocket_client.py
 
 import asyncio
+import random
 import websockets
 import json
-from src.modules.utils.logger import get_logger
+from src.modules.utils.logger import get_logger, RateLimitedLogger
+from src.modules.utils.metrics import get_counters
+from src.modules.datafeed.decoder import MessageDecoder
+
+# Logical channel name -> exchange-specific channel name
+CHANNEL_NAMES = {
+    "binance": {"ticker": "ticker", "depth": "depth@100ms", "trade": "trade"},
+    "coinbase": {"ticker": "ticker", "depth": "level2", "trade": "matches"},
+    "kraken": {"ticker": "ticker", "depth": "book", "trade": "trade"}
+}
 
 
 class WebSocketClient:
-    def __init__(self, exchange_name: str, ws_url: str, symbol: str):
+    def __init__(self, exchange_name: str, ws_url: str, symbol: str = None, symbols=None,
+                 channels=("ticker",), on_message=None, reconnect=True,
+                 reconnect_base_delay: float = 0.5, reconnect_max_delay: float = 30.0, recorder=None):
         """
         Initialize the WebSocketClient.
 
+        A single client carries every symbol it is given over one connection, using the
+        exchange's combined subscription message (one SUBSCRIBE with many streams on Binance,
+        many product_ids on Coinbase, many pairs on Kraken).
+
         :param exchange_name: Name of the exchange (e.g., "binance", "coinbase").
         :param ws_url: WebSocket URL for the exchange.
         :param symbol: Trading pair symbol (e.g., "BTC/USDT").
+        :param symbols: List of trading pair symbols to stream on this connection.
+        :param channels: Channels to subscribe to for every symbol (e.g., ("ticker", "depth")).
+        :param on_message: Optional callback invoked as on_message(exchange_name, payload) with a
+                           Ticker record, a list of Trade records, or a parsed depth message.
+        :param reconnect: Reconnect and resubscribe automatically when the connection drops.
+        :param reconnect_base_delay: Initial reconnect backoff in seconds.
+        :param reconnect_max_delay: Upper bound for the reconnect backoff in seconds.
+        :param recorder: Optional FrameRecorder capturing every raw frame before it is decoded.
         """
         self.logger = get_logger("WebSocketClient")
+        self.sampled_logger = RateLimitedLogger(self.logger)
+        self.counters = get_counters("datafeed")
         self.exchange_name = exchange_name.lower()
         self.ws_url = ws_url
-        self.symbol = symbol
+        self.symbols = list(symbols) if symbols else [symbol]
+        self.symbol = self.symbols[0]
+        self.channels = tuple(channels)
+        self.on_message = on_message
+        self.decoder = MessageDecoder(self.exchange_name, self.channels)
+        self.reconnect = reconnect
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.recorder = recorder
         self.connection = None
+        self._stopped = False
 
     async def connect(self):
         """Establish a WebSocket connection."""
         try:
             self.connection = await websockets.connect(self.ws_url)
+            self.counters.increment(f"{self.exchange_name}.connects")
             self.logger.info(f"Connected to WebSocket: {self.ws_url}")
         except Exception as e:
             self.logger.error(f"Failed to connect to WebSocket: {e}")
             raise
 
+    def _subscription_payload(self, symbols=None, unsubscribe: bool = False):
+        """
+        Build the combined (un)subscription message for symbols on this connection.
+
+        :param symbols: Symbols to include; defaults to every symbol on this connection.
+        :param unsubscribe: Build an unsubscribe message instead.
+        """
+        symbols = self.symbols if symbols is None else list(symbols)
+        names = CHANNEL_NAMES.get(self.exchange_name, {})
+        channels = [names.get(channel, channel) for channel in self.channels]
+        if self.exchange_name == "binance":
+            return {
+                "method": "UNSUBSCRIBE" if unsubscribe else "SUBSCRIBE",
+                "params": [f"{symbol.lower()}@{channel}" for symbol in symbols for channel in channels],
+                "id": 1
+            }
+        elif self.exchange_name == "coinbase":
+            return {
+                "type": "unsubscribe" if unsubscribe else "subscribe",
+                "channels": [{"name": channel, "product_ids": symbols} for channel in channels]
+            }
+        elif self.exchange_name == "kraken":
+            # Kraken accepts one subscription name per message
+            return [
+                {"event": "unsubscribe" if unsubscribe else "subscribe", "pair": symbols,
+                 "subscription": {"name": channel, "depth": 100} if channel == "book" else {"name": channel}}
+                for channel in channels
+            ]
+        return None
+
+    async def _send_payload(self, payload):
+        for message in payload if isinstance(payload, list) else [payload]:
+            await self.connection.send(json.dumps(message))
+
     async def subscribe(self):
         """Subscribe to real-time data based on the exchange."""
         try:
-            if self.exchange_name == "binance":
-                payload = {
-                    "method": "SUBSCRIBE",
-                    "params": [f"{self.symbol.lower()}@ticker"],
-                    "id": 1
-                }
-            elif self.exchange_name == "coinbase":
-                payload = {
-                    "type": "subscribe",
-                    "channels": [{"name": "ticker", "product_ids": [self.symbol]}]
-                }
-            elif self.exchange_name == "kraken":
-                payload = {
-                    "event": "subscribe",
-                    "pair": [self.symbol],
-                    "subscription": {"name": "ticker"}
-                }
-            else:
+            payload = self._subscription_payload()
+            if payload is None:
                 self.logger.error(f"WebSocket subscription not supported for {self.exchange_name}")
                 return
 
-            await self.connection.send(json.dumps(payload))
-            self.logger.info(f"Subscribed to {self.symbol} on {self.exchange_name}")
+            await self._send_payload(payload)
+            self.logger.info(f"Subscribed to {len(self.symbols)} symbol(s) on {self.exchange_name}: {self.symbols}")
         except Exception as e:
             self.logger.error(f"Subscription error for {self.exchange_name}: {e}")
 
+    async def resubscribe(self, symbols):
+        """
+        Unsubscribe and subscribe again so the exchange replays its snapshot for these symbols.
+
+        :param symbols: Symbols on this connection to resubscribe.
+        :return: True if both requests were sent.
+        """
+        if self.connection is None:
+            return False
+        try:
+            await self._send_payload(self._subscription_payload(symbols, unsubscribe=True))
+            await self._send_payload(self._subscription_payload(symbols))
+            self.counters.increment(f"{self.exchange_name}.resubscribes")
+            self.logger.info(f"Resubscribed to {symbols} on {self.exchange_name}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Resubscribe error for {self.exchange_name}: {e}")
+            return False
+
     async def receive_data(self):
-        """Receive and process real-time data."""
+        """
+        Receive and process real-time data until the connection closes.
+
+        Errors raised while handling a single message are logged (rate limited) and counted
+        without dropping the connection; connection errors propagate so run() can reconnect.
+        """
+        recv = self.connection.recv
+        decode = self.decoder.decode
+        on_message = self.on_message
+        exchange_name = self.exchange_name
+        record = self.recorder.record if self.recorder else None
+        received = 0
         try:
             while True:
-                message = await self.connection.recv()
-                data = json.loads(message)
-                self.logger.info(f"Received data: {data}")
-        except Exception as e:
-            self.logger.error(f"Error receiving WebSocket data: {e}")
+                message = await recv()
+                if record:
+                    record(exchange_name, message)
+                received += 1
+                if received == 1000:
+                    self.counters.increment(f"{exchange_name}.messages", received)
+                    received = 0
+                try:
+                    decoded = decode(message)
+                    if decoded is None:
+                        continue
+                    if on_message:
+                        on_message(exchange_name, decoded[1])
+                    else:
+                        self.sampled_logger.info("received", "Received %s data on %s: %s",
+                                                 decoded[0], exchange_name, decoded[1])
+                except Exception as e:
+                    self.counters.increment(f"{exchange_name}.message_errors")
+                    self.sampled_logger.error("message_error", "Error processing WebSocket message on %s: %s",
+                                              exchange_name, e)
+        finally:
+            self.counters.increment(f"{exchange_name}.messages", received)
+
+    def _backoff_delay(self, attempt: int):
+        """Exponential backoff with jitter: half fixed, half random."""
+        delay = min(self.reconnect_max_delay, self.reconnect_base_delay * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def close(self):
+        """Close the WebSocket connection if it is open."""
+        if self.connection is not None:
+            await self.connection.close()
+            self.connection = None
+
+    def stop(self):
+        """Stop reconnecting after the current connection ends."""
+        self._stopped = True
 
     async def run(self):
-        """Main WebSocket event loop."""
-        await self.connect()
-        await self.subscribe()
-        await self.receive_data()
\ No newline at end of file
+        """Main WebSocket event loop; reconnects with jittered backoff when the connection drops."""
+        attempt = 0
+        while not self._stopped:
+            try:
+                await self.connect()
+                await self.subscribe()
+                attempt = 0
+                await self.receive_data()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters.increment(f"{self.exchange_name}.disconnects")
+                self.logger.error(f"Error receiving WebSocket data: {e}")
+            finally:
+                await self.close()
+
+            if not self.reconnect or self._stopped:
+                break
+            delay = self._backoff_delay(attempt)
+            attempt += 1
+            self.counters.increment(f"{self.exchange_name}.reconnects")
+            self.logger.warning(f"Reconnecting to {self.exchange_name} in {delay:.2f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
@@ -0,0 +1,177 @@
+# src/modules/exchange_connector/async_connector.py
+
+import asyncio
+import random
+import yaml
+import ccxt
+from src.modules.utils.logger import get_logger
+from src.modules.utils.metrics import get_counters, get_latencies
+from src.modules.exchange_connector.exchange_registry import get_exchange_registry
+
+# Methods that only read state; a timed-out call to anything else may already have acted on the venue
+READ_ONLY_PREFIXES = ("fetch", "load")
+
+
+class AsyncExchangeConnector:
+    """
+    Non-blocking access to every configured exchange from a single event loop.
+
+    Calls go through shared ccxt.async_support clients, which keep one keep-alive aiohttp
+    session per venue. Every request has a hard deadline, so a slow venue costs at most its
+    timeout and never blocks the others; fan-out helpers query all venues concurrently.
+    Failures are logged and returned as None, as in the synchronous modules.
+    """
+
+    def __init__(self, secrets_path: str = "src/config/secrets.yaml", timeout: float = 10.0, retries: int = 0,
+                 registry=None):
+        """
+        :param secrets_path: Path to the API credentials file.
+        :param timeout: Per-request deadline in seconds.
+        :param retries: Extra attempts after a network error or timeout (short jittered backoff),
+                        for read-only methods only.
+        :param registry: ExchangeRegistry providing shared clients; defaults to the process-wide one.
+        """
+        self.logger = get_logger("AsyncExchangeConnector")
+        self.counters = get_counters("exchange")
+        self.latencies = get_latencies("exchange")
+        self.secrets = self._load_yaml(secrets_path)
+        self.timeout = timeout
+        self.retries = retries
+        self.registry = registry or get_exchange_registry()
+
+    def _load_yaml(self, path):
+        """Load YAML configuration file."""
+        try:
+            with open(path, "r") as file:
+                return yaml.safe_load(file)
+        except Exception as e:
+            self.logger.error(f"Failed to load YAML file {path}: {e}")
+            return {}
+
+    @property
+    def exchange_names(self):
+        """Exchanges configured in secrets.yaml."""
+        return list((self.secrets or {}).get("exchanges", {}))
+
+    def client(self, exchange_name: str):
+        """
+        Return the shared async client for an exchange (must be called inside the event loop).
+
+        :param exchange_name: ccxt exchange id (e.g., 'binance').
+        """
+        credentials = (self.secrets or {}).get("exchanges", {}).get(exchange_name, {})
+        return self.registry.get_async(exchange_name, credentials.get("api_key"), credentials.get("api_secret"),
+                                       options={"timeout": int(self.timeout * 1000)})
+
+    async def _throttled_call(self, exchange_name, client, method, args, kwargs):
+        await self.registry.rate_limiter(exchange_name).acquire_for_async(method)
+        with self.latencies.time(f"{exchange_name}.{method}"):
+            return await getattr(client, method)(*args, **kwargs)
+
+    async def attempt(self, exchange_name: str, method: str, *args, timeout: float = None, **kwargs):
+        """
+        Make one throttled, deadline-bound call and raise its errors, for callers that decide
+        themselves what is safe to retry (e.g. order submission with a client order id).
+
+        :param exchange_name: ccxt exchange id.
+        :param method: ccxt unified method name.
+        :param timeout: Deadline in seconds; defaults to the connector timeout.
+        :return: The method's result.
+        :raises asyncio.TimeoutError: If the deadline passes first.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        client = self.client(exchange_name)
+        return await asyncio.wait_for(self._throttled_call(exchange_name, client, method, args, kwargs), timeout)
+
+    async def call(self, exchange_name: str, method: str, *args, timeout: float = None, **kwargs):
+        """
+        Await a ccxt method with a deadline, after waiting for the venue's shared rate limiter
+        in the method's priority lane (the wait counts towards the deadline). The call itself is
+        timed into the shared '<exchange>.<method>' latency histogram.
+
+        Only read-only methods (fetch_*, load_*) are retried. Orders and cancels get a single
+        attempt: a timed-out create_order may have reached the venue, and sending it again would
+        place it twice (retry those under a client order id with attempt() instead).
+
+        :param exchange_name: ccxt exchange id.
+        :param method: ccxt unified method name (e.g., 'fetch_ticker').
+        :param timeout: Deadline in seconds; defaults to the connector timeout.
+        :return: The method's result, or None on error or timeout.
+        """
+        retries = self.retries if method.startswith(READ_ONLY_PREFIXES) else 0
+        for attempt in range(retries + 1):
+            try:
+                return await self.attempt(exchange_name, method, *args, timeout=timeout, **kwargs)
+            except asyncio.TimeoutError:
+                self.counters.increment(f"{exchange_name}.timeouts")
+                self.logger.warning(f"{method} on {exchange_name} timed out after {timeout}s")
+            except ccxt.NetworkError as e:
+                self.counters.increment(f"{exchange_name}.network_errors")
+                self.logger.warning(f"{method} on {exchange_name} failed: {e}")
+            except Exception as e:
+                self.counters.increment(f"{exchange_name}.errors")
+                self.logger.error(f"{method} on {exchange_name} failed: {e}")
+                return None
+            if attempt < retries:
+                await asyncio.sleep(random.uniform(0.05, 0.2) * (attempt + 1))
+        return None
+
+    async def fan_out(self, method: str, *args, exchanges=None, timeout: float = None, **kwargs):
+        """
+        Call the same ccxt method on several exchanges concurrently.
+
+        :param method: ccxt unified method name.
+        :param exchanges: Exchange names; defaults to every configured exchange.
+        :param timeout: Per-request deadline in seconds.
+        :return: Dictionary of exchange name -> result (None for venues that failed).
+        """
+        names = list(exchanges) if exchanges is not None else self.exchange_names
+        results = await asyncio.gather(*(self.call(name, method, *args, timeout=timeout, **kwargs) for name in names))
+        return dict(zip(names, results))
+
+    async def ensure_markets(self, exchange_name: str):
+        """Load an exchange's markets once (ccxt deduplicates concurrent loads)."""
+        return await self.call(exchange_name, "load_markets")
+
+    async def fetch_ticker(self, exchange_name: str, symbol: str):
+        """Fetch a ticker for a symbol."""
+        return await self.call(exchange_name, "fetch_ticker", symbol)
+
+    async def fetch_order_book(self, exchange_name: str, symbol: str, limit: int = None):
+        """Fetch an L2 order book snapshot."""
+        return await self.call(exchange_name, "fetch_order_book", symbol, limit)
+
+    async def fetch_balance(self, exchange_name: str):
+        """Fetch account balances."""
+        return await self.call(exchange_name, "fetch_balance")
+
+    async def create_order(self, exchange_name: str, symbol: str, order_type: str, side: str, amount: float,
+                           price: float = None, params: dict = None):
+        """Place an order with a single attempt (never retried); None if it failed or timed out."""
+        return await self.call(exchange_name, "create_order", symbol, order_type, side, amount, price, params or {})
+
+    async def cancel_order(self, exchange_name: str, order_id: str, symbol: str = None):
+        """Cancel an order."""
+        return await self.call(exchange_name, "cancel_order", order_id, symbol)
+
+    async def fetch_open_orders(self, exchange_name: str, symbol: str = None):
+        """Fetch open orders."""
+        return await self.call(exchange_name, "fetch_open_orders", symbol)
+
+    async def fetch_balances(self, exchanges=None):
+        """Fetch balances from every venue at once."""
+        return await self.fan_out("fetch_balance", exchanges=exchanges)
+
+    async def fetch_tickers(self, symbol: str, exchanges=None):
+        """Fetch one symbol's ticker from every venue at once."""
+        return await self.fan_out("fetch_ticker", symbol, exchanges=exchanges)
+
+    async def close(self):
+        """Close the async clients (and their HTTP sessions) opened on this event loop."""
+        await self.registry.close_async()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
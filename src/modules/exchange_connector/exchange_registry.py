@@ -0,0 +1,285 @@
+# src/modules/exchange_connector/exchange_registry.py
+
+import asyncio
+import threading
+import ccxt
+import ccxt.async_support as ccxt_async
+import yaml
+from src.modules.utils.logger import get_logger
+from src.modules.utils.metrics import get_latencies
+from src.modules.exchange_connector.market_cache import MarketMetadataCache
+from src.modules.exchange_connector.rate_limiter import RateLimiter, DEFAULT_RATE_LIMIT
+
+
+class ExchangeRegistry:
+    """
+    Hands out one shared ccxt client per (exchange, API key, sandbox) combination.
+
+    Clients are created lazily on first request and reused by every module afterwards, so
+    each venue has a single HTTP session and a single copy of
+    its markets. Creation and market loading are guarded by locks, so concurrent callers
+    (threads, or coroutines dispatching to threads) never build or load a client twice.
+
+    Async clients (ccxt.async_support) are shared the same way, per event loop, because their
+    HTTP session belongs to the loop that opened it.
+
+    Request pacing is done by one RateLimiter per venue (see rate_limiter()), shared by sync and
+    async clients alike, instead of ccxt's built-in FIFO throttle, so cancels and orders are
+    never queued behind market-data or backfill traffic.
+    """
+
+    def __init__(self, exchanges_config_path: str = "src/config/exchanges.yaml", market_cache=None):
+        """
+        :param exchanges_config_path: exchanges.yaml with each venue's rate_limit, rate_limit_burst
+                                      and endpoint_weights.
+        :param market_cache: MarketMetadataCache used to prime new clients' markets from disk.
+        """
+        self.logger = get_logger("ExchangeRegistry")
+        self.exchanges_config_path = exchanges_config_path
+        self.market_cache = market_cache
+        self._clients = {}
+        self._async_clients = {}
+        self._market_locks = {}
+        self._rate_limiters = {}
+        self._registered = {}  # exchange name -> (client, async client) served instead of ccxt's
+        self._venue_settings = None
+        self.latencies = get_latencies("exchange")
+        self._lock = threading.Lock()
+
+    def get(self, exchange_name: str, api_key: str = None, secret: str = None, sandbox: bool = False,
+            options: dict = None):
+        """
+        Return the shared client for an exchange and credential set, creating it on first use.
+
+        :param exchange_name: ccxt exchange id (e.g., 'binance').
+        :param api_key: API key, or None for a public-data client.
+        :param secret: API secret.
+        :param sandbox: Use the exchange's testnet.
+        :param options: Extra ccxt constructor settings, applied only when the client is created.
+        :return: ccxt exchange instance.
+        """
+        registered = self._registered.get(exchange_name)
+        if registered is not None:
+            return registered[0]
+        key = (exchange_name, api_key, sandbox)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                exchange_class = getattr(ccxt, exchange_name)
+                settings = {"enableRateLimit": False, **(options or {})}
+                if api_key:
+                    settings.update({"apiKey": api_key, "secret": secret})
+                client = exchange_class(settings)
+                if sandbox:
+                    client.set_sandbox_mode(True)
+                self._market_locks[id(client)] = threading.Lock()
+                if self.market_cache is not None:
+                    self.market_cache.prime(client, loader=self.reload_markets)
+                self._clients[key] = client
+                self.logger.info(f"Created shared {exchange_name} client{' (sandbox)' if sandbox else ''}")
+        return client
+
+    def get_async(self, exchange_name: str, api_key: str = None, secret: str = None, sandbox: bool = False,
+                  options: dict = None):
+        """
+        Return the shared ccxt.async_support client for the running event loop.
+
+        :param exchange_name: ccxt exchange id (e.g., 'binance').
+        :param api_key: API key, or None for a public-data client.
+        :param secret: API secret.
+        :param sandbox: Use the exchange's testnet.
+        :param options: Extra ccxt constructor settings, applied only when the client is created.
+        :return: ccxt async exchange instance; close it with close_async().
+        """
+        registered = self._registered.get(exchange_name)
+        if registered is not None and registered[1] is not None:
+            return registered[1]
+        key = (exchange_name, api_key, sandbox, asyncio.get_running_loop())
+        client = self._async_clients.get(key)
+        if client is None:
+            exchange_class = getattr(ccxt_async, exchange_name)
+            settings = {"enableRateLimit": False, **(options or {})}
+            if api_key:
+                settings.update({"apiKey": api_key, "secret": secret})
+            client = exchange_class(settings)
+            if sandbox:
+                client.set_sandbox_mode(True)
+            if self.market_cache is not None:
+                self.market_cache.prime(client)
+            self._async_clients[key] = client
+            self.logger.info(f"Created shared async {exchange_name} client{' (sandbox)' if sandbox else ''}")
+        return client
+
+    def register(self, exchange_name: str, client, async_client=None, rate_limit: float = None):
+        """
+        Serve a prebuilt client (e.g. a SimulatedExchange) for an exchange name, whatever the
+        credentials or sandbox flag callers ask for.
+
+        :param exchange_name: Name modules look the venue up by.
+        :param client: Client with ccxt's unified methods, returned by get().
+        :param async_client: Client returned by get_async() on every event loop; defaults to
+                             client.async_client() when the client provides one.
+        :param rate_limit: Requests per minute for the venue's RateLimiter, overriding exchanges.yaml.
+        """
+        if async_client is None and hasattr(client, "async_client"):
+            async_client = client.async_client()
+        with self._lock:
+            self._registered[exchange_name] = (client, async_client)
+            self._market_locks[id(client)] = threading.Lock()
+            if rate_limit is not None:
+                self._rate_limiters[exchange_name] = RateLimiter(rate_limit, name=exchange_name)
+        self.logger.info(f"Registered {type(client).__name__} as {exchange_name}")
+
+    def is_registered(self, exchange_name: str):
+        """Return True if register() put a prebuilt client in place for the exchange."""
+        return exchange_name in self._registered
+
+    async def close_async(self):
+        """Close every async client opened on the running event loop."""
+        loop = asyncio.get_running_loop()
+        keys = [key for key in self._async_clients if key[3] is loop]
+        for key in keys:
+            client = self._async_clients.pop(key)
+            try:
+                await client.close()
+            except Exception as e:
+                self.logger.error(f"Failed to close async {key[0]} client: {e}")
+
+    def _venue_config(self, exchange_name):
+        if self._venue_settings is None:
+            try:
+                with open(self.exchanges_config_path, "r") as file:
+                    self._venue_settings = (yaml.safe_load(file) or {}).get("exchanges") or {}
+            except Exception as e:
+                self.logger.error(f"Failed to load YAML file {self.exchanges_config_path}: {e}")
+                self._venue_settings = {}
+        return self._venue_settings.get(exchange_name) or {}
+
+    def rate_limiter(self, exchange_name: str):
+        """
+        Return the shared RateLimiter for an exchange, built from its exchanges.yaml settings.
+
+        :param exchange_name: ccxt exchange id (e.g., 'binance').
+        :return: RateLimiter shared by every client of that venue.
+        """
+        limiter = self._rate_limiters.get(exchange_name)
+        if limiter is not None:
+            return limiter
+        with self._lock:
+            limiter = self._rate_limiters.get(exchange_name)
+            if limiter is None:
+                settings = self._venue_config(exchange_name)
+                limiter = RateLimiter(settings.get("rate_limit") or DEFAULT_RATE_LIMIT,
+                                      burst=settings.get("rate_limit_burst"),
+                                      weights=settings.get("endpoint_weights"), name=exchange_name)
+                self._rate_limiters[exchange_name] = limiter
+        return limiter
+
+    def throttled(self, exchange_name: str, client, method: str, priority: int = None):
+        """
+        Wrap a client method so each call first waits for the venue's rate limiter, then is timed
+        into the '<exchange>.<method>' latency histogram (the rate-limit wait is not included).
+
+        :param exchange_name: Exchange name the client belongs to.
+        :param client: ccxt client.
+        :param method: ccxt unified method name (e.g., 'cancel_order').
+        :param priority: Lane override; defaults to the method's lane in rate_limiter.METHOD_LANES.
+        :return: Callable with the method's signature.
+        """
+        limiter = self.rate_limiter(exchange_name)
+        bound = getattr(client, method)
+        name = f"{exchange_name}.{method}"
+
+        def call(*args, **kwargs):
+            limiter.acquire_for(method, priority)
+            with self.latencies.time(name):
+                return bound(*args, **kwargs)
+        return call
+
+    def clients_for(self, secrets: dict):
+        """
+        Return shared clients for every exchange listed in a secrets.yaml mapping.
+
+        :param secrets: Parsed secrets.yaml ({'exchanges': {name: {'api_key': ..., 'api_secret': ...}}}).
+        :return: Dictionary of exchange name -> ccxt client; venues that fail are logged and skipped.
+        """
+        exchanges = {}
+        for exchange_name, credentials in (secrets or {}).get("exchanges", {}).items():
+            try:
+                exchanges[exchange_name] = self.get(exchange_name, credentials["api_key"], credentials["api_secret"])
+            except Exception as e:
+                self.logger.error(f"Failed to initialize {exchange_name}: {e}")
+        return exchanges
+
+    def ensure_markets(self, exchange, reload: bool = False):
+        """
+        Load a client's markets exactly once, however many callers race for them.
+
+        Clients primed from the market cache already have markets and return immediately;
+        a fresh load is written back to the cache.
+
+        :param exchange: Client returned by get().
+        :param reload: Force a refresh of already-loaded markets.
+        :return: The client's markets.
+        """
+        if exchange.markets and not reload:
+            return exchange.markets
+        lock = self._market_locks.get(id(exchange))
+        if lock is None:
+            return self._load_markets(exchange, reload)
+        with lock:
+            if exchange.markets and not reload:
+                return exchange.markets
+            markets = self._load_markets(exchange, reload)
+            self.logger.info(f"Loaded {len(markets)} markets for {exchange.id}")
+            if self.market_cache is not None:
+                self.market_cache.save(exchange)
+            return markets
+
+    def reload_markets(self, exchange):
+        """
+        Reload a client's markets under its market lock and the venue's rate limit, without
+        writing the market cache (the loader the cache refreshes stale entries with).
+
+        :param exchange: Client returned by get().
+        :return: The client's markets.
+        """
+        lock = self._market_locks.get(id(exchange))
+        if lock is None:
+            return self._load_markets(exchange, True)
+        with lock:
+            return self._load_markets(exchange, True)
+
+    def _load_markets(self, exchange, reload):
+        # load_markets is one of the heaviest calls in the venues' request weights
+        return self.throttled(exchange.id, exchange, "load_markets")(reload)
+
+    def clear(self):
+        """Forget every client, registered ones included (ccxt clients are rebuilt on next use)."""
+        with self._lock:
+            self._clients.clear()
+            self._registered.clear()
+            self._market_locks.clear()
+            self._rate_limiters.clear()
+            self._venue_settings = None
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_exchange_registry():
+    """
+    Return the process-wide ExchangeRegistry.
+
+    :return: Shared ExchangeRegistry instance.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ExchangeRegistry(market_cache=MarketMetadataCache())
+        return _registry
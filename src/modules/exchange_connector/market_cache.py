@@ -0,0 +1,169 @@
+# src/modules/exchange_connector/market_cache.py
+
+import json
+import os
+import threading
+import time
+from src.modules.utils.logger import get_logger
+from src.modules.utils.metrics import get_counters
+
+DEFAULT_MARKET_TTL = 6 * 3600  # seconds cached market metadata is considered current
+
+
+class MarketMetadataCache:
+    """
+    On-disk cache of each venue's ccxt markets and currencies.
+
+    One JSON file per venue (and sandbox) holds the markets, the currencies and the derived
+    min_trade_size and fee tables, stamped with the time they were fetched. A new client is
+    primed from the file with set_markets() instead of calling load_markets(); when the file is
+    older than the TTL the stale copy is still served and a background thread refreshes it, so
+    neither process start nor the first order waits on the exchange.
+    """
+
+    def __init__(self, cache_dir: str = "data/markets", ttl: float = DEFAULT_MARKET_TTL):
+        """
+        :param cache_dir: Directory holding one <exchange>.json file per venue.
+        :param ttl: Seconds after which cached metadata is refreshed in the background.
+        """
+        self.logger = get_logger("MarketMetadataCache")
+        self.counters = get_counters("market_cache")
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(exchange):
+        return f"{exchange.id}-sandbox" if getattr(exchange, "isSandboxModeEnabled", False) else exchange.id
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self, key: str):
+        """
+        Read a venue's cache file.
+
+        :param key: Exchange id, with a '-sandbox' suffix for testnet clients.
+        :return: Dict with fetched_at, markets, currencies, min_trade_size and fees, or None.
+        """
+        try:
+            with open(self._path(key), "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.error(f"Failed to read market cache for {key}: {e}")
+            return None
+
+    def is_fresh(self, entry):
+        """Return True if a loaded entry is within the TTL."""
+        return entry is not None and time.time() - entry.get("fetched_at", 0) <= self.ttl
+
+    @staticmethod
+    def trading_rules(markets: dict):
+        """
+        Derive the min_trade_size and fee tables from ccxt markets.
+
+        :return: (min_trade_size {symbol: amount}, fees {symbol: {'maker': rate, 'taker': rate}}).
+        """
+        min_trade_size, fees = {}, {}
+        for symbol, market in markets.items():
+            minimum = ((market.get("limits") or {}).get("amount") or {}).get("min")
+            if minimum is not None:
+                min_trade_size[symbol] = minimum
+            if market.get("maker") is not None or market.get("taker") is not None:
+                fees[symbol] = {"maker": market.get("maker"), "taker": market.get("taker")}
+        return min_trade_size, fees
+
+    def save(self, exchange):
+        """Write a client's loaded markets and currencies to its cache file (atomically)."""
+        key = self._key(exchange)
+        min_trade_size, fees = self.trading_rules(exchange.markets or {})
+        entry = {
+            "fetched_at": time.time(),
+            "markets": exchange.markets,
+            "currencies": exchange.currencies,
+            "min_trade_size": min_trade_size,
+            "fees": fees,
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._path(key)}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(entry, file, separators=(",", ":"), default=str)
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            self.logger.error(f"Failed to write market cache for {key}: {e}")
+
+    def prime(self, exchange, loader=None):
+        """
+        Load cached markets into a client without any network call.
+
+        Stale entries are still applied; for sync clients a background refresh is started
+        (async clients are refreshed whenever a sync client of the same venue refreshes the file).
+
+        :param exchange: ccxt client (sync or async).
+        :param loader: Callable loader(exchange) reloading the client's markets for a refresh, e.g.
+                       ExchangeRegistry.reload_markets so the venue's rate limit and market lock apply.
+        :return: True if the client was primed from the cache.
+        """
+        key = self._key(exchange)
+        entry = self.load(key)
+        if entry is None or not entry.get("markets"):
+            self.counters.increment(f"{key}.misses")
+            return False
+        exchange.set_markets(entry["markets"], entry.get("currencies"))
+        self.counters.increment(f"{key}.hits")
+        if not self.is_fresh(entry) and not _is_async(exchange):
+            self.refresh_in_background(exchange, loader)
+        return True
+
+    def refresh(self, exchange, loader=None):
+        """
+        Reload a client's markets from the exchange and rewrite its cache file.
+
+        :param loader: Callable loader(exchange) doing the reload; defaults to load_markets(True).
+        """
+        if loader is not None:
+            loader(exchange)
+        else:
+            exchange.load_markets(True)
+        self.save(exchange)
+        self.logger.info(f"Refreshed {len(exchange.markets)} cached markets for {self._key(exchange)}")
+        return exchange.markets
+
+    def refresh_in_background(self, exchange, loader=None):
+        """Refresh a client's markets on a daemon thread (at most one refresh per venue at a time)."""
+        key = self._key(exchange)
+        with self._lock:
+            if key in self._refreshing:
+                return None
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self.refresh(exchange, loader)
+            except Exception as e:
+                self.logger.warning(f"Background market refresh for {key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        thread = threading.Thread(target=run, name=f"market-refresh-{key}", daemon=True)
+        thread.start()
+        return thread
+
+    def min_trade_size(self, exchange_name: str, symbol: str = None):
+        """Cached minimum order amounts for a venue (one symbol, or the whole table)."""
+        table = (self.load(exchange_name) or {}).get("min_trade_size", {})
+        return table if symbol is None else table.get(symbol)
+
+    def fees(self, exchange_name: str, symbol: str = None):
+        """Cached maker/taker fee rates for a venue (one symbol, or the whole table)."""
+        table = (self.load(exchange_name) or {}).get("fees", {})
+        return table if symbol is None else table.get(symbol)
+
+
+def _is_async(exchange):
+    return type(exchange).__module__.startswith("ccxt.async_support")
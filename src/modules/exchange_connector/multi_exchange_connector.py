@@ -1,9 +1,11 @@
-import ccxt
 import logging
 import time
+from src.modules.datafeed.price_cache import get_price_cache
+from src.modules.exchange_connector.exchange_registry import get_exchange_registry
+from src.modules.simulation.simulated_exchange import SimulatedExchange, SIMULATED_RATE_LIMIT
 
 class MultiExchangeConnector:
-    def __init__(self, exchange_id, api_key, secret, testnet=False):
+    def __init__(self, exchange_id, api_key, secret, testnet=False, registry=None, paper=False):
         """
         Initializes the exchange connection.
         
@@ -11,25 +13,34 @@ class MultiExchangeConnector:
         :param api_key: API key for authentication
         :param secret: API secret for authentication
         :param testnet: If True, uses testnet for paper trading
+        :param registry: ExchangeRegistry providing shared clients; defaults to the process-wide one
+        :param paper: If True, trades against a local SimulatedExchange registered under exchange_id
+                      (works for every venue and needs no network or credentials)
         """
         self.exchange_id = exchange_id.lower()
         self.api_key = api_key
         self.secret = secret
         self.testnet = testnet
+        self.paper = paper
+        self.registry = registry or get_exchange_registry()
         self.exchange = self._connect_exchange()
+        self.price_cache = get_price_cache()
 
     def _connect_exchange(self):
-        """Connects to the selected exchange using API keys and handles testnet mode."""
-        exchange_class = getattr(ccxt, self.exchange_id)
-        exchange = exchange_class({
-            'apiKey': self.api_key,
-            'secret': self.secret,
-            'enableRateLimit': True  # Prevent API ban due to rate limits
-        })
+        """Connects to the selected exchange using API keys and handles testnet and paper mode."""
+        if self.paper:
+            # One simulator per venue name, shared with every module using the registry
+            if not self.registry.is_registered(self.exchange_id):
+                self.registry.register(self.exchange_id, SimulatedExchange(self.exchange_id),
+                                       rate_limit=SIMULATED_RATE_LIMIT)
+            print(f"[INFO] Connected to simulated {self.exchange_id} (paper trading).")
+            return self.registry.get(self.exchange_id)
 
-        # Enable testnet for supported exchanges
-        if self.exchange_id == "binance" and self.testnet:
-            exchange.set_sandbox_mode(True)
+        # Shared client throttled by the registry's RateLimiter; Binance testnet uses ccxt's sandbox mode
+        binance_testnet = self.exchange_id == "binance" and self.testnet
+        exchange = self.registry.get(self.exchange_id, self.api_key, self.secret, sandbox=binance_testnet)
+
+        if binance_testnet:
             print("[INFO] Connected to Binance Testnet.")
         
         if self.exchange_id == "ftx" and self.testnet:
@@ -38,19 +49,23 @@ class MultiExchangeConnector:
 
         return exchange
 
+    def _throttled(self, method):
+        """Return a client method that first waits for the venue's shared rate limiter."""
+        return self.registry.throttled(self.exchange_id, self.exchange, method)
+
     def get_balance(self, asset):
         """Retrieves balance of a specific asset (e.g., BTC, USDT)."""
         try:
-            balance = self.exchange.fetch_balance()
+            balance = self._throttled("fetch_balance")()
             return balance.get('total', {}).get(asset, 0)
         except Exception as e:
             logging.error(f"Error fetching balance: {e}")
             return None
 
     def get_market_price(self, symbol):
-        """Fetches the latest market price for a trading pair."""
+        """Fetches the latest market price for a trading pair, from the streaming price cache when fresh."""
         try:
-            ticker = self.exchange.fetch_ticker(symbol)
+            ticker = self.price_cache.get_or_fetch(self.exchange_id, symbol, self._throttled("fetch_ticker"))
             return ticker['last']
         except Exception as e:
             logging.error(f"Error fetching market price: {e}")
@@ -61,9 +76,9 @@ class MultiExchangeConnector:
         try:
             params = {}
             if order_type == 'limit':
-                order = self.exchange.create_limit_order(symbol, side, amount, price, params)
+                order = self._throttled("create_limit_order")(symbol, side, amount, price, params)
             elif order_type == 'market':
-                order = self.exchange.create_market_order(symbol, side, amount, params)
+                order = self._throttled("create_market_order")(symbol, side, amount, params)
             else:
                 raise ValueError("Invalid order type. Use 'limit' or 'market'.")
             
@@ -75,7 +90,7 @@ class MultiExchangeConnector:
     def cancel_order(self, order_id, symbol):
         """Cancels an order."""
         try:
-            return self.exchange.cancel_order(order_id, symbol)
+            return self._throttled("cancel_order")(order_id, symbol)
         except Exception as e:
             logging.error(f"Error cancelling order: {e}")
             return None
@@ -83,7 +98,7 @@ class MultiExchangeConnector:
     def get_open_orders(self, symbol):
         """Retrieves open orders for a given trading pair."""
         try:
-            return self.exchange.fetch_open_orders(symbol)
+            return self._throttled("fetch_open_orders")(symbol)
         except Exception as e:
             logging.error(f"Error fetching open orders: {e}")
             return None
@@ -91,7 +106,7 @@ class MultiExchangeConnector:
     def get_trade_history(self, symbol):
         """Fetches trade history for a given symbol."""
         try:
-            return self.exchange.fetch_my_trades(symbol)
+            return self._throttled("fetch_my_trades")(symbol)
         except Exception as e:
             logging.error(f"Error fetching trade history: {e}")
             return None
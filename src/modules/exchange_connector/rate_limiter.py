@@ -0,0 +1,228 @@
+# src/modules/exchange_connector/rate_limiter.py
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from src.modules.utils.metrics import get_counters
+
+# Priority lanes; lower values are served first
+CANCEL = 0
+ORDER = 1
+MARKET_DATA = 2
+ACCOUNT = 3
+BACKFILL = 4
+
+LANE_NAMES = {CANCEL: "cancel", ORDER: "order", MARKET_DATA: "market_data", ACCOUNT: "account", BACKFILL: "backfill"}
+
+# Default lane for each ccxt method
+METHOD_LANES = {
+    "cancel_order": CANCEL, "cancel_orders": CANCEL, "cancel_all_orders": CANCEL,
+    "create_order": ORDER, "create_orders": ORDER, "edit_order": ORDER, "create_limit_order": ORDER,
+    "create_market_order": ORDER,
+    "fetch_ticker": MARKET_DATA, "fetch_tickers": MARKET_DATA, "fetch_order_book": MARKET_DATA,
+    "fetch_trades": MARKET_DATA, "fetch_ohlcv": MARKET_DATA, "load_markets": MARKET_DATA,
+    "fetch_balance": ACCOUNT, "fetch_open_orders": ACCOUNT, "fetch_my_trades": ACCOUNT, "fetch_orders": ACCOUNT,
+    "fetch_order": ACCOUNT,
+}
+
+# Default request weight for each ccxt method (override per venue with endpoint_weights in exchanges.yaml)
+DEFAULT_ENDPOINT_WEIGHTS = {
+    "fetch_order_book": 5, "fetch_ohlcv": 2, "fetch_tickers": 40, "fetch_balance": 10,
+    "fetch_open_orders": 3, "fetch_my_trades": 10, "fetch_orders": 10, "load_markets": 20,
+}
+
+DEFAULT_RATE_LIMIT = 600  # requests per minute when a venue has no configured rate_limit
+
+
+class _Waiter:
+    __slots__ = ("priority", "sequence", "weight", "wake")
+
+    def __init__(self, priority, sequence, weight, wake):
+        self.priority = priority
+        self.sequence = sequence
+        self.weight = weight
+        self.wake = wake
+
+    def __lt__(self, other):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class RateLimiter:
+    """
+    Weighted token bucket for one exchange, shared by every thread and coroutine using it.
+
+    Tokens refill continuously at the venue's requests-per-minute rate up to a burst capacity,
+    and each request costs its endpoint weight. Waiting requests are served strictly by lane
+    (cancels, then orders, market data, account polling, backfill) and FIFO within a lane.
+    The lowest lanes may not spend the last 'reserve' tokens, so a cancel or order arriving
+    during a backfill burst finds capacity immediately.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_RATE_LIMIT, burst: float = None, reserve: float = None,
+                 weights: dict = None, name: str = "exchange"):
+        """
+        :param requests_per_minute: Sustained weight per minute (exchanges.yaml rate_limit).
+        :param burst: Bucket capacity; defaults to one second of refill (at least 1).
+        :param reserve: Tokens only CANCEL and ORDER may use; defaults to 10% of capacity.
+        :param weights: Method name -> weight overrides.
+        :param name: Exchange name, used for counters.
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst or max(1.0, self.rate)
+        self.reserve = self.capacity * 0.1 if reserve is None else reserve
+        self.weights = {**DEFAULT_ENDPOINT_WEIGHTS, **(weights or {})}
+        self.name = name
+        self.counters = get_counters("rate_limiter")
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self):
+        """Tokens currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def weight_of(self, method: str):
+        """Return the configured weight of a ccxt method (1 if unknown)."""
+        return self.weights.get(method, 1)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _floor(self, priority):
+        return 0.0 if priority <= ORDER else self.reserve
+
+    def _take_now(self, weight, priority):
+        """Take tokens immediately if nobody is queued and the lane may spend them."""
+        self._refill()
+        if not self._waiters and self._tokens - weight >= self._floor(priority):
+            self._tokens -= weight
+            return True
+        return False
+
+    def _poll(self, waiter):
+        """
+        Try to serve a queued waiter.
+
+        :return: 0 if it was served, seconds until it could be served if it is at the head,
+                 or None if it must wait for the waiters ahead of it.
+        """
+        self._refill()
+        if self._waiters[0] is not waiter:
+            return None
+        deficit = waiter.weight + self._floor(waiter.priority) - self._tokens
+        if deficit > 0:
+            return deficit / self.rate
+        self._tokens -= waiter.weight
+        heapq.heappop(self._waiters)
+        if self._waiters:
+            self._waiters[0].wake()
+        return 0
+
+    def _enqueue(self, weight, priority, wake):
+        waiter = _Waiter(priority, next(self._sequence), weight, wake)
+        heapq.heappush(self._waiters, waiter)
+        if self._waiters[0] is waiter and len(self._waiters) > 1:
+            # The previous head may be sleeping on its own deficit; it now waits behind us
+            self._waiters[1].wake()
+        self.counters.increment(f"{self.name}.{LANE_NAMES.get(priority, priority)}.queued")
+        return waiter
+
+    def _abandon(self, waiter):
+        was_head = self._waiters and self._waiters[0] is waiter
+        self._waiters.remove(waiter)
+        heapq.heapify(self._waiters)
+        if was_head and self._waiters:
+            self._waiters[0].wake()
+
+    def _clamp(self, weight):
+        # A weight above what every lane can spend would never be served
+        return min(weight, self.capacity - self.reserve)
+
+    def acquire(self, weight: float = 1, priority: int = MARKET_DATA, timeout: float = None):
+        """
+        Block the calling thread until the request may be sent.
+
+        :param weight: Request weight.
+        :param priority: Lane (CANCEL, ORDER, MARKET_DATA, ACCOUNT, BACKFILL).
+        :param timeout: Give up after this many seconds.
+        :return: True if acquired, False on timeout.
+        """
+        weight = self._clamp(weight)
+        event = threading.Event()
+        with self._lock:
+            if self._take_now(weight, priority):
+                return True
+            waiter = self._enqueue(weight, priority, event.set)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            event.clear()  # before polling, so a wake-up between poll and wait is not lost
+            with self._lock:
+                wait = self._poll(waiter)
+                if wait == 0:
+                    return True
+                if deadline is not None and time.monotonic() >= deadline:
+                    self._abandon(waiter)
+                    return False
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                wait = remaining if wait is None else min(wait, remaining)
+            event.wait(wait)
+
+    async def acquire_async(self, weight: float = 1, priority: int = MARKET_DATA, timeout: float = None):
+        """
+        Wait without blocking the event loop until the request may be sent.
+
+        :param weight: Request weight.
+        :param priority: Lane (CANCEL, ORDER, MARKET_DATA, ACCOUNT, BACKFILL).
+        :param timeout: Give up after this many seconds.
+        :return: True if acquired, False on timeout.
+        """
+        weight = self._clamp(weight)
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        with self._lock:
+            if self._take_now(weight, priority):
+                return True
+            waiter = self._enqueue(weight, priority, lambda: loop.call_soon_threadsafe(event.set))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                event.clear()
+                with self._lock:
+                    wait = self._poll(waiter)
+                    if wait == 0:
+                        return True
+                    if deadline is not None and time.monotonic() >= deadline:
+                        self._abandon(waiter)
+                        return False
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    wait = remaining if wait is None else min(wait, remaining)
+                try:
+                    await asyncio.wait_for(event.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._abandon(waiter)
+            raise
+
+    def acquire_for(self, method: str, priority: int = None, timeout: float = None):
+        """Blocking acquire using a ccxt method's configured weight and default lane."""
+        return self.acquire(self.weight_of(method), METHOD_LANES.get(method, MARKET_DATA) if priority is None
+                            else priority, timeout)
+
+    async def acquire_for_async(self, method: str, priority: int = None, timeout: float = None):
+        """Async acquire using a ccxt method's configured weight and default lane."""
+        return await self.acquire_async(self.weight_of(method), METHOD_LANES.get(method, MARKET_DATA)
+                                        if priority is None else priority, timeout)
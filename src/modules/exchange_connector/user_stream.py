@@ -0,0 +1,501 @@
+# src/modules/exchange_connector/user_stream.py
+
+import asyncio
+import json
+import random
+import threading
+import time
+import websockets
+import yaml
+from src.modules.utils.logger import get_logger
+from src.modules.utils.metrics import get_counters, get_latencies
+from src.modules.datafeed.decoder import json_loads
+from src.modules.exchange_connector.exchange_registry import get_exchange_registry
+from src.modules.exchange_connector.rate_limiter import ACCOUNT
+
+# Authenticated WebSocket endpoints for account updates
+USER_STREAM_URLS = {
+    "binance": "wss://stream.binance.com:9443/ws",
+    "coinbase": "wss://advanced-trade-ws-user.coinbase.com",
+    "kraken": "wss://ws-auth.kraken.com/v2",
+}
+
+BINANCE_STATUS = {"NEW": "open", "PARTIALLY_FILLED": "open", "PENDING_NEW": "open", "FILLED": "closed",
+                  "CANCELED": "canceled", "PENDING_CANCEL": "open", "REJECTED": "rejected",
+                  "EXPIRED": "expired", "EXPIRED_IN_MATCH": "expired"}
+COINBASE_STATUS = {"PENDING": "open", "OPEN": "open", "FILLED": "closed", "CANCELLED": "canceled",
+                   "CANCEL_QUEUED": "open", "EXPIRED": "expired", "FAILED": "rejected"}
+KRAKEN_STATUS = {"pending_new": "open", "new": "open", "partially_filled": "open", "filled": "closed",
+                 "canceled": "canceled", "expired": "expired"}
+
+
+def _float(value):
+    return None if value in (None, "") else float(value)
+
+
+class UserState:
+    """
+    Local copy of the account's orders and balances, kept current by the user-data streams.
+
+    Orders are ccxt-shaped dicts keyed by (exchange, order id) and also indexed by client order
+    id; balances are {asset: {'free', 'used', 'total'}} per exchange. Each order update that
+    raises the cumulative filled amount produces a fill event; an order's first update and
+    snapshot updates only set the starting point, since their fills predate the stream. Listeners are called on the
+    stream's event loop thread, and wait_for_update() lets polling loops block on changes.
+    """
+
+    def __init__(self):
+        self.logger = get_logger("UserState")
+        self.counters = get_counters("user_stream")
+        self._orders = {}
+        self._client_ids = {}
+        self._balances = {}
+        self._live = set()
+        self._listeners = []
+        self._changed = threading.Condition()
+        self.version = 0
+
+    def add_listener(self, callback):
+        """
+        Register a callback invoked as callback(event, exchange_name, payload) with event
+        'order' (order dict), 'fill' (fill dict) or 'balance' ({asset: balance}).
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Unregister a callback added with add_listener(); unknown callbacks are ignored."""
+        # Rebound rather than mutated, so a notification in progress on the stream thread is unaffected
+        self._listeners = [listener for listener in self._listeners if listener != callback]
+
+    def _notify(self, event, exchange_name, payload):
+        for callback in self._listeners:
+            try:
+                callback(event, exchange_name, payload)
+            except Exception as e:
+                self.logger.error(f"User state listener failed on {event} from {exchange_name}: {e}")
+        with self._changed:
+            self.version += 1
+            self._changed.notify_all()
+
+    def set_live(self, exchange_name: str, live: bool):
+        """Mark a venue's stream as connected (its state is authoritative) or not."""
+        if live:
+            self._live.add(exchange_name)
+        else:
+            self._live.discard(exchange_name)
+
+    def is_live(self, exchange_name: str):
+        """Return True while the venue's user-data stream is connected and seeded."""
+        return exchange_name in self._live
+
+    def apply_order(self, exchange_name: str, update: dict, last_price: float = None, snapshot: bool = False):
+        """
+        Merge an order update (partial updates keep earlier fields) and emit a fill if the
+        cumulative filled amount grew since an earlier update of the same order.
+
+        :param exchange_name: Exchange name.
+        :param update: Order fields in ccxt naming; must include 'id'.
+        :param last_price: Price of the latest execution, if the venue reports it.
+        :param snapshot: True for a venue's state snapshot, whose fills are history rather than executions.
+        :return: The merged order.
+        """
+        update = {**update, "id": str(update["id"])}
+        key = (exchange_name, update["id"])
+        first_seen = key not in self._orders
+        previous = self._orders.get(key) or {"filled": 0.0, "average": None}
+        order = {**previous, **{field: value for field, value in update.items() if value is not None}}
+        if order.get("amount") is not None and order.get("filled") is not None:
+            order["remaining"] = max(0.0, order["amount"] - order["filled"])
+        self._orders[key] = order
+        if order.get("clientOrderId"):
+            self._client_ids[(exchange_name, order["clientOrderId"])] = order["id"]
+
+        filled_before, filled_now = previous.get("filled") or 0.0, order.get("filled") or 0.0
+        self._notify("order", exchange_name, order)
+        if filled_now > filled_before and not (first_seen or snapshot):
+            amount = filled_now - filled_before
+            price = last_price
+            if price is None and order.get("average") is not None:
+                # Recover the execution price from the change in the average fill price
+                price = (order["average"] * filled_now - (previous.get("average") or 0.0) * filled_before) / amount
+            fill = {"order_id": order["id"], "clientOrderId": order.get("clientOrderId"), "symbol": order.get("symbol"),
+                    "side": order.get("side"), "amount": amount, "price": price, "timestamp": order.get("timestamp")}
+            self.counters.increment(f"{exchange_name}.fills")
+            self._notify("fill", exchange_name, fill)
+        return order
+
+    def order(self, exchange_name: str, order_id: str = None, client_order_id: str = None):
+        """Return a copy of a tracked order by exchange id or client order id, or None."""
+        if order_id is None:
+            order_id = self._client_ids.get((exchange_name, client_order_id))
+        order = self._orders.get((exchange_name, str(order_id)))
+        return dict(order) if order is not None else None
+
+    def open_orders(self, exchange_name: str, symbol: str = None):
+        """Return the tracked open orders on a venue (optionally for one symbol)."""
+        return [dict(order) for (name, _), order in list(self._orders.items())
+                if name == exchange_name and order.get("status") == "open"
+                and (symbol is None or order.get("symbol") == symbol)]
+
+    def set_balances(self, exchange_name: str, balances: dict):
+        """
+        Overwrite the listed assets' balances (other assets are kept).
+
+        :param balances: {asset: {'free', 'used', 'total'}}; missing keys keep their values.
+        """
+        venue = self._balances.setdefault(exchange_name, {})
+        for asset, balance in balances.items():
+            venue[asset] = {**venue.get(asset, {}), **balance}
+        self._notify("balance", exchange_name, balances)
+
+    def apply_balance_delta(self, exchange_name: str, asset: str, delta: float):
+        """Add a deposit, withdrawal or transfer amount to an asset's free and total balance."""
+        current = self._balances.setdefault(exchange_name, {}).get(asset, {})
+        self.set_balances(exchange_name, {asset: {"free": (current.get("free") or 0.0) + delta,
+                                                  "total": (current.get("total") or 0.0) + delta}})
+
+    def balances(self, exchange_name: str):
+        """Return a copy of a venue's balances."""
+        return {asset: dict(balance) for asset, balance in self._balances.get(exchange_name, {}).items()}
+
+    def totals(self, exchange_name: str):
+        """Return {asset: total} for a venue, like ccxt's fetch_balance()['total']."""
+        return {asset: balance.get("total") for asset, balance in self._balances.get(exchange_name, {}).items()}
+
+    def wait_for_update(self, timeout: float = None, since: int = None):
+        """
+        Block until the state changes (or the timeout passes).
+
+        :param timeout: Seconds to wait at most.
+        :param since: Version already seen; defaults to the current version.
+        :return: The new version.
+        """
+        with self._changed:
+            since = self.version if since is None else since
+            self._changed.wait_for(lambda: self.version != since, timeout)
+            return self.version
+
+
+class UserDataStream:
+    """
+    One authenticated user-data WebSocket for one venue, feeding a UserState.
+
+    Subclasses obtain the venue's credentials for the socket (listen key, token or JWT), send
+    its subscription and translate its messages. On every (re)connect the balances are seeded
+    once over REST; after that only pushed updates change the state. Reconnects use the same
+    jittered exponential backoff as the market-data WebSocketClient.
+    """
+
+    exchange_name = None
+    keepalive_interval = None  # seconds between keepalive() calls, if the venue needs them
+
+    def __init__(self, client, state: UserState, ws_url: str = None, registry=None,
+                 reconnect_base_delay: float = 0.5, reconnect_max_delay: float = 30.0):
+        """
+        :param client: Authenticated ccxt client for the venue.
+        :param state: UserState receiving the updates.
+        :param ws_url: Override of the venue's user-stream URL.
+        :param registry: ExchangeRegistry whose rate limiter paces the REST calls.
+        :param reconnect_base_delay: Initial reconnect backoff in seconds.
+        :param reconnect_max_delay: Upper bound for the reconnect backoff in seconds.
+        """
+        self.logger = get_logger(type(self).__name__)
+        self.counters = get_counters("user_stream")
+        self.latencies = get_latencies("user_stream")
+        self.client = client
+        self.state = state
+        self.ws_url = ws_url or USER_STREAM_URLS[self.exchange_name]
+        self.registry = registry or get_exchange_registry()
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self._stopped = False
+        self._balance_refresh = None
+
+    async def _rest(self, method, *args):
+        """Run a ccxt REST call in a worker thread through the venue's rate limiter."""
+        return await asyncio.to_thread(self.registry.throttled(self.exchange_name, self.client, method, ACCOUNT), *args)
+
+    async def prepare(self):
+        """Obtain stream credentials; return the URL to connect to."""
+        return self.ws_url
+
+    async def subscribe(self, connection):
+        """Send the venue's subscription messages."""
+
+    async def keepalive(self):
+        """Extend the stream credentials (called every keepalive_interval seconds)."""
+
+    def handle(self, message):
+        """Apply one decoded message to the state."""
+        raise NotImplementedError
+
+    async def seed_balances(self):
+        """Replace local balances with a REST snapshot."""
+        balance = await self._rest("fetch_balance")
+        self.state.set_balances(self.exchange_name, {
+            asset: {"free": balance.get("free", {}).get(asset), "used": balance.get("used", {}).get(asset),
+                    "total": total}
+            for asset, total in (balance.get("total") or {}).items()
+        })
+
+    def refresh_balances_soon(self):
+        """Schedule one REST balance refresh (for venues whose stream carries no balances)."""
+        if self._balance_refresh is None or self._balance_refresh.done():
+            self._balance_refresh = asyncio.ensure_future(self.seed_balances())
+
+    def _event_latency(self, event_time_ms):
+        if event_time_ms:
+            self.latencies.record(f"{self.exchange_name}.event_delay", max(0.0, time.time() - event_time_ms / 1000))
+
+    async def _keepalive_loop(self):
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await self.keepalive()
+            except Exception as e:
+                self.logger.warning(f"User stream keepalive failed on {self.exchange_name}: {e}")
+
+    async def _session(self):
+        url = await self.prepare()
+        async with websockets.connect(url) as connection:
+            await self.subscribe(connection)
+            await self.seed_balances()
+            self.state.set_live(self.exchange_name, True)
+            self.counters.increment(f"{self.exchange_name}.connects")
+            self.logger.info(f"User-data stream connected on {self.exchange_name}")
+            keepalive = asyncio.ensure_future(self._keepalive_loop()) if self.keepalive_interval else None
+            try:
+                async for raw in connection:
+                    try:
+                        self.handle(json_loads(raw))
+                    except Exception as e:
+                        self.counters.increment(f"{self.exchange_name}.message_errors")
+                        self.logger.error(f"Failed to apply user-data message on {self.exchange_name}: {e}")
+            finally:
+                if keepalive is not None:
+                    keepalive.cancel()
+
+    async def run(self):
+        """Run the stream until stop(), reconnecting with jittered backoff."""
+        attempt = 0
+        while not self._stopped:
+            try:
+                await self._session()
+                attempt = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters.increment(f"{self.exchange_name}.disconnects")
+                self.logger.error(f"User-data stream error on {self.exchange_name}: {e}")
+            finally:
+                # Until resynchronized, callers fall back to REST
+                self.state.set_live(self.exchange_name, False)
+            if self._stopped:
+                break
+            delay = min(self.reconnect_max_delay, self.reconnect_base_delay * (2 ** attempt))
+            delay = delay / 2 + random.uniform(0, delay / 2)
+            attempt += 1
+            self.logger.warning(f"Reconnecting user-data stream on {self.exchange_name} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def stop(self):
+        """Stop reconnecting after the current connection ends."""
+        self._stopped = True
+
+
+class BinanceUserStream(UserDataStream):
+    """Binance spot user-data stream (listenKey): executionReport, outboundAccountPosition, balanceUpdate."""
+
+    exchange_name = "binance"
+    keepalive_interval = 30 * 60
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.listen_key = None
+
+    async def prepare(self):
+        response = await self._rest("publicPostUserDataStream")
+        self.listen_key = response["listenKey"]
+        return f"{self.ws_url}/{self.listen_key}"
+
+    async def keepalive(self):
+        await self._rest("publicPutUserDataStream", {"listenKey": self.listen_key})
+
+    def handle(self, message):
+        event = message.get("e")
+        self._event_latency(message.get("E"))
+        if event == "executionReport":
+            filled, quote = float(message["z"]), float(message["Z"])
+            amount = float(message["q"])
+            status = BINANCE_STATUS.get(message["X"], message["X"].lower())
+            # Cancels carry the cancel request's id in 'c' and the order's own client id in 'C'
+            client_id = message.get("C") if message["X"] == "CANCELED" and message.get("C") else message.get("c")
+            self.state.apply_order(self.exchange_name, {
+                "id": str(message["i"]), "clientOrderId": client_id,
+                "symbol": self.client.safe_symbol(message["s"]), "side": message["S"].lower(),
+                "type": message["o"].lower(), "status": status, "price": _float(message.get("p")) or None,
+                "amount": amount, "filled": filled, "cost": quote, "average": quote / filled if filled else None,
+                "timestamp": message.get("T") or message.get("E"),
+            }, last_price=_float(message.get("L")) if float(message.get("l") or 0) else None)
+        elif event == "outboundAccountPosition":
+            self.state.set_balances(self.exchange_name, {
+                entry["a"]: {"free": float(entry["f"]), "used": float(entry["l"]),
+                             "total": float(entry["f"]) + float(entry["l"])}
+                for entry in message["B"]
+            })
+        elif event == "balanceUpdate":
+            self.state.apply_balance_delta(self.exchange_name, message["a"], float(message["d"]))
+
+
+class CoinbaseUserStream(UserDataStream):
+    """Coinbase Advanced Trade 'user' channel (JWT); balances are refreshed over REST after fills."""
+
+    exchange_name = "coinbase"
+
+    async def subscribe(self, connection):
+        token = self.client.create_auth_token(self.client.seconds())
+        await connection.send(json.dumps({"type": "subscribe", "channel": "user", "jwt": token}))
+
+    def handle(self, message):
+        if message.get("channel") != "user":
+            return
+        filled_any = False
+        for event in message.get("events", []):
+            for order in event.get("orders", []):
+                filled = _float(order.get("cumulative_quantity")) or 0.0
+                remaining = _float(order.get("leaves_quantity")) or 0.0
+                before = self.state.order(self.exchange_name, order["order_id"])
+                if event.get("type") != "snapshot":
+                    filled_any |= filled > ((before or {}).get("filled") or 0.0)
+                self.state.apply_order(self.exchange_name, {
+                    "id": order["order_id"], "clientOrderId": order.get("client_order_id"),
+                    "symbol": self.client.safe_symbol(order.get("product_id")),
+                    "side": (order.get("order_side") or "").lower() or None,
+                    "type": (order.get("order_type") or "").lower() or None,
+                    "status": COINBASE_STATUS.get(order.get("status"), (order.get("status") or "").lower()),
+                    "price": _float(order.get("limit_price")), "amount": filled + remaining, "filled": filled,
+                    "average": _float(order.get("avg_price")) or None,
+                }, snapshot=event.get("type") == "snapshot")
+        if filled_any:
+            self.refresh_balances_soon()
+
+
+class KrakenUserStream(UserDataStream):
+    """Kraken WebSocket v2 'executions' and 'balances' channels (REST-issued token)."""
+
+    exchange_name = "kraken"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.token = None
+
+    async def prepare(self):
+        response = await self._rest("privatePostGetWebSocketsToken")
+        self.token = response["result"]["token"]
+        return self.ws_url
+
+    async def subscribe(self, connection):
+        await connection.send(json.dumps({"method": "subscribe", "params": {
+            "channel": "executions", "token": self.token, "snap_orders": True, "snap_trades": False}}))
+        await connection.send(json.dumps({"method": "subscribe", "params": {
+            "channel": "balances", "token": self.token, "snapshot": False}}))
+
+    def handle(self, message):
+        channel = message.get("channel")
+        if channel == "executions":
+            for report in message.get("data", []):
+                status = report.get("order_status")
+                self.state.apply_order(self.exchange_name, {
+                    "id": report["order_id"], "clientOrderId": report.get("cl_ord_id"),
+                    "symbol": report.get("symbol"), "side": report.get("side"), "type": report.get("order_type"),
+                    "status": KRAKEN_STATUS.get(status, status), "price": _float(report.get("limit_price")),
+                    "amount": _float(report.get("order_qty")), "filled": _float(report.get("cum_qty")),
+                    "average": _float(report.get("avg_price")) or None, "timestamp": report.get("timestamp"),
+                }, last_price=_float(report.get("last_price")) if report.get("exec_type") == "trade" else None,
+                   snapshot=message.get("type") == "snapshot")
+        elif channel == "balances":
+            self.state.set_balances(self.exchange_name, {
+                entry["asset"]: {"total": float(entry["balance"])} for entry in message.get("data", [])
+            })
+
+
+USER_STREAM_CLASSES = {"binance": BinanceUserStream, "coinbase": CoinbaseUserStream, "kraken": KrakenUserStream}
+
+
+class UserStreamManager:
+    """Runs a user-data stream for every configured venue that supports one."""
+
+    def __init__(self, secrets_path: str = "src/config/secrets.yaml", state: UserState = None, registry=None,
+                 ws_urls: dict = None):
+        """
+        :param secrets_path: Path to the API credentials file.
+        :param state: UserState to feed; defaults to the process-wide one.
+        :param registry: ExchangeRegistry providing the authenticated clients.
+        :param ws_urls: Optional mapping of exchange name to user-stream URL overrides.
+        """
+        self.logger = get_logger("UserStreamManager")
+        self.secrets = self._load_yaml(secrets_path)
+        self.state = state or get_user_state()
+        self.registry = registry or get_exchange_registry()
+        self.ws_urls = ws_urls or {}
+        self.streams = []
+        self._tasks = []
+
+    def _load_yaml(self, path):
+        """Load YAML configuration file."""
+        try:
+            with open(path, "r") as file:
+                return yaml.safe_load(file)
+        except Exception as e:
+            self.logger.error(f"Failed to load YAML file {path}: {e}")
+            return {}
+
+    def build_streams(self):
+        """Create one stream per configured venue with a user-stream implementation."""
+        streams = []
+        for exchange_name, client in self.registry.clients_for(self.secrets).items():
+            stream_class = USER_STREAM_CLASSES.get(exchange_name)
+            if stream_class is None:
+                self.logger.warning(f"No user-data stream available for {exchange_name}; it will be polled")
+                continue
+            streams.append(stream_class(client, self.state, ws_url=self.ws_urls.get(exchange_name),
+                                        registry=self.registry))
+        return streams
+
+    async def run(self):
+        """Run every stream side by side until stopped."""
+        self.streams = self.build_streams()
+        self._tasks = [asyncio.ensure_future(stream.run()) for stream in self.streams]
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def stop(self):
+        """Stop reconnecting and cancel the running streams."""
+        for stream in self.streams:
+            stream.stop()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def run_in_background(self):
+        """Run the streams on a daemon thread with its own event loop (for synchronous callers)."""
+        thread = threading.Thread(target=lambda: asyncio.run(self.run()), name="user-streams", daemon=True)
+        thread.start()
+        return thread
+
+
+_user_state = None
+_user_state_lock = threading.Lock()
+
+
+def get_user_state():
+    """
+    Return the process-wide UserState shared by the user-data streams and their consumers.
+
+    :return: Shared UserState instance.
+    """
+    global _user_state
+    with _user_state_lock:
+        if _user_state is None:
+            _user_state = UserState()
+        return _user_state
@@ -0,0 +1,50 @@
+# src/modules/exchange_connector/venue_router.py
+
+from src.modules.utils.metrics import get_latencies
+
+
+class VenueRouter:
+    """
+    Orders candidate venues for an action by their recent latency on the endpoint it uses.
+
+    Latencies come from the shared 'exchange' histograms that every connector call records,
+    so the ranking follows a venue as it degrades or recovers. Venues with fewer than
+    'min_samples' calls are ranked after the measured ones, in the order they were given.
+    """
+
+    def __init__(self, latencies=None, min_samples: int = 5, statistic: str = "recent"):
+        """
+        :param latencies: Latencies to read; defaults to the process-wide 'exchange' histograms.
+        :param min_samples: Calls a venue needs before its latency is trusted.
+        :param statistic: Summary to compare: 'recent' (weighted recent average), 'p50' or 'p99'.
+        """
+        self.latencies = latencies or get_latencies("exchange")
+        self.min_samples = min_samples
+        self.statistic = statistic
+
+    def latency(self, exchange_name: str, endpoint: str):
+        """Return the venue's latency statistic for an endpoint, or None if it is not measured yet."""
+        histogram = self.latencies.histogram(f"{exchange_name}.{endpoint}")
+        if histogram.count < self.min_samples:
+            return None
+        if self.statistic == "recent":
+            return histogram.recent
+        return histogram.percentile(float(self.statistic.lstrip("p")))
+
+    def rank(self, venues, endpoint: str = "create_order"):
+        """
+        Sort venues fastest first.
+
+        :param venues: Candidate exchange names.
+        :param endpoint: ccxt method the action will call.
+        :return: List of exchange names.
+        """
+        venues = list(venues)
+        measured = {venue: self.latency(venue, endpoint) for venue in venues}
+        return sorted(venues, key=lambda venue: (measured[venue] is None,
+                                                 measured[venue] if measured[venue] is not None else 0.0))
+
+    def choose(self, venues, endpoint: str = "create_order"):
+        """Return the fastest venue, or None if there are no candidates."""
+        ranked = self.rank(venues, endpoint)
+        return ranked[0] if ranked else None
@@ -0,0 +1,294 @@
+# src/modules/order_management/order_journal.py
+
+import math
+import os
+import struct
+import threading
+import time
+import zlib
+from src.modules.utils.logger import get_logger
+from src.modules.utils.metrics import get_counters
+
+# Record header: CRC32 of the body, body length, record type, time (ns since epoch)
+RECORD_HEADER = struct.Struct("<IIBq")
+
+# Record types and the fixed numeric fields that precede their strings
+INTENT, ACK, FILL, STATUS, AMEND = 1, 2, 3, 4, 5
+NUMBERS = {INTENT: struct.Struct("<dd"), ACK: struct.Struct(""), FILL: struct.Struct("<ddd"), STATUS: struct.Struct(""),
+           AMEND: struct.Struct("<dd")}
+SEPARATOR = b"\x1f"
+COMMIT_RETRY_DELAY = 0.5  # seconds to wait after a failed commit before retrying
+
+
+class OrderJournal:
+    """
+    Crash-safe, append-only binary log of order intents, acks, fills, amends and terminal states.
+
+    Appends only pack a record into an in-memory buffer. A background thread group-commits the
+    buffer with one write and one fsync every 'commit_interval' seconds, so journaling costs
+    microseconds per order; sync() blocks until everything appended so far is durable. Each
+    record carries a CRC, and a torn or corrupt tail left by a crash is cut off when the journal
+    is reopened. Attached to an OrderStore, the journal records every change to it, and replay()
+    rebuilds the store after a restart.
+    """
+
+    def __init__(self, path: str = "data/orders/journal.bin", commit_interval: float = 0.005):
+        """
+        :param path: Journal file.
+        :param commit_interval: Seconds between group commits.
+        """
+        self.logger = get_logger("OrderJournal")
+        self.counters = get_counters("order_journal")
+        self.path = path
+        self.commit_interval = commit_interval
+        self._buffer = bytearray()
+        self._appended = 0  # sequence number of the last appended record
+        self._durable = 0  # sequence number of the last fsynced record
+        self._file = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._committer = None
+        self._writing = False
+
+    @staticmethod
+    def _pack(record_type, numbers, strings):
+        body = NUMBERS[record_type].pack(*numbers) + SEPARATOR.join(value.encode() for value in strings)
+        return RECORD_HEADER.pack(zlib.crc32(body), len(body), record_type, time.time_ns()) + body
+
+    @staticmethod
+    def _intent_fields(order):
+        return (INTENT, (order.amount, math.nan if order.price is None else order.price),
+                (order.client_order_id, order.exchange, order.symbol, order.side or "", order.type or ""))
+
+    def _append(self, record_type, numbers, strings):
+        record = self._pack(record_type, numbers, strings)
+        with self._condition:
+            if self._closed:
+                raise ValueError(f"Order journal {self.path} is closed")
+            if self._file is None:
+                self._open()
+            self._buffer += record
+            self._appended += 1
+            return self._appended
+
+    def intent(self, order):
+        """Record an order about to be sent (or adopted); return its sequence number."""
+        return self._append(*self._intent_fields(order))
+
+    def ack(self, client_order_id: str, order_id: str):
+        """Record the venue's order id for an order."""
+        return self._append(ACK, (), (client_order_id, str(order_id)))
+
+    def fill(self, client_order_id: str, amount: float, price: float, fee: float = 0.0, trade_id=None):
+        """Record one execution."""
+        return self._append(FILL, (amount, price, fee or 0.0),
+                            (client_order_id, "" if trade_id is None else str(trade_id)))
+
+    def status(self, client_order_id: str, status: str):
+        """Record a lifecycle state change."""
+        return self._append(STATUS, (), (client_order_id, status))
+
+    def amend(self, client_order_id: str, amount: float, price: float):
+        """Record an in-place amend of an order's total amount and price."""
+        return self._append(AMEND, (amount, price), (client_order_id,))
+
+    def _open(self):
+        """Open the file for appending (after cutting off a torn tail) and start the committer."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        valid = sum(RECORD_HEADER.size + length for length in self._lengths()) if os.path.exists(self.path) else 0
+        self._file = open(self.path, "ab", buffering=0)
+        if self._file.tell() > valid:
+            self.logger.warning(f"Truncating {self._file.tell() - valid} bytes of torn records from {self.path}")
+            self._file.truncate(valid)
+        self._committer = threading.Thread(target=self._commit_loop, name="order-journal", daemon=True)
+        self._committer.start()
+
+    def _lengths(self):
+        """Body lengths of the valid records at the start of the file."""
+        return [len(body) for _, _, body in self._records()]
+
+    def _commit_loop(self):
+        while True:
+            with self._condition:
+                while not self._buffer and not self._closed:
+                    self._condition.wait()
+                if not self._buffer and self._closed:
+                    return
+            time.sleep(self.commit_interval)  # let concurrent appends join this commit
+            if not self._commit():
+                time.sleep(COMMIT_RETRY_DELAY)
+
+    def _commit(self):
+        """
+        Write and fsync the buffered records. They leave the buffer, and count as durable, only once
+        both succeed; a failed batch is cut back off the file and retried with the next commit.
+
+        :return: False if the commit failed.
+        """
+        with self._condition:
+            data, sequence = bytes(self._buffer), self._appended
+            self._writing = True  # compact() waits for the write to finish before swapping files
+        committed = True
+        try:
+            if data:
+                position = self._file.tell()
+                try:
+                    self._file.write(data)
+                    os.fsync(self._file.fileno())
+                except OSError as e:
+                    self.counters.increment("commit_errors")
+                    self.logger.error(f"Failed to commit order journal {self.path}: {e}")
+                    try:
+                        self._file.truncate(position)  # no partial batch before the retry
+                    except OSError as truncate_error:
+                        self.logger.error(f"Failed to cut a partial commit off {self.path}: {truncate_error}")
+                    committed = False
+                else:
+                    self.counters.increment("commits")
+                    self.counters.increment("records", sequence - self._durable)
+        finally:
+            with self._condition:
+                if committed:
+                    del self._buffer[:len(data)]  # records appended during the write stay buffered
+                    self._durable = max(self._durable, sequence)
+                self._writing = False
+                self._condition.notify_all()
+        return committed
+
+    def sync(self, sequence: int = None, timeout: float = None):
+        """
+        Block until a record (by default, everything appended so far) is on disk.
+
+        :param sequence: Sequence number returned by an append.
+        :param timeout: Seconds to wait at most.
+        :return: True if the record is durable.
+        """
+        with self._condition:
+            sequence = self._appended if sequence is None else sequence
+            self._condition.notify_all()
+            return self._condition.wait_for(lambda: self._durable >= sequence or self._file is None, timeout) \
+                and self._durable >= sequence
+
+    def close(self):
+        """Commit everything appended and close the file; appending afterwards raises ValueError."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            committer, self._committer = self._committer, None
+        if committer is not None:
+            committer.join()
+            self._commit()
+            self._file.close()
+            self._file = None
+
+    def _records(self):
+        """Yield (record_type, timestamp_ns, body) up to the first torn or corrupt record."""
+        header_size = RECORD_HEADER.size
+        with open(self.path, "rb") as file:
+            data = file.read()
+        offset = 0
+        while offset + header_size <= len(data):
+            crc, length, record_type, timestamp_ns = RECORD_HEADER.unpack_from(data, offset)
+            body = data[offset + header_size:offset + header_size + length]
+            if len(body) < length or zlib.crc32(body) != crc or record_type not in NUMBERS:
+                self.logger.warning(f"{self.path} has a torn or corrupt record at byte {offset}; stopping there")
+                return
+            yield record_type, timestamp_ns, body
+            offset += header_size + length
+
+    def records(self):
+        """
+        Iterate over the journal.
+
+        :return: Generator of (record_type, timestamp_ns, numbers tuple, strings list).
+        """
+        if not os.path.exists(self.path):
+            return
+        for record_type, timestamp_ns, body in self._records():
+            numbers = NUMBERS[record_type]
+            strings = [value.decode() for value in body[numbers.size:].split(SEPARATOR)]
+            yield record_type, timestamp_ns, numbers.unpack_from(body), strings
+
+    def replay(self, store):
+        """
+        Rebuild an OrderStore from the journal, without journaling the replayed changes.
+
+        :param store: OrderStore to load (normally empty).
+        :return: Number of records replayed.
+        """
+        started = time.monotonic()
+        count = 0
+        journal, store.journal = store.journal, None
+        try:
+            for record_type, timestamp_ns, numbers, strings in self.records():
+                count += 1
+                if record_type == INTENT:
+                    amount, price = numbers
+                    client_order_id, exchange, symbol, side, order_type = strings
+                    order = store.add(exchange, symbol, side or None, order_type or None, amount,
+                                      None if math.isnan(price) else price, client_order_id)
+                    order.created_at = order.updated_at = timestamp_ns / 1e9
+                    continue
+                order = store.get(strings[0])
+                if order is None:
+                    continue
+                if record_type == ACK:
+                    store.ack(order.client_order_id, strings[1])
+                elif record_type == FILL:
+                    amount, price, fee = numbers
+                    store.apply_fill(order, amount, price, fee, strings[1] or None, notify=False)
+                elif record_type == STATUS:
+                    store.set_status(order, strings[1])
+                elif record_type == AMEND:
+                    store.amend(order, *numbers)
+        finally:
+            store.journal = journal
+        elapsed = time.monotonic() - started
+        self.logger.info(f"Replayed {count} journal records from {self.path} in {elapsed:.3f}s "
+                         f"({len(store.open_orders())} open orders)")
+        return count
+
+    def compact(self, store):
+        """
+        Rewrite the journal with only the store's open orders, so the next replay stays short.
+
+        The store's changes and the journal's commits are held off for the whole swap, so appends
+        arriving meanwhile (e.g. from stream listener threads) simply wait: the new journal is
+        written to a temporary file, fsynced and renamed over the old one, and appending resumes
+        into it. Records still buffered describe changes the rewritten journal already contains.
+
+        :param store: OrderStore holding the current state (e.g. right after replay and reconcile).
+        :return: Number of records written.
+        """
+        temporary = f"{self.path}.tmp"
+        records = bytearray()
+        count = 0
+        with store._lock, self._condition:
+            self._condition.wait_for(lambda: not self._writing)
+            for order in store.open_orders():
+                records += self._pack(*self._intent_fields(order))
+                count += 1
+                if order.order_id is not None:
+                    records += self._pack(ACK, (), (order.client_order_id, order.order_id))
+                    count += 1
+                if order.filled:
+                    records += self._pack(FILL, (order.filled, order.average, order.fee), (order.client_order_id, ""))
+                    count += 1
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(temporary, "wb") as file:
+                file.write(records)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, self.path)
+            if self._file is not None:
+                self._file.close()
+                self._file = open(self.path, "ab", buffering=0)
+            self._buffer.clear()
+            self._durable = self._appended
+            self._condition.notify_all()
+        self.logger.info(f"Compacted {self.path} to {count} records")
+        return count
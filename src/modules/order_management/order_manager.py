@@ -1,24 +1,111 @@
 # src/modules/order_management/order_manager.py
 
-import ccxt
+import asyncio
+import itertools
+import random
 import yaml
+import threading
 import time
-from tenacity import retry, stop_after_attempt, wait_fixed
-from src.utils.logger import get_logger
+from concurrent.futures import ThreadPoolExecutor
+import ccxt
+from src.modules.utils.logger import get_logger
+from src.modules.utils.metrics import get_counters
 from src.modules.risk_management.risk_manager import RiskManager
+from src.modules.risk_management.pretrade_gate import PreTradeGate
+from src.modules.exchange_connector.exchange_registry import get_exchange_registry
+from src.modules.exchange_connector.async_connector import AsyncExchangeConnector
+from src.modules.exchange_connector.user_stream import get_user_state
+from src.modules.datafeed.price_cache import get_price_cache
+from src.modules.order_management.order_store import OrderStore
+from src.modules.order_management.order_journal import OrderJournal
+
+# Most orders a venue accepts in one native batch request (ccxt createOrders)
+NATIVE_BATCH_LIMITS = {"binance": 5, "bybit": 10, "kraken": 15, "okx": 20}
+DEFAULT_BATCH_LIMIT = 5
+
+# Venues whose ccxt editOrder amends the order in place, keeping its id; a clientOrderId passed to it
+# names the order to amend rather than a new one
+AMEND_IN_PLACE = frozenset({"kraken", "bybit", "okx"})
+
+
+class OrderHandle:
+    """
+    Returned at once by OrderManager.submit_order(); await it for the venue's response.
+
+    The tracked order shows the live lifecycle state while the submission is in flight.
+    """
+
+    __slots__ = ("exchange", "tracked", "future")
+
+    def __init__(self, exchange, tracked, future):
+        self.exchange = exchange
+        self.tracked = tracked
+        self.future = future
+
+    @property
+    def client_order_id(self):
+        return self.tracked.client_order_id
+
+    @property
+    def status(self):
+        return self.tracked.status
+
+    def done(self):
+        return self.future.done()
+
+    def __await__(self):
+        return self.future.__await__()
+
+    def __repr__(self):
+        return f"OrderHandle({self.exchange} {self.client_order_id} {self.status})"
+
 
 class OrderManager:
-    def __init__(self, config_path="src/config/order_config.yaml", secrets_path="src/config/secrets.yaml"):
+    def __init__(self, config_path="src/config/order_config.yaml", secrets_path="src/config/secrets.yaml",
+                 risk_manager=None, registry=None, user_state=None, order_store=None, async_connector=None,
+                 order_journal=None, pretrade_gate=None, price_cache=None):
         """
         Initializes the Order Management module.
         :param config_path: Path to the order configuration file.
         :param secrets_path: Path to the API keys and credentials file.
+        :param risk_manager: Shared RiskManager; a new one is created if omitted.
+        :param registry: ExchangeRegistry providing shared clients; defaults to the process-wide one.
+        :param user_state: UserState fed by the user-data streams; defaults to the process-wide one.
+        :param order_store: OrderStore tracking this manager's orders; a new one is created if omitted.
+        :param async_connector: AsyncExchangeConnector used by submit_order(); created on first use if omitted.
+        :param order_journal: OrderJournal recording the order store's changes; one is opened at the
+            'journal_path' setting if configured. See recover().
+        :param pretrade_gate: PreTradeGate run on every order; built from the risk manager's settings if omitted.
+        :param price_cache: PriceCache supplying the gate's reference prices; defaults to the process-wide one.
         """
         self.logger = get_logger("OrderManager")
+        self.counters = get_counters("orders")
+        self.secrets_path = secrets_path
         self.config = self._load_yaml(config_path)
         self.secrets = self._load_yaml(secrets_path)
+        self.registry = registry or get_exchange_registry()
         self.exchanges = self._initialize_exchanges()
-        self.risk_manager = RiskManager()
+        self.risk_manager = risk_manager or RiskManager()
+        self.user_state = user_state or get_user_state()
+        self._owns_journal = order_journal is None and bool(self.config.get("journal_path"))
+        if self._owns_journal:
+            order_journal = OrderJournal(self.config["journal_path"], self.config.get("journal_commit_interval", 0.005))
+        self.order_journal = order_journal
+        self.order_store = order_store or OrderStore()
+        if order_journal is not None:
+            self.order_store.journal = order_journal
+        self.pretrade_gate = pretrade_gate or PreTradeGate(self.risk_manager.risk_settings, self.order_store,
+                                                           market_cache=self.registry.market_cache)
+        self.price_cache = price_cache or get_price_cache()
+        self.user_state.add_listener(self._on_user_event)
+        self.max_concurrent_orders = self.config.get("max_concurrent_orders", 8)
+        self.max_in_flight_orders = self.config.get("max_in_flight_orders", 32)
+        self.order_deadline = self.config.get("order_deadline", 5.0)
+        self.retry_backoff = self.config.get("order_retry_backoff", 0.05)
+        self._async_connector = async_connector
+        self._in_flight = {}  # exchange name -> asyncio.Semaphore
+        self._executor = None
+        self._unsupported_batches = set()  # (exchange name, ccxt capability) that failed natively
 
     def _load_yaml(self, path):
         """Load YAML configuration file."""
@@ -30,21 +117,9 @@ class OrderManager:
             return {}
 
     def _initialize_exchanges(self):
-        """Initialize exchange connections with API keys."""
-        exchanges = {}
-        for exchange_name, credentials in self.secrets.get("exchanges", {}).items():
-            try:
-                exchange_class = getattr(ccxt, exchange_name)
-                exchanges[exchange_name] = exchange_class({
-                    "apiKey": credentials["api_key"],
-                    "secret": credentials["api_secret"],
-                })
-                self.logger.info(f"Connected to {exchange_name}")
-            except Exception as e:
-                self.logger.error(f"Failed to connect to {exchange_name}: {e}")
-        return exchanges
+        """Get the shared exchange clients for the configured API keys."""
+        return self.registry.clients_for(self.secrets)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
     def place_order(self, exchange_name, symbol, order_type, side, quantity, price=None):
         """
         Place an order on the specified exchange.
@@ -55,57 +130,584 @@ class OrderManager:
         :param quantity: Amount of asset to trade.
         :param price: Price for limit/stop-limit orders (None for market orders).
         :return: Order execution details or None if failed.
+
+        Blocks for one round trip and does not retry; use submit_order() for deadline-bound
+        retries from an event loop.
         """
         exchange = self.exchanges.get(exchange_name)
         if not exchange:
             self.logger.error(f"Exchange {exchange_name} not initialized.")
             return None
 
-        # Validate order against risk constraints
-        portfolio_value = 100  # Placeholder for portfolio value retrieval
-        if not self.risk_manager.assess_order_risk(quantity, portfolio_value):
-            self.logger.warning(f"Order rejected due to risk constraints: {quantity} {symbol}")
+        price = price if order_type in ["limit", "stop-limit"] else None
+        if not self._passes_risk(exchange_name, symbol, side, quantity, price):
             return None
+        return self._send_order(exchange_name, exchange, symbol, order_type, side, quantity, price)
 
+    def _send_order(self, exchange_name, exchange, symbol, order_type, side, quantity, price):
+        """Track, journal and send one order that passed the pre-trade check."""
+        tracked = self.order_store.add(exchange_name, symbol, side, order_type, quantity, price)
+        if not self._journaled([tracked]):
+            return None
         try:
-            order_params = {"symbol": symbol, "side": side, "type": order_type, "quantity": quantity}
-            if order_type in ["limit", "stop-limit"] and price:
-                order_params["price"] = price
-
-            order = exchange.create_order(**order_params)
+            order = self.registry.throttled(exchange_name, exchange, "create_order")(
+                symbol, order_type, side, quantity, price, {"clientOrderId": tracked.client_order_id})
+            self._settle(exchange_name, tracked, order)
             self.logger.info(f"Order placed on {exchange_name}: {order}")
             return order
         except Exception as e:
+            self._settle(exchange_name, tracked, None, e)
             self.logger.error(f"Order placement failed on {exchange_name}: {e}")
             return None
 
+    def submit_order(self, exchange_name, symbol, order_type, side, quantity, price=None, params=None,
+                     deadline=None):
+        """
+        Submit an order without waiting for the venue (call from inside the running event loop).
+
+        The order is risk-checked and tracked at once, then sent on the venue's shared async client,
+        with at most 'max_in_flight_orders' submissions in flight per venue. Timeouts and network
+        errors are retried with jittered backoff until the order's deadline, always under the same
+        client order id, so a retry of an order that already reached the venue is refused instead of
+        placing it twice; an order whose retry is refused is looked up by its client order id before
+        it is settled as rejected.
+
+        :param exchange_name: Exchange to execute trade (e.g., "binance").
+        :param symbol: Trading pair (e.g., "BTC/USDT").
+        :param order_type: Type of order ("market", "limit", "stop-limit").
+        :param side: Buy or sell ("buy" or "sell").
+        :param quantity: Amount of asset to trade.
+        :param price: Price for limit/stop-limit orders (None for market orders).
+        :param params: Extra ccxt order params.
+        :param deadline: Seconds the submission may take in total; defaults to 'order_deadline' (5).
+        :return: OrderHandle resolving to the placed order (or None), or None if the order was not sent.
+        """
+        if exchange_name not in self.exchanges:
+            self.logger.error(f"Exchange {exchange_name} not initialized.")
+            return None
+
+        price = price if order_type in ["limit", "stop-limit"] else None
+        if not self._passes_risk(exchange_name, symbol, side, quantity, price):
+            return None
+
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + (deadline or self.order_deadline)
+        tracked = self.order_store.add(exchange_name, symbol, side, order_type, quantity, price)
+        request = (symbol, order_type, side, quantity, price,
+                   {**(params or {}), "clientOrderId": tracked.client_order_id})
+        future = loop.create_task(self._submit(exchange_name, tracked, request, expires))
+        return OrderHandle(exchange_name, tracked, future)
+
+    def submit_orders(self, exchange_name, orders, deadline=None):
+        """
+        Submit several orders concurrently with submit_order().
+
+        :param exchange_name: Exchange to execute trades (e.g., "binance").
+        :param orders: List of dicts with symbol, type, side, quantity, and optionally price and params.
+        :param deadline: Per-order deadline in seconds.
+        :return: List aligned with 'orders' of OrderHandles (None where the order was not sent).
+        """
+        return [self.submit_order(exchange_name, order["symbol"], order.get("type", "limit"), order["side"],
+                                  order["quantity"], order.get("price"), order.get("params"), deadline)
+                for order in orders]
+
+    @property
+    def async_connector(self):
+        if self._async_connector is None:
+            self._async_connector = AsyncExchangeConnector(secrets_path=self.secrets_path,
+                                                           timeout=self.order_deadline, registry=self.registry)
+        return self._async_connector
+
+    async def _submit(self, exchange_name, tracked, request, expires):
+        """Send one order, retrying transient failures under its client order id until 'expires'."""
+        loop = asyncio.get_running_loop()
+        if exchange_name not in self._in_flight:
+            self._in_flight[exchange_name] = asyncio.Semaphore(self.max_in_flight_orders)
+        semaphore = self._in_flight[exchange_name]
+        if self.order_store.journal is not None and \
+                not await loop.run_in_executor(None, self._journaled, [tracked], max(expires - loop.time(), 0)):
+            return None
+        error = None
+        async with semaphore:
+            for attempt in itertools.count():
+                remaining = expires - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    order = await self.async_connector.attempt(exchange_name, "create_order", *request,
+                                                               timeout=remaining)
+                    self._settle(exchange_name, tracked, order)
+                    self.logger.info(f"Order placed on {exchange_name}: {order}")
+                    return order
+                except (asyncio.TimeoutError, ccxt.NetworkError) as e:
+                    error = e
+                    self.counters.increment(f"{exchange_name}.order_retries")
+                except Exception as e:
+                    if error is not None or isinstance(e, ccxt.DuplicateOrderId):
+                        # An earlier attempt may have reached the venue. Most venues refuse the retry's
+                        # reused client order id as an ordinary rejection (Binance -2010 "Duplicate order
+                        # sent." is an InvalidOrder), so look the order up before settling it as rejected.
+                        return await self._adopt_sent(exchange_name, tracked, expires, e)
+                    self._settle(exchange_name, tracked, None, e)
+                    self.logger.error(f"Order placement failed on {exchange_name}: {e}")
+                    return None
+                backoff = random.uniform(0.5, 1.0) * min(self.retry_backoff * 2 ** attempt, 1.0)
+                await asyncio.sleep(min(backoff, max(expires - loop.time(), 0)))
+
+        self.counters.increment(f"{exchange_name}.order_deadlines")
+        if error is None:
+            # Never sent: the deadline passed while waiting for an in-flight slot
+            self.order_store.reject(tracked)
+        self.logger.error(f"Order {tracked.client_order_id} on {exchange_name} unconfirmed at its deadline: {error!r}")
+        return None  # still NEW if it was sent: the venue may have it, and reconcile() settles it
+
+    def _client_order_lookups(self, exchange_name, tracked):
+        """(method, args) calls listing the venue's open, then recently closed, orders for a tracked order's symbol."""
+        lookups = [("fetch_open_orders", (tracked.symbol,))]
+        exchange = self.exchanges.get(exchange_name)
+        if exchange is not None and exchange.has.get("fetchClosedOrders"):
+            # A minute of slack for clock skew between this host and the venue
+            lookups.append(("fetch_closed_orders", (tracked.symbol, int(tracked.created_at * 1000) - 60000)))
+        return lookups
+
+    def find_client_order(self, exchange_name, tracked):
+        """
+        Look an order up on the venue by its client order id.
+
+        :param exchange_name: Exchange the order was sent to.
+        :param tracked: TrackedOrder.
+        :return: The venue's ccxt order dict, or None if the venue does not have it.
+        :raises Exception: If a lookup request fails (the answer is then unknown).
+        """
+        return self._find_client_orders(exchange_name, [tracked]).get(tracked.client_order_id)
+
+    def _find_client_orders(self, exchange_name, tracked_orders):
+        """
+        Look several orders up by client order id, listing each symbol's orders once.
+
+        :return: Dict of client order id -> venue order for the orders the venue has.
+        :raises Exception: If a lookup request fails.
+        """
+        exchange = self.exchanges[exchange_name]
+        wanted = {tracked.client_order_id for tracked in tracked_orders}
+        earliest = {}
+        for tracked in tracked_orders:
+            if tracked.symbol not in earliest or tracked.created_at < earliest[tracked.symbol].created_at:
+                earliest[tracked.symbol] = tracked
+        found = {}
+        for tracked in earliest.values():
+            for method, args in self._client_order_lookups(exchange_name, tracked):
+                for order in self.registry.throttled(exchange_name, exchange, method)(*args) or []:
+                    if order.get("clientOrderId") in wanted:
+                        found.setdefault(order["clientOrderId"], order)
+        return found
+
+    async def _adopt_sent(self, exchange_name, tracked, expires, error):
+        """Settle an order whose resubmission failed: adopt the venue's copy, or reject it if there is none."""
+        try:
+            for method, args in self._client_order_lookups(exchange_name, tracked):
+                timeout = max(expires - asyncio.get_running_loop().time(), 0.1)
+                orders = await self.async_connector.attempt(exchange_name, method, *args, timeout=timeout)
+                for order in orders or []:
+                    if order.get("clientOrderId") == tracked.client_order_id:
+                        self._settle(exchange_name, tracked, order)
+                        self.counters.increment(f"{exchange_name}.orders_adopted")
+                        return order
+        except Exception as e:
+            self.logger.warning(f"Could not look up order {tracked.client_order_id} on {exchange_name} after "
+                                f"{error!r}: {e}")
+            return None  # unknown: left NEW for reconcile()
+        self._settle(exchange_name, tracked, None, error)
+        self.logger.error(f"Order placement failed on {exchange_name}: {error}")
+        return None
+
+    def _journaled(self, tracked_orders, timeout=None):
+        """
+        Wait until the journal intents of orders about to be sent are on disk, so no order reaches a
+        venue without a record of it surviving a crash. Orders recorded within one commit window
+        share a single fsync.
+
+        :param tracked_orders: TrackedOrders just added to the order store.
+        :param timeout: Seconds to wait at most; defaults to 'order_deadline'.
+        :return: True if the orders may be sent; otherwise they have been rejected.
+        """
+        journal = self.order_store.journal
+        if journal is None or journal.sync(timeout=self.order_deadline if timeout is None else timeout):
+            return True
+        for tracked in tracked_orders:
+            self.order_store.reject(tracked)
+        self.counters.increment("journal_timeouts")
+        self.logger.error(f"Order journal not durable in time; {len(tracked_orders)} orders not sent")
+        return False
+
+    def _passes_risk(self, exchange_name, symbol, side, quantity, price=None, record=True, replaces=None):
+        """
+        Validate an order against the pre-trade risk limits, at the latest streamed reference price.
+
+        :param record: Start the symbol's cooldown if the order passes (False inside a batch).
+        :param replaces: Open amount of the order an amend replaces (see PreTradeGate.check()).
+        """
+        ticker = self.price_cache.get(exchange_name, symbol)
+        if ticker is not None:
+            reference = (ticker.bid + ticker.ask) / 2 if ticker.bid and ticker.ask else ticker.last
+            if reference:
+                self.pretrade_gate.update_price(symbol, reference)
+        return self.pretrade_gate.check(exchange_name, symbol, side, quantity, price, record=record,
+                                        replaces=replaces) is None
+
+    def _settle(self, exchange_name, tracked, order, error=None):
+        """
+        Record the outcome of a placement in the order store.
+
+        Network errors leave the order NEW (it may have reached the venue); reconcile() settles it.
+        """
+        if order is not None:
+            self.order_store.ack(tracked.client_order_id, order.get("id"))
+            self.order_store.apply_update(exchange_name, {**order, "clientOrderId": tracked.client_order_id})
+        elif not isinstance(error, ccxt.NetworkError):
+            self.order_store.reject(tracked)
+
+    def _on_user_event(self, event, exchange_name, payload):
+        """Apply order updates pushed by the user-data streams to the order store."""
+        if event == "order" and exchange_name in self.exchanges:
+            self.order_store.apply_update(exchange_name, payload)
+        elif event == "balance" and exchange_name in self.exchanges:
+            self.pretrade_gate.set_balances(exchange_name, self.user_state.totals(exchange_name))
+
+    def close(self):
+        """
+        Stop following the user-data streams and release the batch pool, and the journal if this
+        manager opened it. Call when discarding a manager; the shared UserState would otherwise
+        keep it alive and keep applying updates to its order store.
+        """
+        self.user_state.remove_listener(self._on_user_event)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._owns_journal:
+            self.order_journal.close()
+
+    def _pool(self):
+        """Bounded thread pool used when a venue has no native batch endpoint."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_orders,
+                                                thread_name_prefix="order-batch")
+        return self._executor
+
+    def _supports_batch(self, exchange_name, exchange, capability):
+        return bool(exchange.has.get(capability)) and (exchange_name, capability) not in self._unsupported_batches
+
+    def _submit_each(self, exchange_name, call, items, action, on_error=None):
+        """
+        Run 'call' for every item on the bounded pool; failures are logged and returned as None.
+
+        :param on_error: Optional callback on_error(item, exception) for failed items.
+        """
+        def run(item):
+            try:
+                return call(item)
+            except Exception as e:
+                self.logger.error(f"{action} failed on {exchange_name} for {item}: {e}")
+                if on_error is not None:
+                    on_error(item, e)
+                return None
+        return list(self._pool().map(run, items))
+
+    def place_orders(self, exchange_name, orders):
+        """
+        Place several orders with as few round trips as possible.
+
+        Uses the venue's native batch endpoint (ccxt createOrders) in chunks of its batch limit
+        when available, otherwise submits the orders concurrently on a bounded thread pool.
+        Orders failing the risk check are not sent. The batch counts as one order for the
+        per-symbol cooldown, so a quote ladder is not rejected by its own first level.
+
+        :param exchange_name: Exchange to execute trades (e.g., "binance").
+        :param orders: List of dicts with symbol, type, side, quantity, and optionally price and params.
+        :return: List aligned with 'orders': the placed order, or None if it was rejected or failed.
+        """
+        exchange = self.exchanges.get(exchange_name)
+        if not exchange:
+            self.logger.error(f"Exchange {exchange_name} not initialized.")
+            return [None] * len(orders)
+
+        results = [None] * len(orders)
+        requests = []  # (index, ccxt order request)
+        tracked = {}  # index -> TrackedOrder
+        for index, order in enumerate(orders):
+            order_type = order.get("type", "limit")
+            price = order.get("price") if order_type in ["limit", "stop-limit"] else None
+            if not self._passes_risk(exchange_name, order["symbol"], order["side"], order["quantity"], price,
+                                     record=False):
+                continue
+            tracked[index] = self.order_store.add(exchange_name, order["symbol"], order["side"], order_type,
+                                                  order["quantity"], price)
+            requests.append((index, {
+                "symbol": order["symbol"], "type": order_type, "side": order["side"], "amount": order["quantity"],
+                "price": price,
+                "params": {"clientOrderId": tracked[index].client_order_id, **(order.get("params") or {})},
+            }))
+
+        for symbol in {order.symbol for order in tracked.values()}:
+            self.pretrade_gate.start_cooldown(exchange_name, symbol)
+        if requests and not self._journaled(list(tracked.values())):
+            return results
+
+        pending = requests
+        if requests and self._supports_batch(exchange_name, exchange, "createOrders"):
+            pending = self._place_native(exchange_name, exchange, requests, results)
+
+        if pending:
+            create_order = self.registry.throttled(exchange_name, exchange, "create_order")
+            errors = {}
+            placed = self._submit_each(exchange_name, lambda request: create_order(
+                request["symbol"], request["type"], request["side"], request["amount"], request["price"],
+                request["params"]), [request for _, request in pending], "Order placement",
+                on_error=lambda request, e: errors.__setitem__(request["params"]["clientOrderId"], e))
+            for (index, _), order in zip(pending, placed):
+                results[index] = order
+                if order is None:
+                    self._settle(exchange_name, tracked[index], None, errors.get(tracked[index].client_order_id))
+
+        for index, order in enumerate(results):
+            if order is not None:
+                self._settle(exchange_name, tracked[index], order)
+
+        self.logger.info(f"Placed {sum(order is not None for order in results)}/{len(orders)} orders on {exchange_name}")
+        return results
+
+    def _place_native(self, exchange_name, exchange, requests, results):
+        """Send requests through createOrders; return the requests still to be sent one by one."""
+        create_orders = self.registry.throttled(exchange_name, exchange, "create_orders")
+        limit = NATIVE_BATCH_LIMITS.get(exchange_name, DEFAULT_BATCH_LIMIT)
+        for start in range(0, len(requests), limit):
+            chunk = requests[start:start + limit]
+            try:
+                placed = create_orders([request for _, request in chunk])
+            except (ccxt.NotSupported, ccxt.BadRequest) as e:
+                # Rejected before any order was accepted (e.g. spot markets without a batch endpoint)
+                self.logger.warning(f"Native batch orders unavailable on {exchange_name}, submitting individually: {e}")
+                self._unsupported_batches.add((exchange_name, "createOrders"))
+                return requests[start:]
+            except Exception as e:
+                # The venue may have accepted part of the chunk before failing: settle it from a lookup
+                self.logger.error(f"Batch order placement failed on {exchange_name}, looking the orders up: {e}")
+                self._settle_unknown_chunk(exchange_name, chunk, results)
+                continue
+            for (index, request), order in zip(chunk, placed):
+                # Venues report per-order rejections inside the batch response
+                if order and order.get("id") and order.get("status") != "rejected":
+                    results[index] = order
+                else:
+                    self.order_store.reject(self.order_store.get(request["params"]["clientOrderId"]))
+        return []
+
+    def _settle_unknown_chunk(self, exchange_name, chunk, results):
+        """
+        Resolve a batch whose outcome is unknown by looking its orders up by client order id:
+        orders the venue has are placed, the rest rejected. If the lookup fails too, the orders
+        stay NEW for reconcile().
+        """
+        indexes = {request["params"]["clientOrderId"]: index for index, request in chunk}
+        tracked_orders = [self.order_store.get(client_id) for client_id in indexes]
+        try:
+            found = self._find_client_orders(exchange_name, tracked_orders)
+        except Exception as e:
+            self.logger.warning(f"Could not look up {len(chunk)} batch orders on {exchange_name}: {e}")
+            return
+        for tracked in tracked_orders:
+            order = found.get(tracked.client_order_id)
+            if order is not None:
+                results[indexes[tracked.client_order_id]] = order
+                self.counters.increment(f"{exchange_name}.orders_adopted")
+            else:
+                self.order_store.reject(tracked)
+
+    def cancel_orders(self, exchange_name, order_ids, symbol=None):
+        """
+        Cancel several orders with as few round trips as possible.
+
+        :param exchange_name: Exchange to cancel orders on.
+        :param order_ids: Order IDs to cancel.
+        :param symbol: Trading pair of the orders (required by some venues).
+        :return: List aligned with 'order_ids': the cancellation result, or None if it failed.
+        """
+        exchange = self.exchanges.get(exchange_name)
+        if not exchange:
+            self.logger.error(f"Exchange {exchange_name} not initialized.")
+            return [None] * len(order_ids)
+        order_ids = list(order_ids)
+        if not order_ids:
+            return []
+
+        if self._supports_batch(exchange_name, exchange, "cancelOrders"):
+            try:
+                canceled = self.registry.throttled(exchange_name, exchange, "cancel_orders")(order_ids, symbol)
+                by_id = {str(order.get("id")): order for order in canceled or [] if isinstance(order, dict)}
+                results = [by_id.get(str(order_id)) for order_id in order_ids]
+                self._record_cancels(exchange_name, order_ids, results)
+                self.logger.info(f"Canceled {sum(r is not None for r in results)}/{len(order_ids)} orders "
+                                 f"on {exchange_name}")
+                return results
+            except (ccxt.NotSupported, ccxt.BadRequest) as e:
+                self.logger.warning(f"Native batch cancel unavailable on {exchange_name}, canceling individually: {e}")
+                self._unsupported_batches.add((exchange_name, "cancelOrders"))
+            except ccxt.ArgumentsRequired as e:
+                self.logger.warning(f"Batch cancel on {exchange_name} needs more arguments, canceling individually: {e}")
+            except Exception as e:
+                self.logger.error(f"Batch cancel failed on {exchange_name}, canceling individually: {e}")
+
+        cancel_order = self.registry.throttled(exchange_name, exchange, "cancel_order")
+        results = self._submit_each(exchange_name, lambda order_id: cancel_order(order_id, symbol), order_ids,
+                                    "Order cancellation")
+        self._record_cancels(exchange_name, order_ids, results)
+        self.logger.info(f"Canceled {sum(r is not None for r in results)}/{len(order_ids)} orders on {exchange_name}")
+        return results
+
+    def _record_cancels(self, exchange_name, order_ids, results):
+        """Mark successfully cancelled orders in the order store."""
+        for order_id, result in zip(order_ids, results):
+            tracked = self.order_store.by_exchange_id(exchange_name, order_id)
+            if tracked is None or result is None:
+                continue
+            if isinstance(result, dict) and result.get("status"):
+                self.order_store.apply_update(exchange_name, {**result, "id": str(order_id)})
+            else:
+                self.order_store.cancel(tracked)
+
+    def cancel_all(self, exchange_name, symbol=None):
+        """
+        Cancel every open order on an exchange (optionally for one symbol).
+
+        Uses the venue's cancel-all endpoint when available, otherwise fetches the open orders
+        and cancels them with cancel_orders().
+
+        :param exchange_name: Exchange to cancel orders on.
+        :param symbol: Limit to one trading pair.
+        :return: Cancellation results, or None if the open orders could not be fetched.
+        """
+        exchange = self.exchanges.get(exchange_name)
+        if not exchange:
+            self.logger.error(f"Exchange {exchange_name} not initialized.")
+            return None
+
+        if self._supports_batch(exchange_name, exchange, "cancelAllOrders"):
+            try:
+                result = self.registry.throttled(exchange_name, exchange, "cancel_all_orders")(symbol)
+                for tracked in self.order_store.open_orders(exchange_name):
+                    if tracked.order_id is not None and (symbol is None or tracked.symbol == symbol):
+                        self.order_store.cancel(tracked)
+                self.logger.info(f"Canceled all orders{f' for {symbol}' if symbol else ''} on {exchange_name}")
+                return result
+            except (ccxt.NotSupported, ccxt.BadRequest) as e:
+                self.logger.warning(f"Native cancel-all unavailable on {exchange_name}: {e}")
+                self._unsupported_batches.add((exchange_name, "cancelAllOrders"))
+            except ccxt.ArgumentsRequired as e:
+                self.logger.warning(f"Cancel-all on {exchange_name} needs a symbol, canceling open orders: {e}")
+            except Exception as e:
+                self.logger.error(f"Cancel-all failed on {exchange_name}: {e}")
+                return None
+
+        try:
+            open_orders = self.registry.throttled(exchange_name, exchange, "fetch_open_orders")(symbol)
+        except Exception as e:
+            self.logger.error(f"Failed to fetch open orders on {exchange_name}: {e}")
+            return None
+        by_symbol = {}
+        for order in open_orders:
+            by_symbol.setdefault(order["symbol"], []).append(order["id"])
+        results = []
+        for order_symbol, order_ids in by_symbol.items():
+            results.extend(self.cancel_orders(exchange_name, order_ids, order_symbol))
+        return results
+
     def modify_order(self, exchange_name, order_id, new_price, new_quantity):
         """
         Modify an existing order.
+
+        Uses the venue's amend endpoint (ccxt editOrder) when it has one, otherwise cancels and
+        re-places the order. An amend that keeps the order id updates the tracked order (its fills
+        are kept); one that returns a new order (cancel-replace venues, or the fallback) is tracked
+        as a new order replacing the old one. The new price and quantity pass the pre-trade check
+        before the amend is sent, or before the order is canceled for its replacement.
+
         :param exchange_name: Exchange to modify order on.
-        :param order_id: ID of the order to modify.
+        :param order_id: ID of the order to modify (must be tracked by the order store).
         :param new_price: New price for limit/stop-limit orders.
-        :param new_quantity: Updated trade size.
-        :return: Modified order details.
+        :param new_quantity: Updated trade size; on venues in AMEND_IN_PLACE, the order's new total
+                             amount including what has already filled.
+        :return: Modified order details, or None if the order was left unchanged.
         """
         exchange = self.exchanges.get(exchange_name)
         if not exchange:
             self.logger.error(f"Exchange {exchange_name} not initialized.")
             return None
 
+        tracked = self.order_store.by_exchange_id(exchange_name, order_id)
+        if tracked is None:
+            self.logger.error(f"Cannot modify untracked order {order_id} on {exchange_name}")
+            return None
+
+        price = new_price if tracked.type in ["limit", "stop-limit"] else None
+        if not self._supports_batch(exchange_name, exchange, "editOrder"):
+            # Check the replacement first: a rejected one must not cost the order it replaces
+            if not self._passes_risk(exchange_name, tracked.symbol, tracked.side, new_quantity, price, record=False,
+                                     replaces=tracked.remaining):
+                return None
+            if self.cancel_order(exchange_name, order_id, tracked.symbol) is None:
+                return None
+            return self._send_order(exchange_name, exchange, tracked.symbol, tracked.type, tracked.side, new_quantity,
+                                    price)
+
+        in_place = exchange_name in AMEND_IN_PLACE
+        if not self._passes_risk(exchange_name, tracked.symbol, tracked.side, new_quantity, price,
+                                 replaces=tracked.amount if in_place else tracked.remaining):
+            return None
+
+        replacement, params = None, {}
+        if not in_place:
+            replacement = self.order_store.add(exchange_name, tracked.symbol, tracked.side, tracked.type, new_quantity,
+                                               new_price)
+            params = {"clientOrderId": replacement.client_order_id}
+            if not self._journaled([replacement]):
+                return None
         try:
-            cancel_status = exchange.cancel_order(order_id)
-            if cancel_status:
-                return self.place_order(exchange_name, order_type="limit", price=new_price, quantity=new_quantity)
+            order = self.registry.throttled(exchange_name, exchange, "edit_order")(
+                order_id, tracked.symbol, tracked.type, tracked.side, new_quantity, new_price, params)
+        except (ccxt.NotSupported, ccxt.BadRequest) as e:
+            self.logger.warning(f"Order amend unavailable on {exchange_name}, canceling and replacing: {e}")
+            self._unsupported_batches.add((exchange_name, "editOrder"))
+            if replacement is not None:
+                self.order_store.reject(replacement)
+            return self.modify_order(exchange_name, order_id, new_price, new_quantity)
         except Exception as e:
+            if replacement is not None:
+                self.order_store.reject(replacement)
             self.logger.error(f"Failed to modify order {order_id} on {exchange_name}: {e}")
             return None
 
-    def cancel_order(self, exchange_name, order_id):
+        if order.get("id") is None or str(order["id"]) == tracked.order_id:
+            # Amended in place: same order, same fills
+            if replacement is not None:
+                self.order_store.cancel(replacement)
+            self.order_store.amend(tracked, new_quantity, new_price)
+            self.order_store.apply_update(exchange_name, {**order, "id": tracked.order_id,
+                                                          "clientOrderId": tracked.client_order_id})
+        else:
+            self.order_store.cancel(tracked)
+            if replacement is not None:
+                self._settle(exchange_name, replacement, order)
+            else:
+                self.order_store.apply_update(exchange_name, order)
+        self.logger.info(f"Order {order_id} amended on {exchange_name}: {order}")
+        return order
+
+    def cancel_order(self, exchange_name, order_id, symbol=None):
         """
         Cancel an order.
         :param exchange_name: Exchange to cancel order on.
         :param order_id: ID of the order to cancel.
+        :param symbol: Trading pair of the order (required by some venues).
         :return: Cancellation status.
         """
         exchange = self.exchanges.get(exchange_name)
@@ -114,7 +716,8 @@ class OrderManager:
             return None
 
         try:
-            cancel_status = exchange.cancel_order(order_id)
+            cancel_status = self.registry.throttled(exchange_name, exchange, "cancel_order")(order_id, symbol)
+            self._record_cancels(exchange_name, [order_id], [cancel_status])
             self.logger.info(f"Order {order_id} canceled on {exchange_name}")
             return cancel_status
         except Exception as e:
@@ -124,19 +727,112 @@ class OrderManager:
     def get_order_status(self, exchange_name, order_id):
         """
         Get the status of an order.
+
+        While the venue's user-data stream is live, orders it has reported are answered from
+        local state without a REST call.
+
         :param exchange_name: Exchange to check order status.
         :param order_id: ID of the order.
         :return: Order status details.
         """
+        if self.user_state.is_live(exchange_name):
+            order = self.user_state.order(exchange_name, order_id)
+            if order is not None:
+                return order
+
         exchange = self.exchanges.get(exchange_name)
         if not exchange:
             self.logger.error(f"Exchange {exchange_name} not initialized.")
             return None
 
         try:
-            order_status = exchange.fetch_order(order_id)
+            order_status = self.registry.throttled(exchange_name, exchange, "fetch_order")(order_id)
+            if self.order_store.by_exchange_id(exchange_name, order_id) is not None:
+                self.order_store.apply_update(exchange_name, order_status)
             self.logger.info(f"Order status on {exchange_name}: {order_status}")
             return order_status
         except Exception as e:
             self.logger.error(f"Failed to fetch order status {order_id} on {exchange_name}: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def open_orders(self, exchange_name=None, symbol=None):
+        """
+        Return the locally tracked open orders (no REST call).
+
+        :param exchange_name: Limit to one exchange.
+        :param symbol: Limit to one trading pair (with exchange_name).
+        :return: List of ccxt-shaped order dicts.
+        """
+        return [order.to_dict() for order in self.order_store.open_orders(exchange_name, symbol)]
+
+    def reconcile(self, exchange_name=None):
+        """
+        Reconcile the order store against each exchange's open orders, for every symbol with
+        locally open orders plus the symbols listed under 'reconcile_symbols' in the config.
+
+        :param exchange_name: Limit to one exchange; defaults to every initialized exchange.
+        :return: Dictionary of exchange name -> reconcile report (None where it failed).
+        """
+        reports = {}
+        for name in [exchange_name] if exchange_name else list(self.exchanges):
+            exchange = self.exchanges.get(name)
+            if not exchange:
+                self.logger.error(f"Exchange {name} not initialized.")
+                continue
+            # Per symbol: most venues rate fetch_open_orders without a symbol very heavily
+            symbols = {order.symbol for order in self.order_store.open_orders(name)}
+            symbols.update(self.config.get("reconcile_symbols", {}).get(name, []))
+            fetch_open_orders = self.registry.throttled(name, exchange, "fetch_open_orders")
+            fetch_order = self.registry.throttled(name, exchange, "fetch_order")
+            report = {"adopted": 0, "updated": 0, "closed": 0}
+            try:
+                for symbol in sorted(symbols):
+                    result = self.order_store.reconcile(
+                        name, fetch_open_orders(symbol), fetch_order=fetch_order, symbol=symbol,
+                        stale_after=self.config.get("unacked_order_timeout", 30),
+                        find_client_order=lambda tracked, name=name: self.find_client_order(name, tracked))
+                    report = {key: report[key] + result[key] for key in report}
+                reports[name] = report
+            except Exception as e:
+                self.logger.error(f"Failed to reconcile orders on {name}: {e}")
+                reports[name] = None
+        return reports
+
+    def recover(self):
+        """
+        Restore order state after a restart: replay the journal into the order store, reconcile it
+        against every exchange's open orders, then compact the journal to what is still open.
+
+        Run this once at startup, before placing orders.
+
+        :return: Dictionary of exchange name -> reconcile report (empty without a journal).
+        """
+        if self.order_journal is None:
+            self.logger.warning("No order journal configured; nothing to recover.")
+            return {}
+        started = time.monotonic()
+        self.order_journal.replay(self.order_store)
+        reports = self.reconcile()
+        if all(report is not None for report in reports.values()):
+            self.order_journal.compact(self.order_store)
+        self.logger.info(f"Recovered {len(self.order_store.open_orders())} open orders in "
+                         f"{time.monotonic() - started:.2f}s: {reports}")
+        return reports
+
+    def start_reconciliation(self, interval=None):
+        """
+        Reconcile every 'interval' seconds on a daemon thread.
+
+        :param interval: Seconds between passes; defaults to the 'reconcile_interval' setting (60).
+        :return: The started thread.
+        """
+        interval = interval or self.config.get("reconcile_interval", 60)
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.reconcile()
+
+        thread = threading.Thread(target=loop, name="order-reconcile", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,404 @@
+# src/modules/order_management/order_store.py
+
+import itertools
+import os
+import threading
+import time
+import ccxt
+from src.modules.utils.logger import get_logger
+from src.modules.utils.metrics import get_counters
+
+# Lifecycle states
+NEW = "new"  # created locally, not yet acknowledged by the venue
+ACKED = "acked"
+PARTIALLY_FILLED = "partially_filled"
+FILLED = "filled"
+CANCELLED = "cancelled"
+REJECTED = "rejected"
+EXPIRED = "expired"
+
+OPEN_STATES = frozenset({NEW, ACKED, PARTIALLY_FILLED})
+TERMINAL_STATES = frozenset({FILLED, CANCELLED, REJECTED, EXPIRED})
+
+# Allowed moves; anything else (late acks, updates after a terminal state) is ignored
+TRANSITIONS = {
+    NEW: {ACKED, PARTIALLY_FILLED, FILLED, CANCELLED, REJECTED, EXPIRED},
+    ACKED: {PARTIALLY_FILLED, FILLED, CANCELLED, EXPIRED},
+    PARTIALLY_FILLED: {FILLED, CANCELLED, EXPIRED},
+}
+
+# ccxt unified order status -> lifecycle state (open orders are refined by their filled amount)
+CCXT_STATUS = {"open": ACKED, "closed": FILLED, "canceled": CANCELLED, "cancelled": CANCELLED,
+               "rejected": REJECTED, "expired": EXPIRED}
+
+FILL_EPSILON = 1e-12
+
+_client_sequence = itertools.count(1)
+
+
+def new_client_order_id(prefix: str = "mm"):
+    """Return a process-unique, 18-character alphanumeric client order id (fits every supported venue)."""
+    return f"{prefix}{int(time.time()) & 0xffffffff:08x}{os.getpid() & 0xfff:03x}{next(_client_sequence) & 0xfffff:05x}"
+
+
+class TrackedOrder:
+    """One order's identity, lifecycle state and fill aggregates."""
+
+    __slots__ = ("client_order_id", "order_id", "exchange", "symbol", "side", "type", "price", "amount", "filled",
+                 "cost", "fee", "status", "created_at", "updated_at", "trade_ids")
+
+    def __init__(self, client_order_id, exchange, symbol, side, order_type, amount, price=None):
+        self.client_order_id = client_order_id
+        self.order_id = None
+        self.exchange = exchange
+        self.symbol = symbol
+        self.side = side
+        self.type = order_type
+        self.price = price
+        self.amount = amount
+        self.filled = 0.0
+        self.cost = 0.0
+        self.fee = 0.0
+        self.status = NEW
+        self.created_at = self.updated_at = time.time()
+        self.trade_ids = set()
+
+    @property
+    def remaining(self):
+        return max(0.0, self.amount - self.filled)
+
+    @property
+    def average(self):
+        return self.cost / self.filled if self.filled else None
+
+    @property
+    def is_open(self):
+        return self.status in OPEN_STATES
+
+    def to_dict(self):
+        """Return the order as a ccxt-shaped dict."""
+        return {
+            "id": self.order_id, "clientOrderId": self.client_order_id, "exchange": self.exchange,
+            "symbol": self.symbol, "side": self.side, "type": self.type, "price": self.price, "amount": self.amount,
+            "filled": self.filled, "remaining": self.remaining, "cost": self.cost, "average": self.average,
+            "fee": self.fee, "status": self.status, "timestamp": int(self.created_at * 1000),
+        }
+
+    def __repr__(self):
+        return (f"TrackedOrder({self.exchange} {self.symbol} {self.side} {self.filled}/{self.amount} "
+                f"@ {self.price} {self.status} client={self.client_order_id} id={self.order_id})")
+
+
+class OrderStore:
+    """
+    In-memory record of every order this process has sent or adopted.
+
+    Orders move through NEW -> ACKED -> PARTIALLY_FILLED -> FILLED / CANCELLED / REJECTED /
+    EXPIRED; out-of-order or duplicate updates that would move an order backwards are ignored.
+    Lookups by client order id, by (exchange, exchange order id), by (exchange, symbol) for open
+    orders and by status are dictionary reads. Fills are aggregated into filled, cost and fee,
+    de-duplicated by trade id. reconcile() repairs the store from the exchange's view.
+    """
+
+    def __init__(self, journal=None):
+        """
+        :param journal: Optional OrderJournal that records every intent, ack, fill and terminal state.
+        """
+        self.journal = journal
+        self.logger = get_logger("OrderStore")
+        self.counters = get_counters("order_store")
+        self._by_client = {}
+        self._by_exchange_id = {}
+        self._open_by_venue = {}  # (exchange, symbol) -> {client_order_id: order}
+        self._by_status = {}  # status -> {client_order_id: order}
+        self._open_amount = {}  # (exchange, symbol, side) -> remaining amount of open orders
+        self._fill_listeners = []
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._by_client)
+
+    def add_fill_listener(self, callback):
+        """Register a callback invoked as callback(order, amount, price) for every fill applied."""
+        self._fill_listeners.append(callback)
+
+    def _index_status(self, order, previous=None):
+        if previous is not None:
+            self._by_status.get(previous, {}).pop(order.client_order_id, None)
+        self._by_status.setdefault(order.status, {})[order.client_order_id] = order
+        venue = self._open_by_venue.setdefault((order.exchange, order.symbol), {})
+        key = (order.exchange, order.symbol, order.side)
+        if order.is_open:
+            if order.client_order_id not in venue:
+                venue[order.client_order_id] = order
+                self._open_amount[key] = self._open_amount.get(key, 0.0) + order.remaining
+        elif venue.pop(order.client_order_id, None) is not None:
+            self._open_amount[key] -= order.remaining
+
+    def _transition(self, order, status):
+        """Move an order to a new state if the lifecycle allows it."""
+        if status == order.status:
+            return True
+        if status not in TRANSITIONS.get(order.status, ()):
+            self.counters.increment(f"{order.exchange}.ignored_transitions")
+            self.logger.debug(f"Ignoring {order.status} -> {status} for {order.client_order_id}")
+            return False
+        previous = order.status
+        order.status = status
+        order.updated_at = time.time()
+        self._index_status(order, previous)
+        if self.journal is not None and status in TERMINAL_STATES:
+            self.journal.status(order.client_order_id, status)
+        return True
+
+    def set_status(self, order: TrackedOrder, status: str):
+        """Move an order to a lifecycle state if the transition is allowed (e.g. when replaying a journal)."""
+        with self._lock:
+            return self._transition(order, status)
+
+    def add(self, exchange_name: str, symbol: str, side: str, order_type: str, amount: float, price: float = None,
+            client_order_id: str = None):
+        """
+        Record an order about to be sent.
+
+        :return: TrackedOrder in state NEW (its client_order_id should be sent with the order).
+        """
+        order = TrackedOrder(client_order_id or new_client_order_id(), exchange_name, symbol, side, order_type,
+                             amount, price)
+        with self._lock:
+            self._by_client[order.client_order_id] = order
+            self._index_status(order)
+            if self.journal is not None:
+                self.journal.intent(order)
+        return order
+
+    def ack(self, client_order_id: str, order_id: str):
+        """Attach the venue's order id and mark the order acknowledged."""
+        with self._lock:
+            order = self._by_client.get(client_order_id)
+            if order is None:
+                return None
+            if order_id is not None and order.order_id != str(order_id):
+                order.order_id = str(order_id)
+                self._by_exchange_id[(order.exchange, order.order_id)] = order
+                if self.journal is not None:
+                    self.journal.ack(client_order_id, order.order_id)
+            if order.status == NEW:
+                self._transition(order, ACKED)
+            return order
+
+    def apply_fill(self, order: TrackedOrder, amount: float, price: float, fee: float = 0.0, trade_id=None,
+                   notify: bool = True):
+        """
+        Add one execution to an order's aggregates.
+
+        :param order: TrackedOrder.
+        :param amount: Executed base amount.
+        :param price: Execution price.
+        :param fee: Fee charged for the execution.
+        :param trade_id: Venue trade id; repeated ids are ignored.
+        :param notify: Call the fill listeners; False for fills that happened before this process
+            saw them (adopted or replayed orders), which balance snapshots already include.
+        :return: True if the fill was applied.
+        """
+        with self._lock:
+            if trade_id is not None:
+                if trade_id in order.trade_ids:
+                    return False
+                order.trade_ids.add(trade_id)
+            was_open = order.is_open
+            if was_open:
+                key = (order.exchange, order.symbol, order.side)
+                self._open_amount[key] -= min(amount, order.remaining)
+            order.filled += amount
+            order.cost += amount * price
+            order.fee += fee or 0.0
+            order.updated_at = time.time()
+            if self.journal is not None:
+                self.journal.fill(order.client_order_id, amount, price, fee, trade_id)
+            # A fill racing a cancel still happened: it is recorded without reopening the order
+            if was_open:
+                self._transition(order, FILLED if order.filled >= order.amount - FILL_EPSILON else PARTIALLY_FILLED)
+            self.counters.increment(f"{order.exchange}.fills")
+        if not notify:
+            return True
+        for callback in self._fill_listeners:
+            try:
+                callback(order, amount, price)
+            except Exception as e:
+                self.logger.error(f"Order store fill listener failed for {order.client_order_id}: {e}")
+        return True
+
+    def amend(self, order: TrackedOrder, amount: float, price: float):
+        """Apply an amend the venue made in place (same order id): new total amount and price, fills kept."""
+        with self._lock:
+            if order.is_open:
+                key = (order.exchange, order.symbol, order.side)
+                self._open_amount[key] += max(0.0, amount - order.filled) - order.remaining
+            order.amount = amount
+            order.price = price
+            order.updated_at = time.time()
+            if self.journal is not None:
+                self.journal.amend(order.client_order_id, amount, price)
+            if order.is_open and order.filled >= amount - FILL_EPSILON:
+                self._transition(order, FILLED)
+            return order
+
+    def cancel(self, order: TrackedOrder):
+        """Mark an order cancelled (no-op if it already reached a terminal state)."""
+        with self._lock:
+            return self._transition(order, CANCELLED)
+
+    def reject(self, order: TrackedOrder):
+        """Mark an order rejected by the venue or by a local check before sending."""
+        with self._lock:
+            return self._transition(order, REJECTED)
+
+    def apply_update(self, exchange_name: str, update: dict):
+        """
+        Apply a ccxt order dict (REST response or user-stream update) to the matching order.
+
+        Unknown orders are adopted, with the filled amount they already had taken as their starting
+        point rather than reported to the fill listeners. A grown cumulative filled amount is
+        recorded as one aggregated fill at the price implied by the change in average price.
+
+        :param exchange_name: Exchange the order lives on.
+        :param update: ccxt-shaped order dict.
+        :return: The TrackedOrder, or None if the update cannot be matched or adopted.
+        """
+        with self._lock:
+            order = self.find(exchange_name, update.get("id"), update.get("clientOrderId"))
+            adopted = order is None
+            if adopted:
+                if update.get("symbol") is None or update.get("amount") is None:
+                    return None
+                order = self.add(exchange_name, update["symbol"], update.get("side"), update.get("type"),
+                                 update["amount"], update.get("price"),
+                                 update.get("clientOrderId") or f"adopted-{exchange_name}-{update.get('id')}")
+                self.counters.increment(f"{exchange_name}.adopted")
+            if update.get("id") is not None and order.order_id is None:
+                self.ack(order.client_order_id, update["id"])
+
+            filled = update.get("filled")
+            if filled is not None and filled > order.filled + FILL_EPSILON:
+                delta = filled - order.filled
+                average = update.get("average") or update.get("price") or order.price or 0.0
+                price = (average * filled - order.cost) / delta if update.get("average") else average
+                self.apply_fill(order, delta, price, notify=not adopted)
+
+            status = CCXT_STATUS.get(update.get("status"))
+            if status == ACKED and order.filled > 0:
+                status = PARTIALLY_FILLED
+            if status is not None:
+                self._transition(order, status)
+            return order
+
+    def get(self, client_order_id: str):
+        """Return the order with a client order id, or None."""
+        return self._by_client.get(client_order_id)
+
+    def by_exchange_id(self, exchange_name: str, order_id):
+        """Return the order with a venue order id, or None."""
+        return self._by_exchange_id.get((exchange_name, str(order_id)))
+
+    def find(self, exchange_name: str, order_id=None, client_order_id: str = None):
+        """Look an order up by venue order id, falling back to client order id."""
+        order = self.by_exchange_id(exchange_name, order_id) if order_id is not None else None
+        return order or (self._by_client.get(client_order_id) if client_order_id else None)
+
+    def open_orders(self, exchange_name: str = None, symbol: str = None):
+        """Return open orders, optionally for one venue and symbol."""
+        with self._lock:
+            if exchange_name is not None and symbol is not None:
+                return list(self._open_by_venue.get((exchange_name, symbol), {}).values())
+            return [order for (venue, _), orders in self._open_by_venue.items() for order in orders.values()
+                    if exchange_name is None or venue == exchange_name]
+
+    def open_count(self, exchange_name: str, symbol: str):
+        """Number of open orders on a venue and symbol."""
+        return len(self._open_by_venue.get((exchange_name, symbol), ()))
+
+    def open_amount(self, exchange_name: str, symbol: str, side: str):
+        """Remaining amount of the open orders on one side of a venue and symbol (maintained incrementally)."""
+        return self._open_amount.get((exchange_name, symbol, side), 0.0)
+
+    def with_status(self, status: str):
+        """Return every order currently in a state."""
+        with self._lock:
+            return list(self._by_status.get(status, {}).values())
+
+    def reconcile(self, exchange_name: str, exchange_open_orders, fetch_order=None, stale_after: float = 30.0,
+                  symbol: str = None, find_client_order=None):
+        """
+        Repair the store against the venue's list of open orders.
+
+        Open orders the store does not know are adopted. Locally open orders the venue no longer
+        lists are re-read with fetch_order (when given) to learn how they ended; they are closed
+        only when it reports a terminal status or OrderNotFound (without fetch_order, being absent
+        from the list closes them). Orders still NEW are in flight and left alone until 'stale_after'
+        seconds old; then they are looked up by client order id with find_client_order (when given)
+        and rejected only if the venue does not have them. Orders whose lookup fails stay as they are.
+
+        :param exchange_name: Exchange to reconcile.
+        :param exchange_open_orders: Result of fetch_open_orders() on that venue.
+        :param fetch_order: Optional callable (order_id, symbol) -> ccxt order dict.
+        :param stale_after: Seconds after which an unacknowledged order is considered lost.
+        :param symbol: The open orders cover only this symbol; other symbols are left untouched.
+        :param find_client_order: Optional callable (TrackedOrder) -> ccxt order dict found by client
+            order id, or None if the venue does not have it.
+        :return: Report dict with adopted, updated and closed counts.
+        """
+        report = {"adopted": 0, "updated": 0, "closed": 0}
+        seen = set()
+        cutoff = time.time() - stale_after
+        with self._lock:
+            for update in exchange_open_orders:
+                known = self.find(exchange_name, update.get("id"), update.get("clientOrderId"))
+                order = self.apply_update(exchange_name, update)
+                if order is None:
+                    continue
+                seen.add(order.client_order_id)
+                report["adopted" if known is None else "updated"] += 1
+            local = self.open_orders(exchange_name, symbol) if symbol else self.open_orders(exchange_name)
+            missing = [order for order in local
+                       if order.client_order_id not in seen and (order.status != NEW or order.created_at < cutoff)]
+
+        for order in missing:
+            lookup = fetch_order if order.order_id is not None else find_client_order
+            update, gone = None, lookup is None
+            if lookup is not None:
+                try:
+                    update = lookup(order.order_id, order.symbol) if order.order_id is not None else lookup(order)
+                    gone = update is None
+                except ccxt.OrderNotFound:
+                    gone = True
+                except Exception as e:
+                    self.logger.warning(f"Failed to look up {order.client_order_id} on {exchange_name} during "
+                                        f"reconcile: {e}")
+                    continue
+            with self._lock:
+                if update is not None:
+                    self.apply_update(exchange_name, {**update, "clientOrderId": order.client_order_id})
+                    if CCXT_STATUS.get(update.get("status")) not in TERMINAL_STATES:
+                        report["updated"] += 1
+                        continue
+                if gone and order.is_open:
+                    self._transition(order, REJECTED if order.status == NEW else CANCELLED)
+            report["closed"] += 1
+
+        if report["adopted"] or report["closed"]:
+            self.logger.info(f"Reconciled {exchange_name}: {report}")
+        return report
+
+    def prune(self, older_than: float):
+        """Forget terminal orders last updated more than 'older_than' seconds ago; return how many."""
+        cutoff = time.time() - older_than
+        with self._lock:
+            stale = [order for order in self._by_client.values()
+                     if order.status in TERMINAL_STATES and order.updated_at < cutoff]
+            for order in stale:
+                del self._by_client[order.client_order_id]
+                self._by_status.get(order.status, {}).pop(order.client_order_id, None)
+                if order.order_id is not None:
+                    self._by_exchange_id.pop((order.exchange, order.order_id), None)
+            return len(stale)
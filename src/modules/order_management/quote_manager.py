@@ -0,0 +1,231 @@
+# src/modules/order_management/quote_manager.py
+
+import threading
+import time
+from src.modules.utils.logger import get_logger
+from src.modules.utils.metrics import get_counters
+from src.modules.order_management.order_manager import AMEND_IN_PLACE
+
+DEFAULT_PRICE_TOLERANCE_BPS = 2.0
+DEFAULT_SIZE_TOLERANCE_PERCENT = 10.0
+DEFAULT_COALESCE_WINDOW = 0.05  # seconds
+
+
+class QuoteManager:
+    """
+    Keeps the desired quotes per (exchange, symbol) and only touches live orders that moved.
+
+    Each quote occupies a slot (side, level). On a sync the desired slots are diffed against the
+    live orders in the order store: missing quotes are placed, dropped quotes cancelled, and quotes
+    whose price or remaining size moved past the tolerances amended (editOrder where the venue
+    has it, otherwise cancel/replace). Everything else is left resting, as is a quote whose
+    replacement the pre-trade check rejects. Requotes for the same
+    symbol arriving within the coalescing window collapse into one sync of the latest quotes.
+    """
+
+    def __init__(self, order_manager, price_tolerance_bps: float = None, size_tolerance_percent: float = None,
+                 coalesce_window: float = None):
+        """
+        :param order_manager: OrderManager used to place, amend and cancel quotes.
+        :param price_tolerance_bps: Price move (basis points) that triggers an amend; defaults to the
+            'quoting.price_tolerance_bps' setting (2).
+        :param size_tolerance_percent: Remaining-size move (% of the desired size) that triggers an amend;
+            defaults to 'quoting.size_tolerance_percent' (10).
+        :param coalesce_window: Minimum seconds between syncs of one symbol; defaults to
+            'quoting.coalesce_window' (0.05).
+        """
+        self.logger = get_logger("QuoteManager")
+        self.counters = get_counters("quotes")
+        self.order_manager = order_manager
+        settings = (order_manager.config or {}).get("quoting", {})
+        self.price_tolerance_bps = price_tolerance_bps if price_tolerance_bps is not None else \
+            settings.get("price_tolerance_bps", DEFAULT_PRICE_TOLERANCE_BPS)
+        self.size_tolerance_percent = size_tolerance_percent if size_tolerance_percent is not None else \
+            settings.get("size_tolerance_percent", DEFAULT_SIZE_TOLERANCE_PERCENT)
+        self.coalesce_window = coalesce_window if coalesce_window is not None else \
+            settings.get("coalesce_window", DEFAULT_COALESCE_WINDOW)
+        self._desired = {}  # (exchange, symbol) -> {(side, level): (price, quantity)}
+        self._live = {}  # (exchange, symbol) -> {(side, level): TrackedOrder}
+        self._orphans = {}  # (exchange, symbol) -> [TrackedOrder] to cancel once acknowledged
+        self._pending = set()  # keys with quotes not yet synced
+        self._last_sync = {}  # key -> monotonic time of the last sync
+        self._lock = threading.RLock()
+
+    def set_quotes(self, exchange_name: str, symbol: str, quotes, force: bool = False):
+        """
+        Replace the desired quotes for a symbol.
+
+        :param exchange_name: Exchange to quote on.
+        :param symbol: Trading pair.
+        :param quotes: List of dicts with side, price and quantity; levels are numbered per side
+            in the order given.
+        :param force: Sync now even inside the coalescing window.
+        :return: Sync report (see sync()), or None if the requote was coalesced into a later sync.
+        """
+        desired = {}
+        levels = {}
+        for quote in quotes:
+            level = levels[quote["side"]] = levels.get(quote["side"], -1) + 1
+            desired[(quote["side"], level)] = (quote["price"], quote["quantity"])
+        key = (exchange_name, symbol)
+        with self._lock:
+            if key in self._pending:
+                self.counters.increment(f"{exchange_name}.coalesced")
+            self._desired[key] = desired
+            self._pending.add(key)
+            if not force and time.monotonic() - self._last_sync.get(key, float("-inf")) < self.coalesce_window:
+                return None
+            return self.sync(exchange_name, symbol)
+
+    def quote(self, exchange_name: str, symbol: str, bid: float, ask: float, quantity: float, force: bool = False):
+        """
+        Quote one bid and one ask (e.g. the output of PricingStrategy.calculate_bid_ask).
+
+        A None price withdraws that side.
+        """
+        quotes = [{"side": side, "price": price, "quantity": quantity}
+                  for side, price in (("buy", bid), ("sell", ask)) if price is not None]
+        return self.set_quotes(exchange_name, symbol, quotes, force)
+
+    def cancel_quotes(self, exchange_name: str, symbol: str):
+        """Withdraw every quote for a symbol immediately."""
+        return self.set_quotes(exchange_name, symbol, [], force=True)
+
+    def flush(self):
+        """
+        Sync every symbol whose requotes were coalesced and whose window has passed.
+
+        :return: Dictionary of (exchange, symbol) -> sync report.
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [key for key in self._pending if now - self._last_sync.get(key, float("-inf")) >= self.coalesce_window]
+            return {key: self.sync(*key) for key in due}
+
+    def start(self, interval: float = None):
+        """
+        Flush coalesced requotes every 'interval' seconds on a daemon thread.
+
+        :param interval: Seconds between flushes; defaults to the coalescing window.
+        :return: The started thread.
+        """
+        interval = interval or self.coalesce_window
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.flush()
+                except Exception as e:
+                    self.logger.error(f"Quote flush failed: {e}")
+
+        thread = threading.Thread(target=loop, name="quote-flush", daemon=True)
+        thread.start()
+        return thread
+
+    def live_quotes(self, exchange_name: str, symbol: str):
+        """Return the open quote orders for a symbol as {(side, level): ccxt-shaped order dict}."""
+        with self._lock:
+            return {slot: order.to_dict() for slot, order in self._live.get((exchange_name, symbol), {}).items()
+                    if order.is_open}
+
+    def _moved(self, order, price, quantity):
+        """True if a live order is too far from the desired price or size to leave resting."""
+        if order.price is None or abs(price - order.price) * 1e4 > self.price_tolerance_bps * order.price:
+            return True
+        return abs(quantity - order.remaining) * 100 > self.size_tolerance_percent * quantity
+
+    def sync(self, exchange_name: str, symbol: str):
+        """
+        Bring the live quotes for a symbol in line with the desired ones.
+
+        :return: Dictionary with the number of quotes placed, amended, cancelled and left unchanged.
+        """
+        key = (exchange_name, symbol)
+        with self._lock:
+            self._pending.discard(key)
+            self._last_sync[key] = time.monotonic()
+            desired = self._desired.get(key, {})
+            live = self._live.setdefault(key, {})
+            report = {"placed": 0, "amended": 0, "cancelled": 0, "unchanged": 0}
+
+            places, amends = [], []
+            cancels = [order for order in self._orphans.pop(key, []) if order.is_open]
+            for slot in sorted(set(live) | set(desired)):
+                order = live.get(slot)
+                if order is not None and not order.is_open:
+                    del live[slot]
+                    order = None
+                if slot not in desired:
+                    if order is not None:
+                        cancels.append(live.pop(slot))
+                elif order is None:
+                    places.append(slot)
+                elif self._moved(order, *desired[slot]):
+                    amends.append(slot)
+                else:
+                    report["unchanged"] += 1
+
+            exchange = self.order_manager.exchanges.get(exchange_name)
+            can_edit = exchange is not None and self.order_manager._supports_batch(exchange_name, exchange, "editOrder")
+            for slot in amends:
+                order, (price, quantity) = live[slot], desired[slot]
+                if can_edit and order.order_id is not None:
+                    # An in-place amend keeps the fills, so its new total is what filled plus the desired size
+                    amount = order.filled + quantity if exchange_name in AMEND_IN_PLACE else quantity
+                    amended = self.order_manager.modify_order(exchange_name, order.order_id, price, amount)
+                    replacement = amended and (self.order_manager.order_store.find(
+                        exchange_name, amended.get("id"), amended.get("clientOrderId"))
+                        or (order if order.is_open else None))  # amended in place
+                    if replacement is not None:
+                        live[slot] = replacement
+                        report["amended"] += 1
+                        continue
+                    if not order.is_open:  # the amend replaced or closed it without a usable result
+                        del live[slot]
+                        places.append(slot)
+                        continue
+                # Cancel/replace, folded into the batched cancels and placements below. A replacement
+                # the pre-trade check would reject leaves the live order quoting instead.
+                if not self.order_manager._passes_risk(exchange_name, symbol, order.side, quantity, price,
+                                                       record=False, replaces=order.remaining):
+                    report["unchanged"] += 1
+                    continue
+                cancels.append(live.pop(slot))
+                places.append(slot)
+
+            report["cancelled"] = self._cancel(exchange_name, symbol, cancels)
+            report["placed"] = self._place(exchange_name, symbol, places, desired, live)
+
+        for action, count in report.items():
+            if count:
+                self.counters.increment(f"{exchange_name}.{action}", count)
+        self.logger.debug(f"Requoted {exchange_name} {symbol}: {report}")
+        return report
+
+    def _cancel(self, exchange_name, symbol, orders):
+        """Cancel quote orders in one batch; unacknowledged ones are retried on the next sync."""
+        acked = [order for order in orders if order.order_id is not None]
+        orphans = [order for order in orders if order.order_id is None]
+        if orphans:
+            self._orphans.setdefault((exchange_name, symbol), []).extend(orphans)
+        if not acked:
+            return 0
+        results = self.order_manager.cancel_orders(exchange_name, [order.order_id for order in acked], symbol)
+        return sum(result is not None for result in results)
+
+    def _place(self, exchange_name, symbol, slots, desired, live):
+        """Place the quotes for empty slots in one batch and remember the resulting orders."""
+        if not slots:
+            return 0
+        results = self.order_manager.place_orders(exchange_name, [
+            {"symbol": symbol, "type": "limit", "side": side, "price": desired[(side, level)][0],
+             "quantity": desired[(side, level)][1]} for side, level in slots])
+        placed = 0
+        for slot, result in zip(slots, results):
+            order = result and self.order_manager.order_store.find(exchange_name, result.get("id"),
+                                                                     result.get("clientOrderId"))
+            if order is not None:
+                live[slot] = order
+                placed += 1
+        return placed
@@ -1,22 +1,30 @@
 # src/modules/portfolio_management/portfolio_tracker.py
 
-import ccxt
 import yaml
 import time
-from src.utils.logger import get_logger
+from src.modules.utils.logger import get_logger
+from src.modules.datafeed.price_cache import get_price_cache
+from src.modules.exchange_connector.exchange_registry import get_exchange_registry
+from src.modules.exchange_connector.user_stream import get_user_state
 
 class PortfolioTracker:
-    def __init__(self, config_path="src/config/portfolio_config.yaml", secrets_path="src/config/secrets.yaml"):
+    def __init__(self, config_path="src/config/portfolio_config.yaml", secrets_path="src/config/secrets.yaml",
+                 registry=None, user_state=None):
         """
         Initializes the Portfolio Management module.
         :param config_path: Path to the portfolio configuration file.
         :param secrets_path: Path to the API credentials file.
+        :param registry: ExchangeRegistry providing shared clients; defaults to the process-wide one.
+        :param user_state: UserState fed by the user-data streams; defaults to the process-wide one.
         """
         self.logger = get_logger("PortfolioTracker")
         self.config = self._load_yaml(config_path)
         self.secrets = self._load_yaml(secrets_path)
+        self.registry = registry or get_exchange_registry()
         self.exchanges = self._initialize_exchanges()
         self.portfolio = {}
+        self.price_cache = get_price_cache()
+        self.user_state = user_state or get_user_state()
 
     def _load_yaml(self, path):
         """Load YAML configuration file."""
@@ -28,27 +36,21 @@ class PortfolioTracker:
             return {}
 
     def _initialize_exchanges(self):
-        """Initialize exchange connections with API keys."""
-        exchanges = {}
-        for exchange_name, credentials in self.secrets.get("exchanges", {}).items():
-            try:
-                exchange_class = getattr(ccxt, exchange_name)
-                exchanges[exchange_name] = exchange_class({
-                    "apiKey": credentials["api_key"],
-                    "secret": credentials["api_secret"],
-                })
-                self.logger.info(f"Connected to {exchange_name}")
-            except Exception as e:
-                self.logger.error(f"Failed to connect to {exchange_name}: {e}")
-        return exchanges
+        """Get the shared exchange clients for the configured API keys."""
+        return self.registry.clients_for(self.secrets)
 
     def get_balances(self):
         """
         Fetches balances from all exchanges and updates portfolio.
+
+        Venues with a live user-data stream are read from local state; only the others are polled.
         """
         for exchange_name, exchange in self.exchanges.items():
+            if self.user_state.is_live(exchange_name):
+                self.portfolio[exchange_name] = self.user_state.totals(exchange_name)
+                continue
             try:
-                balance_data = exchange.fetch_balance()
+                balance_data = self.registry.throttled(exchange_name, exchange, "fetch_balance")()
                 self.portfolio[exchange_name] = balance_data["total"]
                 self.logger.info(f"Updated balances from {exchange_name}: {self.portfolio[exchange_name]}")
             except Exception as e:
@@ -98,7 +100,8 @@ class PortfolioTracker:
             return None
 
         try:
-            ticker = exchange.fetch_ticker(f"{asset}/USDT")
+            ticker = self.price_cache.get_or_fetch(exchange_name, f"{asset}/USDT",
+                                                 self.registry.throttled(exchange_name, exchange, "fetch_ticker"))
             return ticker["last"]
         except Exception as e:
             self.logger.error(f"Failed to fetch price for {asset} on {exchange_name}: {e}")
@@ -106,11 +109,18 @@ class PortfolioTracker:
 
     def track_portfolio(self):
         """
-        Continuously tracks the portfolio at regular intervals.
+        Continuously tracks the portfolio.
+
+        When every venue has a live user-data stream, the loop wakes on pushed balance changes
+        (or after update_frequency at most); otherwise it polls every update_frequency seconds.
         """
         update_frequency = self.config["portfolio_management"]["update_frequency"]
+        version = self.user_state.version
         while True:
             self.logger.info("Updating portfolio balances and risk monitoring...")
             self.get_balances()
             self.monitor_asset_exposure()
-            time.sleep(update_frequency)
\ No newline at end of file
+            if self.exchanges and all(self.user_state.is_live(name) for name in self.exchanges):
+                version = self.user_state.wait_for_update(update_frequency, since=version)
+            else:
+                time.sleep(update_frequency)
\ No newline at end of file
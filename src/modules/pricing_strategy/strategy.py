@@ -1,7 +1,7 @@
 # src/modules/pricing_strategy/strategy.py
 
 import yaml
-from src.utils.logger import get_logger
+from src.modules.utils.logger import get_logger
 
 class PricingStrategy:
     def __init__(self, config_path="src/config/strategy_config.yaml"):
@@ -45,6 +45,23 @@ class PricingStrategy:
             self.logger.error(f"Unknown strategy: {strategy}")
             return None, None
 
+    def calculate_bid_ask_from_ticks(self, tick_buffer, inventory_ratio=0):
+        """
+        Determines bid/ask prices from live ticks: the last trade is the market price and the
+        buffer's EWMA volatility, scaled to the dynamic strategy's 'volatility_horizon_seconds'
+        (default daily), drives dynamic spreads.
+
+        :param tick_buffer: TickRingBuffer for the symbol being quoted.
+        :param inventory_ratio: Current inventory ratio for risk-based strategies.
+        :return: Tuple (bid_price, ask_price), or (None, None) if no ticks have arrived yet.
+        """
+        if tick_buffer is None or tick_buffer.last_price is None:
+            self.logger.warning("No ticks available for pricing.")
+            return None, None
+        horizon = self.config.get("strategies", {}).get("dynamic_spread", {}).get("volatility_horizon_seconds", 86400)
+        volatility = tick_buffer.volatility_percent(horizon) or 0
+        return self.calculate_bid_ask(tick_buffer.last_price, volatility, inventory_ratio)
+
     def _fixed_spread(self, market_price):
         """Apply fixed spread market-making strategy."""
         spread = self.config["strategies"]["fixed_spread"]["spread_percent"] / 100
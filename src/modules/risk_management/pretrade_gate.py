@@ -0,0 +1,194 @@
+# src/modules/risk_management/pretrade_gate.py
+
+import math
+import time
+from src.modules.utils.logger import get_logger
+from src.modules.utils.metrics import get_counters
+
+# Assets valued at par when computing the portfolio value
+DEFAULT_QUOTE_ASSETS = ("USDT", "USD", "USDC", "BUSD", "FDUSD", "DAI")
+
+# Rejection reasons returned by PreTradeGate.check()
+SIZE = "size"
+MIN_SIZE = "min_size"
+COLLAR = "price_collar"
+NOTIONAL = "notional"
+EXPOSURE = "exposure"
+POSITION = "position"
+OPEN_ORDERS = "open_orders"
+COOLDOWN = "cooldown"
+NO_PRICE = "no_reference_price"
+
+
+class PreTradeGate:
+    """
+    Pre-trade risk check for the order path.
+
+    Limits are read from the risk settings once, at construction. Everything else the check needs
+    is kept current by events, not computed per order: balances from user-stream snapshots and
+    fills, reference prices from market data, open-order counts and amounts from the order store,
+    and the portfolio value, revalued when a balance or price changes. check() is a handful of
+    dictionary reads and comparisons, in single-digit microseconds.
+
+    Checks: order size (max and venue minimum), price collar around the reference price, order
+    notional, notional against 'max_exposure' percent of the portfolio value, projected position
+    including open orders on the same side, open-order count, and a per-symbol cooldown (started
+    once per batch by callers placing several orders together; see start_cooldown()). An amend is
+    checked against the order it replaces: only its extra quantity counts toward exposure and
+    position, and it adds nothing to the open-order count or the cooldown.
+    Checks whose inputs are not known yet (no reference price, no balances) are skipped, except
+    that market orders are rejected without a reference price, since nothing else values them.
+    """
+
+    def __init__(self, risk_settings: dict = None, order_store=None, market_cache=None,
+                 quote_assets=DEFAULT_QUOTE_ASSETS):
+        """
+        :param risk_settings: The 'risk_management' section of the risk configuration (risk_config.yaml).
+            Notional, position, open-order and cooldown limits it leaves out are off.
+        :param order_store: OrderStore providing open-order counts and amounts; its fills update positions.
+        :param market_cache: Optional MarketMetadataCache providing venue minimum order sizes.
+        :param quote_assets: Assets valued at 1.0 in the portfolio value.
+        """
+        self.logger = get_logger("PreTradeGate")
+        self.counters = get_counters("pretrade")
+        settings = risk_settings or {}
+        self.max_order_size = float(settings.get("max_order_size", 10))
+        self.max_order_notional = float(settings.get("max_order_notional", math.inf))
+        self.max_exposure = float(settings.get("max_exposure", 50)) / 100
+        self.max_position = float(settings.get("max_position", math.inf))
+        self.position_limits = {symbol: float(limit) for symbol, limit in settings.get("position_limits", {}).items()}
+        self.max_open_orders = settings.get("max_open_orders", math.inf)
+        self.cooldown = float(settings.get("order_cooldown", 0.0))
+        self.collar = float(settings.get("price_collar_percent", 5)) / 100
+        self.order_store = order_store
+        self.market_cache = market_cache
+        self.quote_assets = frozenset(quote_assets)
+        self.portfolio_value = settings.get("portfolio_value")  # until balances and prices arrive
+        self._symbols = {}  # (exchange, symbol) -> (base, quote, position limit, minimum size)
+        self._balances = {}  # exchange -> {asset: total}
+        self._prices = {}  # symbol -> reference price
+        self._asset_prices = {asset: 1.0 for asset in self.quote_assets}
+        self._last_order = {}  # (exchange, symbol) -> monotonic time of the last accepted order
+        if order_store is not None:
+            order_store.add_fill_listener(self.on_fill)
+
+    def _symbol(self, exchange_name, symbol):
+        """Per-symbol constants, computed on first use."""
+        base, _, quote = symbol.partition("/")
+        quote = quote.split(":")[0]
+        limit = self.position_limits.get(symbol, self.max_position)
+        minimum = 0.0
+        if self.market_cache is not None:
+            minimum = self.market_cache.min_trade_size(exchange_name, symbol) or 0.0
+        entry = self._symbols[(exchange_name, symbol)] = (base, quote, limit, minimum)
+        return entry
+
+    def check(self, exchange_name: str, symbol: str, side: str, quantity: float, price: float = None,
+              record: bool = True, replaces: float = None):
+        """
+        Check one order against every limit.
+
+        :param exchange_name: Exchange the order goes to.
+        :param symbol: Trading pair.
+        :param side: "buy" or "sell".
+        :param quantity: Order amount in the base asset.
+        :param price: Limit price; None for market orders (the reference price is used).
+        :param record: Start the symbol's cooldown if the order passes (False for a dry run).
+        :param replaces: Open amount of the order an amend replaces (None for a new order).
+        :return: None if the order passes, otherwise the reason it was rejected.
+        """
+        key = (exchange_name, symbol)
+        constants = self._symbols.get(key) or self._symbol(exchange_name, symbol)
+        base, quote, position_limit, minimum = constants
+        extra = quantity if replaces is None else quantity - replaces
+        reason = None
+        if not 0 < quantity <= self.max_order_size:
+            reason = SIZE
+        elif quantity < minimum:
+            reason = MIN_SIZE
+        else:
+            reference = self._prices.get(symbol)
+            if price is None and reference is None:
+                reason = NO_PRICE
+            elif price is not None and reference is not None and abs(price - reference) > self.collar * reference:
+                reason = COLLAR
+            else:
+                value = quantity * (price or reference)
+                if value > self.max_order_notional:
+                    reason = NOTIONAL
+                elif self.portfolio_value is not None and \
+                        extra * (price or reference) > self.max_exposure * self.portfolio_value:
+                    reason = EXPOSURE
+        if reason is None and self.order_store is not None:
+            balances = self._balances.get(exchange_name)
+            if balances is not None and position_limit != math.inf and extra > 0:
+                if side == "buy":
+                    projected = balances.get(base, 0.0) + self.order_store.open_amount(exchange_name, symbol, "buy")
+                    projected += extra
+                else:
+                    projected = balances.get(base, 0.0) - self.order_store.open_amount(exchange_name, symbol, "sell")
+                    projected -= extra
+                if abs(projected) > position_limit:
+                    reason = POSITION
+            if reason is None and replaces is None and \
+                    self.order_store.open_count(exchange_name, symbol) >= self.max_open_orders:
+                reason = OPEN_ORDERS
+        if reason is None and self.cooldown and replaces is None:
+            now = time.monotonic()
+            if now - self._last_order.get(key, -math.inf) < self.cooldown:
+                reason = COOLDOWN
+            elif record:
+                self._last_order[key] = now
+
+        if reason is not None:
+            self.counters.increment(f"{exchange_name}.{reason}")
+            self.logger.warning(f"Order rejected by pre-trade check ({reason}): {side} {quantity} {symbol} "
+                                f"@ {price} on {exchange_name}")
+        return reason
+
+    def start_cooldown(self, exchange_name: str, symbol: str):
+        """Start a symbol's cooldown, e.g. after a batch checked with record=False was accepted."""
+        if self.cooldown:
+            self._last_order[(exchange_name, symbol)] = time.monotonic()
+
+    def update_price(self, symbol: str, price: float):
+        """
+        Set a symbol's reference price (e.g. the mid from the order book or the last trade).
+
+        Prices of pairs quoted in a quote asset also value their base asset in the portfolio.
+        """
+        self._prices[symbol] = price
+        base, _, quote = symbol.partition("/")
+        if quote.split(":")[0] in self.quote_assets and self._asset_prices.get(base) != price:
+            self._asset_prices[base] = price
+            if any(base in balances for balances in self._balances.values()):
+                self._revalue()
+
+    def set_balances(self, exchange_name: str, totals: dict):
+        """Replace a venue's balances with a snapshot ({asset: total}), e.g. from a user-data stream."""
+        self._balances[exchange_name] = dict(totals)
+        self._revalue()
+
+    def on_fill(self, order, amount: float, price: float):
+        """Apply a fill to the venue's balances until the next balance snapshot (order store listener)."""
+        balances = self._balances.get(order.exchange)
+        if balances is None:
+            return
+        constants = self._symbols.get((order.exchange, order.symbol)) or self._symbol(order.exchange, order.symbol)
+        base, quote = constants[0], constants[1]
+        signed = amount if order.side == "buy" else -amount
+        balances[base] = balances.get(base, 0.0) + signed
+        balances[quote] = balances.get(quote, 0.0) - signed * price
+        self._revalue()
+
+    def _revalue(self):
+        """Recompute the portfolio value from balances and reference prices."""
+        prices = self._asset_prices
+        value = sum(amount * prices[asset] for balances in self._balances.values()
+                    for asset, amount in balances.items() if asset in prices)
+        self.portfolio_value = value or None  # nothing priced yet: skip the exposure check
+
+    def position(self, exchange_name: str, asset: str):
+        """Current balance of an asset on a venue, or None if no balances are known."""
+        balances = self._balances.get(exchange_name)
+        return None if balances is None else balances.get(asset, 0.0)
@@ -1,7 +1,7 @@
 # src/modules/risk_management/risk_manager.py
 
 import yaml
-from src.utils.logger import get_logger
+from src.modules.utils.logger import get_logger
 
 class RiskManager:
     def __init__(self, config_path="src/config/risk_config.yaml"):
@@ -95,23 +95,34 @@ class RiskManager:
 
         return True
 
-    def monitor_market_conditions(self, volatility, order_book_depth):
+    def monitor_market_conditions(self, volatility=None, order_book_depth=None, order_book=None, tick_buffer=None):
         """
         Check if market conditions meet risk thresholds.
 
         :param volatility: Current market volatility (%).
         :param order_book_depth: Depth of the order book ($).
+        :param order_book: Optional live OrderBook; when given, depth is measured from it within
+                           the configured depth band around the mid price.
+        :param tick_buffer: Optional TickRingBuffer; when given, its EWMA volatility is used, scaled
+                            to 'volatility_horizon_seconds' (default daily) to match the threshold.
         :return: Boolean indicating whether trading conditions are safe.
         """
         high_volatility_threshold = self.risk_settings.get("alert_thresholds", {}).get("high_volatility", 5)
         low_liquidity_threshold = self.risk_settings.get("alert_thresholds", {}).get("low_liquidity", 5000)
 
-        if volatility > high_volatility_threshold:
+        if order_book is not None:
+            depth_band_percent = self.risk_settings.get("depth_band_percent", 1)
+            order_book_depth = order_book.depth_notional(within_percent=depth_band_percent)
+
+        if tick_buffer is not None:
+            volatility = tick_buffer.volatility_percent(self.risk_settings.get("volatility_horizon_seconds", 86400))
+
+        if volatility is not None and volatility > high_volatility_threshold:
             self.logger.warning(f"High volatility detected ({volatility}%). Consider reducing exposure!")
             return False
 
-        if order_book_depth < low_liquidity_threshold:
+        if order_book_depth is not None and order_book_depth < low_liquidity_threshold:
             self.logger.warning(f"Low liquidity detected ({order_book_depth}). Trading may be risky!")
             return False
 
-        return True
\ No newline at end of file
+        return True
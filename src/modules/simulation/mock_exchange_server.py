@@ -0,0 +1,530 @@
+# src/modules/simulation/mock_exchange_server.py
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import ccxt
+from websockets.asyncio.server import serve
+from src.modules.utils.logger import get_logger
+from src.modules.datafeed.market_data import SymbolMap
+
+MOCK_EXCHANGES = ("binance", "coinbase", "kraken")
+
+
+def _dumps(message):
+    # Venues send compact JSON; the decoder's substring filters rely on it
+    return json.dumps(message, separators=(",", ":"))
+
+
+class MockMarket:
+    """
+    Synthetic order book and ticker for one symbol.
+
+    The mid price follows a random walk on the tick grid; every step regenerates the levels
+    around the new mid, keeping most sizes and re-drawing a few, so the book never crosses
+    and each step produces a realistic diff.
+    """
+
+    def __init__(self, symbol: str, mid: float = 100.0, tick_size: float = 0.1, levels: int = 50,
+                 change_probability: float = 0.1, rng: random.Random = None):
+        """
+        :param symbol: Unified symbol (e.g., 'BTC/USDT').
+        :param mid: Starting mid price.
+        :param tick_size: Price grid spacing.
+        :param levels: Levels maintained per side.
+        :param change_probability: Chance that a level's size is re-drawn on each step.
+        :param rng: Random source (seed it for reproducible runs).
+        """
+        self.symbol = symbol
+        self.tick_size = tick_size
+        self.price_decimals = max(0, -int(math.floor(math.log10(tick_size))))
+        self.levels = levels
+        self.change_probability = change_probability
+        self.rng = rng or random.Random()
+        self.mid_ticks = int(round(mid / tick_size))
+        self.bids, self.asks = {}, {}
+        self.update_id = 0
+        self.last = mid
+        self.volume = 0.0
+        self.lock = threading.Lock()
+        self.step()
+
+    def _price(self, ticks):
+        return round(ticks * self.tick_size, self.price_decimals)
+
+    def _size(self):
+        return round(self.rng.uniform(0.01, 5.0), 8)
+
+    def step(self):
+        """
+        Advance the market by one update.
+
+        :return: (bid_changes, ask_changes) as lists of (price, size), size 0 meaning removed.
+        """
+        with self.lock:
+            self.mid_ticks += self.rng.choice((-1, 0, 0, 1))
+            changes = []
+            for book, direction in ((self.bids, -1), (self.asks, 1)):
+                grid = {self._price(self.mid_ticks + direction * k) for k in range(1, self.levels + 1)}
+                side_changes = [(price, 0.0) for price in book if price not in grid]
+                for price, _ in side_changes:
+                    del book[price]
+                for price in grid:
+                    if price not in book or self.rng.random() < self.change_probability:
+                        book[price] = self._size()
+                        side_changes.append((price, book[price]))
+                changes.append(side_changes)
+            self.last = self._price(self.mid_ticks)
+            self.volume += self.rng.uniform(0, 1)
+            self.update_id += 1
+            return changes[0], changes[1]
+
+    def snapshot(self, depth: int = None):
+        """Return (bids best-first, asks best-first, update_id)."""
+        with self.lock:
+            bids = sorted(self.bids.items(), reverse=True)[:depth]
+            asks = sorted(self.asks.items())[:depth]
+            return bids, asks, self.update_id
+
+    def best(self):
+        """Return (best_bid, best_ask)."""
+        with self.lock:
+            return max(self.bids), min(self.asks)
+
+    def candle(self, open_time: int, interval_ms: int):
+        """Deterministic synthetic OHLCV candle for a given open time."""
+        base = self.last * (1 + 0.01 * math.sin(open_time / 3_600_000))
+        close = self.last * (1 + 0.01 * math.sin((open_time + interval_ms) / 3_600_000))
+        return [open_time, base, max(base, close) * 1.001, min(base, close) * 0.999, close, 10.0]
+
+
+class MockExchangeServer:
+    """
+    Local stand-in for Binance, Coinbase and Kraken market data.
+
+    One WebSocket server speaks each venue's ticker and depth protocol on its own path
+    (ws://host:port/binance, /coinbase, /kraken), and one HTTP server answers Binance-style
+    public REST calls (/api/v3/ticker/24hr, /depth, /klines, /time) so ccxt can be pointed at it.
+    Update rate, added latency, dropped updates (gaps) and forced disconnects are configurable.
+    """
+
+    def __init__(self, symbols=("BTC/USDT",), host: str = "127.0.0.1", ws_port: int = 0, rest_port: int = 0,
+                 message_rate: float = 100.0, latency: float = 0.0, gap_probability: float = 0.0,
+                 disconnect_after: int = None, levels: int = 50, seed: int = None):
+        """
+        :param symbols: Unified symbols served on every venue.
+        :param host: Interface to bind.
+        :param ws_port: WebSocket port (0 picks a free port).
+        :param rest_port: REST port (0 picks a free port).
+        :param message_rate: Market updates per second per symbol.
+        :param latency: Seconds added between producing a message and sending it, and to every REST reply.
+        :param gap_probability: Chance that a venue drops a depth update (simulates a sequence gap).
+        :param disconnect_after: Close each connection after this many messages (None never).
+        :param levels: Order book levels per side.
+        :param seed: Seed for reproducible markets.
+        """
+        self.logger = get_logger("MockExchangeServer")
+        self.host = host
+        self.ws_port = ws_port
+        self.rest_port = rest_port
+        self.message_rate = message_rate
+        self.latency = latency
+        self.gap_probability = gap_probability
+        self.disconnect_after = disconnect_after
+        self.rng = random.Random(seed)
+        self.markets = {symbol: MockMarket(symbol, levels=levels, rng=random.Random(self.rng.random()))
+                        for symbol in symbols}
+        # Venue wire symbol -> unified symbol
+        self.wire_symbols = {exchange: {SymbolMap.wire_symbol(exchange, symbol).upper(): symbol for symbol in symbols}
+                             for exchange in MOCK_EXCHANGES}
+        self.subscribers = {}  # (exchange, channel, symbol) -> set of connection queues
+        self.sent = 0
+        self._ws_server = None
+        self._http_server = None
+        self._publisher = None
+
+    @property
+    def ws_urls(self):
+        """Mapping of exchange name -> WebSocket URL, suitable for StreamManager(ws_urls=...)."""
+        return {exchange: f"ws://{self.host}:{self.ws_port}/{exchange}" for exchange in MOCK_EXCHANGES}
+
+    @property
+    def rest_url(self):
+        """Base URL of the Binance-style REST API."""
+        return f"http://{self.host}:{self.rest_port}"
+
+    async def start(self):
+        """Start the WebSocket server, the REST server and the market publisher."""
+        self._ws_server = await serve(self._handle_connection, self.host, self.ws_port)
+        self.ws_port = self._ws_server.sockets[0].getsockname()[1]
+        self._http_server = ThreadingHTTPServer((self.host, self.rest_port), self._rest_handler())
+        self.rest_port = self._http_server.server_address[1]
+        threading.Thread(target=self._http_server.serve_forever, daemon=True).start()
+        self._publisher = asyncio.ensure_future(self._publish())
+        self.logger.info(f"Mock exchange listening on ws://{self.host}:{self.ws_port} and {self.rest_url}")
+
+    async def stop(self):
+        """Stop publishing and shut both servers down."""
+        if self._publisher is not None:
+            self._publisher.cancel()
+            await asyncio.gather(self._publisher, return_exceptions=True)
+        if self._ws_server is not None:
+            self._ws_server.close()
+            await self._ws_server.wait_closed()
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+
+    def ccxt_client(self):
+        """
+        Return a ccxt.binance client whose public REST calls go to this server.
+
+        :return: ccxt exchange with markets preloaded for the served symbols.
+        """
+        return self.point_ccxt_client(ccxt.binance({"enableRateLimit": False}))
+
+    def point_ccxt_client(self, exchange):
+        """
+        Redirect an existing ccxt binance client (sync or async) to this server's REST API.
+
+        :param exchange: ccxt.binance or ccxt.async_support.binance instance.
+        :return: The same client, with markets preloaded for the served symbols.
+        """
+        exchange.urls["api"]["public"] = f"{self.rest_url}/api/v3"
+        markets = []
+        for symbol in self.markets:
+            base, quote = symbol.split("/")
+            markets.append({
+                "id": f"{base}{quote}", "symbol": symbol, "base": base, "quote": quote, "baseId": base,
+                "quoteId": quote, "type": "spot", "spot": True, "margin": False, "swap": False, "future": False,
+                "option": False, "contract": False, "linear": None, "inverse": None, "active": True,
+                "precision": {"amount": 1e-8, "price": 0.1},
+                "limits": {"amount": {"min": 1e-8, "max": None}, "price": {"min": None, "max": None},
+                           "cost": {"min": None, "max": None}},
+                "info": {}
+            })
+        exchange.set_markets(markets)
+        return exchange
+
+    # WebSocket side -------------------------------------------------------------------------
+
+    async def _handle_connection(self, connection):
+        exchange = connection.request.path.strip("/").lower()
+        if exchange not in MOCK_EXCHANGES:
+            await connection.close(code=1008, reason="unknown exchange")
+            return
+
+        queue = asyncio.Queue()
+        subscriptions = set()
+        sender = asyncio.ensure_future(self._send_loop(connection, queue))
+        try:
+            async for message in connection:
+                request = json.loads(message)
+                for reply in self._on_request(exchange, request, queue, subscriptions):
+                    queue.put_nowait((time.monotonic(), reply))
+        except Exception as e:
+            self.logger.debug(f"Mock {exchange} connection ended: {e}")
+        finally:
+            for key in subscriptions:
+                self.subscribers.get(key, set()).discard(queue)
+            sender.cancel()
+
+    async def _send_loop(self, connection, queue):
+        sent = 0
+        while True:
+            produced, frame = await queue.get()
+            if self.latency:
+                delay = produced + self.latency - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await connection.send(frame)
+            sent += 1
+            self.sent += 1
+            if self.disconnect_after and sent >= self.disconnect_after:
+                await connection.close(code=1011, reason="mock disconnect")
+                return
+
+    def _on_request(self, exchange, request, queue, subscriptions):
+        """Apply a (un)subscribe request and return the frames to send back."""
+        replies = []
+        if exchange == "binance":
+            subscribe = request.get("method") == "SUBSCRIBE"
+            for stream in request.get("params", []):
+                wire, channel = stream.split("@", 1)
+                keys = self._keys(exchange, "depth" if channel.startswith("depth") else channel, [wire])
+                self._update_subscriptions(keys, subscribe, queue, subscriptions)
+            replies.append(_dumps({"result": None, "id": request.get("id")}))
+        elif exchange == "coinbase":
+            subscribe = request.get("type") == "subscribe"
+            for channel in request.get("channels", []):
+                if isinstance(channel, str):
+                    channel = {"name": channel, "product_ids": request.get("product_ids", [])}
+                name = "depth" if channel["name"] in ("level2", "level2_batch") else channel["name"]
+                keys = self._keys(exchange, name, channel["product_ids"])
+                self._update_subscriptions(keys, subscribe, queue, subscriptions)
+                if subscribe and name == "depth":
+                    replies.extend(self._coinbase_snapshot(symbol) for _, _, symbol in keys)
+            replies.append(_dumps({"type": "subscriptions", "channels": request.get("channels", [])}))
+        elif exchange == "kraken":
+            subscribe = request.get("event") == "subscribe"
+            name = request.get("subscription", {}).get("name")
+            channel = "depth" if name == "book" else name
+            keys = self._keys(exchange, channel, request.get("pair", []))
+            self._update_subscriptions(keys, subscribe, queue, subscriptions)
+            for _, _, symbol in keys:
+                replies.append(_dumps({"event": "subscriptionStatus", "status": request.get("event") + "d",
+                                           "pair": SymbolMap.wire_symbol("kraken", symbol),
+                                           "subscription": request.get("subscription", {})}))
+                if subscribe and channel == "depth":
+                    replies.append(self._kraken_snapshot(symbol))
+        return replies
+
+    def _keys(self, exchange, channel, wire_symbols):
+        known = self.wire_symbols[exchange]
+        return [(exchange, channel, known[wire.upper()]) for wire in wire_symbols if wire.upper() in known]
+
+    def _update_subscriptions(self, keys, subscribe, queue, subscriptions):
+        for key in keys:
+            if subscribe:
+                self.subscribers.setdefault(key, set()).add(queue)
+                subscriptions.add(key)
+            else:
+                self.subscribers.get(key, set()).discard(queue)
+                subscriptions.discard(key)
+
+    async def _publish(self):
+        """Step every market at message_rate and fan the resulting frames out to subscribers."""
+        started = time.monotonic()
+        steps = 0
+        while True:
+            due = int((time.monotonic() - started) * self.message_rate) - steps
+            for _ in range(max(due, 0)):
+                steps += 1
+                for market in self.markets.values():
+                    self._broadcast(market, *market.step())
+            await asyncio.sleep(min(0.001, 1.0 / self.message_rate))
+
+    def _broadcast(self, market, bid_changes, ask_changes):
+        now = time.monotonic()
+        for exchange in MOCK_EXCHANGES:
+            ticker_queues = self.subscribers.get((exchange, "ticker", market.symbol))
+            if ticker_queues:
+                frame = getattr(self, f"_{exchange}_ticker")(market)
+                for queue in ticker_queues:
+                    queue.put_nowait((now, frame))
+            depth_queues = self.subscribers.get((exchange, "depth", market.symbol))
+            if depth_queues and (bid_changes or ask_changes):
+                if self.gap_probability and self.rng.random() < self.gap_probability:
+                    continue
+                frame = getattr(self, f"_{exchange}_depth")(market, bid_changes, ask_changes)
+                for queue in depth_queues:
+                    queue.put_nowait((now, frame))
+
+    # Venue message formats ------------------------------------------------------------------
+
+    def _levels(self, market, levels):
+        return [[f"{price:.{market.price_decimals}f}", f"{size:.8f}"] for price, size in levels]
+
+    def _binance_ticker(self, market):
+        bid, ask = market.best()
+        return _dumps({"e": "24hrTicker", "E": int(time.time() * 1000),
+                           "s": SymbolMap.wire_symbol("binance", market.symbol), "b": str(bid), "a": str(ask),
+                           "c": str(market.last), "v": f"{market.volume:.8f}"})
+
+    def _binance_depth(self, market, bid_changes, ask_changes):
+        return _dumps({"e": "depthUpdate", "E": int(time.time() * 1000),
+                           "s": SymbolMap.wire_symbol("binance", market.symbol),
+                           "U": market.update_id, "u": market.update_id,
+                           "b": self._levels(market, bid_changes), "a": self._levels(market, ask_changes)})
+
+    def _coinbase_ticker(self, market):
+        bid, ask = market.best()
+        return _dumps({"type": "ticker", "product_id": SymbolMap.wire_symbol("coinbase", market.symbol),
+                           "price": str(market.last), "best_bid": str(bid), "best_ask": str(ask),
+                           "volume_24h": f"{market.volume:.8f}",
+                           "time": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")})
+
+    def _coinbase_snapshot(self, symbol):
+        market = self.markets[symbol]
+        bids, asks, _ = market.snapshot()
+        return _dumps({"type": "snapshot", "product_id": SymbolMap.wire_symbol("coinbase", symbol),
+                           "bids": self._levels(market, bids), "asks": self._levels(market, asks)})
+
+    def _coinbase_depth(self, market, bid_changes, ask_changes):
+        changes = [["buy", *level] for level in self._levels(market, bid_changes)]
+        changes += [["sell", *level] for level in self._levels(market, ask_changes)]
+        return _dumps({"type": "l2update", "product_id": SymbolMap.wire_symbol("coinbase", market.symbol),
+                           "changes": changes,
+                           "time": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")})
+
+    def _kraken_channel_id(self, symbol):
+        return list(self.markets).index(symbol) + 1
+
+    def _kraken_ticker(self, market):
+        bid, ask = market.best()
+        return _dumps([self._kraken_channel_id(market.symbol),
+                           {"a": [str(ask), 1, "1.000"], "b": [str(bid), 1, "1.000"],
+                            "c": [str(market.last), "0.1"], "v": [f"{market.volume:.8f}", f"{market.volume:.8f}"]},
+                           "ticker", SymbolMap.wire_symbol("kraken", market.symbol)])
+
+    def _kraken_levels(self, market, levels):
+        timestamp = f"{time.time():.6f}"
+        return [level + [timestamp] for level in self._levels(market, levels)]
+
+    def _kraken_snapshot(self, symbol):
+        market = self.markets[symbol]
+        bids, asks, _ = market.snapshot()
+        return _dumps([self._kraken_channel_id(symbol),
+                           {"as": self._kraken_levels(market, asks), "bs": self._kraken_levels(market, bids)},
+                           "book-100", SymbolMap.wire_symbol("kraken", symbol)])
+
+    def _kraken_checksum(self, market):
+        bids, asks, _ = market.snapshot(10)
+        parts = []
+        for price, size in asks + bids:
+            parts.append(f"{price:.{market.price_decimals}f}".replace(".", "").lstrip("0"))
+            parts.append(f"{size:.8f}".replace(".", "").lstrip("0"))
+        return str(zlib.crc32("".join(parts).encode()))
+
+    def _kraken_depth(self, market, bid_changes, ask_changes):
+        payloads = []
+        if ask_changes:
+            payloads.append({"a": self._kraken_levels(market, ask_changes)})
+        if bid_changes:
+            payloads.append({"b": self._kraken_levels(market, bid_changes)})
+        payloads[-1]["c"] = self._kraken_checksum(market)
+        return _dumps([self._kraken_channel_id(market.symbol), *payloads, "book-100",
+                           SymbolMap.wire_symbol("kraken", market.symbol)])
+
+    # REST side ------------------------------------------------------------------------------
+
+    def _rest_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                if server.latency:
+                    time.sleep(server.latency)
+                status, body = server._rest_response(url.path, query)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                try:
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client gave up (e.g. a timeout test)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _rest_response(self, path, query):
+        """Answer a Binance v3 public REST call; returns (status, body)."""
+        if path == "/api/v3/ping":
+            return 200, {}
+        if path == "/api/v3/time":
+            return 200, {"serverTime": int(time.time() * 1000)}
+
+        market = self.markets.get(self.wire_symbols["binance"].get(query.get("symbol", "").upper()))
+        if market is None:
+            return 400, {"code": -1121, "msg": "Invalid symbol."}
+        now = int(time.time() * 1000)
+
+        if path == "/api/v3/ticker/24hr":
+            bid, ask = market.best()
+            return 200, {"symbol": query["symbol"], "bidPrice": str(bid), "askPrice": str(ask),
+                         "lastPrice": str(market.last), "openPrice": str(market.last), "highPrice": str(ask),
+                         "lowPrice": str(bid), "volume": f"{market.volume:.8f}", "quoteVolume": "0",
+                         "openTime": now - 86_400_000, "closeTime": now, "count": market.update_id}
+        if path == "/api/v3/depth":
+            bids, asks, update_id = market.snapshot(int(query.get("limit", 100)))
+            return 200, {"lastUpdateId": update_id, "bids": self._levels(market, bids),
+                         "asks": self._levels(market, asks)}
+        if path == "/api/v3/klines":
+            interval_ms = ccxt.Exchange.parse_timeframe(query.get("interval", "1h")) * 1000
+            limit = int(query.get("limit", 500))
+            start = int(query.get("startTime", now - limit * interval_ms))
+            start -= start % interval_ms
+            candles = []
+            for open_time in range(start, now, interval_ms):
+                if len(candles) == limit:
+                    break
+                row = market.candle(open_time, interval_ms)
+                candles.append([open_time, *(str(value) for value in row[1:]), open_time + interval_ms - 1,
+                                "0", 1, "0", "0", "0"])
+            return 200, candles
+        return 404, {"code": -1, "msg": f"Unknown endpoint {path}"}
+
+
+async def run_benchmark(seconds: float = 10.0, message_rate: float = 1000.0, symbols=("BTC/USDT", "ETH/USDT"),
+                        latency: float = 0.0, gap_probability: float = 0.0, disconnect_after: int = None):
+    """
+    Stream ticker and depth data from the mock server through StreamManager and the order book
+    engine on every venue, and report end-to-end throughput.
+
+    :return: Dictionary with messages, messages_per_second, synced_books and the datafeed counters.
+    """
+    from src.modules.datafeed.stream_manager import StreamManager
+    from src.modules.datafeed.order_book import OrderBookManager
+    from src.modules.utils.metrics import get_counters
+
+    server = MockExchangeServer(symbols=symbols, message_rate=message_rate, latency=latency,
+                                gap_probability=gap_probability, disconnect_after=disconnect_after, seed=1)
+    await server.start()
+    client = server.ccxt_client()
+    books = OrderBookManager(snapshot_fetcher=lambda exchange, symbol, limit: client.fetch_order_book(symbol, limit))
+    received = 0
+
+    def on_message(exchange_name, payload):
+        nonlocal received
+        received += 1
+        books.on_message(exchange_name, payload)
+
+    manager = StreamManager(ws_urls=server.ws_urls, on_message=on_message)
+    books.resubscriber = manager.resubscribe
+    for exchange in MOCK_EXCHANGES:
+        wire = [SymbolMap.wire_symbol(exchange, symbol) for symbol in symbols]
+        manager.add_stream(exchange, wire, channels=("ticker", "depth"))
+        for stream_symbol in wire:
+            books.track(exchange, stream_symbol)
+
+    get_counters("datafeed").reset()
+    started = time.monotonic()
+    runner = asyncio.ensure_future(manager.run())
+    await asyncio.sleep(seconds)
+    elapsed = time.monotonic() - started
+    await manager.stop()
+    runner.cancel()
+    await asyncio.gather(runner, return_exceptions=True)
+    await server.stop()
+    synced = sum(1 for book in books.books.values() if book.synced)
+    return {"messages": received, "messages_per_second": received / elapsed, "server_sent": server.sent,
+            "synced_books": f"{synced}/{len(books.books)}", "counters": get_counters("datafeed").snapshot()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline market-data throughput benchmark")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--rate", type=float, default=1000.0, help="updates per second per symbol")
+    parser.add_argument("--symbols", nargs="+", default=["BTC/USDT", "ETH/USDT"])
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of added latency")
+    parser.add_argument("--gap-probability", type=float, default=0.0)
+    parser.add_argument("--disconnect-after", type=int, default=None)
+    args = parser.parse_args()
+    report = asyncio.run(run_benchmark(args.seconds, args.rate, tuple(args.symbols), args.latency,
+                                       args.gap_probability, args.disconnect_after))
+    print(json.dumps(report, indent=2))
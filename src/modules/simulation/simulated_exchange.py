@@ -0,0 +1,666 @@
+# src/modules/simulation/simulated_exchange.py
+
+import asyncio
+import bisect
+import functools
+import itertools
+import random
+import threading
+import time
+from collections import deque
+
+import ccxt
+from src.modules.utils.logger import get_logger
+from src.modules.utils.metrics import get_counters
+from src.modules.simulation.mock_exchange_server import MockMarket
+
+EPSILON = 1e-12
+SIMULATED_RATE_LIMIT = 6_000_000  # requests per minute to register the simulator with, so load tests are not paced
+
+
+class SimulatedOrder:
+    """One order resting in or passing through the simulated book (external liquidity included)."""
+
+    __slots__ = ("id", "client_order_id", "symbol", "side", "type", "price", "amount", "filled", "cost", "fee",
+                 "status", "timestamp", "external", "reserve_rate")
+
+    def __init__(self, order_id, client_order_id, symbol, side, order_type, amount, price, external=False):
+        self.id = order_id
+        self.client_order_id = client_order_id
+        self.symbol = symbol
+        self.side = side
+        self.type = order_type
+        self.price = price
+        self.amount = amount
+        self.filled = 0.0
+        self.cost = 0.0
+        self.fee = 0.0
+        self.status = "open"
+        self.timestamp = int(time.time() * 1000)
+        self.external = external
+        self.reserve_rate = 0.0  # fee rate reserved on top of a resting buy's notional
+
+    @property
+    def remaining(self):
+        return self.amount - self.filled
+
+    def to_dict(self, quote=None):
+        """Return the order as a ccxt-shaped dict."""
+        return {
+            "id": self.id, "clientOrderId": self.client_order_id, "timestamp": self.timestamp, "datetime": None,
+            "lastTradeTimestamp": None, "symbol": self.symbol, "type": self.type, "timeInForce": None,
+            "side": self.side, "price": self.price, "amount": self.amount, "filled": self.filled,
+            "remaining": max(0.0, self.remaining), "cost": self.cost,
+            "average": self.cost / self.filled if self.filled else None, "status": self.status,
+            "fee": {"cost": self.fee, "currency": quote}, "trades": None, "info": {},
+        }
+
+
+class SimulatedBook:
+    """
+    Price-time priority order book for one symbol.
+
+    Each price level is a FIFO queue holding both external liquidity (from a synthetic or
+    recorded book) and this account's resting orders. Level prices are kept in ascending lists
+    for the best-price lookups.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.levels = {"buy": {}, "sell": {}}  # side -> {price: deque of SimulatedOrder}
+        self.prices = {"buy": [], "sell": []}  # side -> ascending level prices
+        self.external = {"buy": {}, "sell": {}}  # side -> {price: external SimulatedOrder}
+        self.last = None
+
+    def best(self, side):
+        prices = self.prices[side]
+        if not prices:
+            return None
+        return prices[-1] if side == "buy" else prices[0]
+
+    def add(self, order):
+        levels = self.levels[order.side]
+        queue = levels.get(order.price)
+        if queue is None:
+            queue = levels[order.price] = deque()
+            bisect.insort(self.prices[order.side], order.price)
+        queue.append(order)
+
+    def remove(self, order):
+        queue = self.levels[order.side].get(order.price)
+        if queue is None:
+            return
+        try:
+            queue.remove(order)
+        except ValueError:
+            return
+        if not queue:
+            self._drop_level(order.side, order.price)
+
+    def _drop_level(self, side, price):
+        del self.levels[side][price]
+        prices = self.prices[side]
+        del prices[bisect.bisect_left(prices, price)]
+
+    def pop_front(self, side, price):
+        """Remove the first order at a level (after it was filled)."""
+        queue = self.levels[side][price]
+        queue.popleft()
+        if not queue:
+            self._drop_level(side, price)
+
+    def set_external(self, side, price, size):
+        """
+        Set the external size at a level. Changed sizes keep their queue position; new
+        liquidity joins behind the orders already resting at that price.
+        """
+        current = self.external[side].get(price)
+        if size <= EPSILON:
+            if current is not None:
+                del self.external[side][price]
+                self.remove(current)
+            return
+        if current is not None:
+            current.amount, current.filled = size, 0.0
+            return
+        order = self.external[side][price] = SimulatedOrder(None, None, self.symbol, side, "limit", size, price,
+                                                            external=True)
+        self.add(order)
+
+    def depth(self, side, limit=None):
+        """Aggregated [price, size] levels, best first."""
+        prices = self.prices[side]
+        ordered = reversed(prices) if side == "buy" else prices
+        levels = []
+        for price in ordered:
+            levels.append([price, sum(order.remaining for order in self.levels[side][price])])
+            if limit is not None and len(levels) >= limit:
+                break
+        return levels
+
+
+def _request(method):
+    """Apply the latency model, then run the method under the exchange lock."""
+    @functools.wraps(method)
+    def call(self, *args, **kwargs):
+        delay = self.sample_latency()
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            return method(self, *args, **kwargs)
+    call.unwrapped = method
+    return call
+
+
+class SimulatedExchange:
+    """
+    Local matching engine with a ccxt-compatible interface, for paper trading and load tests.
+
+    Orders are matched with price-time priority against a book of external liquidity, either
+    synthetic (MockMarket random walks, advanced with step()) or loaded from recorded snapshots
+    and diffs (load_book(), apply_book_changes()), and against this account's own resting orders.
+    Limit orders fill partially and rest; market orders walk the book and expire any remainder;
+    postOnly, IOC and FOK are honoured. When external liquidity moves through a resting order it
+    fills at the order's price as maker. Fees are charged in the quote asset at the maker or taker
+    rate, balances are reserved while orders rest, and every request can be delayed by a fixed
+    plus random latency. Self-trades cancel the resting order.
+
+    The unified methods OrderManager, MultiExchangeConnector and the user-stream code use are
+    implemented with ccxt's signatures, results and exceptions, so the simulator can be
+    registered in the ExchangeRegistry in place of a real venue (see register()).
+    """
+
+    def __init__(self, exchange_id: str = "paper", symbols=("BTC/USDT",), balances: dict = None,
+                 maker_fee: float = 0.0002, taker_fee: float = 0.0005, latency: float = 0.0, jitter: float = 0.0,
+                 levels: int = 20, mid: float = 100.0, tick_size: float = 0.1, min_amount: float = 1e-8,
+                 user_state=None, seed: int = None):
+        """
+        :param exchange_id: Venue name the simulator is registered and reported under.
+        :param symbols: Unified symbols traded; each starts with a synthetic book around 'mid'.
+        :param balances: Starting free balances {asset: amount}; defaults to 1,000,000 of each quote
+            asset and 1,000 of each base asset.
+        :param maker_fee: Fee rate for resting orders that get filled.
+        :param taker_fee: Fee rate for orders that take liquidity.
+        :param latency: Seconds added to every request.
+        :param jitter: Extra uniformly random seconds (0..jitter) added to every request.
+        :param levels: Synthetic levels per side (0 starts with empty books, e.g. to load recordings).
+        :param mid: Starting mid price of the synthetic books.
+        :param tick_size: Price grid of the synthetic books.
+        :param min_amount: Minimum order amount reported in the markets.
+        :param user_state: Optional UserState to push order updates and balances to, like a user-data stream.
+        :param seed: Seed for reproducible synthetic markets and latencies.
+        """
+        self.logger = get_logger("SimulatedExchange")
+        self.counters = get_counters("simulated_exchange")
+        self.id = self.name = exchange_id
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.latency = latency
+        self.jitter = jitter
+        self.user_state = user_state
+        self.has = {"createOrders": True, "cancelOrders": True, "cancelAllOrders": True, "editOrder": True,
+                    "fetchOpenOrders": True, "fetchOrder": True, "fetchMyTrades": True}
+        self.rng = random.Random(seed)
+        self.markets = {}
+        self.books = {}
+        self.synthetic = {}
+        for symbol in symbols:
+            base, quote = symbol.split("/")
+            self.markets[symbol] = {
+                "id": symbol.replace("/", ""), "symbol": symbol, "base": base, "quote": quote, "type": "spot",
+                "spot": True, "active": True, "precision": {"amount": min_amount, "price": tick_size},
+                "limits": {"amount": {"min": min_amount, "max": None}, "price": {"min": None, "max": None},
+                           "cost": {"min": None, "max": None}},
+                "maker": maker_fee, "taker": taker_fee, "info": {},
+            }
+            self.books[symbol] = SimulatedBook(symbol)
+            if levels:
+                self.synthetic[symbol] = MockMarket(symbol, mid=mid, tick_size=tick_size, levels=levels,
+                                                    rng=random.Random(self.rng.random()))
+        self.symbols = list(self.markets)
+        if balances is None:
+            balances = {market[key]: 1_000_000.0 if key == "quote" else 1_000.0
+                        for market in self.markets.values() for key in ("base", "quote")}
+        self.balances = {asset: [float(amount), 0.0] for asset, amount in balances.items()}  # asset -> [free, used]
+        self._orders = {}  # id -> SimulatedOrder (every order of this account)
+        self._open = {}  # id -> SimulatedOrder
+        self._by_client = {}  # client order id -> open SimulatedOrder
+        self._trades = []  # (trade id, order id, symbol, side, amount, price, fee, maker, timestamp)
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        for symbol, market in self.synthetic.items():
+            bids, asks, _ = market.snapshot()
+            self._load(symbol, bids, asks)
+        if user_state is not None:
+            user_state.set_live(exchange_id, True)  # updates are pushed synchronously, so never stale
+            user_state.set_balances(exchange_id, self._balance_snapshot())
+
+    # Market data source ---------------------------------------------------------------------
+
+    def sample_latency(self):
+        """Seconds one request is delayed by."""
+        return self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def _load(self, symbol, bids, asks):
+        book = self.books[symbol]
+        for side, levels in (("buy", bids), ("sell", asks)):
+            keep = {price for price, _ in levels}
+            for price in [price for price in book.external[side] if price not in keep]:
+                book.set_external(side, price, 0.0)
+            for price, size in levels:
+                book.set_external(side, price, size)
+        self._uncross(book)
+
+    def load_book(self, symbol: str, bids, asks):
+        """
+        Replace a symbol's external liquidity with a snapshot (e.g. from a recording).
+
+        :param bids: [[price, size], ...].
+        :param asks: [[price, size], ...].
+        """
+        with self._lock:
+            self._load(symbol, bids, asks)
+
+    def apply_book_changes(self, symbol: str, bid_changes, ask_changes):
+        """
+        Apply an order book diff to a symbol's external liquidity.
+
+        :param bid_changes: [(price, size), ...], size 0 removing the level.
+        :param ask_changes: [(price, size), ...].
+        """
+        with self._lock:
+            book = self.books[symbol]
+            for side, changes in (("buy", bid_changes), ("sell", ask_changes)):
+                for price, size in changes:
+                    book.set_external(side, price, size)
+            self._uncross(book)
+
+    def step(self, symbol: str = None):
+        """Advance the synthetic market of one symbol (or all of them) by one update."""
+        for name in [symbol] if symbol else list(self.synthetic):
+            bid_changes, ask_changes = self.synthetic[name].step()
+            self.apply_book_changes(name, bid_changes, ask_changes)
+
+    # Matching --------------------------------------------------------------------------------
+
+    def _balance(self, asset):
+        balance = self.balances.get(asset)
+        if balance is None:
+            balance = self.balances[asset] = [0.0, 0.0]
+        return balance
+
+    def _reserve(self, order, market):
+        """Lock the funds a resting order could spend; raise InsufficientFunds if they are missing."""
+        if order.side == "buy":
+            order.reserve_rate = max(self.maker_fee, self.taker_fee)
+            asset, needed = market["quote"], order.remaining * order.price * (1 + order.reserve_rate)
+        else:
+            asset, needed = market["base"], order.remaining
+        balance = self._balance(asset)
+        if balance[0] + EPSILON < needed:
+            raise ccxt.InsufficientFunds(f"{self.id} {order.side} {order.amount} {order.symbol} needs {needed} "
+                                         f"{asset}, {balance[0]} free")
+        balance[0] -= needed
+        balance[1] += needed
+
+    def _release(self, order, market):
+        """Unlock what is still reserved for an order that stops resting."""
+        if order.type == "market" and order.side == "buy":
+            return
+        if order.side == "buy":
+            amount = order.remaining * order.price * (1 + order.reserve_rate)
+            balance = self._balance(market["quote"])
+        else:
+            amount = order.remaining
+            balance = self._balance(market["base"])
+        balance[0] += amount
+        balance[1] -= amount
+
+    def _fill(self, order, amount, price, maker, market, timestamp):
+        """Book one execution against an order of this account."""
+        notional = amount * price
+        fee = notional * (self.maker_fee if maker else self.taker_fee)
+        base, quote = self._balance(market["base"]), self._balance(market["quote"])
+        if order.side == "buy":
+            if order.type == "market":
+                quote[0] -= notional + fee
+            else:
+                reserved = amount * order.price * (1 + order.reserve_rate)
+                quote[1] -= reserved
+                quote[0] += reserved - notional - fee
+            base[0] += amount
+        else:
+            base[1] -= amount
+            quote[0] += notional - fee
+        order.filled += amount
+        order.cost += notional
+        order.fee += fee
+        self._trades.append((len(self._trades) + 1, order.id, order.symbol, order.side, amount, price, fee, maker,
+                             timestamp))
+        if order.remaining <= EPSILON:
+            order.status = "closed"
+            self._close(order)
+
+    def _close(self, order):
+        self._open.pop(order.id, None)
+        if order.client_order_id is not None:
+            self._by_client.pop(order.client_order_id, None)
+
+    def _trade(self, book, maker, taker, amount, price, market, timestamp):
+        """Execute between a resting order and an incoming one (either may be external liquidity)."""
+        if maker.external:
+            maker.filled += amount
+        else:
+            self._fill(maker, amount, price, True, market, timestamp)
+        if taker.external:
+            taker.filled += amount
+        else:
+            self._fill(taker, amount, price, False, market, timestamp)
+        book.last = price
+        self.counters.increment("trades")
+
+    def _match(self, book, order, market):
+        """Match an incoming order against the opposite side until it is filled or stops crossing."""
+        side = "sell" if order.side == "buy" else "buy"
+        buying = order.side == "buy"
+        levels, prices = book.levels[side], book.prices[side]
+        limit = order.price if order.type != "market" else None
+        timestamp = order.timestamp
+        touched = []
+        while order.remaining > EPSILON and prices:
+            best = prices[0] if buying else prices[-1]
+            if limit is not None and (best > limit if buying else best < limit):
+                break
+            maker = levels[best][0]
+            if not maker.external:
+                # Self-trade prevention: the resting order is cancelled
+                book.pop_front(side, best)
+                self._release(maker, market)
+                maker.status = "canceled"
+                self._close(maker)
+                touched.append(maker)
+                continue
+            amount = min(order.remaining, maker.remaining)
+            if buying and order.type == "market":
+                affordable = self._balance(market["quote"])[0] / (best * (1 + self.taker_fee))
+                amount = min(amount, affordable)
+                if amount <= EPSILON:
+                    break
+            self._trade(book, maker, order, amount, best, market, timestamp)
+            if maker.remaining <= EPSILON:
+                book.pop_front(side, best)
+                del book.external[side][best]
+        return touched
+
+    def _uncross(self, book):
+        """After external liquidity moved, fill resting orders it now crosses at their own price."""
+        market = self.markets[book.symbol]
+        timestamp = int(time.time() * 1000)
+        while book.prices["buy"] and book.prices["sell"]:
+            bid_price, ask_price = book.prices["buy"][-1], book.prices["sell"][0]
+            if bid_price < ask_price:
+                break
+            bid, ask = book.levels["buy"][bid_price][0], book.levels["sell"][ask_price][0]
+            maker, taker = (bid, ask) if not bid.external else (ask, bid)
+            amount = min(bid.remaining, ask.remaining)
+            self._trade(book, maker, taker, amount, maker.price, market, timestamp)
+            for order in (bid, ask):
+                if order.remaining <= EPSILON:
+                    book.pop_front(order.side, order.price)
+                    if order.external:
+                        del book.external[order.side][order.price]
+                    else:
+                        self._notify(order)
+            for order in (bid, ask):
+                if not order.external and order.remaining > EPSILON:
+                    self._notify(order)
+
+    def _notify(self, order):
+        """Push an order update, and the balances it moved, to the attached UserState."""
+        if self.user_state is None:
+            return
+        market = self.markets[order.symbol]
+        self.user_state.apply_order(self.id, order.to_dict(market["quote"]))
+        self.user_state.set_balances(self.id, self._balance_snapshot((market["base"], market["quote"])))
+
+    def _balance_snapshot(self, assets=None):
+        """{asset: {'free', 'used', 'total'}} for some or all assets."""
+        return {asset: {"free": free, "used": used, "total": free + used}
+                for asset, (free, used) in self.balances.items() if assets is None or asset in assets}
+
+    def _market(self, symbol):
+        market = self.markets.get(symbol)
+        if market is None:
+            raise ccxt.BadSymbol(f"{self.id} does not have market symbol {symbol}")
+        return market
+
+    def _create(self, symbol, order_type, side, amount, price=None, params=None):
+        market = self._market(symbol)
+        params = params or {}
+        if side not in ("buy", "sell"):
+            raise ccxt.InvalidOrder(f"{self.id} invalid order side {side}")
+        if order_type not in ("limit", "market"):
+            raise ccxt.InvalidOrder(f"{self.id} does not support {order_type} orders")
+        if amount is None or amount < market["limits"]["amount"]["min"]:
+            raise ccxt.InvalidOrder(f"{self.id} order amount {amount} is below the minimum")
+        if order_type == "limit" and (price is None or price <= 0):
+            raise ccxt.InvalidOrder(f"{self.id} limit orders need a positive price")
+        client_order_id = params.get("clientOrderId")
+        if client_order_id is not None and client_order_id in self._by_client:
+            # Refused like Binance -2010, which ccxt maps to InvalidOrder rather than DuplicateOrderId
+            raise ccxt.InvalidOrder(f"{self.id} Duplicate order sent. clientOrderId {client_order_id}")
+
+        book = self.books[symbol]
+        time_in_force = params.get("timeInForce", "GTC")
+        opposite = book.best("sell" if side == "buy" else "buy")
+        crosses = opposite is not None and (order_type == "market" or
+                                            (opposite <= price if side == "buy" else opposite >= price))
+        if crosses and (params.get("postOnly") or time_in_force == "PO"):
+            raise ccxt.OrderImmediatelyFillable(f"{self.id} postOnly order would cross at {opposite}")
+
+        order = SimulatedOrder(str(next(self._ids)), client_order_id, symbol, side, order_type, amount,
+                               price if order_type == "limit" else None)
+        if side == "sell" or order_type == "limit":  # market buys spend free quote as they fill
+            self._reserve(order, market)
+        self._orders[order.id] = order
+        self.counters.increment("orders")
+
+        if time_in_force == "FOK" and self._available(book, order) + EPSILON < amount:
+            order.status = "expired"
+            self._release(order, market)
+            self._notify(order)
+            return order.to_dict(market["quote"])
+
+        touched = self._match(book, order, market) if crosses else []
+        if order.remaining > EPSILON:
+            if order_type == "market" or time_in_force in ("IOC", "FOK"):
+                self._release(order, market)
+                order.status = "expired" if order.filled else "canceled"
+            else:
+                book.add(order)
+                self._open[order.id] = order
+                if client_order_id is not None:
+                    self._by_client[client_order_id] = order
+        for other in touched:
+            self._notify(other)
+        self._notify(order)
+        return order.to_dict(market["quote"])
+
+    def _available(self, book, order):
+        """External liquidity an order could take within its limit (for FOK)."""
+        side = "sell" if order.side == "buy" else "buy"
+        available = 0.0
+        for price in (book.prices[side] if order.side == "buy" else reversed(book.prices[side])):
+            if order.price is not None and (price > order.price if order.side == "buy" else price < order.price):
+                break
+            available += sum(maker.remaining for maker in book.levels[side][price] if maker.external)
+            if available >= order.amount:
+                break
+        return available
+
+    def _cancel(self, order_id):
+        order = self._open.get(str(order_id))
+        if order is None:
+            known = self._orders.get(str(order_id))
+            raise ccxt.OrderNotFound(f"{self.id} order {order_id} is {'not open' if known else 'unknown'}")
+        market = self.markets[order.symbol]
+        self.books[order.symbol].remove(order)
+        self._release(order, market)
+        order.status = "canceled"
+        self._close(order)
+        self._notify(order)
+        return order.to_dict(market["quote"])
+
+    # Unified ccxt API ----------------------------------------------------------------------
+
+    @_request
+    def load_markets(self, reload=False, params=None):
+        return self.markets
+
+    def set_markets(self, markets, currencies=None):
+        """Markets are fixed by the simulator's symbols; cached markets are ignored."""
+        return self.markets
+
+    @_request
+    def fetch_ticker(self, symbol, params=None):
+        self._market(symbol)
+        book = self.books[symbol]
+        bid, ask = book.best("buy"), book.best("sell")
+        last = book.last if book.last is not None else (bid + ask) / 2 if bid and ask else None
+        return {"symbol": symbol, "timestamp": int(time.time() * 1000), "datetime": None, "bid": bid, "ask": ask,
+                "last": last, "close": last, "info": {}}
+
+    @_request
+    def fetch_order_book(self, symbol, limit=None, params=None):
+        self._market(symbol)
+        book = self.books[symbol]
+        return {"symbol": symbol, "bids": book.depth("buy", limit), "asks": book.depth("sell", limit),
+                "timestamp": int(time.time() * 1000), "datetime": None, "nonce": None}
+
+    @_request
+    def fetch_balance(self, params=None):
+        result = {"free": {}, "used": {}, "total": {}, "info": {}}
+        for asset, balance in self._balance_snapshot().items():
+            result[asset] = balance
+            for key in ("free", "used", "total"):
+                result[key][asset] = balance[key]
+        return result
+
+    @_request
+    def create_order(self, symbol, type, side, amount, price=None, params=None):
+        return self._create(symbol, type, side, amount, price, params)
+
+    def create_limit_order(self, symbol, side, amount, price, params=None):
+        return self.create_order(symbol, "limit", side, amount, price, params)
+
+    def create_market_order(self, symbol, side, amount, price=None, params=None):
+        return self.create_order(symbol, "market", side, amount, None, params)
+
+    @_request
+    def create_orders(self, orders, params=None):
+        """Place a batch; rejected orders come back with status 'rejected', as venues report them."""
+        results = []
+        for request in orders:
+            try:
+                results.append(self._create(request["symbol"], request["type"], request["side"], request["amount"],
+                                            request.get("price"), request.get("params")))
+            except ccxt.ExchangeError as e:
+                results.append({"id": None, "clientOrderId": (request.get("params") or {}).get("clientOrderId"),
+                                "symbol": request["symbol"], "status": "rejected", "info": {"error": str(e)}})
+        return results
+
+    @_request
+    def edit_order(self, id, symbol, type, side, amount=None, price=None, params=None):
+        """Cancel and re-place an order (a new id, at the back of the new level's queue)."""
+        current = self._open.get(str(id))
+        if current is None:
+            raise ccxt.OrderNotFound(f"{self.id} order {id} is not open")
+        self._cancel(id)
+        return self._create(symbol, type, side, amount if amount is not None else current.remaining,
+                            price if price is not None else current.price, params)
+
+    @_request
+    def cancel_order(self, id, symbol=None, params=None):
+        return self._cancel(id)
+
+    @_request
+    def cancel_orders(self, ids, symbol=None, params=None):
+        results = []
+        for order_id in ids:
+            try:
+                results.append(self._cancel(order_id))
+            except ccxt.OrderNotFound:
+                continue
+        return results
+
+    @_request
+    def cancel_all_orders(self, symbol=None, params=None):
+        return [self._cancel(order.id) for order in list(self._open.values())
+                if symbol is None or order.symbol == symbol]
+
+    @_request
+    def fetch_order(self, id, symbol=None, params=None):
+        order = self._orders.get(str(id))
+        if order is None:
+            raise ccxt.OrderNotFound(f"{self.id} order {id} not found")
+        return order.to_dict(self.markets[order.symbol]["quote"])
+
+    @_request
+    def fetch_open_orders(self, symbol=None, since=None, limit=None, params=None):
+        return [order.to_dict(self.markets[order.symbol]["quote"]) for order in self._open.values()
+                if symbol is None or order.symbol == symbol][:limit]
+
+    @_request
+    def fetch_my_trades(self, symbol=None, since=None, limit=None, params=None):
+        trades = []
+        for trade_id, order_id, trade_symbol, side, amount, price, fee, maker, timestamp in self._trades:
+            if (symbol is None or trade_symbol == symbol) and (since is None or timestamp >= since):
+                trades.append({"id": str(trade_id), "order": order_id, "symbol": trade_symbol, "side": side,
+                               "amount": amount, "price": price, "cost": amount * price, "timestamp": timestamp,
+                               "takerOrMaker": "maker" if maker else "taker",
+                               "fee": {"cost": fee, "currency": self.markets[trade_symbol]["quote"]}, "info": {}})
+        return trades[-limit:] if limit else trades
+
+    def close(self):
+        return None
+
+    def async_client(self):
+        """Return an async view of this simulator for the ccxt.async_support code paths."""
+        return AsyncSimulatedExchange(self)
+
+
+class AsyncSimulatedExchange:
+    """
+    ccxt.async_support-style view of a SimulatedExchange: the same unified methods as
+    coroutines, with the latency awaited instead of slept, on the same books and balances.
+    """
+
+    def __init__(self, exchange: SimulatedExchange):
+        self.exchange = exchange
+
+    def __getattr__(self, name):
+        attribute = getattr(self.exchange, name)
+        target = getattr(getattr(type(self.exchange), name, None), "unwrapped", None)
+        if target is None:
+            return attribute
+        exchange = self.exchange
+
+        async def call(*args, **kwargs):
+            delay = exchange.sample_latency()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            with exchange._lock:
+                return target(exchange, *args, **kwargs)
+        return call
+
+    async def create_limit_order(self, symbol, side, amount, price, params=None):
+        return await self.create_order(symbol, "limit", side, amount, price, params)
+
+    async def create_market_order(self, symbol, side, amount, price=None, params=None):
+        return await self.create_order(symbol, "market", side, amount, None, params)
+
+    def open(self):
+        return None
+
+    async def close(self):
+        return None
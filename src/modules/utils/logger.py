@@ -1,6 +1,7 @@
 # src/modules/utils/logger.py
 
 import logging
+import time
 
 def get_logger(name):
     """
@@ -19,8 +20,52 @@ def get_logger(name):
         logger.addHandler(handler)
 
     return logger
-    
-  
 
-import logging
 
+class RateLimitedLogger:
+    """
+    Wraps a logger for hot paths: each message key is emitted at most once per interval and
+    the number of suppressed occurrences is appended to the next emitted line. Formatting is
+    deferred, so suppressed calls cost a dict lookup and a clock read.
+    """
+
+    def __init__(self, logger, interval: float = 5.0):
+        """
+        :param logger: Underlying logging.Logger.
+        :param interval: Minimum seconds between two emissions of the same key.
+        """
+        self.logger = logger
+        self.interval = interval
+        self._last_emit = {}
+        self._suppressed = {}
+
+    def log(self, level, key, message, *args):
+        """
+        Log a %-style message unless the key was emitted within the interval.
+
+        :param level: logging level (e.g., logging.INFO).
+        :param key: Identifier used for rate limiting (e.g., 'binance.message_error').
+        :param message: %-style format string.
+        :param args: Format arguments, only applied if the line is emitted.
+        """
+        now = time.monotonic()
+        if now - self._last_emit.get(key, float("-inf")) < self.interval:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return
+        self._last_emit[key] = now
+        suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            message = f"{message} ({suppressed} similar messages suppressed)"
+        self.logger.log(level, message, *args)
+
+    def debug(self, key, message, *args):
+        self.log(logging.DEBUG, key, message, *args)
+
+    def info(self, key, message, *args):
+        self.log(logging.INFO, key, message, *args)
+
+    def warning(self, key, message, *args):
+        self.log(logging.WARNING, key, message, *args)
+
+    def error(self, key, message, *args):
+        self.log(logging.ERROR, key, message, *args)
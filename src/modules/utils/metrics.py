@@ -0,0 +1,189 @@
+# src/modules/utils/metrics.py
+
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Counters:
+    """Thread-safe set of named, monotonically increasing event counters."""
+
+    def __init__(self):
+        self._values = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: int = 1):
+        """
+        Add to a counter.
+
+        :param name: Counter name (e.g., 'binance.reconnects').
+        :param amount: Amount to add.
+        """
+        with self._lock:
+            self._values[name] += amount
+
+    def get(self, name: str):
+        """Return the current value of a counter (0 if never incremented)."""
+        return self._values.get(name, 0)
+
+    def snapshot(self):
+        """Return a copy of all counters."""
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self):
+        """Clear every counter."""
+        with self._lock:
+            self._values.clear()
+
+
+_counters = {}
+_counters_lock = threading.Lock()
+
+
+def get_counters(namespace: str):
+    """
+    Return the process-wide Counters instance for a namespace.
+
+    :param namespace: Subsystem name (e.g., 'datafeed').
+    :return: Shared Counters instance.
+    """
+    with _counters_lock:
+        if namespace not in _counters:
+            _counters[namespace] = Counters()
+        return _counters[namespace]
+
+
+class LatencyHistogram:
+    """
+    Thread-safe latency distribution with logarithmic buckets (about 5% relative precision).
+
+    Memory is fixed however many samples are recorded, so every call can be timed. Besides
+    the percentiles it keeps an exponentially weighted recent average, which reacts to a
+    degrading venue within a few calls.
+    """
+
+    GROWTH = 1.05  # ratio between consecutive bucket bounds
+    MIN_SECONDS = 1e-5  # bucket 0 upper bound (10 microseconds)
+
+    def __init__(self, alpha: float = 0.2):
+        """
+        :param alpha: Weight of the newest sample in the recent average.
+        """
+        self.alpha = alpha
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = None
+        self._buckets = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _bucket(self, seconds):
+        if seconds <= self.MIN_SECONDS:
+            return 0
+        return int(math.ceil(math.log(seconds / self.MIN_SECONDS, self.GROWTH)))
+
+    def record(self, seconds: float):
+        """
+        Add one sample.
+
+        :param seconds: Measured latency in seconds.
+        """
+        with self._lock:
+            self._buckets[self._bucket(seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            self.recent = seconds if self.recent is None else self.recent + self.alpha * (seconds - self.recent)
+
+    def percentile(self, p: float):
+        """
+        Return the latency below which 'p' percent of samples fall (bucket upper bound).
+
+        :param p: Percentile between 0 and 100.
+        :return: Seconds, or None if nothing was recorded.
+        """
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, math.ceil(self.count * p / 100))
+            seen = 0
+            for bucket in sorted(self._buckets):
+                seen += self._buckets[bucket]
+                if seen >= rank:
+                    return min(self.MIN_SECONDS * self.GROWTH ** bucket, self.max)
+            return self.max
+
+    def snapshot(self):
+        """Return count, mean, p50, p90, p99, max and recent (seconds)."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max if self.count else None,
+            "recent": self.recent,
+        }
+
+
+class Latencies:
+    """Named LatencyHistograms, e.g. one per '<exchange>.<endpoint>'."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str):
+        """Return the histogram for a name, creating it on first use."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def record(self, name: str, seconds: float):
+        """Add a sample to a named histogram."""
+        self.histogram(name).record(seconds)
+
+    @contextmanager
+    def time(self, name: str):
+        """
+        Time the enclosed block into a named histogram (also when it raises).
+
+        :param name: Histogram name (e.g., 'binance.create_order').
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def snapshot(self):
+        """Return each histogram's summary, keyed by name."""
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histogram.snapshot() for name, histogram in histograms.items()}
+
+    def reset(self):
+        """Drop every histogram."""
+        with self._lock:
+            self._histograms.clear()
+
+
+_latencies = {}
+
+
+def get_latencies(namespace: str):
+    """
+    Return the process-wide Latencies instance for a namespace.
+
+    :param namespace: Subsystem name (e.g., 'exchange').
+    :return: Shared Latencies instance.
+    """
+    with _counters_lock:
+        if namespace not in _latencies:
+            _latencies[namespace] = Latencies()
+        return _latencies[namespace]
@@ -0,0 +1,166 @@
+# src/tests/conftest.py
+
+import itertools
+import os
+import threading
+import ccxt
+import pytest
+from unittest.mock import patch
+from src.modules.order_management.order_manager import OrderManager
+from src.modules.exchange_connector.exchange_registry import ExchangeRegistry
+
+MOCK_SECRETS = {"exchanges": {"binance": {"api_key": "key", "api_secret": "secret"}}}
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: wall-clock performance check, run only with RUN_BENCHMARKS=1")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmark-marked tests unless RUN_BENCHMARKS is set; timings are unreliable on shared machines."""
+    if os.environ.get("RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="benchmark; set RUN_BENCHMARKS=1 to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+class FakeExchange:
+    """
+    In-memory venue standing in for a ccxt client, for the order path and historical candles.
+
+    Keeps every order it accepts in 'orders' (id -> ccxt-shaped order) and records each call in
+    'calls' as (method, argument), or (method, symbol, since) for candles. Behaviour is switched per test:
+    - has: capabilities, native batches on and editOrder off by default.
+    - reject_batch: batch endpoints refuse, like venues whose batches are contract only.
+    - amend_in_place: editOrder keeps the order id and fills, like Kraken's AmendOrder (which does
+      not accept a new clientOrderId); otherwise it cancels and replaces the order.
+    - max_limit: fewer candles per fetch_ohlcv call than asked, like Coinbase's 300.
+    """
+
+    def __init__(self):
+        self.has = {"createOrders": True, "cancelOrders": True, "cancelAllOrders": False, "editOrder": False}
+        self.reject_batch = False
+        self.amend_in_place = False
+        self.max_limit = None
+        self.orders = {}
+        self.calls = []
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def _order(self, symbol, side, amount, price, params=None):
+        with self.lock:
+            order = {"id": str(next(self.ids)), "clientOrderId": (params or {}).get("clientOrderId"),
+                     "symbol": symbol, "side": side, "amount": amount, "price": price, "status": "open",
+                     "filled": 0.0}
+            self.orders[order["id"]] = order
+            return dict(order)
+
+    def _cancel(self, order_id):
+        with self.lock:
+            order = self.orders.get(order_id)
+            if order is None or order["status"] != "open":
+                raise ccxt.OrderNotFound(order_id)
+            order["status"] = "canceled"
+            return dict(order)
+
+    def fill(self, order_id, amount):
+        """Fill part of a resting order on the venue side; returns the updated order."""
+        with self.lock:
+            order = self.orders[order_id]
+            order["filled"] += amount
+            if order["filled"] >= order["amount"]:
+                order["status"] = "closed"
+            return dict(order)
+
+    def create_order(self, symbol, order_type, side, amount, price=None, params=None):
+        self.calls.append(("create_order", symbol))
+        return self._order(symbol, side, amount, price, params)
+
+    def create_orders(self, orders):
+        self.calls.append(("create_orders", len(orders)))
+        if self.reject_batch:
+            raise ccxt.BadRequest("batch orders are contract only")
+        return [self._order(o["symbol"], o["side"], o["amount"], o["price"], o.get("params")) for o in orders]
+
+    def edit_order(self, order_id, symbol, order_type, side, amount, price, params=None):
+        self.calls.append(("edit_order", order_id))
+        if not self.amend_in_place:
+            self._cancel(order_id)
+            return self._order(symbol, side, amount, price, params)
+        if (params or {}).get("clientOrderId"):
+            raise ccxt.OrderNotFound("unknown cl_ord_id")
+        with self.lock:
+            order = self.orders[order_id]
+            order.update(amount=amount, price=price)
+            return dict(order)
+
+    def cancel_order(self, order_id, symbol=None):
+        self.calls.append(("cancel_order", order_id))
+        return self._cancel(order_id)
+
+    def cancel_orders(self, ids, symbol=None):
+        self.calls.append(("cancel_orders", len(ids)))
+        results = []
+        for order_id in ids:
+            try:
+                results.append(self._cancel(order_id))
+            except ccxt.OrderNotFound:
+                pass
+        return results
+
+    def fetch_open_orders(self, symbol=None):
+        self.calls.append(("fetch_open_orders", symbol))
+        with self.lock:
+            return [dict(order) for order in self.orders.values()
+                    if order["status"] == "open" and symbol in (None, order["symbol"])]
+
+    def fetch_order(self, order_id, symbol=None):
+        self.calls.append(("fetch_order", order_id))
+        with self.lock:
+            if order_id not in self.orders:
+                raise ccxt.OrderNotFound(order_id)
+            return dict(self.orders[order_id])
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        """Synthetic candles from 'since', one per timeframe step."""
+        self.calls.append(("fetch_ohlcv", symbol, since))
+        step = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        return [[since + i * step, 1.0, 1.0, 1.0, 1.0, 1.0] for i in range(min(limit, self.max_limit or limit))]
+
+
+@pytest.fixture
+def fake_exchange():
+    """Fixture providing a fresh FakeExchange."""
+    return FakeExchange()
+
+
+@pytest.fixture
+def make_order_manager():
+    """
+    Fixture providing a factory for OrderManagers with mocked configuration files.
+
+    The factory takes the exchanges to trade on (left to the registry if None), the configuration
+    returned for both the order config and the secrets, and OrderManager keyword arguments.
+    Every manager made is closed after the test.
+    """
+    managers = []
+
+    def make(exchanges=None, config=MOCK_SECRETS, registry=None, **kwargs):
+        with patch("src.modules.order_management.order_manager.OrderManager._load_yaml", return_value=config):
+            manager = OrderManager(registry=registry or ExchangeRegistry(), **kwargs)
+        if exchanges is not None:
+            manager.exchanges = exchanges
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.close()
+
+
+@pytest.fixture
+def order_manager(make_order_manager, fake_exchange):
+    """Fixture providing an OrderManager trading on fake_exchange as "binance"."""
+    return make_order_manager({"binance": fake_exchange})
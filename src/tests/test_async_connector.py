@@ -0,0 +1,86 @@
+# src/tests/test_async_connector.py
+
+import asyncio
+import time
+from src.modules.exchange_connector.async_connector import AsyncExchangeConnector
+from src.modules.exchange_connector.exchange_registry import ExchangeRegistry
+from src.modules.simulation.mock_exchange_server import MockExchangeServer
+from src.modules.utils.metrics import get_counters
+
+
+def _connector(timeout):
+    connector = AsyncExchangeConnector(secrets_path="missing.yaml", timeout=timeout, registry=ExchangeRegistry())
+    connector.secrets = {"exchanges": {"binance": {}}}
+    return connector
+
+
+def test_fan_out_fetches_from_one_shared_session():
+    """Test concurrent requests share one async client and all complete."""
+    async def scenario():
+        server = MockExchangeServer(symbols=("BTC/USDT", "ETH/USDT"), seed=1)
+        await server.start()
+        async with _connector(timeout=5.0) as connector:
+            server.point_ccxt_client(connector.client("binance"))
+            tickers = await asyncio.gather(*(connector.fetch_ticker("binance", symbol)
+                                             for symbol in ("BTC/USDT", "ETH/USDT") * 5))
+            fanned = await connector.fetch_tickers("BTC/USDT")
+            same_client = connector.client("binance") is connector.client("binance")
+        await server.stop()
+        return tickers, fanned, same_client
+
+    tickers, fanned, same_client = asyncio.run(scenario())
+    assert same_client
+    assert all(ticker["bid"] < ticker["ask"] for ticker in tickers)
+    assert fanned["binance"]["symbol"] == "BTC/USDT"
+
+
+def test_slow_venue_times_out_without_blocking_loop():
+    """Test a request past its deadline returns None while other coroutines keep running."""
+    async def scenario():
+        server = MockExchangeServer(seed=1, latency=0.5)
+        await server.start()
+        async with _connector(timeout=0.1) as connector:
+            server.point_ccxt_client(connector.client("binance"))
+            connector.client("binance").open()  # build the SSL context and session up front, not mid-deadline
+            ticks = 0
+
+            async def heartbeat():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            beat = asyncio.ensure_future(heartbeat())
+            started = time.monotonic()
+            result = await connector.fetch_ticker("binance", "BTC/USDT")
+            elapsed = time.monotonic() - started
+            beat.cancel()
+        await server.stop()
+        return result, elapsed, ticks
+
+    timeouts_before = get_counters("exchange").get("binance.timeouts")
+    result, elapsed, ticks = asyncio.run(scenario())
+    assert result is None
+    assert elapsed < 0.4
+    assert ticks >= 5
+    assert get_counters("exchange").get("binance.timeouts") == timeouts_before + 1
+
+
+def test_only_read_only_calls_are_retried():
+    """Test a timed-out create_order is attempted once while reads are retried up to 'retries' times."""
+    calls = []
+
+    async def attempt(exchange_name, method, *args, timeout=None, **kwargs):
+        calls.append(method)
+        raise asyncio.TimeoutError()
+
+    async def scenario():
+        connector = _connector(timeout=0.1)
+        connector.retries = 2
+        connector.attempt = attempt
+        order = await connector.create_order("binance", "BTC/USDT", "limit", "buy", 1.0, 100.0, {"clientOrderId": "a"})
+        ticker = await connector.fetch_ticker("binance", "BTC/USDT")
+        return order, ticker
+
+    assert asyncio.run(scenario()) == (None, None)
+    assert calls == ["create_order", "fetch_ticker", "fetch_ticker", "fetch_ticker"]
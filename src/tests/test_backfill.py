@@ -0,0 +1,53 @@
+# src/tests/test_backfill.py
+
+import time
+from src.modules.datafeed.backfill import HistoricalBackfill
+from src.modules.datafeed.ohlcv_store import OHLCVStore
+
+MINUTE = 60_000
+BASE = 1_700_000_000_000 - 1_700_000_000_000 % MINUTE
+
+
+def test_backfill_pages_merges_and_skips_cached(tmp_path, fake_exchange):
+    """Test ranges are paged, stored without duplicates, and cached ranges are not refetched."""
+    store = OHLCVStore(str(tmp_path))
+    store.write("binance", "BTC/USDT", "1m", [[BASE + i * MINUTE, 1, 1, 1, 1, 1] for i in range(100)])
+    backfill = HistoricalBackfill({"binance": fake_exchange, "kraken": fake_exchange}, store,
+                                  rate_limits={"binance": 60_000, "kraken": 60_000}, page_limit=300)
+
+    report = backfill.run([
+        ("binance", "BTC/USDT", "1m", BASE, BASE + 999 * MINUTE),
+        ("kraken", "BTC/USD", "1m", BASE, BASE + 499 * MINUTE),
+    ])
+
+    assert [since for _, symbol, since in fake_exchange.calls if symbol == "BTC/USDT"] == \
+        [BASE + 100 * MINUTE + i * 300 * MINUTE for i in range(3)]
+    assert report["pages"] == 5 and report["failed_pages"] == 0
+    assert report["candles"] == 900 + 500
+    assert report["candles_per_second"] > 0
+    assert len(store.load("binance", "BTC/USDT", "1m")) == 1000
+    assert len(store.load("kraken", "BTC/USD", "1m")) == 500
+
+
+def test_backfill_respects_venue_rate_limit(tmp_path, fake_exchange):
+    """Test requests to one venue are spaced by its requests-per-minute limit."""
+    backfill = HistoricalBackfill({"binance": fake_exchange}, OHLCVStore(str(tmp_path)),
+                                  rate_limits={"binance": 600}, page_limit=10)
+    started = time.monotonic()
+    report = backfill.run([("binance", "BTC/USDT", "1m", BASE, BASE + 29 * MINUTE)])
+    assert report["pages"] == 3
+    assert time.monotonic() - started >= 0.2
+
+
+def test_short_pages_from_capped_venues_are_continued(tmp_path, fake_exchange):
+    """Test a venue returning fewer candles than asked (Coinbase: 300) still fills the whole range."""
+    store = OHLCVStore(str(tmp_path))
+    coinbase = fake_exchange
+    coinbase.max_limit = 300
+    backfill = HistoricalBackfill({"coinbase": coinbase}, store, rate_limits={"coinbase": 60_000}, page_limit=1000)
+
+    report = backfill.run([("coinbase", "BTC/USD", "1m", BASE, BASE + 999 * MINUTE)])
+
+    assert [since for _, _, since in coinbase.calls] == [BASE + i * 300 * MINUTE for i in range(4)]
+    assert report["pages"] == 1 and report["candles"] == 1000
+    assert store.missing_ranges("coinbase", "BTC/USD", "1m", BASE, BASE + 999 * MINUTE) == []
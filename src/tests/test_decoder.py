@@ -0,0 +1,65 @@
+# src/tests/test_decoder.py
+
+from unittest.mock import patch
+from src.modules.datafeed.decoder import MessageDecoder
+
+
+def test_skipped_frames_are_not_parsed():
+    """Test that acks, heartbeats and unsubscribed channels never reach the JSON parser."""
+    decoder = MessageDecoder("coinbase", channels=("ticker",))
+    with patch("src.modules.datafeed.decoder.json_loads") as mock_loads:
+        assert decoder.decode('{"type":"heartbeat","sequence":1}') is None
+        assert decoder.decode('{"type":"l2update","product_id":"BTC-USD","changes":[]}') is None
+        mock_loads.assert_not_called()
+
+
+def test_binance_ticker_extraction():
+    """Test Binance 24hrTicker frames become Ticker records."""
+    decoder = MessageDecoder("binance")
+    channel, ticker = decoder.decode(
+        '{"e":"24hrTicker","E":1700000000000,"s":"BTCUSDT","b":"99.5","a":"100.5","c":"100.0","v":"12.5"}'
+    )
+    assert channel == "ticker"
+    assert (ticker.symbol, ticker.bid, ticker.ask, ticker.last, ticker.volume) == ("BTC/USDT", 99.5, 100.5, 100.0, 12.5)
+    assert ticker.timestamp == 1700000000000
+
+
+def test_coinbase_and_kraken_ticker_extraction():
+    """Test Coinbase and Kraken ticker frames share the same record layout."""
+    _, coinbase = MessageDecoder("coinbase").decode(
+        '{"type":"ticker","product_id":"BTC-USD","price":"100.0","best_bid":"99.0","best_ask":"101.0",'
+        '"volume_24h":"7.0","time":"2024-01-01T00:00:00.000000Z"}'
+    )
+    _, kraken = MessageDecoder("kraken").decode(
+        '[340,{"a":["101.0",1,"1.0"],"b":["99.0",1,"1.0"],"c":["100.0","0.1"],"v":["3.0","7.0"]},"ticker","XBT/USD"]'
+    )
+    assert (coinbase.bid, coinbase.ask, coinbase.last, coinbase.volume) == (99.0, 101.0, 100.0, 7.0)
+    assert coinbase.timestamp == 1704067200000
+    assert coinbase.symbol == kraken.symbol == "BTC/USD"
+    assert (kraken.symbol, kraken.bid, kraken.ask, kraken.last, kraken.volume) == ("BTC/USD", 99.0, 101.0, 100.0, 7.0)
+
+
+def test_depth_frames_pass_through_parsed():
+    """Test depth frames are parsed and handed on for the order book engine."""
+    channel, data = MessageDecoder("binance").decode(
+        '{"e":"depthUpdate","E":1,"s":"BTCUSDT","U":1,"u":2,"b":[["100","1"]],"a":[]}'
+    )
+    assert channel == "depth"
+    assert data["u"] == 2
+
+
+def test_trade_extraction_uses_taker_side():
+    """Test trade frames become Trade records with the taker side on every venue."""
+    _, binance = MessageDecoder("binance").decode(
+        '{"e":"trade","E":2,"s":"ETHUSDT","t":7,"p":"2000.0","q":"0.5","T":1,"m":true}'
+    )
+    _, coinbase = MessageDecoder("coinbase").decode(
+        '{"type":"match","trade_id":9,"product_id":"ETH-USD","price":"2000.0","size":"0.5","side":"sell",'
+        '"time":"2024-01-01T00:00:00Z"}'
+    )
+    _, kraken = MessageDecoder("kraken").decode(
+        '[42,[["2000.0","0.5","1704067200.5","b","l",""],["2001.0","0.1","1704067201.0","s","m",""]],"trade","ETH/USD"]'
+    )
+    assert (binance[0].symbol, binance[0].side, binance[0].price) == ("ETH/USDT", "sell", 2000.0)
+    assert (coinbase[0].symbol, coinbase[0].side) == ("ETH/USD", "buy")
+    assert [(trade.side, trade.timestamp) for trade in kraken] == [("buy", 1704067200500), ("sell", 1704067201000)]
@@ -0,0 +1,61 @@
+# src/tests/test_event_bus.py
+
+import asyncio
+from src.modules.datafeed.event_bus import EventBus, CONFLATE
+
+
+def test_topic_wildcards_route_events():
+    """Test subscribers only receive events whose exchange/symbol/channel match their pattern."""
+    bus = EventBus()
+    btc_tickers = bus.subscribe(symbol="BTC/USDT", channel="ticker")
+    binance_all = bus.subscribe(exchange="binance")
+
+    assert bus.publish("binance", "BTC/USDT", "ticker", 1) == 2
+    assert bus.publish("kraken", "BTC/USDT", "ticker", 2) == 1
+    assert bus.publish("binance", "ETH/USDT", "trade", 3) == 1
+
+    assert [btc_tickers.get_nowait()[1], btc_tickers.get_nowait()[1]] == [1, 2]
+    assert [binance_all.get_nowait()[1], binance_all.get_nowait()[1]] == [1, 3]
+    assert btc_tickers.get_nowait() is None
+
+
+def test_slow_subscribers_are_bounded_without_affecting_others():
+    """Test drop-oldest and conflating queues stay bounded while a fast consumer sees every event."""
+    bus = EventBus()
+    fast = bus.subscribe(maxsize=10_000)
+    bounded = bus.subscribe(maxsize=3)
+    latest = bus.subscribe(policy=CONFLATE)
+
+    for price in range(100):
+        bus.publish("binance", "BTC/USDT", "ticker", price)
+        bus.publish("binance", "ETH/USDT", "ticker", -price)
+
+    assert len(fast) == 200
+    assert [bounded.get_nowait()[1] for _ in range(3)] == [-98, 99, -99]
+    assert bounded.stats()["dropped"] == 197
+    assert latest.get_nowait() == (("binance", "BTC/USDT", "ticker"), 99)
+    assert latest.get_nowait() == (("binance", "ETH/USDT", "ticker"), -99)
+    assert latest.stats()["conflated"] == 198
+
+
+def test_async_consumer_receives_events_until_closed():
+    """Test async iteration delivers published events and ends when the subscription closes."""
+    bus = EventBus()
+
+    async def scenario():
+        subscription = bus.subscribe(channel="trade")
+        received = []
+
+        async def consume():
+            async for topic, event in subscription:
+                received.append(event)
+
+        consumer = asyncio.ensure_future(consume())
+        for value in range(3):
+            bus.publish("kraken", "BTC/USD", "trade", value)
+            await asyncio.sleep(0)
+        subscription.close()
+        await asyncio.wait_for(consumer, 1)
+        return received
+
+    assert asyncio.run(scenario()) == [0, 1, 2]
@@ -0,0 +1,61 @@
+# src/tests/test_exchange_registry.py
+
+import threading
+import time
+from unittest.mock import patch
+from src.modules.exchange_connector.exchange_registry import ExchangeRegistry
+from src.modules.arbitrage.arbitrage_detector import ArbitrageDetector
+
+MOCK_SECRETS = {"exchanges": {"binance": {"api_key": "key", "api_secret": "secret"}}}
+
+
+def test_clients_are_shared_per_credentials():
+    """Test concurrent callers get one client per exchange and API key."""
+    registry = ExchangeRegistry()
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(registry.get("binance", "key", "secret")))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(client is clients[0] for client in clients)
+    assert clients[0].apiKey == "key"
+    assert registry.get("binance", "other", "secret") is not clients[0]
+    assert registry.clients_for(MOCK_SECRETS)["binance"] is clients[0]
+
+
+def test_markets_load_once_under_concurrency():
+    """Test racing ensure_markets calls trigger a single load_markets."""
+    registry = ExchangeRegistry()
+    client = registry.get("binance")
+    calls = []
+
+    def slow_load(reload=False):
+        calls.append(reload)
+        time.sleep(0.05)
+        client.markets = {"BTC/USDT": {}}
+        return client.markets
+
+    with patch.object(client, "load_markets", side_effect=slow_load):
+        threads = [threading.Thread(target=registry.ensure_markets, args=(client,)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(calls) == 1
+
+
+def test_arbitrage_detector_reuses_order_manager_clients():
+    """Test the detector and its order manager share clients and no second risk manager is built."""
+    registry = ExchangeRegistry()
+    with patch("src.modules.arbitrage.arbitrage_detector.ArbitrageDetector._load_yaml", return_value=MOCK_SECRETS), \
+            patch("src.modules.order_management.order_manager.OrderManager._load_yaml", return_value=MOCK_SECRETS):
+        detector = ArbitrageDetector(registry=registry)
+    assert detector.exchanges["binance"] is detector.order_manager.exchanges["binance"]
+
+    with patch("src.modules.arbitrage.arbitrage_detector.ArbitrageDetector._load_yaml", return_value=MOCK_SECRETS), \
+            patch("src.modules.arbitrage.arbitrage_detector.OrderManager") as order_manager_class:
+        ArbitrageDetector(registry=registry, order_manager=detector.order_manager)
+    order_manager_class.assert_not_called()
@@ -0,0 +1,70 @@
+# src/tests/test_latency.py
+
+import random
+import time
+from unittest.mock import patch
+from src.modules.utils.metrics import LatencyHistogram, Latencies
+from src.modules.exchange_connector.exchange_registry import ExchangeRegistry
+from src.modules.exchange_connector.venue_router import VenueRouter
+from src.modules.arbitrage.arbitrage_detector import ArbitrageDetector
+
+
+def test_histogram_percentiles_within_bucket_precision():
+    """Test p50/p99 match the exact sample percentiles to within the 5% bucket width."""
+    rng = random.Random(7)
+    samples = [rng.lognormvariate(-4, 0.8) for _ in range(20_000)]
+    histogram = LatencyHistogram()
+    for sample in samples:
+        histogram.record(sample)
+
+    ordered = sorted(samples)
+    for p in (50, 99):
+        exact = ordered[int(len(ordered) * p / 100) - 1]
+        assert abs(histogram.percentile(p) - exact) / exact < 0.06
+    assert histogram.snapshot()["count"] == 20_000 and histogram.snapshot()["max"] == max(samples)
+
+
+def test_throttled_calls_are_timed_per_venue_and_endpoint():
+    """Test every call through the registry lands in its '<exchange>.<method>' histogram, failures included."""
+    registry = ExchangeRegistry()
+    registry.latencies = Latencies()
+
+    class Client:
+        def fetch_ticker(self, symbol):
+            time.sleep(0.01)
+            return {"last": 1}
+
+        def cancel_order(self, order_id):
+            raise RuntimeError("venue down")
+
+    client = Client()
+    for _ in range(3):
+        registry.throttled("kraken", client, "fetch_ticker")("BTC/USD")
+    try:
+        registry.throttled("kraken", client, "cancel_order")("1")
+    except RuntimeError:
+        pass
+
+    snapshot = registry.latencies.snapshot()
+    assert snapshot["kraken.fetch_ticker"]["count"] == 3 and snapshot["kraken.fetch_ticker"]["p50"] >= 0.01
+    assert snapshot["kraken.cancel_order"]["count"] == 1
+
+
+def test_router_prefers_fast_venue_for_arbitrage_legs():
+    """Test venues quoting within tolerance are chosen by recent order latency, unmeasured venues last."""
+    latencies = Latencies()
+    for _ in range(5):
+        latencies.record("binance.create_order", 0.200)
+        latencies.record("kraken.create_order", 0.020)
+        latencies.record("coinbase.create_order", 0.050)
+    router = VenueRouter(latencies=latencies)
+    assert router.rank(["bitstamp", "binance", "kraken"]) == ["kraken", "binance", "bitstamp"]
+
+    config = {"arbitrage": {"min_profit_percent": 0.5, "fee_tracking": False, "routing_tolerance_percent": 0.1}}
+    with patch("src.modules.arbitrage.arbitrage_detector.ArbitrageDetector._load_yaml", return_value=config):
+        detector = ArbitrageDetector(registry=ExchangeRegistry(), order_manager=object(), router=router)
+    detector.exchanges = {"binance": None, "kraken": None, "coinbase": None}
+    prices = {"binance": 100.0, "kraken": 100.05, "coinbase": 101.0}
+    with patch.object(ArbitrageDetector, "get_price_data", side_effect=lambda exchange, symbol: prices[exchange]):
+        opportunity = detector.detect_arbitrage("BTC/USDT")
+    assert opportunity["buy_exchange"] == "kraken" and opportunity["sell_exchange"] == "coinbase"
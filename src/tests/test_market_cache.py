@@ -0,0 +1,84 @@
+# src/tests/test_market_cache.py
+
+import json
+import os
+import time
+from unittest.mock import patch
+from src.modules.exchange_connector.exchange_registry import ExchangeRegistry
+from src.modules.exchange_connector.market_cache import MarketMetadataCache
+
+MARKETS = {
+    "BTC/USDT": {"id": "BTCUSDT", "symbol": "BTC/USDT", "base": "BTC", "quote": "USDT", "type": "spot", "spot": True,
+                 "maker": 0.001, "taker": 0.001, "precision": {"amount": 0.00001, "price": 0.01},
+                 "limits": {"amount": {"min": 0.00001, "max": 9000}}},
+}
+
+
+def load_markets_into(client):
+    """Return a load_markets replacement that installs MARKETS and records its calls."""
+    calls = []
+
+    def load_markets(reload=False):
+        calls.append(reload)
+        client.set_markets(MARKETS)
+        return client.markets
+    return load_markets, calls
+
+
+def test_new_clients_are_primed_from_disk(tmp_path):
+    """Test markets loaded once are written to disk and a new process's client starts without load_markets."""
+    registry = ExchangeRegistry(market_cache=MarketMetadataCache(str(tmp_path)))
+    client = registry.get("binance")
+    load_markets, _ = load_markets_into(client)
+    with patch.object(client, "load_markets", side_effect=load_markets):
+        registry.ensure_markets(client)
+    assert os.path.exists(tmp_path / "binance.json")
+
+    cache = MarketMetadataCache(str(tmp_path))
+    started = time.monotonic()
+    primed = ExchangeRegistry(market_cache=cache).get("binance")
+    assert time.monotonic() - started < 1.0
+    assert primed.market("BTC/USDT")["id"] == "BTCUSDT"
+    assert cache.min_trade_size("binance", "BTC/USDT") == 0.00001
+    assert cache.fees("binance", "BTC/USDT") == {"maker": 0.001, "taker": 0.001}
+    assert cache.load("binance-sandbox") is None
+
+
+def test_stale_cache_is_served_and_refreshed_in_background(tmp_path):
+    """Test a stale entry still primes the client while a background thread reloads and rewrites it."""
+    with open(tmp_path / "binance.json", "w") as file:
+        json.dump({"fetched_at": 0, "markets": MARKETS, "currencies": None}, file)
+    cache = MarketMetadataCache(str(tmp_path), ttl=60)
+    registry = ExchangeRegistry(market_cache=cache)
+
+    with patch.object(MarketMetadataCache, "refresh_in_background") as refresh:
+        client = registry.get("binance")
+    assert client.markets and refresh.call_count == 1
+
+    load_markets, calls = load_markets_into(client)
+    with patch.object(client, "load_markets", side_effect=load_markets):
+        cache.refresh_in_background(client).join(timeout=5)
+    assert calls == [True]
+    assert cache.is_fresh(cache.load("binance"))
+
+
+def test_background_refresh_goes_through_the_registry_rate_limit_and_market_lock(tmp_path):
+    """Test a stale entry is refreshed with the registry's loader: rate-limited and under the market lock."""
+    with open(tmp_path / "binance.json", "w") as file:
+        json.dump({"fetched_at": 0, "markets": MARKETS, "currencies": None}, file)
+    cache = MarketMetadataCache(str(tmp_path), ttl=60)
+    registry = ExchangeRegistry(market_cache=cache)
+    with patch.object(MarketMetadataCache, "refresh_in_background") as refresh:
+        client = registry.get("binance")
+    assert refresh.call_args.args[1] == registry.reload_markets
+
+    lock = registry._market_locks[id(client)]
+    load_markets, _ = load_markets_into(client)
+    locked = []
+    with patch.object(client, "load_markets", side_effect=lambda reload: locked.append(lock.locked())
+                      or load_markets(reload)), \
+            patch.object(registry.rate_limiter("binance"), "acquire_for") as acquire:
+        cache.refresh_in_background(client, registry.reload_markets).join(timeout=5)
+    assert locked == [True]
+    assert acquire.call_args.args[0] == "load_markets"
+    assert cache.is_fresh(cache.load("binance"))
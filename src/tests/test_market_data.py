@@ -0,0 +1,34 @@
+# src/tests/test_market_data.py
+
+from src.modules.datafeed.market_data import SymbolMap, Ticker, normalize_symbol
+
+
+def test_normalize_symbol_across_venues():
+    """Test that every venue's wire format maps to the same unified symbol."""
+    assert normalize_symbol("binance", "BTCUSDT") == "BTC/USDT"
+    assert normalize_symbol("binance", "btcusdt") == "BTC/USDT"
+    assert normalize_symbol("coinbase", "BTC-USD") == "BTC/USD"
+    assert normalize_symbol("kraken", "XBT/USD") == "BTC/USD"
+
+
+def test_unregistered_symbols_are_parsed_and_cached():
+    """Test that unseen symbols are split on known quote currencies once and cached."""
+    symbols = SymbolMap(pairs=())
+    assert symbols.to_unified("binance", "SOLFDUSD") == "SOL/FDUSD"
+    assert symbols.to_unified("binance", "DOGEUSDC") == "DOGE/USDC"
+    assert ("binance", "SOLFDUSD") in symbols._to_unified
+
+
+def test_to_exchange_formats_wire_symbols():
+    """Test unified symbols are rendered in each exchange's wire format."""
+    symbols = SymbolMap()
+    assert symbols.to_exchange("binance", "ETH/USDT") == "ETHUSDT"
+    assert symbols.to_exchange("coinbase", "ETH/USD") == "ETH-USD"
+    assert symbols.to_exchange("kraken", "BTC/USD") == "XBT/USD"
+
+
+def test_ticker_from_ccxt():
+    """Test REST tickers convert to the same record type as streamed ones."""
+    ticker = Ticker.from_ccxt("binance", {"symbol": "BTC/USDT", "bid": 1.0, "ask": 2.0, "last": 1.5,
+                                          "baseVolume": 10.0, "timestamp": 5})
+    assert (ticker.symbol, ticker.bid, ticker.ask, ticker.last, ticker.volume) == ("BTC/USDT", 1.0, 2.0, 1.5, 10.0)
@@ -0,0 +1,43 @@
+# src/tests/test_mock_exchange_server.py
+
+import asyncio
+from src.modules.simulation.mock_exchange_server import MockExchangeServer, run_benchmark
+
+
+def test_ccxt_client_reads_mock_rest_endpoints():
+    """Test ccxt can fetch ticker, order book and candles from the local REST server."""
+    async def scenario():
+        server = MockExchangeServer(symbols=("BTC/USDT",), seed=1)
+        await server.start()
+        try:
+            client = server.ccxt_client()
+            ticker = await asyncio.to_thread(client.fetch_ticker, "BTC/USDT")
+            book = await asyncio.to_thread(client.fetch_order_book, "BTC/USDT", 5)
+            candles = await asyncio.to_thread(client.fetch_ohlcv, "BTC/USDT", "1h", None, 3)
+        finally:
+            await server.stop()
+        return ticker, book, candles
+
+    ticker, book, candles = asyncio.run(scenario())
+    assert ticker["bid"] < ticker["ask"]
+    assert len(book["bids"]) == 5 and book["bids"][0][0] < book["asks"][0][0]
+    assert book["nonce"] >= 1
+    assert len(candles) == 3
+
+
+def test_benchmark_syncs_books_on_every_venue():
+    """Test ticker and depth streams from all three venues build consistent local books."""
+    report = asyncio.run(run_benchmark(seconds=1.0, message_rate=100, symbols=("BTC/USDT",)))
+    assert report["messages"] > 100
+    assert report["synced_books"] == "3/3"
+    assert report["counters"].get("kraken.checksum_mismatches", 0) == 0
+
+
+def test_injected_gaps_and_disconnects_are_detected():
+    """Test dropped depth updates trigger resyncs and forced disconnects trigger reconnects."""
+    report = asyncio.run(run_benchmark(seconds=1.5, message_rate=100, symbols=("BTC/USDT",),
+                                       gap_probability=0.2, disconnect_after=60))
+    counters = report["counters"]
+    assert counters.get("binance.sequence_gaps", 0) > 0
+    assert counters.get("kraken.checksum_mismatches", 0) > 0
+    assert counters.get("binance.reconnects", 0) > 0
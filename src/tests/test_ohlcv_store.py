@@ -0,0 +1,76 @@
+# src/tests/test_ohlcv_store.py
+
+import numpy as np
+from src.modules.datafeed.ohlcv_store import OHLCVStore
+
+HOUR = 3_600_000
+BASE = 1_700_000_000_000 - 1_700_000_000_000 % HOUR
+
+
+def _candles(start, count):
+    return [[start + i * HOUR, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10.0] for i in range(count)]
+
+
+def test_write_merges_and_loads_memory_mapped(tmp_path):
+    """Test writes merge by timestamp (new rows win) and reads are memory-mapped and columnar."""
+    store = OHLCVStore(str(tmp_path))
+    store.write("binance", "BTC/USDT", "1h", _candles(BASE, 3))
+    updated = _candles(BASE + 2 * HOUR, 2)
+    updated[0][4] = 555.0
+    assert store.write("binance", "BTC/USDT", "1h", updated) == 4
+
+    cached = store.load("binance", "BTC/USDT", "1h")
+    assert isinstance(cached, np.memmap)
+    assert cached.flags.f_contiguous
+    assert list(cached[:, 0]) == [BASE + i * HOUR for i in range(4)]
+    assert cached[2, 4] == 555.0
+
+
+def test_missing_ranges_finds_head_gap_and_tail(tmp_path):
+    """Test missing_ranges reports head, interior gap and tail ranges."""
+    store = OHLCVStore(str(tmp_path))
+    store.write("binance", "BTC/USDT", "1h", _candles(BASE + 2 * HOUR, 2) + _candles(BASE + 6 * HOUR, 2))
+    assert store.missing_ranges("binance", "BTC/USDT", "1h", BASE, BASE + 9 * HOUR) == [
+        (BASE, BASE + HOUR), (BASE + 4 * HOUR, BASE + 5 * HOUR), (BASE + 8 * HOUR, BASE + 9 * HOUR)
+    ]
+    assert store.missing_ranges("binance", "BTC/USDT", "1h", BASE + 2 * HOUR, BASE + 3 * HOUR) == []
+
+
+def test_get_downloads_only_missing_ranges(tmp_path):
+    """Test a warm cache serves repeated requests without calling the fetcher again."""
+    store = OHLCVStore(str(tmp_path))
+    calls = []
+
+    def fetcher(start, end):
+        calls.append((start, end))
+        return _candles(start, (end - start) // HOUR + 1)
+
+    first = store.get("binance", "BTC/USDT", "1h", BASE, BASE + 9 * HOUR, fetcher=fetcher)
+    second = store.get("binance", "BTC/USDT", "1h", BASE + 3 * HOUR, BASE + 5 * HOUR, fetcher=fetcher)
+    extended = store.get("binance", "BTC/USDT", "1h", BASE, BASE + 11 * HOUR, fetcher=fetcher)
+
+    assert len(first) == 10 and len(second) == 3 and len(extended) == 12
+    assert calls == [(BASE, BASE + 9 * HOUR), (BASE + 10 * HOUR, BASE + 11 * HOUR)]
+
+
+def test_ranges_without_candles_are_fetched_once(tmp_path):
+    """Test a range the venue returns no candles for is remembered and the series is written once per get()."""
+    store = OHLCVStore(str(tmp_path))
+    store.write("binance", "BTC/USDT", "1h", _candles(BASE + 4 * HOUR, 2))
+    calls, writes = [], []
+    write = store.write
+    store.write = lambda *args: writes.append(args) or write(*args)
+
+    def fetcher(start, end):  # listed at BASE + 2h: nothing before it
+        calls.append((start, end))
+        return [row for row in _candles(start, (end - start) // HOUR + 1) if row[0] >= BASE + 2 * HOUR]
+
+    first = store.get("binance", "BTC/USDT", "1h", BASE, BASE + 9 * HOUR, fetcher=fetcher)
+    second = store.get("binance", "BTC/USDT", "1h", BASE, BASE + 9 * HOUR, fetcher=fetcher)
+
+    assert len(first) == len(second) == 8
+    assert calls == [(BASE, BASE + 3 * HOUR), (BASE + 6 * HOUR, BASE + 9 * HOUR)]
+    assert len(writes) == 1
+    assert store.covered("binance", "BTC/USDT", "1h").tolist() == [
+        [BASE, BASE + 3 * HOUR], [BASE + 6 * HOUR, BASE + 9 * HOUR]
+    ]
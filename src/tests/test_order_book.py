@@ -0,0 +1,150 @@
+# src/tests/test_order_book.py
+
+import asyncio
+import pytest
+from src.modules.datafeed.order_book import OrderBook, OrderBookManager
+
+
+@pytest.fixture
+def book():
+    """Fixture with a small synced BTC/USDT book."""
+    order_book = OrderBook("binance", "BTC/USDT")
+    order_book.apply_snapshot(
+        bids=[["100.0", "1.0"], ["99.0", "2.0"], ["98.0", "3.0"]],
+        asks=[["101.0", "1.5"], ["102.0", "2.5"]],
+        update_id=10
+    )
+    return order_book
+
+
+def test_best_levels_and_top(book):
+    """Test best bid/ask and ordered top-N lookups."""
+    assert book.best_bid() == (100.0, 1.0)
+    assert book.best_ask() == (101.0, 1.5)
+    assert book.mid_price() == 100.5
+    assert book.top(2) == {"bids": [(100.0, 1.0), (99.0, 2.0)], "asks": [(101.0, 1.5), (102.0, 2.5)]}
+
+
+def test_apply_diff_updates_inserts_and_removes(book):
+    """Test that diffs set absolute sizes and zero sizes remove levels."""
+    book.apply_diff(bids=[["100.0", "0"], ["99.5", "4.0"]], asks=[["100.8", "0.5"], ["102.0", "0"]], update_id=11)
+
+    assert book.best_bid() == (99.5, 4.0)
+    assert book.best_ask() == (100.8, 0.5)
+    assert book.asks.top(5) == [(100.8, 0.5), (101.0, 1.5)]
+    assert book.last_update_id == 11
+
+
+def test_depth_notional_within_band(book):
+    """Test liquidity measured within a percentage band around the mid."""
+    # Mid is 100.5; a 1% band covers bids >= 99.495 and asks <= 101.505
+    assert book.depth_notional(within_percent=1) == pytest.approx(100.0 * 1.0 + 101.0 * 1.5)
+
+
+def test_manager_buffers_binance_diffs_until_snapshot():
+    """Test that Binance diffs are layered on top of the REST snapshot."""
+    snapshot = {"bids": [[100.0, 1.0]], "asks": [[101.0, 1.0]], "nonce": 5}
+    manager = OrderBookManager(snapshot_fetcher=lambda exchange, symbol, limit: snapshot)
+    manager.track("binance", "BTCUSDT", "BTC/USDT")
+
+    manager.on_message("binance", {"e": "depthUpdate", "s": "BTCUSDT", "U": 4, "u": 5,
+                                   "b": [["90.0", "9.0"]], "a": []})
+    manager.on_message("binance", {"e": "depthUpdate", "s": "BTCUSDT", "U": 6, "u": 7,
+                                   "b": [["100.5", "2.0"]], "a": []})
+
+    book = manager.get("binance", "BTC/USDT")
+    assert book.best_bid() == (100.5, 2.0)
+    assert book.bids.top(5) == [(100.5, 2.0), (100.0, 1.0)]
+    assert book.last_update_id == 7
+
+
+def test_manager_applies_coinbase_level2():
+    """Test Coinbase level2 snapshot and l2update handling."""
+    manager = OrderBookManager()
+    manager.track("coinbase", "BTC-USD", "BTC/USD")
+    manager.on_message("coinbase", {"type": "snapshot", "product_id": "BTC-USD",
+                                    "bids": [["100", "1"]], "asks": [["101", "1"]]})
+    manager.on_message("coinbase", {"type": "l2update", "product_id": "BTC-USD",
+                                    "changes": [["buy", "100", "0"], ["sell", "100.5", "3"]]})
+
+    book = manager.get("coinbase", "BTC/USD")
+    assert book.best_bid() is None
+    assert book.best_ask() == (100.5, 3.0)
+
+
+def test_binance_gap_triggers_snapshot_resync():
+    """Test that a skipped update id re-fetches the snapshot and counts the gap."""
+    snapshots = [
+        {"bids": [[100.0, 1.0]], "asks": [[101.0, 1.0]], "nonce": 5},
+        {"bids": [[99.0, 1.0]], "asks": [[101.0, 1.0]], "nonce": 20},
+    ]
+    manager = OrderBookManager(snapshot_fetcher=lambda exchange, symbol, limit: snapshots.pop(0))
+    manager.track("binance", "BTCUSDT", "BTC/USDT")
+    gaps_before = manager.counters.get("binance.sequence_gaps")
+
+    manager.on_message("binance", {"e": "depthUpdate", "s": "BTCUSDT", "U": 6, "u": 6, "b": [], "a": []})
+    manager.on_message("binance", {"e": "depthUpdate", "s": "BTCUSDT", "U": 15, "u": 21,
+                                   "b": [["99.5", "2.0"]], "a": []})
+
+    book = manager.get("binance", "BTC/USDT")
+    assert manager.counters.get("binance.sequence_gaps") == gaps_before + 1
+    assert book.last_update_id == 21
+    assert book.bids.top(5) == [(99.5, 2.0), (99.0, 1.0)]
+
+
+def test_kraken_checksum_mismatch_requests_resubscribe():
+    """Test that a Kraken checksum mismatch resubscribes the pair."""
+    resubscribed = []
+    manager = OrderBookManager(resubscriber=lambda exchange, symbol: resubscribed.append((exchange, symbol)))
+    book = manager.track("kraken", "XBT/USD", "BTC/USD")
+    manager.on_message("kraken", [1, {"as": [["101.0", "1.00000000", "1"]], "bs": [["100.0", "2.00000000", "1"]]},
+                                  "book-100", "XBT/USD"])
+
+    book.asks.update(100.5, 1.0)
+    valid = manager._kraken_checksum(book)
+    book.asks.update(100.5, 0.0)
+    manager.on_message("kraken", [1, {"a": [["100.5", "1.00000000", "2"]], "c": str(valid)}, "book-100", "XBT/USD"])
+    assert manager.get("kraken", "BTC/USD") is not None
+    assert resubscribed == []
+
+    manager.on_message("kraken", [1, {"b": [["100.2", "1.00000000", "3"]], "c": "12345"}, "book-100", "XBT/USD"])
+    assert manager.get("kraken", "BTC/USD") is None
+    assert resubscribed == [("kraken", "XBT/USD")]
+
+
+def test_failed_resubscribe_lets_the_next_resync_retry():
+    """Test a resubscribe that was not sent does not leave the book waiting for a snapshot forever."""
+    attempts = []
+
+    def resubscriber(exchange, symbol):
+        attempts.append(symbol)
+        if len(attempts) == 1:
+            raise ConnectionError("socket closed")
+        return False
+
+    manager = OrderBookManager(resubscriber=resubscriber)
+    book = manager.track("kraken", "XBT/USD", "BTC/USD")
+    try:
+        manager.resync(book)
+    except ConnectionError:
+        pass
+    manager.resync(book)
+    manager.resync(book)
+    assert attempts == ["XBT/USD"] * 3
+
+
+def test_pending_resubscribe_holds_until_it_is_sent():
+    """Test a resubscribe task blocks further resyncs until it finishes, and releases them if it failed."""
+    async def run():
+        sent = asyncio.get_running_loop().create_future()
+        attempts = []
+        manager = OrderBookManager(resubscriber=lambda exchange, symbol: attempts.append(symbol) or sent)
+        book = manager.track("kraken", "XBT/USD", "BTC/USD")
+        manager.resync(book)
+        manager.resync(book)
+        assert len(attempts) == 1
+        sent.set_result(False)
+        await asyncio.sleep(0)
+        manager.resync(book)
+        assert len(attempts) == 2
+    asyncio.run(run())
@@ -0,0 +1,177 @@
+# src/tests/test_order_journal.py
+
+import os
+import threading
+from unittest.mock import patch
+from src.modules.order_management.order_journal import OrderJournal, RECORD_HEADER, FILL
+from src.modules.order_management.order_store import OrderStore, ACKED, CANCELLED, FILLED, PARTIALLY_FILLED, REJECTED
+from src.modules.utils.metrics import get_counters
+
+
+def test_journal_replays_store_and_survives_a_torn_tail(tmp_path):
+    """Test a replayed journal rebuilds the store, and a torn tail is cut off when appending resumes."""
+    path = str(tmp_path / "journal.bin")
+    store = OrderStore(journal=OrderJournal(path))
+    quote = store.add("binance", "BTC/USDT", "buy", "limit", 1.0, 100.0)
+    store.ack(quote.client_order_id, "11")
+    store.apply_fill(quote, 0.25, 99.5, fee=0.01, trade_id="t1")
+    market = store.add("binance", "ETH/USDT", "sell", "market", 2.0)
+    store.cancel(store.add("kraken", "BTC/USD", "sell", "limit", 3.0, 50.0))
+    store.journal.close()
+    with open(path, "ab") as file:
+        file.write(RECORD_HEADER.pack(0, 40, FILL, 0) + b"torn")  # a record cut short by a crash
+
+    restored = OrderStore()
+    assert OrderJournal(path).replay(restored) == 6
+    order = restored.by_exchange_id("binance", "11")
+    assert order.client_order_id == quote.client_order_id and order.status == PARTIALLY_FILLED
+    assert (order.filled, order.cost, order.fee) == (0.25, 0.25 * 99.5, 0.01)
+    assert restored.get(market.client_order_id).price is None and restored.get(market.client_order_id).is_open
+    assert [o.status for o in restored.open_orders("kraken")] == [] and len(restored.with_status(CANCELLED)) == 1
+
+    restored.journal = OrderJournal(path)
+    restored.apply_fill(order, 0.75, 100.0, trade_id="t2")
+    restored.journal.close()
+    again = OrderStore()
+    OrderJournal(path).replay(again)
+    assert again.get(quote.client_order_id).status == FILLED
+
+
+def test_concurrent_appends_share_fsyncs(tmp_path):
+    """Test concurrent appends are group-committed with far fewer fsyncs than records."""
+    journal = OrderJournal(str(tmp_path / "journal.bin"), commit_interval=0.002)
+    counters = get_counters("order_journal")
+    commits_before, records_before = counters.get("commits"), counters.get("records")
+
+    def writer(prefix):
+        for i in range(2000):
+            journal.fill(f"{prefix}{i}", 0.1, 100.0, trade_id=i)
+
+    threads = [threading.Thread(target=writer, args=(prefix,)) for prefix in "abcd"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert journal.sync(timeout=5)
+    journal.close()
+
+    assert counters.get("records") - records_before == 8000
+    assert counters.get("commits") - commits_before < 8000 / 10
+    assert sum(1 for _ in OrderJournal(journal.path).records()) == 8000
+
+
+def test_orders_are_sent_only_after_their_intent_is_durable(tmp_path, make_order_manager, fake_exchange, monkeypatch):
+    """Test the journal is write-ahead: the venue sees an order only once its intent is on disk."""
+    path = str(tmp_path / "journal.bin")
+    fake_exchange.has.update(createOrders=False, cancelOrders=False)
+    manager = make_order_manager({"binance": fake_exchange}, config={"journal_path": path,
+                                                                     "journal_commit_interval": 0.01})
+    on_disk = []
+    create_order = fake_exchange.create_order
+
+    def recording_create_order(*args, **kwargs):
+        on_disk.append([strings[0] for _, _, _, strings in OrderJournal(path).records()])
+        return create_order(*args, **kwargs)
+
+    monkeypatch.setattr(fake_exchange, "create_order", recording_create_order)
+    manager.place_order("binance", "BTC/USDT", "limit", "buy", 1.0, 100.0)
+    manager.place_orders("binance", [{"symbol": "BTC/USDT", "side": "sell", "quantity": 1.0, "price": 101.0 + i}
+                                     for i in range(3)])
+    manager.order_journal.close()
+
+    sent = [order["clientOrderId"] for order in fake_exchange.orders.values()]
+    assert len(sent) == 4
+    assert all(client_id in durable for client_id, durable in zip(sent, on_disk))
+
+
+def test_failed_commit_keeps_records_until_they_are_durable(tmp_path):
+    """Test a failed write or fsync neither drops the batch nor reports it durable, and the retry lands it."""
+    path = str(tmp_path / "journal.bin")
+    journal = OrderJournal(path, commit_interval=0.001)
+    store = OrderStore(journal=journal)
+    failures = []
+    real_fsync = os.fsync
+
+    def failing_fsync(fd):
+        if not failures:
+            failures.append(fd)
+            raise OSError("disk full")
+        return real_fsync(fd)
+
+    with patch("src.modules.order_management.order_journal.COMMIT_RETRY_DELAY", 0.01), \
+            patch("src.modules.order_management.order_journal.os.fsync", failing_fsync):
+        lost = store.add("binance", "BTC/USDT", "buy", "limit", 1.0, 100.0)
+        assert not journal.sync(timeout=0.005)  # first commit failed: nothing durable yet
+        later = store.add("binance", "BTC/USDT", "sell", "limit", 1.0, 101.0)
+        assert journal.sync(timeout=2) and failures
+    journal.close()
+
+    restored = OrderStore()
+    assert OrderJournal(path).replay(restored) == 2
+    assert restored.get(lost.client_order_id) is not None and restored.get(later.client_order_id) is not None
+
+
+def test_compaction_lets_concurrent_appends_wait_instead_of_failing(tmp_path):
+    """Test appends from another thread during compaction neither raise nor go missing from the new journal."""
+    path = str(tmp_path / "journal.bin")
+    journal = OrderJournal(path, commit_interval=0.001)
+    store = OrderStore(journal=journal)
+    errors = []
+    done = threading.Event()
+
+    def stream_listener():
+        try:
+            while not done.is_set():
+                order = store.add("binance", "BTC/USDT", "buy", "limit", 1.0, 100.0)
+                store.apply_fill(order, 0.5, 100.0)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=stream_listener)
+    thread.start()
+    for _ in range(20):
+        journal.compact(store)
+    done.set()
+    thread.join()
+    journal.close()
+
+    restored = OrderStore()
+    OrderJournal(path).replay(restored)
+    assert errors == []
+    assert sorted(order.client_order_id for order in restored.open_orders()) == \
+        sorted(order.client_order_id for order in store.open_orders())
+    assert all(order.filled == 0.5 for order in restored.open_orders())
+
+
+def test_recover_replays_reconciles_and_compacts(tmp_path, make_order_manager, fake_exchange):
+    """Test a restarted manager restores open orders from the journal and settles them against the venue."""
+    path = str(tmp_path / "journal.bin")
+    previous = OrderStore(journal=OrderJournal(path))
+    resting = previous.add("binance", "BTC/USDT", "buy", "limit", 1.0, 100.0)
+    previous.ack(resting.client_order_id, "1")
+    gone = previous.add("binance", "BTC/USDT", "sell", "limit", 1.0, 110.0)
+    previous.ack(gone.client_order_id, "2")
+    unacked = previous.add("binance", "ETH/USDT", "buy", "limit", 5.0, 10.0)  # crashed before the ack
+    lost = previous.add("binance", "ETH/USDT", "sell", "limit", 5.0, 12.0)  # never reached the venue
+    previous.journal.close()
+
+    fake_exchange.orders.update({
+        "1": {"id": "1", "symbol": "BTC/USDT", "status": "open", "filled": 0.5, "average": 100.0},
+        "2": {"id": "2", "symbol": "BTC/USDT", "status": "closed", "filled": 1.0, "average": 110.0},
+        "3": {"id": "3", "clientOrderId": unacked.client_order_id, "symbol": "ETH/USDT", "status": "open",
+              "filled": 0.0}})
+    manager = make_order_manager({"binance": fake_exchange}, config={"journal_path": path,
+                                                                     "unacked_order_timeout": -1})
+
+    reports = manager.recover()
+    store = manager.order_store
+    assert reports == {"binance": {"adopted": 0, "updated": 2, "closed": 2}}
+    assert store.get(resting.client_order_id).status == PARTIALLY_FILLED
+    assert store.get(gone.client_order_id).status == FILLED
+    assert store.get(unacked.client_order_id).order_id == "3" and store.get(unacked.client_order_id).status == ACKED
+    assert store.get(lost.client_order_id).status == REJECTED
+    manager.order_journal.close()
+
+    compacted = OrderStore()
+    assert OrderJournal(path).replay(compacted) == 5  # two open orders: intents, acks and one fill
+    assert sorted(order.order_id for order in compacted.open_orders()) == ["1", "3"]
@@ -0,0 +1,203 @@
+# src/tests/test_order_manager.py
+
+import asyncio
+import time
+import ccxt
+import pytest
+from src.modules.risk_management.pretrade_gate import PreTradeGate
+from src.modules.exchange_connector.user_stream import UserState
+from src.modules.order_management.order_store import ACKED, NEW, PARTIALLY_FILLED, REJECTED
+
+LADDER = [{"symbol": "BTC/USDT", "type": "limit", "side": "buy", "quantity": 0.1, "price": 100 - i} for i in range(8)]
+
+
+def test_place_orders_uses_native_batches_and_keeps_order(order_manager, fake_exchange):
+    """Test a ladder is sent in native chunks and risk-rejected orders come back as None in place."""
+    exchange = fake_exchange
+    results = order_manager.place_orders("binance", LADDER + [{**LADDER[0], "quantity": 50}])
+
+    assert exchange.calls == [("create_orders", 5), ("create_orders", 3)]
+    assert [order["price"] for order in results[:8]] == [100 - i for i in range(8)]
+    assert results[8] is None
+
+
+def test_place_orders_falls_back_to_concurrent_submission(order_manager, fake_exchange):
+    """Test a rejected native batch falls back to individual orders and is not retried natively."""
+    exchange, manager = fake_exchange, order_manager
+    exchange.reject_batch = True
+    assert all(manager.place_orders("binance", LADDER))
+    assert sum(call[0] == "create_order" for call in exchange.calls) == 8
+
+    exchange.calls.clear()
+    manager.place_orders("binance", LADDER[:2])
+    assert [call[0] for call in exchange.calls] == ["create_order", "create_order"]
+
+
+def test_place_orders_looks_up_a_batch_whose_outcome_is_unknown(order_manager, fake_exchange, monkeypatch):
+    """Test orders of a failed batch that reached the venue are placed and the others rejected."""
+    manager = order_manager
+
+    def create_orders(orders):
+        # The venue accepts the first two orders of the batch, then the response is lost
+        for o in orders[:2]:
+            fake_exchange._order(o["symbol"], o["side"], o["amount"], o["price"], o["params"])
+        raise ccxt.RequestTimeout("batch response lost")
+
+    monkeypatch.setattr(fake_exchange, "create_orders", create_orders)
+    results = manager.place_orders("binance", LADDER[:4])
+
+    assert [order and order["price"] for order in results] == [100, 99, None, None]
+    assert [manager.order_store.find("binance", order["id"]).status for order in results[:2]] == [ACKED, ACKED]
+    assert len(manager.order_store) == 4 and manager.order_store.open_count("binance", "BTC/USDT") == 2
+
+
+def test_place_orders_counts_one_batch_as_one_order_for_the_cooldown(order_manager):
+    """Test a ladder is not rejected by its own cooldown, while the next order for the symbol is."""
+    manager = order_manager
+    manager.pretrade_gate = PreTradeGate({"order_cooldown": 10, "max_order_size": 100}, manager.order_store)
+
+    assert all(manager.place_orders("binance", LADDER))
+    assert manager.place_order("binance", "BTC/USDT", "limit", "buy", 1, 90) is None
+    assert manager.pretrade_gate.counters.get("binance.cooldown") >= 1
+
+
+def test_close_stops_following_the_user_stream(make_order_manager, fake_exchange):
+    """Test a closed manager is unregistered from the shared UserState and no longer applies its updates."""
+    state = UserState()
+    fake_exchange.has.update(createOrders=False, cancelOrders=False)
+    manager = make_order_manager({"binance": fake_exchange}, user_state=state)
+    manager.place_orders("binance", LADDER[:2])
+    manager.close()
+
+    state.apply_order("binance", {"id": "1", "filled": 0.1, "status": "closed"})
+    assert manager.order_store.by_exchange_id("binance", "1").filled == 0.0
+    assert state._listeners == [] and manager._executor is None
+
+
+def test_cancel_orders_and_cancel_all_return_per_order_results(make_order_manager, fake_exchange):
+    """Test batch cancels report failures per order and cancel_all cancels each open order."""
+    native = make_order_manager({"binance": fake_exchange})
+    native.place_orders("binance", LADDER[:2])
+    assert [r and r["id"] for r in native.cancel_orders("binance", ["1", "missing", "2"], "BTC/USDT")] == \
+        ["1", None, "2"]
+
+    fake_exchange.has.update(createOrders=False, cancelOrders=False)
+    manager = make_order_manager({"binance": fake_exchange})
+    manager.place_orders("binance", LADDER[:2] + [{**LADDER[0], "symbol": "ETH/USDT"}])
+    assert [r and r["id"] for r in manager.cancel_orders("binance", ["3", "missing"], "BTC/USDT")] == ["3", None]
+    assert sorted(r["id"] for r in manager.cancel_all("binance")) == ["4", "5"]
+
+
+def test_modify_order_amends_in_place_keeping_fills(make_order_manager, fake_exchange):
+    """Test in-place amends send no new client id and update the tracked order instead of replacing it."""
+    exchange = fake_exchange
+    exchange.has["editOrder"] = True
+    exchange.amend_in_place = True
+    manager = make_order_manager({"kraken": exchange})
+    order = manager.place_order("kraken", "BTC/USDT", "limit", "buy", 1.0, 100.0)
+    tracked = manager.order_store.by_exchange_id("kraken", order["id"])
+    manager.order_store.apply_update("kraken", exchange.fill(order["id"], 0.4))
+
+    assert manager.modify_order("kraken", order["id"], 101.0, 2.0)["id"] == order["id"]
+    assert exchange.calls[-1] == ("edit_order", order["id"])
+    assert (tracked.price, tracked.amount, tracked.filled, tracked.status) == (101.0, 2.0, 0.4, PARTIALLY_FILLED)
+    assert manager.order_store.open_amount("kraken", "BTC/USDT", "buy") == pytest.approx(1.6)
+    assert len(manager.order_store) == 1
+
+
+def test_modify_order_keeps_the_order_when_its_replacement_is_rejected(order_manager, fake_exchange):
+    """Test the cancel/replace fallback checks the replacement before canceling the live order."""
+    order = order_manager.place_order("binance", "BTC/USDT", "limit", "buy", 1.0, 100.0)
+    fake_exchange.calls.clear()
+
+    assert order_manager.modify_order("binance", order["id"], 100.0, 500.0) is None
+    assert fake_exchange.calls == []
+    assert order_manager.order_store.by_exchange_id("binance", order["id"]).is_open
+
+    replaced = order_manager.modify_order("binance", order["id"], 101.0, 2.0)
+    assert fake_exchange.calls == [("cancel_order", order["id"]), ("create_order", "BTC/USDT")]
+    assert replaced["price"] == 101.0 and not order_manager.order_store.by_exchange_id("binance", order["id"]).is_open
+
+
+class FakeAsyncConnector:
+    """Answers async order calls from a script of outcomes per client order id, after a short delay."""
+
+    def __init__(self, script=None, delay=0.02):
+        self.script = script or {}
+        self.delay = delay
+        self.sent = []  # client order ids in submission order
+        self.venue = {}  # client order id -> order that reached the venue
+        self.in_flight = self.max_in_flight = 0
+
+    async def attempt(self, exchange_name, method, *args, timeout=None):
+        if method == "fetch_open_orders":
+            return [order for order in self.venue.values() if order["status"] == "open"]
+        client_id = args[5]["clientOrderId"]
+        self.sent.append(client_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            outcomes = self.script.get(args[3], [])
+            outcome = outcomes.pop(0) if outcomes else "ok"
+            if outcome == "hang":
+                await asyncio.wait_for(asyncio.sleep(10), timeout)
+            await asyncio.sleep(self.delay)
+            if outcome == "unavailable":
+                raise ccxt.ExchangeNotAvailable("503")
+            if outcome == "lost":  # reached the venue but the response was lost
+                self.venue[client_id] = {"id": f"X{len(self.venue)}", "clientOrderId": client_id, "status": "open"}
+                raise ccxt.RequestTimeout("response lost")
+            if client_id in self.venue:  # how Binance refuses a reused client order id
+                raise ccxt.InvalidOrder('binance {"code":-2010,"msg":"Duplicate order sent."}')
+            if outcome == "funds":
+                raise ccxt.InsufficientFunds("not enough balance")
+            self.venue[client_id] = {"id": f"X{len(self.venue)}", "clientOrderId": client_id, "status": "open"}
+            return self.venue[client_id]
+        finally:
+            self.in_flight -= 1
+
+
+def test_submit_order_returns_handles_at_once_and_bounds_in_flight(make_order_manager, fake_exchange):
+    """Test submissions return handles immediately, run concurrently up to the per-venue cap and get acked."""
+    connector = FakeAsyncConnector()
+    manager = make_order_manager({"binance": fake_exchange}, async_connector=connector)
+    manager.max_in_flight_orders = 3
+
+    async def scenario():
+        handles = manager.submit_orders("binance", LADDER + [{**LADDER[0], "quantity": 50}])
+        statuses = [handle.status for handle in handles[:8]]
+        orders = await asyncio.gather(*handles[:8])
+        return handles, statuses, orders
+
+    handles, statuses, orders = asyncio.run(scenario())
+    assert statuses == [NEW] * 8 and handles[8] is None
+    assert all(orders) and all(handle.status == ACKED for handle in handles[:8])
+    assert connector.max_in_flight == 3
+    assert len(set(connector.sent)) == 8
+
+
+def test_submit_order_retries_idempotently_within_its_deadline(make_order_manager, fake_exchange):
+    """Test lost responses are retried under the same client id without duplicates, and deadlines hold."""
+    connector = FakeAsyncConnector(script={0.1: ["lost"], 0.2: ["unavailable", "unavailable"], 0.3: ["funds"],
+                                           0.4: ["hang"], 0.5: ["unavailable", "funds"]})
+    manager = make_order_manager({"binance": fake_exchange}, async_connector=connector)
+    manager.retry_backoff = 0.01
+
+    async def scenario():
+        lost = manager.submit_order("binance", "BTC/USDT", "limit", "buy", 0.1, 100)
+        flaky = manager.submit_order("binance", "BTC/USDT", "limit", "buy", 0.2, 100)
+        funds = manager.submit_order("binance", "BTC/USDT", "limit", "buy", 0.3, 100)
+        expiring = manager.submit_order("binance", "BTC/USDT", "limit", "buy", 0.4, 100, deadline=0.3)
+        refused = manager.submit_order("binance", "BTC/USDT", "limit", "buy", 0.5, 100)
+        started = time.monotonic()
+        results = await asyncio.gather(lost, flaky, funds, expiring, refused)
+        return (lost, flaky, funds, expiring, refused), results, time.monotonic() - started
+
+    (lost, flaky, funds, expiring, refused), results, elapsed = asyncio.run(scenario())
+    assert results[0]["clientOrderId"] == lost.client_order_id and lost.status == ACKED
+    assert connector.sent.count(lost.client_order_id) == 2 and len(connector.venue) == 2
+    assert results[1] is not None and connector.sent.count(flaky.client_order_id) == 3
+    assert results[2] is None and funds.status == REJECTED and connector.sent.count(funds.client_order_id) == 1
+    assert results[3] is None and expiring.status == NEW  # may have reached the venue: left for reconcile
+    assert results[4] is None and refused.status == REJECTED  # looked up after the retry failed: not on the venue
+    assert elapsed < 1.0
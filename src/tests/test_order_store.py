@@ -0,0 +1,99 @@
+# src/tests/test_order_store.py
+
+import ccxt
+from src.modules.order_management.order_store import (OrderStore, NEW, ACKED, PARTIALLY_FILLED, FILLED, CANCELLED,
+                                                      REJECTED)
+from src.modules.exchange_connector.user_stream import UserState
+
+
+def test_lifecycle_indexes_and_fill_aggregation():
+    """Test orders move through the lifecycle, stay indexed and aggregate de-duplicated fills."""
+    store = OrderStore()
+    order = store.add("binance", "BTC/USDT", "buy", "limit", 1.0, 100.0)
+    other = store.add("binance", "ETH/USDT", "sell", "limit", 5.0, 10.0)
+    store.ack(order.client_order_id, 42)
+
+    assert store.by_exchange_id("binance", "42") is order and order.status == ACKED
+    assert store.apply_fill(order, 0.4, 100.0, trade_id="t1")
+    assert not store.apply_fill(order, 0.4, 100.0, trade_id="t1")
+    assert order.status == PARTIALLY_FILLED and store.open_orders("binance", "BTC/USDT") == [order]
+    store.apply_fill(order, 0.6, 101.0, fee=0.01, trade_id="t2")
+
+    assert order.status == FILLED and order.filled == 1.0 and abs(order.average - 100.6) < 1e-9
+    assert store.open_orders("binance", "BTC/USDT") == [] and store.open_orders("binance") == [other]
+    assert not store.cancel(order)  # no way back from a terminal state
+    assert store.with_status(FILLED) == [order] and store.with_status(PARTIALLY_FILLED) == []
+
+
+def test_updates_and_reconcile_repair_the_store():
+    """Test cumulative updates become fills, and reconcile adopts, closes and expires orders."""
+    store = OrderStore()
+    order = store.add("kraken", "BTC/USD", "sell", "limit", 2.0, 50.0)
+    store.apply_update("kraken", {"id": "K1", "clientOrderId": order.client_order_id, "status": "open",
+                                  "filled": 0.5, "average": 50.0})
+    assert order.order_id == "K1" and order.status == PARTIALLY_FILLED and order.cost == 25.0
+
+    lost = store.add("kraken", "BTC/USD", "buy", "limit", 1.0, 40.0)
+    lost.created_at -= 60
+    fetched = []
+
+    def fetch_order(order_id, symbol):
+        fetched.append(order_id)
+        return {"id": order_id, "status": "closed", "filled": 2.0, "average": 51.0}
+
+    report = store.reconcile("kraken", [{"id": "K9", "symbol": "BTC/USD", "side": "buy", "amount": 3.0,
+                                         "price": 45.0, "status": "open", "filled": 0.0}], fetch_order)
+
+    assert report == {"adopted": 1, "updated": 0, "closed": 2} and fetched == ["K1"]
+    assert order.status == FILLED and order.filled == 2.0 and abs(order.cost - 102.0) < 1e-9
+    assert lost.status == REJECTED
+    assert [adopted.order_id for adopted in store.open_orders("kraken", "BTC/USD")] == ["K9"]
+
+
+def test_reconcile_closes_only_orders_the_venue_confirms_ended():
+    """Test orders fetch_order still reports open stay open, and stale NEW orders are looked up before rejecting."""
+    store = OrderStore()
+    resting, vanished, flaky = (store.add("binance", "BTC/USDT", "buy", "limit", 1.0, 40.0) for _ in range(3))
+    for number, order in enumerate((resting, vanished, flaky)):
+        store.ack(order.client_order_id, f"B{number}")
+    filled, lost, unknown = (store.add("binance", "BTC/USDT", "sell", "limit", 1.0, 60.0) for _ in range(3))
+    for order in (filled, lost, unknown):
+        order.created_at -= 60
+
+    def fetch_order(order_id, symbol):
+        if order_id == "B1":
+            raise ccxt.OrderNotFound(order_id)
+        if order_id == "B2":
+            raise ccxt.RequestTimeout(order_id)
+        return {"id": order_id, "status": "open", "filled": 0.0}
+
+    def find_client_order(order):
+        if order is unknown:
+            raise ccxt.NetworkError("timeout")
+        if order is filled:
+            return {"id": "B9", "clientOrderId": order.client_order_id, "status": "closed", "filled": 1.0,
+                    "average": 60.0}
+        return None
+
+    report = store.reconcile("binance", [], fetch_order, find_client_order=find_client_order)
+    assert report == {"adopted": 0, "updated": 1, "closed": 3}
+    assert (resting.status, vanished.status, flaky.status) == (ACKED, CANCELLED, ACKED)
+    assert (filled.status, filled.order_id, lost.status, unknown.status) == (FILLED, "B9", REJECTED, NEW)
+
+
+def test_order_manager_tracks_orders_without_rest_lookups(make_order_manager, fake_exchange):
+    """Test placed orders carry a client id, are tracked open, follow stream updates and leave on cancel."""
+    state = UserState()
+    manager = make_order_manager({"binance": fake_exchange}, config={}, user_state=state)
+
+    order_id = manager.place_order("binance", "BTC/USDT", "limit", "buy", 1.0, 100.0)["id"]
+    client_id = fake_exchange.orders[order_id]["clientOrderId"]
+    assert client_id and [order["clientOrderId"] for order in manager.open_orders("binance", "BTC/USDT")] == \
+        [client_id]
+
+    state.apply_order("binance", {"id": order_id, "clientOrderId": client_id, "status": "open", "filled": 0.25,
+                                  "average": 99.0})
+    assert manager.order_store.get(client_id).filled == 0.25
+
+    manager.cancel_order("binance", order_id)
+    assert manager.open_orders() == [] and manager.order_store.get(client_id).status == CANCELLED
@@ -0,0 +1,132 @@
+# src/tests/test_pretrade_gate.py
+
+import time
+import pytest
+from src.modules.risk_management.pretrade_gate import PreTradeGate
+from src.modules.order_management.order_store import OrderStore
+from src.modules.exchange_connector.user_stream import UserState
+from src.modules.datafeed.market_data import Ticker
+from src.modules.datafeed.price_cache import PriceCache
+
+SETTINGS = {"max_order_size": 5, "max_order_notional": 1000, "max_exposure": 50, "max_position": 3,
+            "max_open_orders": 3, "price_collar_percent": 2, "order_cooldown": 0.05}
+
+
+class FakeMarketCache:
+    def min_trade_size(self, exchange_name, symbol):
+        return {"BTC/USDT": 0.001}.get(symbol)
+
+
+def test_each_limit_rejects_with_its_reason():
+    """Test size, minimum, collar, notional, exposure, position, open-order and cooldown limits."""
+    store = OrderStore()
+    gate = PreTradeGate(SETTINGS, store, market_cache=FakeMarketCache())
+    gate.update_price("BTC/USDT", 100.0)
+
+    assert gate.check("binance", "BTC/USDT", "buy", 6, 100.0) == "size"
+    assert gate.check("binance", "BTC/USDT", "buy", 0.0001, 100.0) == "min_size"
+    assert gate.check("binance", "BTC/USDT", "buy", 1, 97.0) == "price_collar"
+    assert gate.check("binance", "BTC/USDT", "buy", 1, 101.0, record=False) is None
+    assert gate.check("binance", "ETH/USDT", "buy", 5, 250.0) == "notional"
+
+    gate.set_balances("binance", {"USDT": 300.0, "BTC": 1.0})  # portfolio value 400 -> 200 per order
+    assert gate.portfolio_value == 400.0
+    assert gate.check("binance", "BTC/USDT", "buy", 2.5, 100.0) == "exposure"
+    assert gate.check("binance", "BTC/USDT", "buy", 1.5, 100.0) is None
+
+    store.add("binance", "BTC/USDT", "buy", "limit", 1.5, 99.0)  # 1 BTC held + 1.5 bid
+    assert gate.check("binance", "BTC/USDT", "sell", 1.0, 100.0) == "cooldown"
+    time.sleep(0.06)
+    assert gate.check("binance", "BTC/USDT", "buy", 1.0, 100.0) == "position"
+    assert gate.check("binance", "BTC/USDT", "sell", 1.0, 100.0, record=False) is None
+
+    store.add("binance", "BTC/USDT", "sell", "limit", 0.1, 101.0)
+    store.add("binance", "BTC/USDT", "sell", "limit", 0.1, 102.0)
+    assert gate.check("binance", "BTC/USDT", "sell", 0.1, 100.0) == "open_orders"
+
+
+def test_fills_and_balance_events_keep_inputs_live(make_order_manager, fake_exchange):
+    """Test fills move balances and portfolio value incrementally and balance events feed the order path."""
+    state = UserState()
+    manager = make_order_manager({"binance": fake_exchange}, config={}, user_state=state)
+    gate = manager.pretrade_gate
+
+    state.set_balances("binance", {"USDT": {"free": 1000.0, "used": 0.0, "total": 1000.0}})
+    assert gate.portfolio_value == 1000.0
+    order = manager.order_store.add("binance", "BTC/USDT", "buy", "limit", 2.0, 100.0)
+    assert manager.order_store.open_amount("binance", "BTC/USDT", "buy") == 2.0
+    manager.order_store.apply_fill(order, 2.0, 100.0)
+    assert manager.order_store.open_amount("binance", "BTC/USDT", "buy") == 0.0
+    assert gate.position("binance", "BTC") == 2.0 and gate.position("binance", "USDT") == 800.0
+
+    # An order adopted with earlier fills (reconcile, recovery, stream snapshot) is already in the balances
+    manager.order_store.apply_update("binance", {"id": "9", "symbol": "BTC/USDT", "side": "buy", "amount": 3.0,
+                                                 "filled": 1.0, "average": 100.0, "status": "open"})
+    assert gate.position("binance", "BTC") == 2.0
+
+    gate.update_price("BTC/USDT", 150.0)
+    assert gate.portfolio_value == 1100.0
+    assert manager.place_order("binance", "BTC/USDT", "limit", "buy", 4.0, 150.0) is None  # 600 > 50% of 1100
+    assert gate.counters.get("binance.exposure") >= 1
+
+
+def test_market_orders_are_valued_at_the_streamed_reference_price(make_order_manager, fake_exchange):
+    """Test market orders are rejected without a reference price and otherwise checked at the cached mid."""
+    cache = PriceCache()
+    manager = make_order_manager({"binance": fake_exchange}, config={}, user_state=UserState(), price_cache=cache,
+                                 pretrade_gate=PreTradeGate(SETTINGS))
+    gate = manager.pretrade_gate
+    gate.set_balances("binance", {"USDT": 300.0, "BTC": 1.0})
+
+    assert not manager._passes_risk("binance", "BTC/USDT", "buy", 0.5)
+    assert gate.counters.get("binance.no_reference_price") >= 1
+
+    cache.update(Ticker("binance", "BTC/USDT", 99.0, 101.0, 100.5, 0.0, 0))
+    assert manager._passes_risk("binance", "BTC/USDT", "buy", 0.5)
+    assert gate.portfolio_value == 400.0
+    assert not manager._passes_risk("binance", "BTC/USDT", "buy", 4.5)  # 450 > 50% of 400
+    assert gate.check("binance", "BTC/USDT", "buy", 1.0, 90.0) == "price_collar"
+
+
+def test_amends_are_checked_before_they_are_sent(order_manager, fake_exchange):
+    """Test a rejected amend never reaches the venue, and only an amend's extra quantity counts toward positions."""
+    fake_exchange.has["editOrder"] = True
+    manager = order_manager
+    manager.pretrade_gate = PreTradeGate(SETTINGS, manager.order_store)
+    gate = manager.pretrade_gate
+    gate.set_balances("binance", {"USDT": 10000.0, "BTC": 1.0})
+    gate.update_price("BTC/USDT", 100.0)
+    order = manager.place_order("binance", "BTC/USDT", "limit", "buy", 1.5, 100.0)  # 1 BTC held + 1.5 bid
+    fake_exchange.calls.clear()
+
+    assert manager.modify_order("binance", order["id"], 100.0, 500.0) is None
+    assert manager.modify_order("binance", order["id"], 100.0, 2.5) is None  # 1 + 2.5 > max_position 3
+    assert fake_exchange.calls == []
+    assert manager.order_store.open_amount("binance", "BTC/USDT", "buy") == 1.5
+    assert gate.counters.get("binance.size") >= 1 and gate.counters.get("binance.position") >= 1
+
+    amended = manager.modify_order("binance", order["id"], 100.5, 2.0)  # 1 + 2.0: within the limit
+    assert fake_exchange.calls == [("edit_order", order["id"])]
+    assert manager.order_store.open_amount("binance", "BTC/USDT", "buy") == 2.0
+    assert manager.modify_order("binance", amended["id"], 100.4, 1.0) is not None  # amends add no cooldown
+
+
+@pytest.mark.benchmark
+def test_check_runs_in_single_digit_microseconds():
+    """Test a passing check with every limit active costs under 10 microseconds."""
+    store = OrderStore()
+    gate = PreTradeGate({**SETTINGS, "order_cooldown": 0, "max_open_orders": 100}, store,
+                        market_cache=FakeMarketCache())
+    gate.set_balances("binance", {"USDT": 10000.0, "BTC": 1.0})
+    gate.update_price("BTC/USDT", 100.0)
+    store.add("binance", "BTC/USDT", "buy", "limit", 0.5, 99.0)
+    check = gate.check
+    assert check("binance", "BTC/USDT", "buy", 0.1, 100.5) is None
+
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(10000):
+            check("binance", "BTC/USDT", "buy", 0.1, 100.5)
+        best = min(best, (time.perf_counter() - started) / 10000)
+    assert best < 10e-6
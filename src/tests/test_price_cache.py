@@ -0,0 +1,39 @@
+# src/tests/test_price_cache.py
+
+from unittest.mock import MagicMock, patch
+from src.modules.datafeed.data_feed import DataFeed
+from src.modules.datafeed.market_data import Ticker
+from src.modules.datafeed.price_cache import PriceCache
+
+
+def test_fresh_entries_hit_and_stale_entries_miss():
+    """Test tickers are served while fresh and treated as missing once older than the TTL."""
+    cache = PriceCache(ttl=5.0)
+    cache.update(Ticker("binance", "BTC/USDT", 99.0, 101.0, 100.0, 1.0, 1))
+    with patch("src.modules.datafeed.price_cache.time.monotonic", return_value=10**9):
+        assert cache.get("binance", "BTC/USDT") is None
+    assert cache.get("binance", "BTC/USDT")["last"] == 100.0
+    assert cache.get("kraken", "BTC/USDT") is None
+
+
+def test_get_or_fetch_only_calls_rest_on_miss():
+    """Test the REST fallback runs on a miss and is skipped when a streamed ticker is cached."""
+    cache = PriceCache()
+    fetch_ticker = MagicMock(return_value={"last": 50.0})
+    assert cache.get_or_fetch("kraken", "ETH/USD", fetch_ticker)["last"] == 50.0
+    cache.update(Ticker("kraken", "ETH/USD", 59.0, 61.0, 60.0, 1.0, 1))
+    assert cache.get_or_fetch("kraken", "ETH/USD", fetch_ticker)["last"] == 60.0
+    fetch_ticker.assert_called_once_with("ETH/USD")
+
+
+def test_streamed_tickers_serve_fetch_market_data():
+    """Test DataFeed answers fetch_market_data from streamed tickers without REST traffic."""
+    with patch("src.modules.datafeed.data_feed.DataFeed._load_yaml", return_value={}):
+        data_feed = DataFeed(config_path="mock_config.yaml", secrets_path="mock_secrets.yaml")
+    data_feed.exchanges["binance"] = MagicMock()
+    try:
+        data_feed._on_stream_message("binance", Ticker("binance", "SOL/USDT", 9.0, 11.0, 10.0, 1.0, 1))
+        assert data_feed.fetch_market_data("binance", "SOL/USDT")["last"] == 10.0
+        data_feed.exchanges["binance"].fetch_ticker.assert_not_called()
+    finally:
+        data_feed.price_cache.clear()
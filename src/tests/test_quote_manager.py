@@ -0,0 +1,91 @@
+# src/tests/test_quote_manager.py
+
+import time
+from src.modules.order_management.quote_manager import QuoteManager
+
+
+def ladder(mid, size=0.1, levels=2):
+    return [{"side": side, "price": mid * (1 - sign * 0.001 * (level + 1)), "quantity": size}
+            for side, sign in (("buy", 1), ("sell", -1)) for level in range(levels)]
+
+
+def test_only_quotes_past_tolerance_are_amended(order_manager, fake_exchange):
+    """Test small moves leave quotes resting, large moves amend only the changed slots, fills get re-placed."""
+    exchange = fake_exchange
+    exchange.has["editOrder"] = True
+    quoter = QuoteManager(order_manager, price_tolerance_bps=2, size_tolerance_percent=10, coalesce_window=0)
+
+    assert quoter.set_quotes("binance", "BTC/USDT", ladder(100.0))["placed"] == 4
+    exchange.calls.clear()
+    assert quoter.set_quotes("binance", "BTC/USDT", ladder(100.01)) == \
+        {"placed": 0, "amended": 0, "cancelled": 0, "unchanged": 4}
+    assert exchange.calls == []
+
+    quotes = ladder(100.0)
+    quotes[0] = {**quotes[0], "price": 99.5}
+    quoter.set_quotes("binance", "BTC/USDT", quotes)
+    assert exchange.calls == [("edit_order", "1")]
+    assert quoter.live_quotes("binance", "BTC/USDT")[("buy", 0)]["price"] == 99.5
+
+    exchange.calls.clear()
+    filled = quoter.order_manager.order_store.by_exchange_id("binance", "4")
+    quoter.order_manager.order_store.apply_update("binance", {"id": "4", "status": "closed", "filled": 0.1})
+    assert not filled.is_open
+    report = quoter.set_quotes("binance", "BTC/USDT", quotes[:3])  # drop the filled slot's quote
+    assert report == {"placed": 0, "amended": 0, "cancelled": 0, "unchanged": 3} and exchange.calls == []
+    assert quoter.set_quotes("binance", "BTC/USDT", quotes[:2])["cancelled"] == 1
+
+
+def test_cancel_replace_fallback_and_coalescing(order_manager, fake_exchange):
+    """Test venues without amends get one batched cancel and placement, and bursts collapse into one sync."""
+    exchange = fake_exchange
+    quoter = QuoteManager(order_manager, coalesce_window=0.05)
+
+    quoter.set_quotes("binance", "BTC/USDT", ladder(100.0))
+    exchange.calls.clear()
+    for mid in (101.0, 102.0, 103.0):
+        assert quoter.set_quotes("binance", "BTC/USDT", ladder(mid)) is None
+    assert quoter.flush() == {} and exchange.calls == []
+
+    time.sleep(0.06)
+    reports = quoter.flush()
+    assert reports[("binance", "BTC/USDT")] == {"placed": 4, "amended": 0, "cancelled": 4, "unchanged": 0}
+    assert exchange.calls == [("cancel_orders", 4), ("create_orders", 4)]
+    assert [quote["price"] for quote in quoter.live_quotes("binance", "BTC/USDT").values()] == \
+        [quote["price"] for quote in ladder(103.0)]
+
+
+def test_rejected_replacements_leave_the_quote_resting(order_manager, fake_exchange):
+    """Test a requote whose replacement fails the pre-trade check does not cancel the live quote."""
+    quoter = QuoteManager(order_manager, coalesce_window=0)
+    quoter.set_quotes("binance", "BTC/USDT", ladder(100.0, levels=1))
+    fake_exchange.calls.clear()
+
+    report = quoter.set_quotes("binance", "BTC/USDT", ladder(101.0, size=500, levels=1))  # over max_order_size
+    assert report == {"placed": 0, "amended": 0, "cancelled": 0, "unchanged": 2}
+    assert fake_exchange.calls == []
+    assert [quote["price"] for quote in quoter.live_quotes("binance", "BTC/USDT").values()] == \
+        [quote["price"] for quote in ladder(100.0, levels=1)]
+
+
+def test_partially_filled_in_place_quotes_are_amended_once(make_order_manager, fake_exchange):
+    """Test an in-place amend after a partial fill restores the desired remaining size and then stays put."""
+    fake_exchange.has["editOrder"] = True
+    fake_exchange.amend_in_place = True
+    manager = make_order_manager({"kraken": fake_exchange})
+    quoter = QuoteManager(manager, coalesce_window=0)
+    bid = [{"side": "buy", "price": 100.0, "quantity": 1.0}]
+    quoter.set_quotes("kraken", "BTC/USD", bid)
+    order_id = quoter.live_quotes("kraken", "BTC/USD")[("buy", 0)]["id"]
+    manager.order_store.apply_update("kraken", fake_exchange.fill(order_id, 0.5))
+    fake_exchange.calls.clear()
+
+    assert quoter.set_quotes("kraken", "BTC/USD", bid)["amended"] == 1
+    assert fake_exchange.orders[order_id]["amount"] == 1.5
+    live = quoter.live_quotes("kraken", "BTC/USD")[("buy", 0)]
+    assert (live["id"], live["filled"], live["remaining"]) == (order_id, 0.5, 1.0)
+
+    for _ in range(3):
+        assert quoter.set_quotes("kraken", "BTC/USD", bid) == {"placed": 0, "amended": 0, "cancelled": 0,
+                                                              "unchanged": 1}
+    assert fake_exchange.calls == [("edit_order", order_id)]
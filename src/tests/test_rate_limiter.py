@@ -0,0 +1,54 @@
+# src/tests/test_rate_limiter.py
+
+import asyncio
+import threading
+import time
+from src.modules.exchange_connector.rate_limiter import RateLimiter, CANCEL, ORDER, BACKFILL
+
+
+def test_weights_and_refill_rate_are_enforced():
+    """Test a drained bucket refills at the configured rate and heavy endpoints cost more."""
+    limiter = RateLimiter(requests_per_minute=600, burst=10, reserve=0, weights={"fetch_order_book": 5})
+    assert limiter.acquire_for("fetch_order_book") and limiter.acquire_for("fetch_order_book")
+    started = time.monotonic()
+    assert limiter.acquire_for("fetch_order_book")  # needs 5 tokens at 10/s
+    assert 0.4 <= time.monotonic() - started < 1.0
+    assert not limiter.acquire(10, timeout=0.05)
+
+
+def test_cancel_jumps_ahead_of_queued_backfill():
+    """Test a cancel queued behind a backfill burst is served before the backfill requests."""
+    limiter = RateLimiter(requests_per_minute=1200, burst=2, reserve=0)
+    limiter.acquire(2, CANCEL)  # drain the bucket
+    served = []
+
+    def request(name, priority):
+        limiter.acquire(1, priority)
+        served.append(name)
+
+    threads = [threading.Thread(target=request, args=(f"backfill-{i}", BACKFILL)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.02)
+    cancel = threading.Thread(target=request, args=("cancel", CANCEL))
+    cancel.start()
+    for thread in threads + [cancel]:
+        thread.join(timeout=5)
+
+    assert served.index("cancel") <= 1
+    assert len(served) == 6
+
+
+def test_reserve_is_kept_for_cancels_and_orders():
+    """Test low-priority lanes cannot spend the reserve while orders and cancels still get it immediately."""
+    limiter = RateLimiter(requests_per_minute=60, burst=10, reserve=3)
+
+    async def scenario():
+        assert await limiter.acquire_async(7, BACKFILL, timeout=0.1)
+        assert not await limiter.acquire_async(1, BACKFILL, timeout=0.05)
+        started = time.monotonic()
+        assert await limiter.acquire_async(1, ORDER, timeout=0.1)
+        assert await limiter.acquire_async(2, CANCEL, timeout=0.1)
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) < 0.05
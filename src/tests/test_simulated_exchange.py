@@ -0,0 +1,107 @@
+# src/tests/test_simulated_exchange.py
+
+import asyncio
+import time
+import ccxt
+import pytest
+from src.modules.exchange_connector.exchange_registry import ExchangeRegistry
+from src.modules.exchange_connector.user_stream import UserState
+from src.modules.datafeed.market_data import Ticker
+from src.modules.datafeed.price_cache import PriceCache
+from src.modules.simulation.simulated_exchange import SimulatedExchange, SIMULATED_RATE_LIMIT
+
+MOCK_SECRETS = {"exchanges": {"paper": {"api_key": "key", "api_secret": "secret"}}}
+
+
+def make_exchange(**settings):
+    exchange = SimulatedExchange("paper", levels=0, maker_fee=0.001, taker_fee=0.002, **settings)
+    exchange.load_book("BTC/USDT", bids=[[99.0, 1.0], [98.0, 2.0]], asks=[[101.0, 1.0], [102.0, 2.0]])
+    return exchange
+
+
+def test_price_time_priority_partial_fills_and_fees():
+    """Test takers walk the book, resting orders queue behind earlier liquidity, and fees hit balances."""
+    exchange = make_exchange(balances={"BTC": 10.0, "USDT": 10_000.0})
+
+    taker = exchange.create_order("BTC/USDT", "limit", "buy", 1.5, 101.5)
+    assert taker["filled"] == 1.0 and taker["status"] == "open" and taker["average"] == 101.0
+    assert exchange.fetch_order_book("BTC/USDT")["bids"][0] == [101.5, 0.5]
+
+    first = exchange.create_order("BTC/USDT", "limit", "sell", 0.5, 103.0)
+    second = exchange.create_order("BTC/USDT", "limit", "sell", 0.5, 103.0)
+    exchange.cancel_order(taker["id"])
+    exchange.apply_book_changes("BTC/USDT", [(103.0, 0.7)], [(101.0, 0.0), (102.0, 0.0)])
+    assert exchange.fetch_order(first["id"])["status"] == "closed"
+    assert exchange.fetch_order(second["id"])["filled"] == pytest.approx(0.2)  # only what was left behind the first
+
+    market = exchange.create_order("BTC/USDT", "market", "sell", 5.0)
+    assert market["status"] == "expired" and market["filled"] == 3.0  # 0.0 left at 103 + 99 + 98
+
+    trades = exchange.fetch_my_trades("BTC/USDT")
+    assert [trade["takerOrMaker"] for trade in trades] == ["taker", "maker", "maker", "taker", "taker"]
+    fees = sum(trade["fee"]["cost"] for trade in trades)
+    balance = exchange.fetch_balance()
+    assert balance["total"]["BTC"] == pytest.approx(10.0 + 1.0 - 0.7 - 3.0)
+    notional = -101.0 + 0.7 * 103.0 + 99.0 + 2 * 98.0
+    assert balance["total"]["USDT"] == pytest.approx(10_000.0 + notional - fees)
+    assert balance["used"]["BTC"] == pytest.approx(0.3)  # the rest of the second sell still rests
+
+    try:
+        exchange.create_order("BTC/USDT", "limit", "buy", 1.0, 200.0, {"postOnly": True})
+        assert False, "postOnly order crossed"
+    except ccxt.OrderImmediatelyFillable:
+        pass
+    try:
+        exchange.create_order("BTC/USDT", "limit", "buy", 1_000.0, 50.0)
+        assert False, "order exceeded the free balance"
+    except ccxt.InsufficientFunds:
+        pass
+
+
+def test_order_manager_trades_unchanged_against_registered_simulator(make_order_manager):
+    """Test OrderManager places, fills, cancels and tracks orders on a simulator served by the registry."""
+    state = UserState()
+    exchange = make_exchange(user_state=state)
+    registry = ExchangeRegistry()
+    registry.register("paper", exchange, rate_limit=SIMULATED_RATE_LIMIT)
+    prices = PriceCache()
+    prices.update(Ticker("paper", "BTC/USDT", 99.0, 101.0, 100.0, 0.0, 0))
+    manager = make_order_manager(config=MOCK_SECRETS, registry=registry, user_state=state, price_cache=prices)
+    assert manager.exchanges["paper"] is exchange
+
+    resting = manager.place_order("paper", "BTC/USDT", "limit", "buy", 0.5, 98.5)
+    filled = manager.place_order("paper", "BTC/USDT", "market", "buy", 0.2)
+    assert filled["filled"] == 0.2 and state.order("paper", filled["id"])["status"] == "closed"
+    assert manager.get_order_status("paper", resting["id"])["status"] == "open"
+    assert state.totals("paper")["BTC"] == exchange.fetch_balance()["total"]["BTC"]
+
+    manager.cancel_order("paper", resting["id"], "BTC/USDT")
+    assert manager.get_order_status("paper", resting["id"])["status"] == "canceled"
+    assert exchange.fetch_open_orders("BTC/USDT") == []
+
+    async def submit():
+        handle = manager.submit_order("paper", "BTC/USDT", "limit", "sell", 0.1, 105.0)
+        return await handle
+    assert asyncio.run(submit())["status"] == "open"
+    assert [order["price"] for order in exchange.fetch_open_orders("BTC/USDT")] == [105.0]
+
+
+@pytest.mark.benchmark
+def test_sustains_tens_of_thousands_of_orders_per_second():
+    """Test the matching engine handles a load of resting, crossing and cancelled orders above 10k/s."""
+    exchange = SimulatedExchange("paper", levels=20, seed=7, balances={"BTC": 1e9, "USDT": 1e12})
+    count = 20_000
+    started = time.perf_counter()
+    for i in range(count):
+        bid, ask = exchange.books["BTC/USDT"].best("buy"), exchange.books["BTC/USDT"].best("sell")
+        if i % 4 == 0:
+            exchange.create_order("BTC/USDT", "limit", "buy", 0.01, ask)
+        else:
+            order = exchange.create_order("BTC/USDT", "limit", "sell", 0.01, ask + 0.1 * (i % 10))
+            if i % 4 == 1:
+                exchange.cancel_order(order["id"])
+        if i % 100 == 0:
+            exchange.step()
+        assert bid < ask
+    elapsed = time.perf_counter() - started
+    assert count / elapsed > 10_000, f"{count / elapsed:.0f} orders/s"
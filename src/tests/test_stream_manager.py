@@ -0,0 +1,84 @@
+# src/tests/test_stream_manager.py
+
+import asyncio
+from unittest.mock import patch
+from src.modules.datafeed.stream_manager import StreamManager
+
+
+def test_add_stream_rejects_unsupported_exchange():
+    """Test that streams are only registered for exchanges with a WebSocket URL."""
+    manager = StreamManager()
+    assert manager.add_stream("binance", ["BTCUSDT", "ETHUSDT"])
+    assert not manager.add_stream("unknown", "BTCUSDT")
+
+
+def test_build_clients_combines_symbols_per_connection():
+    """Test that symbols are batched onto as few connections as the exchange allows."""
+    manager = StreamManager(max_streams_per_connection={"binance": 2})
+    manager.add_stream("binance", ["BTCUSDT", "ETHUSDT", "BNBUSDT"])
+    manager.add_stream("coinbase", ["BTC-USD", "ETH-USD"])
+
+    clients = manager.build_clients()
+    binance = [client for client in clients if client.exchange_name == "binance"]
+    coinbase = [client for client in clients if client.exchange_name == "coinbase"]
+
+    assert [client.symbols for client in binance] == [["BTCUSDT", "ETHUSDT"], ["BNBUSDT"]]
+    assert coinbase[0].symbols == ["BTC-USD", "ETH-USD"]
+    assert binance[0]._subscription_payload()["params"] == ["btcusdt@ticker", "ethusdt@ticker"]
+
+
+def test_run_isolates_failing_connection():
+    """Test that one failing connection does not stop the others."""
+    manager = StreamManager()
+    manager.add_stream("binance", "BTCUSDT")
+    manager.add_stream("kraken", "BTC/USD")
+    finished = []
+
+    async def fake_run(client):
+        if client.exchange_name == "binance":
+            raise ConnectionError("boom")
+        finished.append(client.exchange_name)
+
+    with patch("src.modules.datafeed.websocket_client.WebSocketClient.run", new=fake_run):
+        asyncio.run(manager.run())
+
+    assert finished == ["kraken"]
+
+
+def test_client_reconnects_after_disconnect():
+    """Test that a dropped connection is re-established with backoff and counted."""
+    from src.modules.datafeed.websocket_client import WebSocketClient
+
+    client = WebSocketClient("binance", "wss://example", symbols=["BTCUSDT"], reconnect_base_delay=0,
+                             on_message=lambda exchange, data: received.append(data))
+    received = []
+    connects = []
+
+    class FakeConnection:
+        def __init__(self):
+            self.frames = ['{"e":"24hrTicker","E":1,"s":"BTCUSDT","b":"99.0","a":"101.0","c":"100.0","v":"5.0"}']
+
+        async def send(self, message):
+            pass
+
+        async def recv(self):
+            if self.frames:
+                return self.frames.pop()
+            if len(connects) >= 2:
+                client.stop()
+            raise ConnectionError("dropped")
+
+        async def close(self):
+            pass
+
+    async def fake_connect(url):
+        connects.append(url)
+        return FakeConnection()
+
+    reconnects_before = client.counters.get("binance.reconnects")
+    with patch("src.modules.datafeed.websocket_client.websockets.connect", new=fake_connect):
+        asyncio.run(client.run())
+
+    assert len(connects) == 2
+    assert [ticker.last for ticker in received] == [100.0, 100.0]
+    assert client.counters.get("binance.reconnects") == reconnects_before + 1
@@ -0,0 +1,67 @@
+# src/tests/test_tick_store.py
+
+import math
+import numpy as np
+import pytest
+from src.modules.datafeed.market_data import Trade
+from src.modules.datafeed.tick_store import TickRingBuffer, TickStore
+
+
+def test_rolling_stats_match_full_recomputation():
+    """Test that incremental statistics equal a from-scratch computation over the window."""
+    buffer = TickRingBuffer(capacity=5)
+    prices = [100.0, 101.0, 100.5, 102.0, 101.5, 103.0, 102.5]
+    sizes = [1.0, 2.0, 0.5, 1.5, 1.0, 2.0, 1.0]
+    for i, (price, size) in enumerate(zip(prices, sizes)):
+        buffer.append(price, size, 1000 * i)
+
+    window_prices = np.array(prices[-5:])
+    window_sizes = np.array(sizes[-5:])
+    window_returns = np.log(np.array(prices[-5:]) / np.array(prices[-6:-1]))
+
+    assert len(buffer) == 5
+    assert buffer.vwap == pytest.approx(float(np.dot(window_prices, window_sizes) / window_sizes.sum()))
+    assert buffer.realized_variance == pytest.approx(float(np.dot(window_returns, window_returns)))
+    assert buffer.trade_rate == pytest.approx(1.0)
+    assert buffer.last_price == 102.5
+    assert buffer.last_timestamp == 6000
+
+
+def test_ewma_volatility():
+    """Test the EWMA variance recursion."""
+    buffer = TickRingBuffer(capacity=8, ewma_lambda=0.5)
+    buffer.append(100.0, 1.0, 0)
+    buffer.append(110.0, 1.0, 1)
+    expected_variance = 0.5 * math.log(1.1) ** 2
+    assert buffer.ewma_volatility == pytest.approx(math.sqrt(expected_variance))
+    assert buffer.ewma_volatility_percent == pytest.approx(math.sqrt(expected_variance) * 100)
+
+
+def test_volatility_is_scaled_to_the_horizon_by_trade_rate():
+    """Test per-tick volatility scales with the square root of the ticks expected in the horizon."""
+    buffer = TickRingBuffer(capacity=8, ewma_lambda=0.5)
+    buffer.append(100.0, 1.0, 0)
+    assert buffer.volatility_percent(86400) is None  # no trade rate yet
+    buffer.append(110.0, 1.0, 500)  # two ticks per second
+    assert buffer.volatility_percent(86400) == pytest.approx(buffer.ewma_volatility_percent * math.sqrt(2 * 86400))
+
+
+def test_segments_are_chronological_views():
+    """Test the window is exposed as views in time order after wrapping."""
+    buffer = TickRingBuffer(capacity=3)
+    for i in range(4):
+        buffer.append(100.0 + i, 1.0, i)
+
+    segments = buffer.segments()
+    assert np.concatenate([prices for prices, _, _ in segments]).tolist() == [101.0, 102.0, 103.0]
+    assert all(prices.base is buffer.prices for prices, _, _ in segments)
+
+
+def test_tick_store_routes_trades_per_symbol():
+    """Test that trades land in per-(exchange, symbol) buffers."""
+    store = TickStore(capacity=4)
+    store.on_trade(Trade("binance", "BTC/USDT", 100.0, 1.0, "buy", 1))
+    store.on_trade(Trade("kraken", "BTC/USD", 99.0, 1.0, "sell", 2))
+    assert store.get("binance", "BTC/USDT").last_price == 100.0
+    assert store.get("kraken", "BTC/USD").last_price == 99.0
+    assert store.get("coinbase", "BTC/USD") is None
@@ -0,0 +1,133 @@
+# src/tests/test_user_stream.py
+
+import asyncio
+import json
+import time
+from unittest.mock import patch
+from websockets.asyncio.server import serve
+from src.modules.exchange_connector.user_stream import (UserState, BinanceUserStream, CoinbaseUserStream,
+                                                        KrakenUserStream)
+from src.modules.exchange_connector.exchange_registry import ExchangeRegistry
+
+
+class FakeClient:
+    """Stands in for the authenticated ccxt client used for listen keys, tokens and balance seeding."""
+
+    def __init__(self):
+        self.calls = []
+
+    def safe_symbol(self, market_id):
+        return {"BTCUSDT": "BTC/USDT", "BTC-USD": "BTC/USD"}.get(market_id, market_id)
+
+    def publicPostUserDataStream(self):
+        self.calls.append("listenKey")
+        return {"listenKey": "abc123"}
+
+    def fetch_balance(self):
+        self.calls.append("fetch_balance")
+        return {"free": {"USDT": 900.0}, "used": {"USDT": 100.0}, "total": {"USDT": 1000.0}}
+
+    def fetch_order(self, order_id):
+        self.calls.append("fetch_order")
+        return {"id": order_id, "status": "unknown"}
+
+
+def execution_report(status, cumulative, last_qty=0.0, last_price=0.0, execution="TRADE"):
+    return {"e": "executionReport", "E": int(time.time() * 1000), "s": "BTCUSDT", "c": "quote-1", "C": "",
+            "S": "BUY", "o": "LIMIT", "x": execution, "X": status, "i": 42, "q": "1.0", "p": "100.0",
+            "l": str(last_qty), "L": str(last_price), "z": str(cumulative), "Z": str(cumulative * 100.0),
+            "T": int(time.time() * 1000)}
+
+
+def test_binance_reports_update_orders_fills_and_balances():
+    """Test execution reports build the order, emit one fill per execution and account frames set balances."""
+    state = UserState()
+    fills = []
+    state.add_listener(lambda event, exchange, payload: fills.append(payload) if event == "fill" else None)
+    stream = BinanceUserStream(FakeClient(), state, registry=ExchangeRegistry())
+
+    stream.handle(execution_report("NEW", 0.0, execution="NEW"))
+    stream.handle(execution_report("PARTIALLY_FILLED", 0.4, 0.4, 100.0))
+    stream.handle(execution_report("FILLED", 1.0, 0.6, 100.0))
+    stream.handle({"e": "outboundAccountPosition", "E": 1, "B": [{"a": "BTC", "f": "1.0", "l": "0.0"}]})
+    stream.handle({"e": "balanceUpdate", "E": 1, "a": "BTC", "d": "0.5"})
+
+    order = state.order("binance", client_order_id="quote-1")
+    assert order["id"] == "42" and order["status"] == "closed" and order["remaining"] == 0.0
+    assert [(fill["amount"], fill["price"]) for fill in fills] == [(0.4, 100.0), (0.6, 100.0)]
+    assert state.totals("binance") == {"BTC": 1.5}
+
+
+def test_kraken_and_coinbase_partial_updates_are_merged():
+    """Test partial updates keep earlier fields, fill prices come from averages and first updates emit no fill."""
+    state = UserState()
+    kraken = KrakenUserStream(FakeClient(), state, registry=ExchangeRegistry())
+    kraken.handle({"channel": "executions", "type": "update", "data": [
+        {"order_id": "K1", "symbol": "BTC/USD", "side": "sell", "order_type": "limit", "order_qty": 2.0,
+         "cum_qty": 0, "order_status": "new", "exec_type": "new"}]})
+    kraken.handle({"channel": "executions", "type": "update", "data": [
+        {"order_id": "K1", "cum_qty": 2.0, "avg_price": 50.0, "last_qty": 2.0, "last_price": 50.0,
+         "order_status": "filled", "exec_type": "trade"}]})
+    kraken.handle({"channel": "balances", "type": "update", "data": [{"asset": "USD", "balance": 100.0}]})
+    assert state.order("kraken", "K1")["side"] == "sell" and state.order("kraken", "K1")["status"] == "closed"
+    assert state.totals("kraken") == {"USD": 100.0}
+
+    fills = []
+    state.add_listener(lambda event, exchange, payload: fills.append(payload) if event == "fill" else None)
+    coinbase = CoinbaseUserStream(FakeClient(), state, registry=ExchangeRegistry())
+    for kind, cumulative, leaves, average in (("snapshot", "1", "2", "10"), ("update", "3", "0", "12")):
+        with patch.object(CoinbaseUserStream, "refresh_balances_soon") as refresh:
+            coinbase.handle({"channel": "user", "events": [{"type": kind, "orders": [
+                {"order_id": "C1", "product_id": "BTC-USD", "order_side": "BUY", "status": "OPEN",
+                 "cumulative_quantity": cumulative, "leaves_quantity": leaves, "avg_price": average}]}]})
+        assert refresh.call_count == (kind == "update")
+    with patch.object(CoinbaseUserStream, "refresh_balances_soon"):
+        coinbase.handle({"channel": "user", "events": [{"type": "update", "orders": [
+            {"order_id": "C2", "product_id": "BTC-USD", "order_side": "SELL", "status": "OPEN",
+             "cumulative_quantity": "1", "leaves_quantity": "1", "avg_price": "11"}]}]})
+    # The snapshot and C2's first update only set where fills are counted from
+    assert [(fill["amount"], fill["price"]) for fill in fills] == [(2.0, 13.0)]
+    assert state.order("coinbase", "C2")["filled"] == 1.0
+
+
+def test_stream_pushes_fills_and_replaces_polling(make_order_manager):
+    """Test a live stream seeds balances once, pushes fills without REST polling and answers order status."""
+    state = UserState()
+    client = FakeClient()
+    received = []
+    state.add_listener(lambda event, exchange, payload: received.append(payload) if event == "fill" else None)
+
+    async def scenario():
+        sent = asyncio.get_running_loop().create_future()
+
+        async def handler(connection):
+            await connection.send(json.dumps(execution_report("NEW", 0.0, execution="NEW")))
+            await asyncio.sleep(0.05)
+            sent.set_result(True)
+            await connection.send(json.dumps(execution_report("FILLED", 1.0, 1.0, 100.0)))
+            await connection.wait_closed()
+
+        async with serve(handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            stream = BinanceUserStream(client, state, ws_url=f"ws://127.0.0.1:{port}/ws", registry=ExchangeRegistry())
+            task = asyncio.ensure_future(stream.run())
+            await sent
+            for _ in range(1000):
+                if received:
+                    break
+                await asyncio.sleep(0.005)
+            live = state.is_live("binance")
+            stream.stop()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return live
+
+    live = asyncio.run(scenario())
+    assert live and [(fill["amount"], fill["price"]) for fill in received] == [(1.0, 100.0)]
+    assert client.calls == ["listenKey", "fetch_balance"]
+    assert state.totals("binance") == {"USDT": 1000.0}
+
+    manager = make_order_manager({"binance": client}, config={}, user_state=state)
+    state.set_live("binance", True)
+    assert manager.get_order_status("binance", "42")["status"] == "closed"
+    assert "fetch_order" not in client.calls